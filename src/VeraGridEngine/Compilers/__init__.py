@@ -7,4 +7,4 @@ import VeraGridEngine.Compilers.circuit_to_data
 # import VeraGridEngine.Compilers.circuit_to_bentayga
 # import VeraGridEngine.Compilers.circuit_to_newton_pa
 # import VeraGridEngine.Compilers.circuit_to_pgm
-from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
\ No newline at end of file
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, compile_numerical_circuit_ts
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: MPL-2.0
 from __future__ import annotations
 import numpy as np
-from typing import Dict, Union, TYPE_CHECKING
+from typing import Dict, List, Tuple, Union, TYPE_CHECKING
 
 from VeraGridEngine.basic_structures import Logger
 import VeraGridEngine.Devices as dev
@@ -13,8 +13,9 @@ from VeraGridEngine.Devices.Aggregation.area import Area
 from VeraGridEngine.enumerations import (BusMode, BranchImpedanceMode, ExternalGridMode, DeviceType,
                                          TapModuleControl, TapPhaseControl, HvdcControlType, ConverterControlType,
                                          ShuntConnectionType)
-from VeraGridEngine.basic_structures import BoolVec, IntVec
-from VeraGridEngine.Devices.types import BRANCH_TYPES
+from VeraGridEngine.basic_structures import BoolVec, IntVec, Vec, CxVec, Mat
+from VeraGridEngine.Devices.types import BRANCH_TYPES, ALL_DEV_TYPES
+from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.DataStructures.battery_data import BatteryData
 from VeraGridEngine.DataStructures.passive_branch_data import PassiveBranchData
 from VeraGridEngine.DataStructures.active_branch_data import ActiveBranchData
@@ -30,6 +31,7 @@ from VeraGridEngine.DataStructures.fluid_pump_data import FluidPumpData
 from VeraGridEngine.DataStructures.fluid_p2x_data import FluidP2XData
 from VeraGridEngine.DataStructures.fluid_path_data import FluidPathData
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
+from VeraGridEngine.DataStructures.numerical_circuit_ts import NumericalCircuitTs
 
 if TYPE_CHECKING:  # Only imports the below statements during type checking
     from VeraGridEngine.Devices.multi_circuit import MultiCircuit
@@ -2515,3 +2517,495 @@ def compile_numerical_circuit_at(circuit: MultiCircuit,
             nc.active_branch_data.any_pf_control = True
 
     return nc
+
+
+# Profiles that only feed their own array of the NumericalCircuit.
+# These are gathered in bulk for all the time steps, the rest of the profiles
+# define the structural state that requires a full compilation
+LOAD_TS_PROPERTIES = ('P', 'Q', 'Ir', 'Ii', 'G', 'B', 'Cost', 'shift_key')
+STATIC_GEN_TS_PROPERTIES = ('P', 'Q', 'Cost', 'shift_key')
+GENERATION_TS_PROPERTIES = ('P', 'Pf', 'Pmax', 'Pmin', 'Qmin', 'Qmax', 'Cost0', 'Cost', 'Cost2', 'shift_key')
+SHUNT_TS_PROPERTIES = ('G', 'B')
+BRANCH_TS_PROPERTIES = ('rate', 'contingency_factor', 'protection_rating_factor', 'Cost')
+CONTROLLABLE_BRANCH_TS_PROPERTIES = BRANCH_TS_PROPERTIES + ('Pset', 'Qset', 'vset', 'tap_module')
+BUS_TS_PROPERTIES = ('Vmin', 'Vmax')
+
+
+class _TsColumns:
+    """
+    Accumulator of the time varying columns of a NumericalCircuit array
+    """
+
+    def __init__(self, nt: int, dtype=float):
+        """
+        :param nt: number of time steps
+        :param dtype: data type of the values
+        """
+        self.nt = nt
+        self.dtype = dtype
+        self.idx = list()
+        self.cols = list()
+
+    def add(self, i: int, values: np.ndarray) -> None:
+        """
+        Add a column if it changes along the time
+        :param i: element index in the NumericalCircuit structure
+        :param values: values for all the time steps
+        """
+        if len(values) > 1 and not np.all(values == values[0]):
+            self.idx.append(i)
+            self.cols.append(values)
+
+    def get(self) -> Tuple[IntVec, np.ndarray]:
+        """
+        Get the indices and the (nt, n) matrix of values
+        """
+        if len(self.idx):
+            return np.array(self.idx, dtype=int), np.array(self.cols, dtype=self.dtype).T.copy()
+        else:
+            return np.zeros(0, dtype=int), np.zeros((self.nt, 0), dtype=self.dtype)
+
+
+def _complex_arr(re: Vec, im: Vec) -> CxVec:
+    """
+    Compose a complex array without touching the real and imaginary parts
+    :param re: real part
+    :param im: imaginary part
+    :return: complex array
+    """
+    arr = np.empty(len(re), dtype=complex)
+    arr.real = re
+    arr.imag = im
+    return arr
+
+
+def _encode_state_column(values: np.ndarray) -> IntVec:
+    """
+    Encode a profile values array as integers, so that equal values get equal codes
+    :param values: array of any type (numeric, enums or objects)
+    :return: array of int64
+    """
+    if values.dtype == object:
+        codes = dict()
+        res = np.empty(len(values), dtype=np.int64)
+        for i, val in enumerate(values):
+            res[i] = codes.setdefault(val, len(codes))
+        return res
+    else:
+        return values.astype(np.float64).view(np.int64)
+
+
+def get_structural_states(columns: List[IntVec], nt: int) -> Tuple[IntVec, IntVec]:
+    """
+    Group the time steps with the same structural values
+    :param columns: list of encoded structural profiles (each of size nt)
+    :param nt: number of time steps
+    :return: state of each time position, first time position of each state
+    """
+    if len(columns) == 0:
+        return np.zeros(nt, dtype=int), np.zeros(1 if nt > 0 else 0, dtype=int)
+
+    mat = np.array(columns, dtype=np.int64).T
+    _, first_pos, inverse = np.unique(mat, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # number the states by order of appearance
+    order = np.argsort(first_pos)
+    state_number = np.empty(len(order), dtype=int)
+    state_number[order] = np.arange(len(order))
+
+    return state_number[inverse], first_pos[order]
+
+
+def uses_reactive_power_curves(circuit: MultiCircuit) -> bool:
+    """
+    Check if any generation device uses its reactive power capability curve
+    :param circuit: MultiCircuit
+    :return: bool
+    """
+    for elm in circuit.get_generators() + circuit.get_batteries():
+        if elm.use_reactive_power_curve:
+            return True
+    return False
+
+
+def get_ts_compiled_devices(circuit: MultiCircuit) -> List[Tuple[ALL_DEV_TYPES, Tuple[str, ...]]]:
+    """
+    Get the devices that take part in the compilation along with the properties gathered in bulk
+    :param circuit: MultiCircuit
+    :return: list of (device, bulk properties)
+    """
+    data = list()
+
+    for elm in circuit.buses:
+        data.append((elm, BUS_TS_PROPERTIES))
+
+    for elm in circuit.get_loads():
+        data.append((elm, LOAD_TS_PROPERTIES))
+
+    for elm in circuit.get_static_generators():
+        data.append((elm, STATIC_GEN_TS_PROPERTIES))
+
+    for lst in [circuit.get_external_grids(), circuit.get_current_injections(), circuit.get_controllable_shunts(),
+                circuit.vsc_devices, circuit.hvdc_lines, circuit.fluid_nodes, circuit.turbines, circuit.pumps,
+                circuit.p2xs, circuit.fluid_paths]:
+        for elm in lst:
+            data.append((elm, ()))
+
+    # the generation P defines the reactive power limits when using capability curves
+    gen_props = GENERATION_TS_PROPERTIES[1:] if uses_reactive_power_curves(circuit) else GENERATION_TS_PROPERTIES
+
+    for elm in circuit.get_generators():
+        data.append((elm, gen_props))
+
+    for elm in circuit.get_batteries():
+        data.append((elm, gen_props))
+
+    for elm in circuit.get_shunts():
+        data.append((elm, SHUNT_TS_PROPERTIES))
+
+    for lst in [circuit.lines, circuit.dc_lines, circuit.series_reactances, circuit.switch_devices,
+                circuit.upfc_devices]:
+        for elm in lst:
+            data.append((elm, BRANCH_TS_PROPERTIES))
+
+    for lst in [circuit.transformers2w, circuit.windings]:
+        for elm in lst:
+            data.append((elm, CONTROLLABLE_BRANCH_TS_PROPERTIES))
+
+    return data
+
+
+def _fill_ts_load_data(nc_ts: NumericalCircuitTs,
+                       circuit: MultiCircuit,
+                       opf_results: VALID_OPF_RESULTS | None) -> None:
+    """
+    Gather the load-like time varying values
+    :param nc_ts: NumericalCircuitTs
+    :param circuit: MultiCircuit
+    :param opf_results: OPF time series results (optional)
+    """
+    nt = nc_ts.nt
+    t = nc_ts.time_indices
+    nelm = circuit.get_load_like_device_number()
+    S = _TsColumns(nt, complex)
+    I = _TsColumns(nt, complex)
+    Y = _TsColumns(nt, complex)
+    cost = _TsColumns(nt)
+    shift_key = _TsColumns(nt)
+    nc_ts.load_q_sign = np.zeros(nelm)
+    nc_ts.load_ii_sign = np.zeros(nelm)
+    nc_ts.load_b_sign = np.zeros(nelm)
+
+    ii = 0
+    for elm in circuit.get_loads():
+        if elm.bus is not None:
+            scale = 1000.0 if elm.use_kw else 1.0
+            s = _complex_arr(elm.P_prof.take(t), elm.Q_prof.take(t))
+            if opf_results is not None:
+                s = s - opf_results.load_shedding[t, ii]
+            S.add(ii, s / scale)
+            I.add(ii, _complex_arr(elm.Ir_prof.take(t), elm.Ii_prof.take(t)) / scale)
+            Y.add(ii, _complex_arr(elm.G_prof.take(t), elm.B_prof.take(t)) / scale)
+            cost.add(ii, elm.Cost_prof.take(t) / scale)
+            shift_key.add(ii, elm.shift_key_prof.take(t))
+            nc_ts.load_q_sign[ii] = -1.0
+            nc_ts.load_ii_sign[ii] = -1.0
+            nc_ts.load_b_sign[ii] = -1.0
+        ii += 1
+
+    for elm in circuit.get_static_generators():
+        if elm.bus is not None:
+            scale = 1000.0 if elm.use_kw else 1.0
+            S.add(ii, -_complex_arr(elm.P_prof.take(t), elm.Q_prof.take(t)) / scale)
+            cost.add(ii, elm.Cost_prof.take(t) / scale)
+            shift_key.add(ii, elm.shift_key_prof.take(t))
+            nc_ts.load_q_sign[ii] = 1.0
+        ii += 1
+
+    nc_ts.add_field('load_data', 'S', *S.get())
+    nc_ts.add_field('load_data', 'I', *I.get())
+    nc_ts.add_field('load_data', 'Y', *Y.get())
+    nc_ts.add_field('load_data', 'cost', *cost.get())
+    nc_ts.add_field('load_data', 'shift_key', *shift_key.get())
+
+
+def _fill_ts_generation_data(nc_ts: NumericalCircuitTs,
+                             struct_name: str,
+                             devices: List[dev.Generator] | List[dev.Battery],
+                             p_opf: Mat | None,
+                             bulk_p: bool) -> None:
+    """
+    Gather the generator-like time varying values
+    :param nc_ts: NumericalCircuitTs
+    :param struct_name: generator_data or battery_data
+    :param devices: list of generators or batteries
+    :param p_opf: OPF power values (n_all_time, n_devices) if any
+    :param bulk_p: gather P in bulk? (False if P is part of the structural state)
+    """
+    nt = nc_ts.nt
+    t = nc_ts.time_indices
+    p = _TsColumns(nt)
+    p_share = _TsColumns(nt)
+    pf_share = list()
+    scale_share = list()
+    fields = [('pf', 'Pf_prof', False), ('pmax', 'Pmax_prof', True), ('pmin', 'Pmin_prof', True),
+              ('qmin', 'Qmin_prof', True), ('qmax', 'Qmax_prof', True), ('cost_0', 'Cost0_prof', False),
+              ('cost_1', 'Cost_prof', True), ('cost_2', 'Cost2_prof', None), ('shift_key', 'shift_key_prof', False)]
+    cols = {attr: _TsColumns(nt) for attr, _, _ in fields}
+    srap = np.zeros((nc_ts.n_states, len(devices)), dtype=bool)
+
+    for k, elm in enumerate(devices):
+        if elm.bus is not None:
+            scale = 1000.0 if elm.use_kw else 1.0
+            p_raw = elm.P_prof.take(t)
+            pf = elm.Pf_prof.take(t)
+
+            if bulk_p and p_opf is None:
+                p.add(k, p_raw / scale)
+
+            for attr, prof_name, scaled in fields:
+                values = getattr(elm, prof_name).take(t)
+                if scaled is True:
+                    values = values / scale
+                elif scaled is None:
+                    values = values / (scale * scale)
+                cols[attr].add(k, values)
+
+            # reactive power sharing data
+            if not (np.all(p_raw == p_raw[0]) and np.all(pf == pf[0])):
+                p_share.idx.append(k)
+                p_share.cols.append(p_raw)
+                pf_share.append(pf)
+                scale_share.append(scale)
+
+            for s, pos in enumerate(nc_ts.template_pos):
+                srap[s, k] = elm.srap_enabled_prof[int(t[pos])]
+
+    if p_opf is not None:
+        nc_ts.add_field(struct_name, 'p', np.arange(len(devices), dtype=int), p_opf[t, :])
+    else:
+        nc_ts.add_field(struct_name, 'p', *p.get())
+
+    for attr, _, _ in fields:
+        nc_ts.add_field(struct_name, attr, *cols[attr].get())
+
+    if len(p_share.idx):
+        idx, p_mat = p_share.get()
+        nc_ts.gen_share_fields[struct_name] = (idx,
+                                               p_mat,
+                                               np.array(pf_share, dtype=float).T.copy(),
+                                               np.array(scale_share, dtype=float))
+        if srap.any():
+            nc_ts.srap_enabled[struct_name] = srap
+
+
+def _fill_ts_branch_data(nc_ts: NumericalCircuitTs,
+                         circuit: MultiCircuit,
+                         opf_results: VALID_OPF_RESULTS | None) -> None:
+    """
+    Gather the branch time varying values
+    :param nc_ts: NumericalCircuitTs
+    :param circuit: MultiCircuit
+    :param opf_results: OPF time series results (optional)
+    """
+    nt = nc_ts.nt
+    t = nc_ts.time_indices
+    Sbase = circuit.Sbase
+    rates = _TsColumns(nt)
+    contingency_rates = _TsColumns(nt)
+    protection_rates = _TsColumns(nt)
+    overload_cost = _TsColumns(nt)
+    Pset = _TsColumns(nt)
+    Qset = _TsColumns(nt)
+    vset = _TsColumns(nt)
+    tap_module = _TsColumns(nt)
+
+    ii = 0
+    for lst, controllable in [(circuit.lines, False),
+                              (circuit.dc_lines, False),
+                              (circuit.transformers2w, True),
+                              (circuit.windings, True),
+                              (circuit.upfc_devices, False),
+                              (circuit.series_reactances, False),
+                              (circuit.switch_devices, False)]:
+        for elm in lst:
+
+            if elm.bus_from is None or elm.bus_to is None:
+                # ill-connected windings are skipped by the compilation
+                continue
+
+            rate = elm.rate_prof.take(t)
+            rates.add(ii, rate)
+            contingency_rates.add(ii, rate * elm.contingency_factor_prof.take(t))
+            protection_rates.add(ii, rate * elm.protection_rating_factor_prof.take(t))
+            overload_cost.add(ii, elm.Cost_prof.take(t))
+
+            if controllable:
+                Pset.add(ii, elm.Pset_prof.take(t) / Sbase)
+                Qset.add(ii, elm.Qset_prof.take(t) / Sbase)
+                vset.add(ii, elm.vset_prof.take(t))
+                if opf_results is None:
+                    tap_module.add(ii, elm.tap_module_prof.take(t))
+
+            ii += 1
+
+    nc_ts.add_field('passive_branch_data', 'rates', *rates.get())
+    nc_ts.add_field('passive_branch_data', 'contingency_rates', *contingency_rates.get())
+    nc_ts.add_field('passive_branch_data', 'protection_rates', *protection_rates.get())
+    nc_ts.add_field('passive_branch_data', 'overload_cost', *overload_cost.get())
+    nc_ts.add_field('active_branch_data', 'Pset', *Pset.get())
+    nc_ts.add_field('active_branch_data', 'Qset', *Qset.get())
+    nc_ts.add_field('active_branch_data', 'vset', *vset.get())
+    nc_ts.add_field('active_branch_data', 'tap_module', *tap_module.get())
+
+
+def get_structural_columns(circuit: MultiCircuit,
+                           time_indices: IntVec,
+                           opf_results: VALID_OPF_RESULTS | None = None) -> List[IntVec]:
+    """
+    Get the encoded values of the profiles that define the structural state of the circuit.
+    Only the profiles that change along the given time indices are returned.
+    :param circuit: MultiCircuit
+    :param time_indices: array of time indices
+    :param opf_results: OPF time series results (optional)
+    :return: list of encoded profiles (each of size len(time_indices))
+    """
+    columns = list()
+    for elm, bulk_props in get_ts_compiled_devices(circuit=circuit):
+        for prop, prof_name in elm.properties_with_profile.items():
+            if prop not in bulk_props:
+                prof: Profile = getattr(elm, prof_name)
+                if prof.is_initialized and not prof.is_constant():
+                    col = _encode_state_column(prof.take(time_indices))
+                    if not np.all(col == col[0]):
+                        columns.append(col)
+
+    if opf_results is not None:
+        # these OPF values modify more than their own array
+        for mat in [opf_results.phase_shift, opf_results.hvdc_Pf]:
+            if mat.ndim == 2 and mat.shape[1] > 0:
+                for col in mat[time_indices, :].T:
+                    columns.append(_encode_state_column(col))
+
+    return columns
+
+
+def fill_ts_fields(nc_ts: NumericalCircuitTs,
+                   circuit: MultiCircuit,
+                   opf_results: VALID_OPF_RESULTS | None = None) -> None:
+    """
+    Gather the numerical (non-structural) profiles in bulk
+    :param nc_ts: NumericalCircuitTs with the structural states already computed
+    :param circuit: MultiCircuit
+    :param opf_results: OPF time series results (optional)
+    """
+    t = nc_ts.time_indices
+    use_q_curve = uses_reactive_power_curves(circuit)
+
+    bus_vmin = _TsColumns(nc_ts.nt)
+    bus_vmax = _TsColumns(nc_ts.nt)
+    for i, elm in enumerate(circuit.buses):
+        bus_vmin.add(i, elm.Vmin_prof.take(t))
+        bus_vmax.add(i, elm.Vmax_prof.take(t))
+    nc_ts.add_field('bus_data', 'Vmin', *bus_vmin.get())
+    nc_ts.add_field('bus_data', 'Vmax', *bus_vmax.get())
+
+    _fill_ts_load_data(nc_ts=nc_ts, circuit=circuit, opf_results=opf_results)
+
+    _fill_ts_generation_data(
+        nc_ts=nc_ts,
+        struct_name='generator_data',
+        devices=circuit.get_generators(),
+        p_opf=(opf_results.generator_power - opf_results.generator_shedding) if opf_results is not None else None,
+        bulk_p=not use_q_curve
+    )
+
+    _fill_ts_generation_data(
+        nc_ts=nc_ts,
+        struct_name='battery_data',
+        devices=circuit.get_batteries(),
+        p_opf=opf_results.battery_power if opf_results is not None else None,
+        bulk_p=not use_q_curve
+    )
+
+    shunt_y = _TsColumns(nc_ts.nt, complex)
+    for k, elm in enumerate(circuit.get_shunts()):
+        if elm.bus is not None:
+            scale = 1000.0 if elm.use_kw else 1.0
+            shunt_y.add(k, _complex_arr(elm.G_prof.take(t), elm.B_prof.take(t)) / scale)
+    nc_ts.add_field('shunt_data', 'Y', *shunt_y.get())
+
+    _fill_ts_branch_data(nc_ts=nc_ts, circuit=circuit, opf_results=opf_results)
+
+
+def compile_numerical_circuit_ts(circuit: MultiCircuit,
+                                 time_indices: IntVec,
+                                 apply_temperature=False,
+                                 branch_tolerance_mode=BranchImpedanceMode.Specified,
+                                 opf_results: VALID_OPF_RESULTS | None = None,
+                                 use_stored_guess=False,
+                                 bus_dict: Union[Dict[Bus, int], None] = None,
+                                 areas_dict: Union[Dict[Area, int], None] = None,
+                                 control_taps_modules: bool = True,
+                                 control_taps_phase: bool = True,
+                                 control_remote_voltage: bool = True,
+                                 fill_gep: bool = False,
+                                 logger=Logger()) -> NumericalCircuitTs:
+    """
+    Compile a time-batched NumericalCircuit from a MultiCircuit.
+    The profiles that change the structure (active states, set points, control modes...) are used to group the
+    time steps, and only one NumericalCircuit is compiled per group. The profiles that only feed numerical
+    arrays (loads, generation, rates, costs...) are gathered in bulk for all the time steps.
+    NumericalCircuitTs.get_at(t) gives the same NumericalCircuit as compile_numerical_circuit_at(t_idx=t)
+    :param circuit: MultiCircuit instance
+    :param time_indices: array of time indices to compile
+    :param apply_temperature: apply the branch temperature correction
+    :param branch_tolerance_mode: Branch tolerance mode
+    :param opf_results:(optional) OptimalPowerFlowTimeSeriesResults instance
+    :param use_stored_guess: use the storage voltage guess?
+    :param bus_dict (optional) Dict[Bus, int] dictionary
+    :param areas_dict (optional) Dict[Area, int] dictionary
+    :param control_taps_modules: control taps modules?
+    :param control_taps_phase: control taps phase?
+    :param control_remote_voltage: control remote voltage?
+    :param fill_gep: fill generation expansion planning parameters?
+    :param logger: Logger instance
+    :return: NumericalCircuitTs instance
+    """
+    nc_ts = NumericalCircuitTs(time_indices=time_indices)
+    t = nc_ts.time_indices
+
+    if bus_dict is None:
+        bus_dict = {bus: i for i, bus in enumerate(circuit.buses)}
+
+    if areas_dict is None:
+        areas_dict = {elm: i for i, elm in enumerate(circuit.areas)}
+
+    # group the time steps by structural state
+    columns = get_structural_columns(circuit=circuit, time_indices=t, opf_results=opf_results)
+    nc_ts.state_of_t, nc_ts.template_pos = get_structural_states(columns=columns, nt=nc_ts.nt)
+
+    # compile one circuit per structural state
+    for pos in nc_ts.template_pos:
+        nc = compile_numerical_circuit_at(
+            circuit=circuit,
+            t_idx=int(t[pos]),
+            apply_temperature=apply_temperature,
+            branch_tolerance_mode=branch_tolerance_mode,
+            opf_results=opf_results,
+            use_stored_guess=use_stored_guess,
+            bus_dict=bus_dict,
+            areas_dict=areas_dict,
+            control_taps_modules=control_taps_modules,
+            control_taps_phase=control_taps_phase,
+            control_remote_voltage=control_remote_voltage,
+            fill_gep=fill_gep,
+            logger=logger
+        )
+        nc_ts.templates.append(nc)
+
+    # gather the numerical profiles in bulk
+    fill_ts_fields(nc_ts=nc_ts, circuit=circuit, opf_results=opf_results)
+
+    return nc_ts
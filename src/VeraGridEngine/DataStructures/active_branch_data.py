@@ -8,9 +8,10 @@ from __future__ import annotations
 import numpy as np
 from VeraGridEngine.Utils.Sparse.sparse_array import SparseObjectArray
 from VeraGridEngine.basic_structures import Vec, IntVec, ObjVec, CxVec, Logger
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 
 
-class ActiveBranchData:
+class ActiveBranchData(LazySlice):
     """
     ControllableBranchData
     """
@@ -64,6 +65,7 @@ class ActiveBranchData:
               bus_map: IntVec, logger: Logger | None) -> ActiveBranchData:
         """
         Slice branch data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: array of bus indices to re index main to island indices
@@ -71,36 +73,16 @@ class ActiveBranchData:
         :return: new BranchData instance
         """
 
-        data = ActiveBranchData(nelm=len(elm_idx), nbus=len(bus_idx))
+        data = lazy_slice(self, ActiveBranchData, elm_idx, nelm=len(elm_idx), nbus=len(bus_idx))
 
-        data.is_controlled = self.is_controlled[elm_idx]
-
-        data.m_taps = self.m_taps.slice(elm_idx)
-        data.tau_taps = self.tau_taps.slice(elm_idx)
-
-        data.tap_module = self.tap_module[elm_idx]
-        data.tap_module_min = self.tap_module_min[elm_idx]
-        data.tap_module_max = self.tap_module_max[elm_idx]
-        data.tap_angle = self.tap_angle[elm_idx]
-        data.tap_angle_min = self.tap_angle_min[elm_idx]
-        data.tap_angle_max = self.tap_angle_max[elm_idx]
-        data.tap_phase_control_mode = self.tap_phase_control_mode[elm_idx]
-        data.tap_module_control_mode = self.tap_module_control_mode[elm_idx]
         data.tap_controlled_buses = self.tap_controlled_buses[elm_idx]
+        ctrl = data.tap_controlled_buses != 0
+        data.tap_controlled_buses[ctrl] = bus_map[data.tap_controlled_buses[ctrl]]
 
-        data.Pset = self.Pset[elm_idx]
-        data.Qset = self.Qset[elm_idx]
-        data.vset = self.vset[elm_idx]
-
-        data.any_pf_control = self.any_pf_control
-
-        for k in range(data.nelm):
-            if data.tap_controlled_buses[k] != 0:
-                data.tap_controlled_buses[k] = bus_map[data.tap_controlled_buses[k]]
-                if data.tap_controlled_buses[k] == -1:
-                    if logger is not None:
-                        logger.add_error(f"Branch {k}, is controlling a bus from another island ",
-                                         value=data.tap_controlled_buses[k])
+        for k in np.where(ctrl & (data.tap_controlled_buses == -1))[0]:
+            if logger is not None:
+                logger.add_error(f"Branch {k}, is controlling a bus from another island ",
+                                 value=data.tap_controlled_buses[k])
 
         return data
 
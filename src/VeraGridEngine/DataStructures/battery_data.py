@@ -35,25 +35,14 @@ class BatteryData(GeneratorData):
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec) -> "BatteryData":
         """
         Slice battery data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of element indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus to index
         :return: new BatteryData instance
         """
 
-        data = super().slice(elm_idx, bus_idx, bus_map)
-
-        data.enom = self.enom[elm_idx]
-        data.e_min = self.e_min[elm_idx]
-        data.e_max = self.e_max[elm_idx]
-        data.min_soc = self.min_soc[elm_idx]
-        data.max_soc = self.max_soc[elm_idx]
-        data.soc_0 = self.soc_0[elm_idx]
-        data.discharge_efficiency = self.discharge_efficiency[elm_idx]
-        data.charge_efficiency = self.charge_efficiency[elm_idx]
-        data.efficiency = self.efficiency[elm_idx]
-
-        return data
+        return super().slice(elm_idx, bus_idx, bus_map)
 
     def copy(self) -> "BatteryData":
         """
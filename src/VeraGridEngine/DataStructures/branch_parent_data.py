@@ -9,10 +9,11 @@ import numpy as np
 import pandas as pd
 import scipy.sparse as sp
 from VeraGridEngine.basic_structures import Vec, IntVec, StrVec, BoolVec, Logger
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 from typing import List, Tuple, Set
 
 
-class BranchParentData:
+class BranchParentData(LazySlice):
     """
     Structure to host all branches data for calculation
     """
@@ -134,6 +135,7 @@ class BranchParentData:
               logger: Logger | None) -> Tuple["BranchParentData", IntVec]:
         """
         Slice branch data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to island bus index {int(o): i for i, o in enumerate(bus_idx)}
@@ -141,49 +143,30 @@ class BranchParentData:
         :return: new BranchData instance
         """
 
-        data = BranchParentData(nelm=len(elm_idx), nbus=len(bus_idx))
+        data = lazy_slice(self, BranchParentData, elm_idx, nelm=len(elm_idx), nbus=len(bus_idx))
 
         if data.nelm == 0:
+            data.materialize()
             return data, np.zeros(0, dtype=int)
 
-        data.names = self.names[elm_idx]
-        data.idtag = self.idtag[elm_idx]
-
-        data.mttf = self.mttf[elm_idx]
-        data.mttr = self.mttr[elm_idx]
-
-        data.dc = self.dc[elm_idx]
-        data.contingency_enabled = self.contingency_enabled[elm_idx]
-        data.monitor_loading = self.monitor_loading[elm_idx]
-
-        data.active = self.active[elm_idx]
-        data.rates = self.rates[elm_idx]
-        data.contingency_rates = self.contingency_rates[elm_idx]
-        data.protection_rates = self.protection_rates[elm_idx]
-
         # first slice, then remap
-        data.F = self.F[elm_idx]
-        data.T = self.T[elm_idx]
+        data.F = bus_map[self.F[elm_idx]]
+        data.T = bus_map[self.T[elm_idx]]
 
-        for k in range(data.nelm):
-            data.F[k] = bus_map[data.F[k]]
+        for k in np.where((data.F == -1) | (data.T == -1))[0]:
             if data.F[k] == -1:
                 if logger is not None:
                     logger.add_error(f"Branch {k}, {self.names[k]} is connected to a disconnected node",
                                      value=data.F[k])
                 data.active[k] = 0
 
-            data.T[k] = bus_map[data.T[k]]
             if data.T[k] == -1:
                 if logger is not None:
                     logger.add_error(f"Branch {k}, {self.names[k]} is connected to a disconnected node",
                                      value=data.T[k])
                 data.active[k] = 0
 
-        data.overload_cost = self.overload_cost[elm_idx]
-
         data.original_idx = elm_idx
-        data.reducible = self.reducible[elm_idx]
 
         return data, bus_map
 
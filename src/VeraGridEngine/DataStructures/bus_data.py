@@ -6,9 +6,10 @@ from typing import Dict
 import numpy as np
 from VeraGridEngine.basic_structures import CxVec, Vec, IntVec, BoolVec, StrVec
 from VeraGridEngine.enumerations import BusMode
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 
 
-class BusData:
+class BusData(LazySlice):
     """
     BusData
     """
@@ -55,40 +56,12 @@ class BusData:
     def slice(self, elm_idx: IntVec) -> "BusData":
         """
         Slice this data structure
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of bus indices
         :return: instance of BusData
         """
 
-        data = BusData(nbus=len(elm_idx))
-
-        data.names = self.names[elm_idx]
-        data.idtag = self.idtag[elm_idx]
-        data.active = self.active[elm_idx]
-
-        data.Vbus = self.Vbus[elm_idx]
-        data.Vmin = self.Vmin[elm_idx]
-        data.Vmax = self.Vmax[elm_idx]
-        data.Vnom = self.Vnom[elm_idx]
-        data.cost_v = self.cost_v[elm_idx]
-        data.angle_min = self.angle_min[elm_idx]
-        data.angle_max = self.angle_max[elm_idx]
-
-        data.bus_types = self.bus_types[elm_idx]
-        data.is_p_controlled = self.is_p_controlled[elm_idx]
-        data.is_q_controlled = self.is_q_controlled[elm_idx]
-        data.is_vm_controlled = self.is_vm_controlled[elm_idx]
-        data.is_va_controlled = self.is_va_controlled[elm_idx]
-        data.installed_power = self.installed_power[elm_idx]
-        data.srap_availbale_power = self.srap_availbale_power[elm_idx]
-        data.is_dc = self.is_dc[elm_idx]
-        data.is_grounded = self.is_grounded[elm_idx]
-        data.areas = self.areas[elm_idx]
-        data.substations = self.substations[elm_idx]
-
-        data.q_shared_total = self.q_shared_total[elm_idx]
-        data.q_fixed = self.q_fixed[elm_idx]
-        data.ii_fixed = self.ii_fixed[elm_idx]
-        data.b_fixed = self.b_fixed[elm_idx]
+        data = lazy_slice(self, BusData, elm_idx, nbus=len(elm_idx))
 
         data.original_idx = elm_idx
 
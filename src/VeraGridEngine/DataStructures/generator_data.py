@@ -8,9 +8,10 @@ import numpy as np
 from scipy.sparse import csc_matrix, coo_matrix
 import VeraGridEngine.Topology.topology as tp
 from VeraGridEngine.basic_structures import CxVec, Vec, IntVec, BoolVec, StrVec
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 
 
-class GeneratorData:
+class GeneratorData(LazySlice):
     """
     GeneratorData
     """
@@ -87,77 +88,30 @@ class GeneratorData:
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec):
         """
         Slice generator data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of element indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to element index
         :return: new GeneratorData instance
         """
 
-        data = GeneratorData(nelm=len(elm_idx),
-                             nbus=len(bus_idx))
-
-        data.names = self.names[elm_idx]
-        data.idtag = self.idtag[elm_idx]
-
-        data.controllable = self.controllable[elm_idx]
-        data.installed_p = self.installed_p[elm_idx]
-
-        data.active = self.active[elm_idx]
-        data.p = self.p[elm_idx]
-        data.pf = self.pf[elm_idx]
-        data.v = self.v[elm_idx]
-
-        data.qmin = self.qmin[elm_idx]
-        data.qmax = self.qmax[elm_idx]
-        data.snom = self.snom[elm_idx]
-        data.q_share = self.q_share[elm_idx]
-
-        data.mttf = self.mttf[elm_idx]
-        data.mttr = self.mttr[elm_idx]
-
-        data.bus_idx = self.bus_idx[elm_idx]
-        data.controllable_bus_idx = self.controllable_bus_idx[elm_idx]
+        data = lazy_slice(self, type(self), elm_idx, nelm=len(elm_idx), nbus=len(bus_idx))
 
         # Remapping of the buses
-        for k in range(data.nelm):
-            data.bus_idx[k] = bus_map[data.bus_idx[k]]
-
-            if data.bus_idx[k] == -1:
-                data.active[k] = 0
+        data.bus_idx = bus_map[self.bus_idx[elm_idx]]
+        data.active[data.bus_idx == -1] = 0
 
-            if data.controllable_bus_idx[k] > -1:
-                data.controllable_bus_idx[k] = bus_map[data.controllable_bus_idx[k]]
-
-        data.r0 = self.r0[elm_idx]
-        data.r1 = self.r1[elm_idx]
-        data.r2 = self.r2[elm_idx]
-
-        data.x0 = self.x0[elm_idx]
-        data.x1 = self.x1[elm_idx]
-        data.x2 = self.x2[elm_idx]
-
-        data.dispatchable = self.dispatchable[elm_idx]
-        data.pmax = self.pmax[elm_idx]
-        data.pmin = self.pmin[elm_idx]
-
-        data.cost_0 = self.cost_0[elm_idx]
-        data.cost_1 = self.cost_1[elm_idx]
-        data.cost_2 = self.cost_2[elm_idx]
-        data.startup_cost = self.startup_cost[elm_idx]
-        data.ramp_up = self.ramp_up[elm_idx]
-        data.ramp_down = self.ramp_down[elm_idx]
-        data.min_time_up = self.min_time_up[elm_idx]
-        data.min_time_down = self.min_time_down[elm_idx]
-
-        data.capex = self.capex[elm_idx]
-        data.discount_rate = self.discount_rate[elm_idx]
-        data.is_candidate = self.is_candidate[elm_idx]
-
-        data.shift_key = self.shift_key[elm_idx]
-        data.scalable = self.scalable[elm_idx]
+        data.controllable_bus_idx = self.controllable_bus_idx[elm_idx]
+        ctrl = data.controllable_bus_idx > -1
+        data.controllable_bus_idx[ctrl] = bus_map[data.controllable_bus_idx[ctrl]]
 
         data.original_idx = elm_idx
 
+        # these are not passed to the islands
+        data.p3_star = np.zeros(data.nelm * 3, dtype=float)
+        data.name_to_idx = dict()
+        data.is_at_dc_bus = np.zeros(data.nelm, dtype=bool)
+
         return data
 
     def remap(self, bus_map_arr: IntVec):
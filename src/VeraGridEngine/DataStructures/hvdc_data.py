@@ -57,34 +57,18 @@ class HvdcData(BranchParentData):
 
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec, logger: Logger | None) -> "HvdcData":
         """
-        Make a deep copy of this structure
+        Slice HVDC data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
+        :param elm_idx: array of branch indices
+        :param bus_idx: array of bus indices
+        :param bus_map: map from bus index to island bus index
+        :param logger: Logger
         :return: new HvdcData instance
         """
         data, bus_map = super().slice(elm_idx, bus_idx, bus_map, logger)
         data: HvdcData = data
         data.__class__ = HvdcData
 
-        data.dispatchable = self.dispatchable[elm_idx]
-
-        data.r = self.r[elm_idx]
-
-        data.Pset = self.Pset[elm_idx]
-        data.Pt = self.Pt[elm_idx]
-
-        data.Vset_f = self.Vset_f[elm_idx]
-        data.Vset_t = self.Vset_t[elm_idx]
-
-        data.Vnf = self.Vnf[elm_idx]
-        data.Vnt = self.Vnt[elm_idx]
-
-        data.angle_droop = self.angle_droop[elm_idx]
-        data.control_mode = self.control_mode[elm_idx]
-
-        data.Qmin_f = self.Qmin_f[elm_idx]
-        data.Qmax_f = self.Qmax_f[elm_idx]
-        data.Qmin_t = self.Qmin_t[elm_idx]
-        data.Qmax_t = self.Qmax_t[elm_idx]
-
         return data
 
     def remap(self, bus_map_arr: IntVec):
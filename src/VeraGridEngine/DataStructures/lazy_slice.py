@@ -0,0 +1,135 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+from typing import Any, Union, Type, TypeVar, Set
+import numpy as np
+from VeraGridEngine.basic_structures import IntVec
+
+T = TypeVar('T', bound='LazySlice')
+
+
+def gather(value: Any, elm_idx: Union[IntVec, None], n: int) -> Any:
+    """
+    Slice the value of an attribute of a data structure by the element indices
+    :param value: attribute value of the parent structure
+    :param elm_idx: element indices, None to take all the elements (the value is copied)
+    :param n: number of elements of the parent structure
+    :return: sliced value
+    """
+    if isinstance(value, np.ndarray):
+        if value.ndim > 0 and value.shape[0] == n:
+            # one entry per element
+            return value.copy() if elm_idx is None else value[elm_idx]
+
+        elif value.ndim > 0 and value.shape[0] == 3 * n:
+            # three entries per element (three-phase magnitudes)
+            if elm_idx is None:
+                return value.copy()
+            else:
+                elm_idx_3 = ((elm_idx * 3)[:, np.newaxis] + np.arange(3)).flatten()
+                return value[elm_idx_3]
+
+        else:
+            return value.copy()
+
+    elif hasattr(value, 'slice'):
+        # i.e. SparseObjectArray
+        return value.slice(np.arange(n) if elm_idx is None else elm_idx)
+
+    else:
+        return value
+
+
+class LazySlice:
+    """
+    Base of the numerical data structures that can be sliced lazily (i.e. to form the islands)
+
+    The slices made with lazy_slice keep a reference to the parent structure and gather
+    each array the first time it is accessed, so the arrays that a simulation never touches
+    are never copied. Since the gathered arrays are copies, writing on a slice never
+    modifies the parent structure.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Gather an attribute from the parent structure
+        This is only called when the attribute does not exist (yet)
+        :param name: attribute name
+        :return: sliced value
+        """
+        lazy = self.__dict__.get('_lazy_parent', None)
+
+        if lazy is None or name.startswith('__'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        parent, elm_idx, n = lazy
+        value = gather(value=getattr(parent, name), elm_idx=elm_idx, n=n)
+        setattr(self, name, value)
+        return value
+
+    def is_lazy(self) -> bool:
+        """
+        Are there attributes still pending to be gathered from the parent structure?
+        :return: bool
+        """
+        return '_lazy_parent' in self.__dict__
+
+    def materialize(self) -> None:
+        """
+        Gather all the pending attributes and release the parent structure
+        (i.e. before sending the structure to another process)
+        """
+        lazy = self.__dict__.get('_lazy_parent', None)
+
+        if lazy is not None:
+            for name in get_attribute_names(lazy[0]):
+                if name not in self.__dict__:
+                    getattr(self, name)
+
+            del self.__dict__['_lazy_parent']
+
+
+def get_attribute_names(data: Any) -> Set[str]:
+    """
+    Get the names of the instance attributes of a structure, including the ones pending to be gathered
+    :param data: data structure
+    :return: set of names
+    """
+    names = set(data.__dict__.keys())
+    names.discard('_lazy_parent')
+
+    lazy = data.__dict__.get('_lazy_parent', None)
+    if lazy is not None:
+        names |= get_attribute_names(lazy[0])
+
+    return names
+
+
+def lazy_slice(parent: LazySlice, cls: Type[T], elm_idx: IntVec, **sizes: int) -> T:
+    """
+    Create a lazy slice of a data structure
+    :param parent: structure to slice
+    :param cls: class of the new structure
+    :param elm_idx: indices of the elements to keep
+    :param sizes: size attributes of the new structure (i.e. nelm=3, nbus=2), these are not sliced
+    :return: instance of cls
+    """
+    n = parent.size()
+
+    if len(elm_idx) == n and np.array_equal(elm_idx, np.arange(n)):
+        # all the elements, in order: the arrays will be plain copies
+        idx = None
+    else:
+        idx = elm_idx
+
+    data = cls.__new__(cls)
+
+    for name, val in sizes.items():
+        setattr(data, name, val)
+
+    data.__dict__['_lazy_parent'] = (parent, idx, n)
+
+    return data
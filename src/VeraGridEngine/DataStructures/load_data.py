@@ -6,9 +6,10 @@
 import numpy as np
 import VeraGridEngine.Topology.topology as tp
 from VeraGridEngine.basic_structures import Vec, CxVec, IntVec, StrVec, BoolVec
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 
 
-class LoadData:
+class LoadData(LazySlice):
     """
     Structure to host the load calculation information
     """
@@ -63,49 +64,18 @@ class LoadData:
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec) -> "LoadData":
         """
         Slice load data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to island bus index {int(o): i for i, o in enumerate(bus_idx)}
         :return: new LoadData instance
         """
 
-        data = LoadData(nelm=len(elm_idx), nbus=len(bus_idx))
-
-        data.names = self.names[elm_idx]
-        data.idtag = self.idtag[elm_idx]
-
-        data.active = self.active[elm_idx]
-        data.S = self.S[elm_idx]
-        data.I = self.I[elm_idx]
-        data.Y = self.Y[elm_idx]
-
-        elm_idx_3 = ((elm_idx * 3)[:, np.newaxis] + np.arange(3)).flatten()
-
-        data.S3_delta = self.S3_delta[elm_idx_3]
-        data.S3_star = self.S3_star[elm_idx_3]
-
-        data.I3_delta = self.I3_delta[elm_idx_3]
-        data.I3_star = self.I3_star[elm_idx_3]
-
-        data.Y3_delta = self.Y3_delta[elm_idx_3]
-        data.Y3_star = self.Y3_star[elm_idx_3]
-
-        data.mttf = self.mttf[elm_idx]
-        data.mttr = self.mttr[elm_idx]
-
-        data.bus_idx = self.bus_idx[elm_idx]
+        data = lazy_slice(self, LoadData, elm_idx, nelm=len(elm_idx), nbus=len(bus_idx))
 
         # Remapping of the buses
-        for k in range(data.nelm):
-            data.bus_idx[k] = bus_map[data.bus_idx[k]]
-
-            if data.bus_idx[k] == -1:
-                data.active[k] = 0
-
-        data.cost = self.cost[elm_idx]
-
-        data.shift_key = self.shift_key[elm_idx]
-        data.scalable = self.scalable[elm_idx]
+        data.bus_idx = bus_map[self.bus_idx[elm_idx]]
+        data.active[data.bus_idx == -1] = 0
 
         data.original_idx = elm_idx
 
@@ -20,6 +20,7 @@ from VeraGridEngine.enumerations import BusMode, ContingencyOperationTypes
 import VeraGridEngine.Topology.topology as tp
 import VeraGridEngine.Topology.simulation_indices as si
 import VeraGridEngine.Topology.admittance_matrices as ycalc
+from VeraGridEngine.Topology.topology_cache import get_topology_cache, hash_arrays
 from VeraGridEngine.DataStructures.battery_data import BatteryData
 from VeraGridEngine.DataStructures.passive_branch_data import PassiveBranchData
 from VeraGridEngine.DataStructures.active_branch_data import ActiveBranchData
@@ -34,6 +35,7 @@ from VeraGridEngine.DataStructures.fluid_turbine_data import FluidTurbineData
 from VeraGridEngine.DataStructures.fluid_pump_data import FluidPumpData
 from VeraGridEngine.DataStructures.fluid_p2x_data import FluidP2XData
 from VeraGridEngine.DataStructures.fluid_path_data import FluidPathData
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice
 from VeraGridEngine.Devices.Aggregation.investment import Investment
 from VeraGridEngine.Devices.Aggregation.contingency import Contingency
 
@@ -774,8 +776,32 @@ class NumericalCircuit:
         :return: Admittance object
         """
 
+        Yshunt_bus = self.get_Yshunt_bus_pu()
+
+        cache = get_topology_cache()
+        if cache is not None:
+            key = hash_arrays(self.bus_data.nbus,
+                              self.passive_branch_data.F,
+                              self.passive_branch_data.T,
+                              self.passive_branch_data.R,
+                              self.passive_branch_data.X,
+                              self.passive_branch_data.G,
+                              self.passive_branch_data.B,
+                              self.passive_branch_data.virtual_tap_f,
+                              self.passive_branch_data.virtual_tap_t,
+                              self.passive_branch_data.conn,
+                              self.active_branch_data.tap_module,
+                              self.active_branch_data.tap_angle,
+                              Yshunt_bus)
+            adm = cache.get('admittances', key)
+            if adm is not None:
+                # the admittances may be modified in-place by the simulations (i.e. the taps)
+                return adm.copy()
+        else:
+            key = ""
+
         # compute admittances on demand
-        return ycalc.compute_admittances(
+        adm = ycalc.compute_admittances(
             R=self.passive_branch_data.R,
             X=self.passive_branch_data.X,
             G=self.passive_branch_data.G,
@@ -786,11 +812,16 @@ class NumericalCircuit:
             tap_angle=self.active_branch_data.tap_angle,
             Cf=self.passive_branch_data.Cf.tocsc(),
             Ct=self.passive_branch_data.Ct.tocsc(),
-            Yshunt_bus=self.get_Yshunt_bus_pu(),
+            Yshunt_bus=Yshunt_bus,
             conn=self.passive_branch_data.conn,
             seq=1
         )
 
+        if cache is not None:
+            cache.set('admittances', key, adm.copy())
+
+        return adm
+
     def get_series_admittance_matrices(self) -> ycalc.SeriesAdmittanceMatrices:
         """
 
@@ -816,7 +847,17 @@ class NumericalCircuit:
 
         :return:
         """
-        return ycalc.compute_fast_decoupled_admittances(
+        cache = get_topology_cache()
+        if cache is not None:
+            key = self.get_fast_decoupled_key()
+            fd_adm = cache.get('fast_decoupled_admittances', key)
+            if fd_adm is not None:
+                # copy, so that the caller can modify the matrices without altering the cache
+                return fd_adm.copy()
+        else:
+            key = ""
+
+        fd_adm = ycalc.compute_fast_decoupled_admittances(
             X=self.passive_branch_data.X,
             B=self.passive_branch_data.B,
             tap_module=self.active_branch_data.tap_module,
@@ -827,6 +868,26 @@ class NumericalCircuit:
             Ct=self.passive_branch_data.Ct.tocsc(),
         )
 
+        if cache is not None:
+            cache.set('fast_decoupled_admittances', key, fd_adm.copy())
+
+        return fd_adm
+
+    def get_fast_decoupled_key(self) -> str:
+        """
+        Get the hash of the arrays that define the fast decoupled admittances (B' and B'')
+        :return: topology cache key
+        """
+        return hash_arrays(self.bus_data.nbus,
+                           self.passive_branch_data.F,
+                           self.passive_branch_data.T,
+                           self.passive_branch_data.active,
+                           self.passive_branch_data.X,
+                           self.passive_branch_data.B,
+                           self.passive_branch_data.virtual_tap_f,
+                           self.passive_branch_data.virtual_tap_t,
+                           self.active_branch_data.tap_module)
+
     def get_linear_admittance_matrices(self,
                                        indices: SimulationIndices | None = None) -> ycalc.LinearAdmittanceMatrices:
         """
@@ -836,7 +897,25 @@ class NumericalCircuit:
         if indices is None:
             indices = self.get_simulation_indices()
 
-        return ycalc.compute_linear_admittances(
+        cache = get_topology_cache()
+        if cache is not None:
+            key = hash_arrays(self.bus_data.nbus,
+                              self.passive_branch_data.F,
+                              self.passive_branch_data.T,
+                              self.passive_branch_data.active,
+                              self.passive_branch_data.R,
+                              self.passive_branch_data.X,
+                              self.active_branch_data.tap_module,
+                              indices.ac,
+                              indices.dc)
+            lin_adm = cache.get('linear_admittances', key)
+            if lin_adm is not None:
+                # copy, so that the caller can modify the matrices without altering the cache
+                return lin_adm.copy()
+        else:
+            key = ""
+
+        lin_adm = ycalc.compute_linear_admittances(
             nbr=self.nbr,
             X=self.passive_branch_data.X,
             R=self.passive_branch_data.R,
@@ -848,6 +927,11 @@ class NumericalCircuit:
             dc=indices.dc
         )
 
+        if cache is not None:
+            cache.set('linear_admittances', key, lin_adm.copy())
+
+        return lin_adm
+
     def get_reactive_power_limits(self) -> Tuple[Vec, Vec]:
         """
         compute the reactive power limits in place
@@ -1396,53 +1480,85 @@ class NumericalCircuit:
 
         return n_red
 
+    def get_island_elements(self, bus_idx: IntVec) -> Dict[str, IntVec]:
+        """
+        Get the indices of the active elements that belong to the island formed by the given buses
+        :param bus_idx: array of bus indices
+        :return: dictionary of data structure name -> indices of the elements in the island
+        """
+        # this is an array to map the old indices to the new indices
+        bus_map = np.full(self.bus_data.nbus, -1, dtype=int)
+        bus_map[bus_idx] = np.arange(len(bus_idx))
+
+        return {
+            'passive_branch_data': tp.get_island_branch_indices(bus_map=bus_map,
+                                                                elm_active=self.passive_branch_data.active,
+                                                                F=self.passive_branch_data.F,
+                                                                T=self.passive_branch_data.T),
+
+            'hvdc_data': tp.get_island_branch_indices(bus_map=bus_map,
+                                                      elm_active=self.hvdc_data.active,
+                                                      F=self.hvdc_data.F,
+                                                      T=self.hvdc_data.T),
+
+            'vsc_data': tp.get_island_branch_indices(bus_map=bus_map,
+                                                     elm_active=self.vsc_data.active,
+                                                     F=self.vsc_data.F,
+                                                     T=self.vsc_data.T),
+
+            'load_data': tp.get_island_monopole_indices(bus_map=bus_map,
+                                                        elm_active=self.load_data.active,
+                                                        elm_bus=self.load_data.bus_idx),
+
+            'generator_data': tp.get_island_monopole_indices(bus_map=bus_map,
+                                                             elm_active=self.generator_data.active,
+                                                             elm_bus=self.generator_data.bus_idx),
+
+            'battery_data': tp.get_island_monopole_indices(bus_map=bus_map,
+                                                           elm_active=self.battery_data.active,
+                                                           elm_bus=self.battery_data.bus_idx),
+
+            'shunt_data': tp.get_island_monopole_indices(bus_map=bus_map,
+                                                         elm_active=self.shunt_data.active,
+                                                         elm_bus=self.shunt_data.bus_idx),
+        }
+
     def get_island(self,
                    bus_idx: IntVec,
-                   logger: Logger | None = None) -> "NumericalCircuit":
+                   logger: Logger | None = None,
+                   elements: Dict[str, IntVec] | None = None) -> "NumericalCircuit":
         """
         Get the island corresponding to the given buses
+        The island structures are lazy slices of this circuit: their arrays are copied (gathered)
+        the first time they are accessed, and only the bus re-mapping is done here.
+        If the island spans the whole circuit, the arrays are plain copies-on-access.
+        Note: this circuit is never returned as its own island, even when it is a single island,
+        because the power flow formulations write the control changes into the island arrays
+        (i.e. tap and converter control modes) and the results are mapped back with the
+        island bus_data.original_idx, which is not the identity in a compiled circuit.
         :param bus_idx: array of bus indices
         :param logger: Logger
+        :param elements: indices of the elements in the island (see get_island_elements), computed if None
         :return: NumericalCircuit
         """
         if logger is None:
             logger = Logger()
 
+        if elements is None:
+            elements = self.get_island_elements(bus_idx=bus_idx)
+
         # this is an array to map the old indices to the new indices
         # it is used by the structures to re-map the bus indices
         bus_map = np.full(self.bus_data.nbus, -1, dtype=int)
         bus_map[bus_idx] = np.arange(len(bus_idx))
 
-        br_idx = tp.get_island_branch_indices(bus_map=bus_map,
-                                              elm_active=self.passive_branch_data.active,
-                                              F=self.passive_branch_data.F,
-                                              T=self.passive_branch_data.T)
-
-        hvdc_idx = tp.get_island_branch_indices(bus_map=bus_map,
-                                                elm_active=self.hvdc_data.active,
-                                                F=self.hvdc_data.F,
-                                                T=self.hvdc_data.T)
-
-        vsc_idx = tp.get_island_branch_indices(bus_map=bus_map,
-                                               elm_active=self.vsc_data.active,
-                                               F=self.vsc_data.F,
-                                               T=self.vsc_data.T)
-
-        load_idx = tp.get_island_monopole_indices(bus_map=bus_map,
-                                                  elm_active=self.load_data.active,
-                                                  elm_bus=self.load_data.bus_idx)
-
-        gen_idx = tp.get_island_monopole_indices(bus_map=bus_map,
-                                                 elm_active=self.generator_data.active,
-                                                 elm_bus=self.generator_data.bus_idx)
-
-        batt_idx = tp.get_island_monopole_indices(bus_map=bus_map,
-                                                  elm_active=self.battery_data.active,
-                                                  elm_bus=self.battery_data.bus_idx)
-
-        shunt_idx = tp.get_island_monopole_indices(bus_map=bus_map,
-                                                   elm_active=self.shunt_data.active,
-                                                   elm_bus=self.shunt_data.bus_idx)
+        br_idx = elements['passive_branch_data']
+        hvdc_idx = elements['hvdc_data']
+        vsc_idx = elements['vsc_data']
+        load_idx = elements['load_data']
+        gen_idx = elements['generator_data']
+        batt_idx = elements['battery_data']
+        shunt_idx = elements['shunt_data']
 
         nc = NumericalCircuit(
             nbus=len(bus_idx),
@@ -1480,6 +1596,64 @@ class NumericalCircuit:
 
         return nc
 
+    def materialize(self) -> None:
+        """
+        Gather all the pending arrays of the lazy structures (see get_island),
+        so that this circuit does not reference its parent (i.e. before sending it to another process)
+        """
+        for value in self.__dict__.values():
+            if isinstance(value, LazySlice):
+                value.materialize()
+
+    def get_islands_elements(self,
+                             consider_hvdc_as_island_links: bool = False) -> List[Tuple[IntVec, Dict[str, IntVec]]]:
+        """
+        Get the buses and elements of each island
+        The result is memoized in the topology cache, keyed by the state and connectivity of the devices
+        :param consider_hvdc_as_island_links: Does the HVDCLine works for the topology as a normal line?
+        :return: list of (bus indices, elements indices) per island
+        """
+        cache = get_topology_cache()
+        if cache is not None:
+            key = hash_arrays(consider_hvdc_as_island_links,
+                              self.bus_data.active,
+                              self.passive_branch_data.F,
+                              self.passive_branch_data.T,
+                              self.passive_branch_data.active,
+                              self.vsc_data.F,
+                              self.vsc_data.T,
+                              self.vsc_data.F_dcn,
+                              self.vsc_data.active,
+                              self.hvdc_data.F,
+                              self.hvdc_data.T,
+                              self.hvdc_data.active,
+                              self.load_data.bus_idx,
+                              self.load_data.active,
+                              self.generator_data.bus_idx,
+                              self.generator_data.active,
+                              self.battery_data.bus_idx,
+                              self.battery_data.active,
+                              self.shunt_data.bus_idx,
+                              self.shunt_data.active)
+            islands = cache.get('islands', key)
+            if islands is not None:
+                return islands
+        else:
+            key = ""
+
+        # find the matching islands
+        adj = self.compute_adjacency_matrix(consider_hvdc_as_island_links=consider_hvdc_as_island_links)
+
+        idx_islands = tp.find_islands(adj=adj, active=self.bus_data.active)
+
+        islands = [(island_bus_indices, self.get_island_elements(bus_idx=island_bus_indices))
+                   for island_bus_indices in idx_islands]
+
+        if cache is not None:
+            cache.set('islands', key, islands)
+
+        return islands
+
     def split_into_islands(self,
                            ignore_single_node_islands: bool = False,
                            consider_hvdc_as_island_links: bool = False,
@@ -1497,20 +1671,17 @@ class NumericalCircuit:
         # detect the topology reductions
         self.process_reducible_branches()
 
-        # find the matching islands
-        adj = self.compute_adjacency_matrix(consider_hvdc_as_island_links=consider_hvdc_as_island_links)
-
-        idx_islands = tp.find_islands(adj=adj, active=self.bus_data.active)
-
         circuit_islands = list()  # type: List[NumericalCircuit]
 
-        for island_bus_indices in idx_islands:
+        for island_bus_indices, elements in self.get_islands_elements(
+                consider_hvdc_as_island_links=consider_hvdc_as_island_links
+        ):
             if ignore_single_node_islands:
                 if len(island_bus_indices) > 1:
-                    island = self.get_island(bus_idx=island_bus_indices, logger=logger)
+                    island = self.get_island(bus_idx=island_bus_indices, logger=logger, elements=elements)
                     circuit_islands.append(island)
             else:
-                island = self.get_island(bus_idx=island_bus_indices, logger=logger)
+                island = self.get_island(bus_idx=island_bus_indices, logger=logger, elements=elements)
                 circuit_islands.append(island)
 
         return circuit_islands
@@ -0,0 +1,304 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+
+from __future__ import annotations
+
+import copy
+from typing import List, Dict, Tuple, Union
+import numpy as np
+
+from VeraGridEngine.basic_structures import IntVec, BoolVec, Vec, CxVec, Mat, CxMat
+from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
+
+
+def copy_numerical_circuit(nc: NumericalCircuit) -> NumericalCircuit:
+    """
+    Copy a NumericalCircuit duplicating every numpy array of every data structure.
+    Unlike NumericalCircuit.copy, nothing is left out, so the copy can be
+    modified in-place (i.e. by the topology reduction) without touching the original.
+    :param nc: NumericalCircuit
+    :return: NumericalCircuit
+    """
+    cpy = copy.copy(nc)
+
+    for key, val in vars(nc).items():
+
+        if isinstance(val, np.ndarray):
+            setattr(cpy, key, val.copy())
+
+        elif isinstance(val, dict):
+            setattr(cpy, key, val.copy())
+
+        elif hasattr(val, '__dict__') and type(val).__module__.startswith('VeraGridEngine.DataStructures'):
+            struct = copy.copy(val)
+            for key2, val2 in vars(val).items():
+                if isinstance(val2, np.ndarray):
+                    setattr(struct, key2, val2.copy())
+                elif isinstance(val2, (dict, list)):
+                    setattr(struct, key2, copy.copy(val2))
+            setattr(cpy, key, struct)
+
+    return cpy
+
+
+class TimeVaryingField:
+    """
+    Values of a NumericalCircuit data structure array that change along the time
+    Only the columns (elements) that change are stored
+    """
+
+    def __init__(self, struct_name: str, attr_name: str, idx: IntVec, values: Mat | CxVec):
+        """
+        Constructor
+        :param struct_name: name of the data structure in the NumericalCircuit (i.e. load_data)
+        :param attr_name: name of the array in the data structure (i.e. S)
+        :param idx: indices of the elements that vary
+        :param values: matrix of values (n_time, len(idx))
+        """
+        self.struct_name = struct_name
+        self.attr_name = attr_name
+        self.idx = idx
+        self.values = values
+
+    def apply(self, nc: NumericalCircuit, pos: int) -> None:
+        """
+        Write the values of a time position into a NumericalCircuit
+        :param nc: NumericalCircuit to modify in-place
+        :param pos: time position (not the time index)
+        """
+        arr = getattr(getattr(nc, self.struct_name), self.attr_name)
+        arr[self.idx] = self.values[pos, :]
+
+
+class NumericalCircuitTs:
+    """
+    Time-batched NumericalCircuit
+
+    The time steps are grouped by "structural state": all the profile values that
+    affect more than their own array (active states, voltage set points, control modes, etc.)
+    For each state a NumericalCircuit template is compiled once, and the purely numerical
+    arrays (loads, generation, rates, costs, ...) are stored as (n_time, n_varying) matrices
+    that are written on top of the template when a time step is requested.
+    """
+
+    def __init__(self, time_indices: IntVec):
+        """
+        Constructor
+        :param time_indices: array of time indices represented
+        """
+        self.time_indices: IntVec = np.array(time_indices, dtype=int)
+        self.nt: int = len(self.time_indices)
+
+        # time position of each time index
+        self._pos_dict: Dict[int, int] = {int(t): i for i, t in enumerate(self.time_indices)}
+
+        # structural state of every time position
+        self.state_of_t: IntVec = np.zeros(self.nt, dtype=int)
+
+        # time position where each state was compiled
+        self.template_pos: IntVec = np.zeros(0, dtype=int)
+
+        # one compiled circuit per structural state
+        self.templates: List[NumericalCircuit] = list()
+
+        # values to write on top of the templates
+        self.fields: Dict[Tuple[str, str], TimeVaryingField] = dict()
+
+        # load-like reactive power sharing: sign of the contribution of each element to q_fixed, ii_fixed and b_fixed
+        self.load_q_sign: Vec = np.zeros(0)
+        self.load_ii_sign: Vec = np.zeros(0)
+        self.load_b_sign: Vec = np.zeros(0)
+
+        # generation reactive power sharing: indices, raw P values (before the kW scaling and any OPF overwrite),
+        # power factor values and kW to MW scale of the varying generation devices
+        self.gen_share_fields: Dict[str, Tuple[IntVec, Mat, Mat, Vec]] = dict()
+
+        # SRAP enabled flag of the generation devices per structural state
+        self.srap_enabled: Dict[str, Mat] = dict()
+
+    @property
+    def n_states(self) -> int:
+        """
+        Number of structural states
+        :return: int
+        """
+        return len(self.templates)
+
+    def get_position(self, t_idx: int) -> int:
+        """
+        Get the position of a time index in the time_indices array
+        :param t_idx: time index
+        :return: position
+        """
+        return self._pos_dict[int(t_idx)]
+
+    def get_template_at(self, t_idx: int) -> NumericalCircuit:
+        """
+        Get the structural template that represents a time index
+        Do not modify it, use get_at to obtain an independent circuit
+        :param t_idx: time index
+        :return: NumericalCircuit
+        """
+        return self.templates[self.state_of_t[self.get_position(t_idx)]]
+
+    def get_values(self, struct_name: str, attr_name: str, positions: IntVec) -> Mat | CxMat:
+        """
+        Get the values of a data structure array at a number of time positions without materializing the circuits
+        All the positions must belong to the same structural state
+        :param struct_name: name of the data structure in the NumericalCircuit (i.e. passive_branch_data)
+        :param attr_name: name of the array in the data structure (i.e. rates)
+        :param positions: time positions (not the time indices)
+        :return: matrix of values (len(positions), n_elements)
+        """
+        template = self.templates[self.state_of_t[positions[0]]]
+        values = np.tile(getattr(getattr(template, struct_name), attr_name), (len(positions), 1))
+
+        field = self.fields.get((struct_name, attr_name), None)
+        if field is not None:
+            values[:, field.idx] = field.values[positions, :]
+
+        return values
+
+    def add_field(self, struct_name: str, attr_name: str, idx: IntVec, values: Mat | CxVec) -> None:
+        """
+        Register a time varying array
+        :param struct_name: name of the data structure in the NumericalCircuit (i.e. load_data)
+        :param attr_name: name of the array in the data structure (i.e. S)
+        :param idx: indices of the elements that vary
+        :param values: matrix of values (n_time, len(idx))
+        """
+        if len(idx) > 0:
+            self.fields[(struct_name, attr_name)] = TimeVaryingField(struct_name=struct_name,
+                                                                     attr_name=attr_name,
+                                                                     idx=idx,
+                                                                     values=values)
+
+    def _update_load_sharing(self, nc: NumericalCircuit, pos: int, pos0: int) -> None:
+        """
+        Update the bus fixed reactive power values with the load-like devices changes
+        :param nc: NumericalCircuit being materialized (modified in-place)
+        :param pos: time position
+        :param pos0: time position of the template
+        """
+        for attr, sign, bus_arr in [('S', self.load_q_sign, nc.bus_data.q_fixed),
+                                    ('I', self.load_ii_sign, nc.bus_data.ii_fixed),
+                                    ('Y', self.load_b_sign, nc.bus_data.b_fixed)]:
+            field = self.fields.get(('load_data', attr), None)
+            if field is not None:
+                k = field.idx
+                delta = (field.values[pos, :].imag - field.values[pos0, :].imag) * sign[k] * nc.load_data.active[k]
+                np.add.at(bus_arr, nc.load_data.bus_idx[k], delta)
+
+        field = self.fields.get(('shunt_data', 'Y'), None)
+        if field is not None:
+            k = field.idx
+            delta = (field.values[pos, :].imag - field.values[pos0, :].imag) * nc.shunt_data.active[k]
+            np.add.at(nc.bus_data.b_fixed, nc.shunt_data.bus_idx[k], delta)
+
+    def _update_generation_sharing(self, nc: NumericalCircuit, pos: int, pos0: int, state: int) -> None:
+        """
+        Update the bus reactive power sharing values with the generation devices changes
+        :param nc: NumericalCircuit being materialized (modified in-place)
+        :param pos: time position
+        :param pos0: time position of the template
+        :param state: structural state
+        """
+        for struct_name, (k, p_mat, pf_mat, scale) in self.gen_share_fields.items():
+            data = getattr(nc, struct_name)
+            bus_idx = data.bus_idx[k]
+            p_raw = p_mat[pos, :]
+            p0_raw = p_mat[pos0, :]
+            p = p_raw / scale
+            p0 = p0_raw / scale
+            active = data.active[k]
+            ctrl = data.controllable[k]
+
+            # controllable devices share the reactive power proportionally to P
+            shared = active & ctrl
+            np.add.at(nc.bus_data.q_shared_total, bus_idx[shared], (p - p0)[shared])
+            data.q_share[k[shared]] = p[shared]
+
+            # the non-controllable ones inject the reactive power given by the power factor
+            fixed = active & ~ctrl
+            if fixed.any():
+                q = get_q_from_pf(p, pf_mat[pos, :])
+                q0 = get_q_from_pf(p0, pf_mat[pos0, :])
+                np.add.at(nc.bus_data.q_fixed, bus_idx[fixed], (q - q0)[fixed])
+
+            srap = self.srap_enabled.get(struct_name, None)
+            if srap is not None:
+                srap_k = srap[state, k] & active
+                delta = np.where(p_raw > 0.0, p_raw, 0.0) - np.where(p0_raw > 0.0, p0_raw, 0.0)
+                np.add.at(nc.bus_data.srap_availbale_power, bus_idx[srap_k], delta[srap_k])
+
+    def _patch(self, nc: NumericalCircuit, pos: int, pos_from: int, state: int) -> None:
+        """
+        Write the values of a time position on top of a circuit that holds the values of another position
+        Both positions must belong to the same structural state
+        :param nc: NumericalCircuit to modify in-place
+        :param pos: time position to move to
+        :param pos_from: time position of the values that nc holds
+        :param state: structural state
+        """
+        if pos != pos_from:
+            for field in self.fields.values():
+                field.apply(nc=nc, pos=pos)
+
+            self._update_load_sharing(nc=nc, pos=pos, pos0=pos_from)
+            self._update_generation_sharing(nc=nc, pos=pos, pos0=pos_from, state=state)
+
+        nc.t_idx = int(self.time_indices[pos])
+
+    def get_at(self, t_idx: int) -> NumericalCircuit:
+        """
+        Get the NumericalCircuit of a time index
+        :param t_idx: time index (must be one of time_indices)
+        :return: independent NumericalCircuit instance
+        """
+        pos = self.get_position(t_idx)
+        state = self.state_of_t[pos]
+
+        nc = copy_numerical_circuit(self.templates[state])
+        self._patch(nc=nc, pos=pos, pos_from=self.template_pos[state], state=state)
+
+        return nc
+
+    def update(self, nc: NumericalCircuit, t_idx: int) -> bool:
+        """
+        Move a circuit obtained with get_at (or update) to another time index in-place
+        If the structural state is the same, only the time varying arrays are written.
+        The circuit must not have been modified otherwise (i.e. by the topology reduction or contingencies),
+        if the topology was processed, the circuit is restored from the template.
+        :param nc: NumericalCircuit to modify in-place
+        :param t_idx: time index (must be one of time_indices)
+        :return: True if the structure changed, False if only the values were patched
+        """
+        pos = self.get_position(t_idx)
+        state = self.state_of_t[pos]
+        pos_from = self._pos_dict.get(nc.t_idx, None) if nc.t_idx is not None else None
+
+        if pos_from is not None and self.state_of_t[pos_from] == state and not nc.topology_performed:
+            self._patch(nc=nc, pos=pos, pos_from=pos_from, state=state)
+            return False
+        else:
+            # restore the template of the state, keeping the same object
+            nc.__dict__.update(copy_numerical_circuit(self.templates[state]).__dict__)
+            self._patch(nc=nc, pos=pos, pos_from=self.template_pos[state], state=state)
+            return True
+
+    def __len__(self) -> int:
+        return self.nt
+
+
+def get_q_from_pf(p: Vec, pf: Vec) -> Vec:
+    """
+    Reactive power from the active power and the power factor (same as GeneratorData.get_q_at)
+    :param p: active power
+    :param pf: power factor
+    :return: reactive power
+    """
+    pf2 = np.power(pf, 2.0)
+    pf_sign = (pf + 1e-20) / np.abs(pf + 1e-20)
+    return pf_sign * p * np.sqrt((1.0 - pf2) / (pf2 + 1e-20))
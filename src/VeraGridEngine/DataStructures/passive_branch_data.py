@@ -69,6 +69,7 @@ class PassiveBranchData(BranchParentData):
               bus_map: IntVec, logger: Logger | None) -> "PassiveBranchData":
         """
         Slice branch data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to island bus index {int(o): i for i, o in enumerate(bus_idx)}
@@ -79,40 +80,6 @@ class PassiveBranchData(BranchParentData):
         data.__class__ = PassiveBranchData
         data: PassiveBranchData = data
 
-        data.R = self.R[elm_idx]
-        data.X = self.X[elm_idx]
-        data.G = self.G[elm_idx]
-        data.B = self.B[elm_idx]
-
-        data.R0 = self.R0[elm_idx]
-        data.X0 = self.X0[elm_idx]
-        data.G0 = self.G0[elm_idx]
-        data.B0 = self.B0[elm_idx]
-
-        data.R2 = self.R2[elm_idx]
-        data.X2 = self.X2[elm_idx]
-        data.G2 = self.G2[elm_idx]
-        data.B2 = self.B2[elm_idx]
-
-        data.conn = self.conn[elm_idx]  # winding connection
-
-        data.m_taps = self.m_taps.slice(elm_idx)
-        data.tau_taps = self.tau_taps.slice(elm_idx)
-
-        data.virtual_tap_f = self.virtual_tap_f[elm_idx]
-        data.virtual_tap_t = self.virtual_tap_t[elm_idx]
-
-        elm_idx_3 = ((elm_idx * 3)[:, np.newaxis] + np.arange(3)).flatten()
-        
-        data.Yff3 = self.Yff3[elm_idx_3, :]
-        data.Yft3 = self.Yft3[elm_idx_3, :]
-        data.Ytt3 = self.Ytt3[elm_idx_3, :]
-        data.Ytf3 = self.Ytf3[elm_idx_3, :]
-
-        data.phA = self.phA[elm_idx]
-        data.phB = self.phB[elm_idx]
-        data.phC = self.phC[elm_idx]
-
         return data
 
     def copy(self) -> "PassiveBranchData":
@@ -8,9 +8,10 @@ from scipy.sparse import csc_matrix, coo_matrix
 import VeraGridEngine.Topology.topology as tp
 from VeraGridEngine.Utils.Sparse.sparse_array import SparseObjectArray
 from VeraGridEngine.basic_structures import Vec, CxVec, IntVec, StrVec, BoolVec
+from VeraGridEngine.DataStructures.lazy_slice import LazySlice, lazy_slice
 
 
-class ShuntData:
+class ShuntData(LazySlice):
     """
     ShuntData
     """
@@ -65,49 +66,27 @@ class ShuntData:
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec) -> "ShuntData":
         """
         Slice shunt data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to branch index
         :return: new ShuntData instance
         """
 
-        data = ShuntData(nelm=len(elm_idx), nbus=len(bus_idx))
-
-        data.names = self.names[elm_idx]
-        data.idtag = self.idtag[elm_idx]
-
-        data.active = self.active[elm_idx]
-
-        data.controllable = self.controllable[elm_idx]
-
-        data.Y = self.Y[elm_idx]
-
-        data.qmax = self.qmax[elm_idx]
-        data.qmin = self.qmin[elm_idx]
-        data.q_share = self.q_share[elm_idx]
-
-        data.cost = self.cost[elm_idx]
-
-        data.taps = self.taps.slice(elm_idx)
-
-        data.mttf = self.mttf[elm_idx]
-        data.mttr = self.mttr[elm_idx]
-
-        data.bus_idx = self.bus_idx[elm_idx]
-        data.controllable_bus_idx = self.controllable_bus_idx[elm_idx]
+        data = lazy_slice(self, ShuntData, elm_idx, nelm=len(elm_idx), nbus=len(bus_idx))
 
         # Remapping of the buses
-        for k in range(data.nelm):
-            data.bus_idx[k] = bus_map[data.bus_idx[k]]
+        data.bus_idx = bus_map[self.bus_idx[elm_idx]]
+        data.active[data.bus_idx == -1] = 0
 
-            if data.bus_idx[k] == -1:
-                data.active[k] = 0
-
-            if data.controllable_bus_idx[k] > -1:
-                data.controllable_bus_idx[k] = bus_map[data.controllable_bus_idx[k]]
+        data.controllable_bus_idx = self.controllable_bus_idx[elm_idx]
+        ctrl = data.controllable_bus_idx > -1
+        data.controllable_bus_idx[ctrl] = bus_map[data.controllable_bus_idx[ctrl]]
 
         data.original_idx = elm_idx
-        data.vset = self.vset[elm_idx]
+
+        # the three-phase admittances are not passed to the islands
+        data.Y3_star = np.zeros((data.nelm * 3, 3), dtype=complex)
 
         return data
 
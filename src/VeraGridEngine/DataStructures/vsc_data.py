@@ -45,6 +45,7 @@ class VscData(BranchParentData):
     def slice(self, elm_idx: IntVec, bus_idx: IntVec, bus_map: IntVec, logger: Logger | None) -> "VscData":
         """
         Slice branch data by given indices
+        The arrays are gathered the first time they are accessed (see LazySlice)
         :param elm_idx: array of branch indices
         :param bus_idx: array of bus indices
         :param bus_map: map from bus index to branch index
@@ -56,44 +57,21 @@ class VscData(BranchParentData):
         data: VscData = data
         data.__class__ = VscData
 
-        # data.F_dcp = self.F_dcp[elm_idx]
-        data.F_dcn = self.F_dcn[elm_idx]
-        # data.T_ac = self.T_ac[elm_idx]
-
-        data.Kdp = self.Kdp[elm_idx]
-        data.alpha1 = self.alpha1[elm_idx]
-        data.alpha2 = self.alpha2[elm_idx]
-        data.alpha3 = self.alpha3[elm_idx]
-
-        data.control1 = self.control1[elm_idx]
-        data.control2 = self.control2[elm_idx]
-
-        data.control1_val = self.control1_val[elm_idx]
-        data.control2_val = self.control2_val[elm_idx]
+        if data.nelm == 0:
+            return data
 
         data.control1_bus_idx = self.control1_bus_idx[elm_idx]
         data.control2_bus_idx = self.control2_bus_idx[elm_idx]
 
-        # TODO: think about how to re-map this stuff
-        data.control1_branch_idx = self.control1_branch_idx[elm_idx]
-        data.control2_branch_idx = self.control2_branch_idx[elm_idx]
-
-        for k in range(data.nelm):
-            if data.control1_bus_idx[k] > -1:
-                data.control1_bus_idx[k] = bus_map[data.control1_bus_idx[k]]
-
-                if data.control1_bus_idx[k] == -1:
-                    if logger is not None:
-                        logger.add_error(f"Branch {k}, {self.names[k]} control1 bus is unreachable",
-                                         value=data.control1_bus_idx[k])
-
-            if data.control2_bus_idx[k] > -1:
-                data.control2_bus_idx[k] = bus_map[data.control2_bus_idx[k]]
+        for control_bus_idx, control_name in ((data.control1_bus_idx, 'control1'),
+                                              (data.control2_bus_idx, 'control2')):
+            ctrl = control_bus_idx > -1
+            control_bus_idx[ctrl] = bus_map[control_bus_idx[ctrl]]
 
-                if data.control2_bus_idx[k] == -1:
-                    if logger is not None:
-                        logger.add_error(f"Branch {k}, {self.names[k]} control2 bus is unreachable",
-                                         value=data.control2_bus_idx[k])
+            for k in np.where(ctrl & (control_bus_idx == -1))[0]:
+                if logger is not None:
+                    logger.add_error(f"Branch {k}, {self.names[k]} {control_name} bus is unreachable",
+                                     value=control_bus_idx[k])
 
         return data
 
@@ -6,7 +6,7 @@
 from typing import Union
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from enum import Enum
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.enumerations import BuildStatus
@@ -18,6 +18,8 @@ from VeraGridEngine.Devices.profile import Profile
 
 from VeraGridEngine.Devices.Parents.editable_device import DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+
 # Global sqrt of 3 (bad practice?)
 SQRT3 = np.sqrt(3.0)
 
@@ -5,7 +5,7 @@
 
 import pandas as pd
 from typing import Union
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 import numpy as np
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.Devices.Parents.branch_parent import BranchParent
@@ -13,6 +13,8 @@ from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.enumerations import DeviceType, BuildStatus, SubObjectType
 from VeraGridEngine.Devices.Branches.line_locations import LineLocations
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class DcLine(BranchParent):
     __slots__ = (
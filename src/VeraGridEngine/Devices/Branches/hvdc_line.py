@@ -6,7 +6,7 @@
 import pandas as pd
 import numpy as np
 from typing import Tuple, Union
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.enumerations import DeviceType, BuildStatus, SubObjectType
@@ -15,6 +15,8 @@ from VeraGridEngine.enumerations import HvdcControlType
 from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Devices.Branches.line_locations import LineLocations
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 def firing_angles_to_reactive_limits(P: float, alphamin: float, alphamax: float) -> Tuple[float, float]:
     """
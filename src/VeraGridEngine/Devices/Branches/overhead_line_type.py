@@ -8,7 +8,7 @@ from typing import List, Dict
 from warnings import warn
 import numpy as np
 from numpy import pi, log, sqrt
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 from VeraGridEngine.Devices.admittance_matrix import AdmittanceMatrix
 from VeraGridEngine.basic_structures import Logger, Mat, IntVec, Vec, CxMat
@@ -16,6 +16,8 @@ from VeraGridEngine.Devices.Parents.editable_device import EditableDevice, Devic
 from VeraGridEngine.Devices.Branches.wire import Wire
 from VeraGridEngine.enumerations import SubObjectType
 
+plt = lazy_import('matplotlib.pyplot')
+
 """
 Equations source:
 a) ATP-EMTP theory book
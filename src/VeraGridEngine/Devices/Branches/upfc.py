@@ -5,13 +5,15 @@
 
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.enumerations import BuildStatus
 from VeraGridEngine.Devices.Parents.branch_parent import BranchParent
 from VeraGridEngine.Devices.Parents.editable_device import DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class UPFC(BranchParent):
     __slots__ = (
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from typing import List, Tuple, TYPE_CHECKING
 from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Devices.Substation.bus import Bus
@@ -14,6 +14,8 @@ from VeraGridEngine.enumerations import BuildStatus, ConverterControlType
 from VeraGridEngine.Devices.Parents.branch_parent import BranchParent
 from VeraGridEngine.Devices.Parents.editable_device import DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+
 if TYPE_CHECKING:
     from VeraGridEngine.Devices.types import BRANCH_TYPES
 
@@ -5,7 +5,6 @@
 
 import sys
 import uuid
-import networkx as nx
 from typing import Dict, Union, List, Tuple
 from VeraGridEngine.Devices.Diagrams.graphic_location import GraphicLocation
 from VeraGridEngine.Devices.Diagrams.map_location import MapLocation
@@ -14,6 +13,9 @@ from VeraGridEngine.enumerations import DiagramType, DeviceType
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.Devices.types import ALL_DEV_TYPES
 from VeraGridEngine.enumerations import Colormaps
+from VeraGridEngine.Utils.lazy_import import lazy_import
+
+nx = lazy_import('networkx')
 
 
 class PointsGroup:
@@ -407,7 +409,7 @@ class BaseDiagram:
                                     category=category)
             self.data[category] = points_group
 
-    def build_graph(self) -> Tuple[nx.DiGraph, List[Bus]]:
+    def build_graph(self) -> Tuple["nx.DiGraph", List[Bus]]:
         """
         Returns a networkx DiGraph object of the grid.
         return DiGraph, List[BusGraphicObject
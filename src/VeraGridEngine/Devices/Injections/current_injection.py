@@ -5,11 +5,13 @@
 from typing import Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.enumerations import DeviceType, BuildStatus
 from VeraGridEngine.Devices.Parents.load_parent import InjectionParent
 from VeraGridEngine.Devices.profile import Profile
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class CurrentInjection(InjectionParent):
     """
@@ -5,11 +5,13 @@
 from typing import Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.enumerations import DeviceType, BuildStatus, ExternalGridMode
 from VeraGridEngine.Devices.Parents.load_parent import LoadParent
 from VeraGridEngine.Devices.profile import Profile
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class ExternalGrid(LoadParent):
     __slots__ = (
@@ -7,7 +7,7 @@
 import numpy as np
 import pandas as pd
 from typing import Union
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.enumerations import DeviceType, BuildStatus, SubObjectType
 from VeraGridEngine.Devices.Associations.association import Associations
@@ -17,6 +17,8 @@ from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Utils.Symbolic.block import Block, Var, Const, DynamicVarType
 from VeraGridEngine.Utils.Symbolic.symbolic import cos, sin, real, imag, conj, angle, exp, log, abs
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class Generator(GeneratorParent):
     __slots__ = (
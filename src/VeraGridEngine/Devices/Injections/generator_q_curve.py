@@ -5,9 +5,11 @@
 import json
 import numpy as np
 from typing import Tuple, List
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.basic_structures import Mat
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class GeneratorQCurve:
     """
@@ -206,7 +208,7 @@ class GeneratorQCurve:
 
         return np.sqrt(pmax * pmax + qfinal * qfinal)
 
-    def plot(self, ax: plt.axis):
+    def plot(self, ax: "plt.axis"):
         """
 
         :param ax:
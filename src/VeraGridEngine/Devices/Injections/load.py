@@ -5,12 +5,14 @@
 from typing import Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.enumerations import DeviceType, BuildStatus
 from VeraGridEngine.Devices.Parents.load_parent import LoadParent
 from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Utils.Symbolic.block import Block, Var, Const, DynamicVarType
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class Load(LoadParent):
     """
@@ -4,9 +4,12 @@
 # SPDX-License-Identifier: MPL-2.0
 import random
 import uuid
+from enum import Enum
+from operator import attrgetter
 import numpy as np
 from VeraGridEngine.Devices.profile import Profile
-from typing import List, Dict, AnyStr, Any, Union, Type, Tuple
+from VeraGridEngine.Utils.hashing import hash_arrays
+from typing import List, Dict, AnyStr, Any, Union, Type, Tuple, Set
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.enumerations import (DeviceType, TimeFrame, BuildStatus, WindingsConnection,
                                          TapModuleControl, TapPhaseControl, SubObjectType, ConverterControlType,
@@ -205,6 +208,27 @@ class GCProp:
         return "prop:" + self.name
 
 
+# number of name or idtag changes of any device,
+# the caches that depend on the devices identity (i.e. the Assets index registry) use it to detect stale entries
+_IDENTITY_VERSION: int = 0
+
+
+def get_identity_version() -> int:
+    """
+    Get the number of name or idtag changes of any device so far
+    :return: int
+    """
+    return _IDENTITY_VERSION
+
+
+def _bump_identity_version() -> None:
+    """
+    Record a name or idtag change
+    """
+    global _IDENTITY_VERSION
+    _IDENTITY_VERSION += 1
+
+
 def get_action_symbol(action: ActionType):
     """
 
@@ -223,6 +247,223 @@ def get_action_symbol(action: ActionType):
         return ""
 
 
+# properties that describe or identify a device without taking part in any calculation,
+# they are left out of the fingerprint so that i.e. renaming a device does not invalidate the caches
+FINGERPRINT_EXCLUDED_PROPERTIES = frozenset(('idtag', 'name', 'code', 'rdfid', 'action', 'comment',
+                                             'color', 'graphic_type'))
+
+
+def _same_fingerprint_values(values1: List[Any], values2: List[Any]) -> bool:
+    """
+    Compare two lists of values gathered for the fingerprint
+    :param values1: list of scalars, strings and numpy arrays
+    :param values2: list of scalars, strings and numpy arrays
+    :return: are all the values equal?
+    """
+    if len(values1) != len(values2):
+        return False
+
+    for val1, val2 in zip(values1, values2):
+        if isinstance(val1, np.ndarray) or isinstance(val2, np.ndarray):
+            if not (isinstance(val1, np.ndarray) and isinstance(val2, np.ndarray)
+                    and val1.dtype == val2.dtype and np.array_equal(val1, val2)):
+                return False
+        elif type(val1) is not type(val2) or val1 != val2:
+            return False
+
+    return True
+
+
+def _same_compared_values(values1: Tuple[Any, ...], values2: Tuple[Any, ...]) -> bool:
+    """
+    Fast comparison of the values read with _FingerprintLayout.get_compared_values
+    The tuple comparison runs in C, the slow comparison is only used if some value is an array
+    :param values1: tuple of values
+    :param values2: tuple of values
+    :return: are all the values equal?
+    """
+    try:
+        return values1 == values2
+    except ValueError:
+        # the truth value of an array comparison is ambiguous
+        return _same_fingerprint_values(list(values1), list(values2))
+
+
+def _get_fingerprint_value(val: Any) -> Any:
+    """
+    Convert a property value into something hash_arrays can digest
+    :param val: property value
+    :return: scalar, string or numpy array
+    """
+    if isinstance(val, Enum):
+        return str(val)
+    elif isinstance(val, EditableDevice):
+        return val.idtag
+    else:
+        return val
+
+
+def _get_sub_object_state(val: Any) -> Any:
+    """
+    Get a comparable representation of a sub-object (i.e. tap changer, associations)
+    :param val: sub-object
+    :return: None for the empty sub-objects, dictionary, list or array copy otherwise
+    """
+    if hasattr(val, 'empty') and val.empty():
+        return None  # empty models have random uids
+    elif hasattr(val, 'to_dict'):
+        return val.to_dict()
+    elif hasattr(val, 'to_list'):
+        return val.to_list()
+    elif isinstance(val, np.ndarray):
+        return val.copy()  # the array may be modified in-place
+    else:
+        return val
+
+
+# classes and property names whose setter has already been wrapped by _track_setter
+_TRACKED_SETTERS: Set[Tuple[type, str]] = set()
+
+
+def _track_setter(cls: type, key: str, is_profile: bool = False) -> None:
+    """
+    Wrap the property setter of a device class so that setting the property marks the device as changed.
+    The plain slots are not wrapped because turning them into properties would slow down every read,
+    their values are compared by get_fingerprint instead.
+    :param cls: device class
+    :param key: property name
+    :param is_profile: is this a profile property? the replaced profile objects leave the columnar storage
+    """
+    if (cls, key) in _TRACKED_SETTERS:
+        return
+
+    _TRACKED_SETTERS.add((cls, key))
+
+    for klass in cls.__mro__:
+        attr = klass.__dict__.get(key, None)
+        if attr is not None:
+            if isinstance(attr, property) and attr.fset is not None and not hasattr(attr.fset, 'tracked_setter'):
+                fget = attr.fget
+                fset = attr.fset
+
+                if is_profile:
+                    def setter(obj: "EditableDevice", val: Any) -> None:
+                        try:
+                            old_profile = fget(obj)
+                        except AttributeError:
+                            old_profile = None  # the profile is being set for the first time
+                        fset(obj, val)
+                        if old_profile is not val and isinstance(old_profile, Profile):
+                            old_profile.leave_columns()
+                        _set_fingerprint(obj, None)
+                else:
+                    def setter(obj: "EditableDevice", val: Any) -> None:
+                        fset(obj, val)
+                        _set_fingerprint(obj, None)
+
+                setter.tracked_setter = fset
+                setattr(klass, key, property(attr.fget, setter, attr.fdel, attr.__doc__))
+            return
+
+
+def _has_tracked_setter(cls: type, key: str) -> bool:
+    """
+    Is the property of a device class a property whose setter marks the device as changed?
+    :param cls: device class
+    :param key: property name
+    :return: bool
+    """
+    for klass in cls.__mro__:
+        attr = klass.__dict__.get(key, None)
+        if attr is not None:
+            return isinstance(attr, property) and hasattr(attr.fset, 'tracked_setter')
+    return False
+
+
+class _FingerprintLayout:
+    """
+    How the registered properties of a device class take part in the fingerprint
+    """
+
+    __slots__ = (
+        'tracked',
+        'compared',
+        'get_compared_values',
+        'sub_objects',
+        'profiles',
+    )
+
+    def __init__(self, elm: "EditableDevice"):
+        """
+        Constructor
+        :param elm: any device of the class
+        """
+        # plain properties whose setter marks the device as changed
+        self.tracked: List[str] = list()
+
+        # plain slots and read-only properties, their values are compared on every call
+        self.compared: List[str] = list()
+
+        # sub-objects (i.e. tap changer), their representation is compared on every call
+        self.sub_objects: List[str] = list()
+
+        for name, prop in elm.registered_properties.items():
+            if name in FINGERPRINT_EXCLUDED_PROPERTIES:
+                continue
+
+            if isinstance(prop.tpe, SubObjectType):
+                self.sub_objects.append(name)
+            elif _has_tracked_setter(type(elm), name):
+                self.tracked.append(name)
+            else:
+                self.compared.append(name)
+
+        if len(self.compared) > 1:
+            self.get_compared_values = attrgetter(*self.compared)
+        elif len(self.compared) == 1:
+            name = self.compared[0]
+            self.get_compared_values = lambda obj: (getattr(obj, name),)
+        else:
+            self.get_compared_values = lambda obj: ()
+
+        # profiles, each one keeps its own fingerprint cache
+        self.profiles: List[str] = list(elm.properties_with_profile.values())
+
+
+# layout of each device class and number of registered properties
+_FINGERPRINT_LAYOUTS: Dict[Tuple[type, int], _FingerprintLayout] = dict()
+
+
+class _DeviceFingerprint:
+    """
+    Fingerprint cache of a device
+    """
+
+    __slots__ = (
+        'compared_values',
+        'digest',
+        'sub_states',
+        'sub_digest',
+        'windows',
+    )
+
+    def __init__(self, compared_values: Tuple[Any, ...], digest: str):
+        """
+        Constructor
+        :param compared_values: values of the compared properties
+        :param digest: hash of the plain properties
+        """
+        self.compared_values = compared_values
+        self.digest = digest
+
+        # representation of the sub-objects and hash of the plain properties plus the sub-objects
+        self.sub_states: Union[List[Any], None] = None
+        self.sub_digest: str = digest
+
+        # (t_from, t_to) -> (sub_digest, fingerprints of the profiles, digest of everything)
+        self.windows: Dict[Tuple[Union[int, None], Union[int, None]], Tuple[str, Tuple[str, ...], str]] = dict()
+
+
 class EditableDevice:
     """
     This is the main device class from which all inherit
@@ -241,6 +482,7 @@ class EditableDevice:
         'non_editable_properties',
         'properties_with_profile',
         '__auto_update_enabled',
+        '_fingerprint',
     )
 
     def __init__(self,
@@ -259,6 +501,9 @@ class EditableDevice:
         :param rdfid: RDFID code optional
         """
 
+        # fingerprint cache, None when a property setter was called since the last get_fingerprint call
+        self._fingerprint: Union[_DeviceFingerprint, None] = None
+
         self._idtag = parse_idtag(val=idtag)
 
         self._name: str = name
@@ -372,6 +617,7 @@ class EditableDevice:
         :param val: any string or None
         """
         self._idtag = parse_idtag(val)
+        _bump_identity_version()
 
     @property
     def code(self) -> str:
@@ -403,6 +649,7 @@ class EditableDevice:
         :return:
         """
         self._idtag = self._idtag.replace('_', '').replace('-', '')
+        _bump_identity_version()
 
     @property
     def type_name(self) -> str:
@@ -475,10 +722,14 @@ class EditableDevice:
 
         self.property_list.append(prop)
 
+        if key not in FINGERPRINT_EXCLUDED_PROPERTIES:
+            _track_setter(cls=type(self), key=key)
+
         if profile_name != '':
             assert (hasattr(self, profile_name))  # the profile property must exist, this avoids bugs in registering
             assert (isinstance(getattr(self, profile_name), Profile))  # the profile must be of type "Profile"
             self.properties_with_profile[key] = profile_name
+            _track_setter(cls=type(self), key=profile_name, is_profile=True)
 
         if not editable:
             self.non_editable_properties.append(key)
@@ -513,6 +764,7 @@ class EditableDevice:
     @name.setter
     def name(self, val: str):
         self._name = val
+        _bump_identity_version()
 
     def get_save_data(self) -> List[Union[str, float, int, bool, object]]:
         """
@@ -540,6 +792,77 @@ class EditableDevice:
 
         return data
 
+    def _get_fingerprint_layout(self) -> _FingerprintLayout:
+        """
+        Get the fingerprint layout of the class of this device
+        :return: _FingerprintLayout
+        """
+        key = (type(self), len(self.registered_properties))
+        layout = _FINGERPRINT_LAYOUTS.get(key, None)
+        if layout is None:
+            layout = _FingerprintLayout(elm=self)
+            _FINGERPRINT_LAYOUTS[key] = layout
+        return layout
+
+    def is_dirty(self) -> bool:
+        """
+        Have the plain properties changed since the last call to get_fingerprint?
+        :return: bool
+        """
+        if self._fingerprint is None:
+            return True
+
+        layout = self._get_fingerprint_layout()
+        return not _same_compared_values(layout.get_compared_values(self), self._fingerprint.compared_values)
+
+    def get_fingerprint(self,
+                        t_from: Union[int, None] = None,
+                        t_to: Union[int, None] = None,
+                        include_profiles: bool = True) -> str:
+        """
+        Content hash of the device.
+        The descriptive properties (see FINGERPRINT_EXCLUDED_PROPERTIES) are not part of the hash.
+        The hash is cached: the property setters mark the device as changed, the plain slots and the
+        sub-objects (i.e. tap changer) are compared with their values of the last call,
+        and the profiles keep their own cache. Only what changed is hashed again.
+        :param t_from: first time index of the profiles window (None for the beginning)
+        :param t_to: time index after the last of the profiles window (None for the end)
+        :param include_profiles: include the profiles in the hash?
+        :return: hexadecimal digest
+        """
+        layout = self._get_fingerprint_layout()
+        compared_values = layout.get_compared_values(self)
+        cache = self._fingerprint
+
+        if cache is None or not _same_compared_values(compared_values, cache.compared_values):
+            values = [self.device_type.value]
+            values += [_get_fingerprint_value(getattr(self, name)) for name in layout.tracked]
+            values += [_get_fingerprint_value(val) for val in compared_values]
+            cache = _DeviceFingerprint(compared_values=compared_values, digest=hash_arrays(*values))
+            _set_fingerprint(self, cache)
+
+        if len(layout.sub_objects):
+            sub_states = [_get_sub_object_state(getattr(self, name)) for name in layout.sub_objects]
+            if cache.sub_states is None or not _same_fingerprint_values(sub_states, cache.sub_states):
+                cache.sub_states = sub_states
+                cache.sub_digest = hash_arrays(cache.digest, *sub_states)
+
+        if not include_profiles:
+            return cache.sub_digest
+
+        profile_digests = list()
+        for name in layout.profiles:
+            profile: Profile = getattr(self, name)
+            profile_digests.append(profile.get_fingerprint(t_from=t_from, t_to=t_to) if profile is not None else None)
+        profile_digests = tuple(profile_digests)
+
+        window = cache.windows.get((t_from, t_to), None)
+        if window is None or window[0] != cache.sub_digest or window[1] != profile_digests:
+            window = (cache.sub_digest, profile_digests, hash_arrays(cache.sub_digest, *profile_digests))
+            cache.windows[(t_from, t_to)] = window
+
+        return window[2]
+
     def get_headers(self) -> List[AnyStr]:
         """
         Return a list of headers
@@ -918,6 +1241,7 @@ class EditableDevice:
         Generate a new IdTag
         """
         self._idtag = uuid.uuid4().hex  # generate a proper UUIDv4 string
+        _bump_identity_version()
 
     def replace_objects(self, old_object: Any, new_obj: Any, logger: Logger) -> None:
         """
@@ -1020,3 +1344,7 @@ class EditableDevice:
                             action = ActionType.Modify
 
         return action, properties_changed
+
+
+# direct setter of the fingerprint slot, used by the property setters wrapped with _track_setter
+_set_fingerprint = EditableDevice._fingerprint.__set__
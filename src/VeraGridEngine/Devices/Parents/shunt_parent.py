@@ -6,13 +6,15 @@
 from typing import Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.enumerations import BuildStatus, DeviceType, SubObjectType
 from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Devices.Parents.injection_parent import InjectionParent
 from VeraGridEngine.Devices.admittance_matrix import AdmittanceMatrix
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class ShuntParent(InjectionParent):
     """
@@ -7,7 +7,7 @@
 from typing import Tuple, Union
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.enumerations import BusMode, DeviceType, BusGraphicType, SubObjectType
 from VeraGridEngine.Devices.Parents.physical_device import PhysicalDevice
 from VeraGridEngine.Devices.Aggregation import Area, Zone, Country
@@ -18,6 +18,8 @@ from VeraGridEngine.Devices.profile import Profile
 from VeraGridEngine.Devices.Dynamic.dynamic_model_host import DynamicModelHost
 from VeraGridEngine.Utils.Symbolic.block import Block, Var, DynamicVarType
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class Bus(PhysicalDevice):
     __slots__ = (
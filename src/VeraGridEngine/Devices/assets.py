@@ -2,6 +2,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.  
 # SPDX-License-Identifier: MPL-2.0
+import tempfile
 import warnings
 import numpy as np
 import pandas as pd
@@ -11,9 +12,10 @@ import datetime as dateslib
 from VeraGridEngine.basic_structures import IntVec, StrVec, Vec
 import VeraGridEngine.Devices as dev
 from VeraGridEngine.Devices.types import ALL_DEV_TYPES, BRANCH_TYPES, INJECTION_DEVICE_TYPES, FLUID_TYPES
-from VeraGridEngine.Devices.Parents.editable_device import GCPROP_TYPES
+from VeraGridEngine.Devices.Parents.editable_device import GCPROP_TYPES, get_identity_version
+from VeraGridEngine.Devices.profile_store import ProfileStore
 from VeraGridEngine.enumerations import DeviceType, ActionType
-from VeraGridEngine.basic_structures import Logger, ListSet
+from VeraGridEngine.basic_structures import Logger, ListSet, DeviceList, ReadOnlyDict, get_device_lists_version
 from VeraGridEngine.data_logger import DataLogger
 
 
@@ -109,6 +111,9 @@ class Assets:
         'profile_magnitudes',
         'device_type_name_dict',
         'device_associations',
+        '_profile_store',
+        '_index_registry',
+        '_index_registry_version',
     )
 
     def __init__(self):
@@ -119,162 +124,162 @@ class Assets:
         # snapshot time
         self._snapshot_time: dateslib.datetime = dateslib.datetime.now()  # dateslib.datetime(year=2000, month=1, day=1)
 
-        self._lines: List[dev.Line] = list()
+        self._lines: List[dev.Line] = DeviceList()
 
-        self._dc_lines: List[dev.DcLine] = list()
+        self._dc_lines: List[dev.DcLine] = DeviceList()
 
-        self._transformers2w: List[dev.Transformer2W] = list()
+        self._transformers2w: List[dev.Transformer2W] = DeviceList()
 
-        self._hvdc_lines: List[dev.HvdcLine] = list()
+        self._hvdc_lines: List[dev.HvdcLine] = DeviceList()
 
-        self._vsc_devices: List[dev.VSC] = list()
+        self._vsc_devices: List[dev.VSC] = DeviceList()
 
-        self._upfc_devices: List[dev.UPFC] = list()
+        self._upfc_devices: List[dev.UPFC] = DeviceList()
 
-        self._switch_devices: List[dev.Switch] = list()
+        self._switch_devices: List[dev.Switch] = DeviceList()
 
-        self._transformers3w: List[dev.Transformer3W] = list()
+        self._transformers3w: List[dev.Transformer3W] = DeviceList()
 
-        self._windings: List[dev.Winding] = list()
+        self._windings: List[dev.Winding] = DeviceList()
 
-        self._series_reactances: List[dev.SeriesReactance] = list()
+        self._series_reactances: List[dev.SeriesReactance] = DeviceList()
 
         # Should accept buses
         self._buses: List[dev.Bus] = ListSet()
 
         # array of busbars
-        self._bus_bars: List[dev.BusBar] = list()
+        self._bus_bars: List[dev.BusBar] = DeviceList()
 
         # array of voltage levels
-        self._voltage_levels: List[dev.VoltageLevel] = list()
+        self._voltage_levels: List[dev.VoltageLevel] = DeviceList()
 
         # List of loads
-        self._loads: List[dev.Load] = list()
+        self._loads: List[dev.Load] = DeviceList()
 
         # List of generators
-        self._generators: List[dev.Generator] = list()
+        self._generators: List[dev.Generator] = DeviceList()
 
         # List of External Grids
-        self._external_grids: List[dev.ExternalGrid] = list()
+        self._external_grids: List[dev.ExternalGrid] = DeviceList()
 
         # List of shunts
-        self._shunts: List[dev.Shunt] = list()
+        self._shunts: List[dev.Shunt] = DeviceList()
 
         # List of batteries
-        self._batteries: List[dev.Battery] = list()
+        self._batteries: List[dev.Battery] = DeviceList()
 
         # List of static generators
-        self._static_generators: List[dev.StaticGenerator] = list()
+        self._static_generators: List[dev.StaticGenerator] = DeviceList()
 
         # List of current injections devices
-        self._current_injections: List[dev.CurrentInjection] = list()
+        self._current_injections: List[dev.CurrentInjection] = DeviceList()
 
         # List of linear shunt devices
-        self._controllable_shunts: List[dev.ControllableShunt] = list()
+        self._controllable_shunts: List[dev.ControllableShunt] = DeviceList()
 
         # Lists of measurements
-        self._pi_measurements: List[dev.PiMeasurement] = list()
-        self._qi_measurements: List[dev.QiMeasurement] = list()
-        self._pg_measurements: List[dev.PgMeasurement] = list()
-        self._qg_measurements: List[dev.QgMeasurement] = list()
-        self._vm_measurements: List[dev.VmMeasurement] = list()
-        self._va_measurements: List[dev.VaMeasurement] = list()
-        self._pf_measurements: List[dev.PfMeasurement] = list()
-        self._pt_measurements: List[dev.PtMeasurement] = list()
-        self._qf_measurements: List[dev.QfMeasurement] = list()
-        self._qt_measurements: List[dev.QtMeasurement] = list()
-        self._if_measurements: List[dev.IfMeasurement] = list()
-        self._it_measurements: List[dev.ItMeasurement] = list()
+        self._pi_measurements: List[dev.PiMeasurement] = DeviceList()
+        self._qi_measurements: List[dev.QiMeasurement] = DeviceList()
+        self._pg_measurements: List[dev.PgMeasurement] = DeviceList()
+        self._qg_measurements: List[dev.QgMeasurement] = DeviceList()
+        self._vm_measurements: List[dev.VmMeasurement] = DeviceList()
+        self._va_measurements: List[dev.VaMeasurement] = DeviceList()
+        self._pf_measurements: List[dev.PfMeasurement] = DeviceList()
+        self._pt_measurements: List[dev.PtMeasurement] = DeviceList()
+        self._qf_measurements: List[dev.QfMeasurement] = DeviceList()
+        self._qt_measurements: List[dev.QtMeasurement] = DeviceList()
+        self._if_measurements: List[dev.IfMeasurement] = DeviceList()
+        self._it_measurements: List[dev.ItMeasurement] = DeviceList()
 
         # List of overhead line objects
-        self._overhead_line_types: List[dev.OverheadLineType] = list()
+        self._overhead_line_types: List[dev.OverheadLineType] = DeviceList()
 
         # list of wire types
-        self._wire_types: List[dev.Wire] = list()
+        self._wire_types: List[dev.Wire] = DeviceList()
 
         # underground cable lines
-        self._underground_cable_types: List[dev.UndergroundLineType] = list()
+        self._underground_cable_types: List[dev.UndergroundLineType] = DeviceList()
 
         # sequence modelled lines
-        self._sequence_line_types: List[dev.SequenceLineType] = list()
+        self._sequence_line_types: List[dev.SequenceLineType] = DeviceList()
 
         # List of transformer types
-        self._transformer_types: List[dev.TransformerType] = list()
+        self._transformer_types: List[dev.TransformerType] = DeviceList()
 
         # list of branch groups
-        self._branch_groups: List[dev.BranchGroup] = list()
+        self._branch_groups: List[dev.BranchGroup] = DeviceList()
 
         # list of substations
-        self._substations: List[dev.Substation] = list()  # [self.default_substation]
+        self._substations: List[dev.Substation] = DeviceList()  # [self.default_substation]
 
         # list of areas
-        self._areas: List[dev.Area] = list()  # [self.default_area]
+        self._areas: List[dev.Area] = DeviceList()  # [self.default_area]
 
         # list of zones
-        self._zones: List[dev.Zone] = list()  # [self.default_zone]
+        self._zones: List[dev.Zone] = DeviceList()  # [self.default_zone]
 
         # list of countries
-        self._countries: List[dev.Country] = list()  # [self.default_country]
+        self._countries: List[dev.Country] = DeviceList()  # [self.default_country]
 
-        self._communities: List[dev.Community] = list()
+        self._communities: List[dev.Community] = DeviceList()
 
-        self._regions: List[dev.Region] = list()
+        self._regions: List[dev.Region] = DeviceList()
 
-        self._municipalities: List[dev.Municipality] = list()
+        self._municipalities: List[dev.Municipality] = DeviceList()
 
         # contingencies
-        self._contingencies: List[dev.Contingency] = list()
+        self._contingencies: List[dev.Contingency] = DeviceList()
 
         # contingency group
-        self._contingency_groups: List[dev.ContingencyGroup] = list()
+        self._contingency_groups: List[dev.ContingencyGroup] = DeviceList()
 
         # remedial actions
-        self._remedial_actions: List[dev.RemedialAction] = list()
+        self._remedial_actions: List[dev.RemedialAction] = DeviceList()
 
         # remedial actions group
-        self._remedial_action_groups: List[dev.RemedialActionGroup] = list()
+        self._remedial_action_groups: List[dev.RemedialActionGroup] = DeviceList()
 
         # investments
-        self._investments: List[dev.Investment] = list()
+        self._investments: List[dev.Investment] = DeviceList()
 
         # investments group
-        self._investments_groups: List[dev.InvestmentsGroup] = list()
+        self._investments_groups: List[dev.InvestmentsGroup] = DeviceList()
 
         # technologies
-        self._technologies: List[dev.Technology] = list()
+        self._technologies: List[dev.Technology] = DeviceList()
 
         # Modelling authority
-        self._modelling_authorities: List[dev.ModellingAuthority] = list()
+        self._modelling_authorities: List[dev.ModellingAuthority] = DeviceList()
 
         # fuels
-        self._fuels: List[dev.Fuel] = list()
+        self._fuels: List[dev.Fuel] = DeviceList()
 
         # emission gasses
-        self._emission_gases: List[dev.EmissionGas] = list()
+        self._emission_gases: List[dev.EmissionGas] = DeviceList()
 
         # list of facilities
-        self._facilities: List[dev.Facility] = list()
+        self._facilities: List[dev.Facility] = DeviceList()
 
         # fluids
-        self._fluid_nodes: List[dev.FluidNode] = list()
+        self._fluid_nodes: List[dev.FluidNode] = DeviceList()
 
         # fluid paths
-        self._fluid_paths: List[dev.FluidPath] = list()
+        self._fluid_paths: List[dev.FluidPath] = DeviceList()
 
         # list of turbines
-        self._turbines: List[dev.FluidTurbine] = list()
+        self._turbines: List[dev.FluidTurbine] = DeviceList()
 
         # list of pumps
-        self._pumps: List[dev.FluidPump] = list()
+        self._pumps: List[dev.FluidPump] = DeviceList()
 
         # list of power to gas devices
-        self._p2xs: List[dev.FluidP2x] = list()
+        self._p2xs: List[dev.FluidP2x] = DeviceList()
 
         # list of wire types
-        self._rms_models: List[dev.RmsModelTemplate] = list()
+        self._rms_models: List[dev.RmsModelTemplate] = DeviceList()
 
         # list of declared diagrams
-        self._diagrams: List[Union[dev.MapDiagram, dev.SchematicDiagram]] = list()
+        self._diagrams: List[Union[dev.MapDiagram, dev.SchematicDiagram]] = DeviceList()
 
         # objects with profiles
         self.template_objects_dict = {
@@ -354,6 +359,13 @@ class Assets:
 
         self.device_associations: Dict[str, List[str]] = dict()
 
+        # optional columnar storage of the profiles
+        self._profile_store: ProfileStore = ProfileStore()
+
+        # cached device arrays and dictionaries: (kind, category) -> (signature, value)
+        self._index_registry: Dict[Tuple[str, Tuple], Tuple[Tuple, Any]] = dict()
+        self._index_registry_version: int = 0
+
         """
         self.type_name = 'Shunt'
 
@@ -598,10 +610,77 @@ class Assets:
         Delete the time profiles
         :return:
         """
+        self._profile_store.clear()
         for elm in self.items():
             elm.delete_profiles()
         self.time_profile = None
 
+    def consolidate_profiles(self, min_dense_fraction: float = 0.5, folder: Union[str, None] = None) -> int:
+        """
+        Move the device profiles into columnar storage: one (n_time, n_devices) matrix per device type and property.
+        Each profile becomes a view of its matrix column, so the profiles keep working as usual,
+        while the bulk reads (i.e. get_profile_matrix) just slice the matrix.
+        Adding or removing devices, or replacing a profile array, invalidates the affected matrix,
+        and the bulk reads fall back to gathering the profiles one by one.
+        :param min_dense_fraction: minimum fraction of dense profiles to consolidate a property
+        :param folder: if provided, the matrices are memory-mapped to files in this folder instead of living in RAM,
+                       this is meant for very long horizons where only a time window is simulated at once.
+                       Every call creates its own sub-folder, so that the files mapped by other grids
+                       or by previous calls are never overwritten.
+        :return: number of consolidated matrices
+        """
+        nt = self.get_time_number()
+
+        if folder is not None:
+            folder = tempfile.mkdtemp(prefix='profiles_', dir=folder)
+
+        n = 0
+        for key, tpe in self.device_type_name_dict.items():
+            n += self._profile_store.consolidate(devices=self.get_elements_by_type(device_type=tpe),
+                                                 nt=nt,
+                                                 min_dense_fraction=min_dense_fraction,
+                                                 folder=folder)
+        return n
+
+    def release_profiles(self) -> None:
+        """
+        Release the columnar storage of the profiles, each profile gets its own array again
+        """
+        self._profile_store.clear()
+
+    def get_profile_matrix(self, devices: List[ALL_DEV_TYPES], prop: str) -> np.ndarray:
+        """
+        Get the profile values of a list of devices of the same type
+        :param devices: list of devices of the same type
+        :param prop: property name (i.e. rate)
+        :return: (n_time, n_devices) matrix, do not modify it since it may be the columnar storage itself
+        """
+        mat = self._profile_store.get_matrix(devices=devices, prop=prop)
+
+        if mat is None:
+            nt = self.get_time_number()
+            if len(devices):
+                mat = np.empty((nt, len(devices)), dtype=devices[0].get_profile(magnitude=prop).dtype)
+                for i, elm in enumerate(devices):
+                    mat[:, i] = elm.get_profile(magnitude=prop).toarray()
+            else:
+                mat = np.zeros((nt, 0))
+
+        return mat
+
+    def get_profile_matrix_from_lists(self, device_lists: List[List[ALL_DEV_TYPES]], prop: str) -> np.ndarray:
+        """
+        Get the profile values of several lists of devices
+        :param device_lists: list of lists of devices of the same type (i.e. the result of get_branch_lists)
+        :param prop: property name (i.e. rate)
+        :return: (n_time, n_devices) matrix
+        """
+        mats = [self.get_profile_matrix(devices=devices, prop=prop) for devices in device_lists if len(devices)]
+        if len(mats):
+            return np.hstack(mats)
+        else:
+            return np.zeros((self.get_time_number(), 0))
+
     # ------------------------------------------------------------------------------------------------------------------
     # Snapshot time
     # ------------------------------------------------------------------------------------------------------------------
@@ -663,7 +742,7 @@ class Assets:
 
     @lines.setter
     def lines(self, value: List[dev.Line]):
-        self._lines = value
+        self._lines = DeviceList(value)
 
     def get_lines(self) -> List[dev.Line]:
         """
@@ -715,7 +794,7 @@ class Assets:
 
     @dc_lines.setter
     def dc_lines(self, value: List[dev.DcLine]):
-        self._dc_lines = value
+        self._dc_lines = DeviceList(value)
 
     def get_dc_lines(self) -> List[dev.DcLine]:
         """
@@ -759,7 +838,7 @@ class Assets:
 
     @transformers2w.setter
     def transformers2w(self, value: List[dev.Transformer2W]):
-        self._transformers2w = value
+        self._transformers2w = DeviceList(value)
 
     def get_transformers2w(self) -> List[dev.Transformer2W]:
         """
@@ -818,7 +897,7 @@ class Assets:
 
     @hvdc_lines.setter
     def hvdc_lines(self, value: List[dev.HvdcLine]):
-        self._hvdc_lines = value
+        self._hvdc_lines = DeviceList(value)
 
     def get_hvdc(self) -> List[dev.HvdcLine]:
         """
@@ -900,7 +979,7 @@ class Assets:
 
     @vsc_devices.setter
     def vsc_devices(self, value: List[dev.VSC]):
-        self._vsc_devices = value
+        self._vsc_devices = DeviceList(value)
 
     def get_vsc(self) -> List[dev.VSC]:
         """
@@ -981,7 +1060,7 @@ class Assets:
 
     @upfc_devices.setter
     def upfc_devices(self, value: List[dev.UPFC]):
-        self._upfc_devices = value
+        self._upfc_devices = DeviceList(value)
 
     def get_upfc(self) -> List[dev.UPFC]:
         """
@@ -1025,7 +1104,7 @@ class Assets:
 
     @switch_devices.setter
     def switch_devices(self, value: List[dev.Switch]):
-        self._switch_devices = value
+        self._switch_devices = DeviceList(value)
 
     def get_switches(self) -> List[dev.Switch]:
         """
@@ -1078,7 +1157,7 @@ class Assets:
 
     @transformers3w.setter
     def transformers3w(self, value: List[dev.Transformer3W]):
-        self._transformers3w = value
+        self._transformers3w = DeviceList(value)
 
     def get_transformers3w(self) -> List[dev.Transformer3W]:
         """
@@ -1146,7 +1225,7 @@ class Assets:
 
     @windings.setter
     def windings(self, value: List[dev.Winding]):
-        self._windings = value
+        self._windings = DeviceList(value)
 
     def get_windings(self) -> List[dev.Winding]:
         """
@@ -1215,7 +1294,7 @@ class Assets:
 
     @series_reactances.setter
     def series_reactances(self, value: List[dev.SeriesReactance]):
-        self._series_reactances = value
+        self._series_reactances = DeviceList(value)
 
     def get_series_reactances(self) -> List[dev.SeriesReactance]:
         """
@@ -1279,7 +1358,7 @@ class Assets:
 
     @buses.setter
     def buses(self, value: List[dev.Bus]):
-        self._buses = value
+        self._buses = ListSet(value)
 
     def get_bus_number(self) -> int:
         """
@@ -1306,9 +1385,9 @@ class Assets:
     def get_bus_names(self) -> StrVec:
         """
         List of bus names
-        :return:
+        :return: read-only array, copy it to modify it
         """
-        return np.array([e.name for e in self._buses])
+        return self._get_registry_entry(kind='names', category=('buses',), lists=[self._buses])
 
     def get_bus_dict(self, by_idtag=False) -> Dict[str, dev.Bus]:
         """
@@ -1324,9 +1403,9 @@ class Assets:
     def get_bus_index_dict(self) -> Dict[dev.Bus, int]:
         """
         Return dictionary of buses
-        :return: dictionary of buses {name:object}
+        :return: read-only dictionary of buses {object: index}, copy it to modify it
         """
-        return {b: i for i, b in enumerate(self._buses)}
+        return self._get_registry_entry(kind='index_dict', category=('buses',), lists=[self._buses])
 
     def get_bus_actives(self, t_idx: int | None = None) -> IntVec:
         """
@@ -1392,6 +1471,8 @@ class Assets:
         except ValueError:
             print(f"Could not delete {obj.name}")
 
+        self.invalidate_index_registry()
+
     def get_buses_by(self, filter_elements: List[Union[dev.Area, dev.Country, dev.Zone]]) -> List[dev.Bus]:
         """
         Get a list of buses that can be found in the list of Areas | Zones | Countries
@@ -1421,7 +1502,7 @@ class Assets:
 
     @bus_bars.setter
     def bus_bars(self, value: List[dev.BusBar]):
-        self._bus_bars = value
+        self._bus_bars = DeviceList(value)
 
     def get_bus_bars(self) -> List[dev.BusBar]:
         """
@@ -1478,7 +1559,7 @@ class Assets:
 
     @voltage_levels.setter
     def voltage_levels(self, value: List[dev.VoltageLevel]):
-        self._voltage_levels = value
+        self._voltage_levels = DeviceList(value)
 
     def get_voltage_levels(self) -> List[dev.VoltageLevel]:
         """
@@ -1562,7 +1643,7 @@ class Assets:
 
     @loads.setter
     def loads(self, value: List[dev.Load]):
-        self._loads = value
+        self._loads = DeviceList(value)
 
     def get_loads(self) -> List[dev.Load]:
         """
@@ -1631,7 +1712,7 @@ class Assets:
 
     @generators.setter
     def generators(self, value: List[dev.Generator]):
-        self._generators = value
+        self._generators = DeviceList(value)
 
     def get_generators(self) -> List[dev.Generator]:
         """
@@ -1733,7 +1814,7 @@ class Assets:
 
     @external_grids.setter
     def external_grids(self, value: List[dev.ExternalGrid]):
-        self._external_grids = value
+        self._external_grids = DeviceList(value)
 
     def get_external_grids(self) -> List[dev.ExternalGrid]:
         """
@@ -1803,7 +1884,7 @@ class Assets:
 
     @shunts.setter
     def shunts(self, value: List[dev.Shunt]):
-        self._shunts = value
+        self._shunts = DeviceList(value)
 
     def get_shunts(self) -> List[dev.Shunt]:
         """
@@ -1875,7 +1956,7 @@ class Assets:
 
     @batteries.setter
     def batteries(self, value: List[dev.Battery]):
-        self._batteries = value
+        self._batteries = DeviceList(value)
 
     def get_batteries(self) -> List[dev.Battery]:
         """
@@ -1960,7 +2041,7 @@ class Assets:
 
     @static_generators.setter
     def static_generators(self, value: List[dev.StaticGenerator]):
-        self._static_generators = value
+        self._static_generators = DeviceList(value)
 
     def get_static_generators(self) -> List[dev.StaticGenerator]:
         """
@@ -2031,7 +2112,7 @@ class Assets:
 
     @current_injections.setter
     def current_injections(self, value: List[dev.CurrentInjection]):
-        self._current_injections = value
+        self._current_injections = DeviceList(value)
 
     def get_current_injections(self) -> List[dev.CurrentInjection]:
         """
@@ -2110,7 +2191,7 @@ class Assets:
 
     @controllable_shunts.setter
     def controllable_shunts(self, value: List[dev.ControllableShunt]):
-        self._controllable_shunts = value
+        self._controllable_shunts = DeviceList(value)
 
     def get_controllable_shunts(self) -> List[dev.ControllableShunt]:
         """
@@ -2190,7 +2271,7 @@ class Assets:
 
     @pi_measurements.setter
     def pi_measurements(self, value: List[dev.PiMeasurement]):
-        self._pi_measurements = value
+        self._pi_measurements = DeviceList(value)
 
     def get_p_measurements(self) -> List[dev.PiMeasurement]:
         """
@@ -2254,7 +2335,7 @@ class Assets:
 
     @qi_measurements.setter
     def qi_measurements(self, value: List[dev.QiMeasurement]):
-        self._qi_measurements = value
+        self._qi_measurements = DeviceList(value)
 
     def get_q_measurements(self) -> List[dev.QiMeasurement]:
         """
@@ -2319,7 +2400,7 @@ class Assets:
 
     @pg_measurements.setter
     def pg_measurements(self, value: List[dev.PgMeasurement]):
-        self._pg_measurements = value
+        self._pg_measurements = DeviceList(value)
 
     def get_pg_measurements(self) -> List[dev.PgMeasurement]:
         """
@@ -2383,7 +2464,7 @@ class Assets:
 
     @qg_measurements.setter
     def qg_measurements(self, value: List[dev.QgMeasurement]):
-        self._qg_measurements = value
+        self._qg_measurements = DeviceList(value)
 
     def get_qg_measurements(self) -> List[dev.QgMeasurement]:
         """
@@ -2448,7 +2529,7 @@ class Assets:
 
     @vm_measurements.setter
     def vm_measurements(self, value: List[dev.VmMeasurement]):
-        self._vm_measurements = value
+        self._vm_measurements = DeviceList(value)
 
     def get_vm_measurements(self) -> List[dev.VmMeasurement]:
         """
@@ -2513,7 +2594,7 @@ class Assets:
 
     @va_measurements.setter
     def va_measurements(self, value: List[dev.VaMeasurement]):
-        self._va_measurements = value
+        self._va_measurements = DeviceList(value)
 
     def get_va_measurements(self) -> List[dev.VaMeasurement]:
         """
@@ -2577,7 +2658,7 @@ class Assets:
 
     @pf_measurements.setter
     def pf_measurements(self, value: List[dev.PfMeasurement]):
-        self._pf_measurements = value
+        self._pf_measurements = DeviceList(value)
 
     def get_pf_measurements(self) -> List[dev.PfMeasurement]:
         """
@@ -2642,7 +2723,7 @@ class Assets:
 
     @pt_measurements.setter
     def pt_measurements(self, value: List[dev.PtMeasurement]):
-        self._pt_measurements = value
+        self._pt_measurements = DeviceList(value)
 
     def get_pt_measurements(self) -> List[dev.PtMeasurement]:
         """
@@ -2707,7 +2788,7 @@ class Assets:
 
     @qf_measurements.setter
     def qf_measurements(self, value: List[dev.QfMeasurement]):
-        self._qf_measurements = value
+        self._qf_measurements = DeviceList(value)
 
     def get_qf_measurements(self) -> List[dev.QfMeasurement]:
         """
@@ -2772,7 +2853,7 @@ class Assets:
 
     @qt_measurements.setter
     def qt_measurements(self, value: List[dev.QtMeasurement]):
-        self._qt_measurements = value
+        self._qt_measurements = DeviceList(value)
 
     def get_qt_measurements(self) -> List[dev.QtMeasurement]:
         """
@@ -2837,7 +2918,7 @@ class Assets:
 
     @if_measurements.setter
     def if_measurements(self, value: List[dev.IfMeasurement]):
-        self._if_measurements = value
+        self._if_measurements = DeviceList(value)
 
     def get_if_measurements(self) -> List[dev.IfMeasurement]:
         """
@@ -2902,7 +2983,7 @@ class Assets:
 
     @it_measurements.setter
     def it_measurements(self, value: List[dev.ItMeasurement]):
-        self._it_measurements = value
+        self._it_measurements = DeviceList(value)
 
     def get_it_measurements(self) -> List[dev.ItMeasurement]:
         """
@@ -2967,7 +3048,7 @@ class Assets:
 
     @overhead_line_types.setter
     def overhead_line_types(self, value: List[dev.OverheadLineType]):
-        self._overhead_line_types = value
+        self._overhead_line_types = DeviceList(value)
 
     def add_overhead_line(self, obj: dev.OverheadLineType):
         """
@@ -3017,7 +3098,7 @@ class Assets:
 
     @wire_types.setter
     def wire_types(self, value: List[dev.Wire]):
-        self._wire_types = value
+        self._wire_types = DeviceList(value)
 
     def add_wire(self, obj: dev.Wire):
         """
@@ -3058,7 +3139,7 @@ class Assets:
 
     @underground_cable_types.setter
     def underground_cable_types(self, value: List[dev.UndergroundLineType]):
-        self._underground_cable_types = value
+        self._underground_cable_types = DeviceList(value)
 
     def add_underground_line(self, obj: dev.UndergroundLineType):
         """
@@ -3097,7 +3178,7 @@ class Assets:
 
     @sequence_line_types.setter
     def sequence_line_types(self, value: List[dev.SequenceLineType]):
-        self._sequence_line_types = value
+        self._sequence_line_types = DeviceList(value)
 
     def add_sequence_line(self, obj: dev.SequenceLineType):
         """
@@ -3136,7 +3217,7 @@ class Assets:
 
     @transformer_types.setter
     def transformer_types(self, value: List[dev.TransformerType]):
-        self._transformer_types = value
+        self._transformer_types = DeviceList(value)
 
     def add_transformer_type(self, obj: dev.TransformerType):
         """
@@ -3185,7 +3266,7 @@ class Assets:
 
     @branch_groups.setter
     def branch_groups(self, value: List[dev.BranchGroup]):
-        self._branch_groups = value
+        self._branch_groups = DeviceList(value)
 
     def get_branch_groups(self) -> List[dev.BranchGroup]:
         """
@@ -3250,7 +3331,7 @@ class Assets:
 
     @substations.setter
     def substations(self, value: List[dev.Substation]):
-        self._substations = value
+        self._substations = DeviceList(value)
 
     def get_substations(self) -> List[dev.Substation]:
         """
@@ -3312,6 +3393,8 @@ class Assets:
             for obj in selected_objects:
                 self.delete_substation(obj=obj)
 
+            self.invalidate_index_registry()
+
     # ------------------------------------------------------------------------------------------------------------------
     # Area
     # ------------------------------------------------------------------------------------------------------------------
@@ -3326,7 +3409,7 @@ class Assets:
 
     @areas.setter
     def areas(self, value: List[dev.Area]):
-        self._areas = value
+        self._areas = DeviceList(value)
 
     def get_areas(self) -> List[dev.Area]:
         """
@@ -3392,7 +3475,7 @@ class Assets:
 
     @zones.setter
     def zones(self, value: List[dev.Zone]):
-        self._zones = value
+        self._zones = DeviceList(value)
 
     def get_zones(self) -> List[dev.Zone]:
         """
@@ -3447,7 +3530,7 @@ class Assets:
 
     @countries.setter
     def countries(self, value: List[dev.Country]):
-        self._countries = value
+        self._countries = DeviceList(value)
 
     def get_countries(self) -> List[dev.Country]:
         """
@@ -3505,7 +3588,7 @@ class Assets:
 
     @communities.setter
     def communities(self, value: List[dev.Community]):
-        self._communities = value
+        self._communities = DeviceList(value)
 
     def get_communities(self) -> List[dev.Community]:
         """
@@ -3579,7 +3662,7 @@ class Assets:
 
     @regions.setter
     def regions(self, value: List[dev.Region]):
-        self._regions = value
+        self._regions = DeviceList(value)
 
     def get_regions(self) -> List[dev.Region]:
         """
@@ -3649,7 +3732,7 @@ class Assets:
 
     @municipalities.setter
     def municipalities(self, value: List[dev.Municipality]):
-        self._municipalities = value
+        self._municipalities = DeviceList(value)
 
     def get_municipalities(self) -> List[dev.Municipality]:
         """
@@ -3719,7 +3802,7 @@ class Assets:
 
     @contingencies.setter
     def contingencies(self, value: List[dev.Contingency]):
-        self._contingencies = value
+        self._contingencies = DeviceList(value)
 
     def get_contingency_number(self) -> int:
         """
@@ -3774,7 +3857,7 @@ class Assets:
 
     @contingency_groups.setter
     def contingency_groups(self, value: List[dev.ContingencyGroup]):
-        self._contingency_groups = value
+        self._contingency_groups = DeviceList(value)
 
     def get_contingency_groups(self) -> List[dev.ContingencyGroup]:
         """
@@ -3933,7 +4016,7 @@ class Assets:
 
     @investments.setter
     def investments(self, value: List[dev.Investment]):
-        self._investments = value
+        self._investments = DeviceList(value)
 
     def add_investment(self, obj: dev.Investment):
         """
@@ -3981,7 +4064,7 @@ class Assets:
 
     @remedial_actions.setter
     def remedial_actions(self, value: List[dev.RemedialAction]):
-        self._remedial_actions = value
+        self._remedial_actions = DeviceList(value)
 
     def get_remedial_action_number(self) -> int:
         """
@@ -4036,7 +4119,7 @@ class Assets:
 
     @remedial_action_groups.setter
     def remedial_action_groups(self, value: List[dev.RemedialActionGroup]):
-        self._remedial_action_groups = value
+        self._remedial_action_groups = DeviceList(value)
 
     def get_rmedial_action_groups(self) -> List[dev.RemedialActionGroup]:
         """
@@ -4192,7 +4275,7 @@ class Assets:
 
     @investments_groups.setter
     def investments_groups(self, value: List[dev.InvestmentsGroup]):
-        self._investments_groups = value
+        self._investments_groups = DeviceList(value)
 
     def get_investment_groups_names(self) -> StrVec:
         """
@@ -4298,7 +4381,7 @@ class Assets:
 
     @technologies.setter
     def technologies(self, value: List[dev.Technology]):
-        self._technologies = value
+        self._technologies = DeviceList(value)
 
     def add_technology(self, obj: dev.Technology):
         """
@@ -4359,7 +4442,7 @@ class Assets:
 
     @modelling_authorities.setter
     def modelling_authorities(self, value: List[dev.ModellingAuthority]):
-        self._modelling_authorities = value
+        self._modelling_authorities = DeviceList(value)
 
     def get_modelling_authorities(self) -> List[dev.ModellingAuthority]:
         """
@@ -4424,7 +4507,7 @@ class Assets:
 
     @facilities.setter
     def facilities(self, value: List[dev.Facility]):
-        self._facilities = value
+        self._facilities = DeviceList(value)
 
     def get_facilities(self) -> List[dev.Facility]:
         """
@@ -4482,7 +4565,7 @@ class Assets:
 
     @fuels.setter
     def fuels(self, value: List[dev.Fuel]):
-        self._fuels = value
+        self._fuels = DeviceList(value)
 
     def get_fuels(self) -> List[dev.Fuel]:
         """
@@ -4557,7 +4640,7 @@ class Assets:
 
     @emission_gases.setter
     def emission_gases(self, value: List[dev.EmissionGas]):
-        self._emission_gases = value
+        self._emission_gases = DeviceList(value)
 
     def get_emissions(self) -> List[dev.EmissionGas]:
         """
@@ -4633,7 +4716,7 @@ class Assets:
 
     @fluid_nodes.setter
     def fluid_nodes(self, value: List[dev.FluidNode]):
-        self._fluid_nodes = value
+        self._fluid_nodes = DeviceList(value)
 
     def add_fluid_node(self, obj: dev.FluidNode):
         """
@@ -4695,7 +4778,7 @@ class Assets:
 
     @fluid_paths.setter
     def fluid_paths(self, value: List[dev.FluidPath]):
-        self._fluid_paths = value
+        self._fluid_paths = DeviceList(value)
 
     def add_fluid_path(self, obj: dev.FluidPath):
         """
@@ -4752,7 +4835,7 @@ class Assets:
 
     @turbines.setter
     def turbines(self, value: List[dev.FluidTurbine]):
-        self._turbines = value
+        self._turbines = DeviceList(value)
 
     def add_fluid_turbine(self,
                           node: Union[None, dev.FluidNode] = None,
@@ -4816,7 +4899,7 @@ class Assets:
 
     @pumps.setter
     def pumps(self, value: List[dev.FluidPump]):
-        self._pumps = value
+        self._pumps = DeviceList(value)
 
     def add_fluid_pump(self,
                        node: Union[None, dev.FluidNode] = None,
@@ -4879,7 +4962,7 @@ class Assets:
 
     @p2xs.setter
     def p2xs(self, value: List[dev.FluidP2x]):
-        self._p2xs = value
+        self._p2xs = DeviceList(value)
 
     def add_fluid_p2x(self,
                       node: Union[None, dev.FluidNode] = None,
@@ -4942,7 +5025,7 @@ class Assets:
 
     @diagrams.setter
     def diagrams(self, value: List[Union[dev.MapDiagram, dev.SchematicDiagram]]):
-        self._diagrams = value
+        self._diagrams = DeviceList(value)
 
     def get_diagrams(self) -> List[Union[dev.MapDiagram, dev.SchematicDiagram]]:
         """
@@ -4990,7 +5073,7 @@ class Assets:
 
     @rms_models.setter
     def rms_models(self, value: List[dev.RmsModelTemplate]):
-        self._rms_models = value
+        self._rms_models = DeviceList(value)
 
     def get_rms_models_number(self) -> int:
         return len(self._rms_models)
@@ -5093,6 +5176,55 @@ class Assets:
             except ValueError:  # element not found ...
                 pass
 
+        self.invalidate_index_registry()
+
+    def invalidate_index_registry(self) -> None:
+        """
+        Invalidate the cached device arrays and dictionaries (see get_branches, get_bus_index_dict, ...)
+        The modifications of the devices lists are detected through their version (see DeviceList),
+        this is only needed when the registry must be rebuilt for other reasons
+        """
+        self._index_registry_version += 1
+        self._index_registry.clear()
+
+    def _get_registry_entry(self, kind: str, category: Tuple, lists: List[List[ALL_DEV_TYPES]]) -> Any:
+        """
+        Get a cached array or dictionary of the devices of a category, building it if it is stale.
+        The entries are checked against the version of the devices lists (see DeviceList), which every
+        modification of the lists changes (add_*, delete_*, the list setters, or append, pop, lst[i] = elm, ...),
+        and against the version of the names and idtags, so a cache hit costs three integer comparisons
+        :param kind: "devices", "names", "idtags", "index_dict" or "idtag_dict"
+        :param category: hashable key of the category (i.e. ('buses',))
+        :param lists: lists of devices that make the category
+        :return: cached value, shared by all the callers (read-only arrays and dictionaries)
+        """
+        signature = (self._index_registry_version, get_identity_version(), get_device_lists_version())
+
+        entry = self._index_registry.get((kind, category), None)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        if kind == 'devices':
+            value = [elm for lst in lists for elm in lst]
+        else:
+            devices = self._get_registry_entry(kind='devices', category=category, lists=lists)
+
+            if kind == 'names':
+                value = np.array([elm.name for elm in devices])
+                value.flags.writeable = False
+            elif kind == 'idtags':
+                value = np.array([elm.idtag for elm in devices])
+                value.flags.writeable = False
+            elif kind == 'index_dict':
+                value = ReadOnlyDict({elm: i for i, elm in enumerate(devices)})
+            elif kind == 'idtag_dict':
+                value = ReadOnlyDict({elm.idtag: i for i, elm in enumerate(devices)})
+            else:
+                raise ValueError(f"Unknown registry entry kind {kind}")
+
+        self._index_registry[(kind, category)] = (signature, value)
+        return value
+
     def get_branch_lists(self, add_vsc: bool = True,
                          add_hvdc: bool = True,
                          add_switch: bool = False) -> List[List[BRANCH_TYPES]]:
@@ -5132,11 +5264,10 @@ class Assets:
         :param add_switch: Include the list of Switch?
         :return: list of branch devices
         """
-        elms = list()
-        for lst in self.get_branch_lists(add_vsc=add_vsc, add_hvdc=add_hvdc, add_switch=add_switch):
-            for elm in lst:
-                elms.append(elm)
-        return elms
+        return list(self._get_branches_registry_entry(kind='devices',
+                                                      add_vsc=add_vsc,
+                                                      add_hvdc=add_hvdc,
+                                                      add_switch=add_switch))
 
     def get_branches_iter(self, add_vsc: bool = True,
                           add_hvdc: bool = True,
@@ -5177,16 +5308,12 @@ class Assets:
         :param add_vsc: Include the list of VSC?
         :param add_hvdc: Include the list of HvdcLine?
         :param add_switch: Include the list of Switch?
-        :return: StrVec
+        :return: StrVec (read-only, copy it to modify it)
         """
-
-        names = list()
-        for lst in self.get_branch_lists(add_vsc=add_vsc,
-                                         add_hvdc=add_hvdc,
-                                         add_switch=add_switch):
-            for elm in lst:
-                names.append(elm.name)
-        return np.array(names)
+        return self._get_branches_registry_entry(kind='names',
+                                                 add_vsc=add_vsc,
+                                                 add_hvdc=add_hvdc,
+                                                 add_switch=add_switch)
 
     def get_branch_actives(self,
                            t_idx: int | None,
@@ -5217,11 +5344,12 @@ class Assets:
         :param add_vsc: Include the list of VSC?
         :param add_hvdc: Include the list of HvdcLine?
         :param add_switch: Include the list of Switch?
-        :return: Branch object to index
+        :return: Branch object to index (read-only, copy it to modify it)
         """
-        return {b: i for i, b in enumerate(self.get_branches_iter(add_vsc=add_vsc,
-                                                                  add_hvdc=add_hvdc,
-                                                                  add_switch=add_switch))}
+        return self._get_branches_registry_entry(kind='index_dict',
+                                                 add_vsc=add_vsc,
+                                                 add_hvdc=add_hvdc,
+                                                 add_switch=add_switch)
 
     def get_branches_index_dict2(self, add_vsc: bool = True,
                                  add_hvdc: bool = True,
@@ -5231,11 +5359,12 @@ class Assets:
         :param add_vsc: Include the list of VSC?
         :param add_hvdc: Include the list of HvdcLine?
         :param add_switch: Include the list of Switch?
-        :return: Branch idtag to index
+        :return: Branch idtag to index (read-only, copy it to modify it)
         """
-        return {b.idtag: i for i, b in enumerate(self.get_branches_iter(add_vsc=add_vsc,
-                                                                        add_hvdc=add_hvdc,
-                                                                        add_switch=add_switch))}
+        return self._get_branches_registry_entry(kind='idtag_dict',
+                                                 add_vsc=add_vsc,
+                                                 add_hvdc=add_hvdc,
+                                                 add_switch=add_switch)
 
     def get_branches_dict(self, add_vsc: bool = True,
                           add_hvdc: bool = True,
@@ -5246,11 +5375,45 @@ class Assets:
         :param add_vsc: Include the list of VSC?
         :param add_hvdc: Include the list of HvdcLine?
         :param add_switch: Include the list of Switch?
-        :return: Dict[str, int]
+        :return: Dict[str, int] (read-only, copy it to modify it)
         """
-        return {e.idtag: ei for ei, e in enumerate(self.get_branches_iter(add_vsc=add_vsc,
-                                                                          add_hvdc=add_hvdc,
-                                                                          add_switch=add_switch))}
+        return self._get_branches_registry_entry(kind='idtag_dict',
+                                                 add_vsc=add_vsc,
+                                                 add_hvdc=add_hvdc,
+                                                 add_switch=add_switch)
+
+    def get_branch_idtags(self, add_vsc: bool = True,
+                          add_hvdc: bool = True,
+                          add_switch: bool = True) -> StrVec:
+        """
+        Get array of all branch idtags
+        :param add_vsc: Include the list of VSC?
+        :param add_hvdc: Include the list of HvdcLine?
+        :param add_switch: Include the list of Switch?
+        :return: StrVec (read-only, copy it to modify it)
+        """
+        return self._get_branches_registry_entry(kind='idtags',
+                                                 add_vsc=add_vsc,
+                                                 add_hvdc=add_hvdc,
+                                                 add_switch=add_switch)
+
+    def _get_branches_registry_entry(self, kind: str,
+                                     add_vsc: bool,
+                                     add_hvdc: bool,
+                                     add_switch: bool) -> Any:
+        """
+        Get a cached array or dictionary of the branches
+        :param kind: "devices", "names", "idtags", "index_dict" or "idtag_dict"
+        :param add_vsc: Include the list of VSC?
+        :param add_hvdc: Include the list of HvdcLine?
+        :param add_switch: Include the list of Switch?
+        :return: cached value (do not modify)
+        """
+        return self._get_registry_entry(kind=kind,
+                                        category=('branches', add_vsc, add_hvdc, add_switch),
+                                        lists=self.get_branch_lists(add_vsc=add_vsc,
+                                                                    add_hvdc=add_hvdc,
+                                                                    add_switch=add_switch))
 
     def get_branch_FT(self, add_vsc: bool = True,
                       add_hvdc: bool = True,
@@ -5772,28 +5935,28 @@ class Assets:
         :param logger: Logger
         """
         if device_type == DeviceType.LoadDevice:
-            self._loads = devices
+            self._loads = DeviceList(devices)
 
         elif device_type == DeviceType.StaticGeneratorDevice:
-            self._static_generators = devices
+            self._static_generators = DeviceList(devices)
 
         elif device_type == DeviceType.GeneratorDevice:
-            self._generators = devices
+            self._generators = DeviceList(devices)
 
         elif device_type == DeviceType.BatteryDevice:
-            self._batteries = devices
+            self._batteries = DeviceList(devices)
 
         elif device_type == DeviceType.ShuntDevice:
-            self._shunts = devices
+            self._shunts = DeviceList(devices)
 
         elif device_type == DeviceType.ExternalGridDevice:
-            self._external_grids = devices
+            self._external_grids = DeviceList(devices)
 
         elif device_type == DeviceType.CurrentInjectionDevice:
-            self._current_injections = devices
+            self._current_injections = DeviceList(devices)
 
         elif device_type == DeviceType.ControllableShuntDevice:
-            self._controllable_shunts = devices
+            self._controllable_shunts = DeviceList(devices)
 
         elif device_type == DeviceType.LineDevice:
             for d in devices:
@@ -5801,176 +5964,178 @@ class Assets:
                 self.add_line(d, logger=logger)
 
         elif device_type == DeviceType.Transformer2WDevice:
-            self._transformers2w = devices
+            self._transformers2w = DeviceList(devices)
 
         elif device_type == DeviceType.Transformer3WDevice:
-            self._transformers3w = devices
+            self._transformers3w = DeviceList(devices)
 
         elif device_type == DeviceType.WindingDevice:
-            self._windings = devices
+            self._windings = DeviceList(devices)
 
         elif device_type == DeviceType.SeriesReactanceDevice:
-            self._series_reactances = devices
+            self._series_reactances = DeviceList(devices)
 
         elif device_type == DeviceType.HVDCLineDevice:
-            self._hvdc_lines = devices
+            self._hvdc_lines = DeviceList(devices)
 
         elif device_type == DeviceType.UpfcDevice:
-            self._upfc_devices = devices
+            self._upfc_devices = DeviceList(devices)
 
         elif device_type == DeviceType.VscDevice:
             # for elm in devices:  # TODO SANPEN: Why not?
             #     elm.correct_buses_connection()
-            self._vsc_devices = devices
+            self._vsc_devices = DeviceList(devices)
 
         elif device_type == DeviceType.BranchGroupDevice:
-            self._branch_groups = devices
+            self._branch_groups = DeviceList(devices)
 
         elif device_type == DeviceType.BusDevice:
             self._buses = ListSet(devices)
 
         elif device_type == DeviceType.OverheadLineTypeDevice:
-            self._overhead_line_types = devices
+            self._overhead_line_types = DeviceList(devices)
 
         elif device_type == DeviceType.TransformerTypeDevice:
-            self._transformer_types = devices
+            self._transformer_types = DeviceList(devices)
 
         elif device_type == DeviceType.UnderGroundLineDevice:
-            self._underground_cable_types = devices
+            self._underground_cable_types = DeviceList(devices)
 
         elif device_type == DeviceType.SequenceLineDevice:
-            self._sequence_line_types = devices
+            self._sequence_line_types = DeviceList(devices)
 
         elif device_type == DeviceType.WireDevice:
-            self._wire_types = devices
+            self._wire_types = DeviceList(devices)
 
         elif device_type == DeviceType.DCLineDevice:
-            self._dc_lines = devices
+            self._dc_lines = DeviceList(devices)
 
         elif device_type == DeviceType.SwitchDevice:
-            self._switch_devices = devices
+            self._switch_devices = DeviceList(devices)
 
         elif device_type == DeviceType.SubstationDevice:
-            self._substations = devices
+            self._substations = DeviceList(devices)
 
         elif device_type == DeviceType.VoltageLevelDevice:
-            self._voltage_levels = devices
+            self._voltage_levels = DeviceList(devices)
 
         elif device_type == DeviceType.BusBarDevice:
-            self._bus_bars = devices
+            self._bus_bars = DeviceList(devices)
 
         elif device_type == DeviceType.AreaDevice:
-            self._areas = devices
+            self._areas = DeviceList(devices)
 
         elif device_type == DeviceType.ZoneDevice:
-            self._zones = devices
+            self._zones = DeviceList(devices)
 
         elif device_type == DeviceType.CountryDevice:
-            self._countries = devices
+            self._countries = DeviceList(devices)
 
         elif device_type == DeviceType.CommunityDevice:
-            self._communities = devices
+            self._communities = DeviceList(devices)
 
         elif device_type == DeviceType.RegionDevice:
-            self._regions = devices
+            self._regions = DeviceList(devices)
 
         elif device_type == DeviceType.MunicipalityDevice:
-            self._municipalities = devices
+            self._municipalities = DeviceList(devices)
 
         elif device_type == DeviceType.ContingencyDevice:
-            self._contingencies = devices
+            self._contingencies = DeviceList(devices)
 
         elif device_type == DeviceType.ContingencyGroupDevice:
-            self._contingency_groups = devices
+            self._contingency_groups = DeviceList(devices)
 
         elif device_type == DeviceType.RemedialActionDevice:
-            self._remedial_actions = devices
+            self._remedial_actions = DeviceList(devices)
 
         elif device_type == DeviceType.RemedialActionGroupDevice:
-            self._remedial_action_groups = devices
+            self._remedial_action_groups = DeviceList(devices)
 
         elif device_type == DeviceType.Technology:
-            self._technologies = devices
+            self._technologies = DeviceList(devices)
 
         elif device_type == DeviceType.InvestmentDevice:
-            self._investments = devices
+            self._investments = DeviceList(devices)
 
         elif device_type == DeviceType.InvestmentsGroupDevice:
-            self._investments_groups = devices
+            self._investments_groups = DeviceList(devices)
 
         elif device_type == DeviceType.FuelDevice:
-            self._fuels = devices
+            self._fuels = DeviceList(devices)
 
         elif device_type == DeviceType.EmissionGasDevice:
-            self._emission_gases = devices
+            self._emission_gases = DeviceList(devices)
 
         elif device_type == DeviceType.FluidNodeDevice:
-            self._fluid_nodes = devices
+            self._fluid_nodes = DeviceList(devices)
 
         elif device_type == DeviceType.FluidPathDevice:
-            self._fluid_paths = devices
+            self._fluid_paths = DeviceList(devices)
 
         elif device_type == DeviceType.FluidTurbineDevice:
-            self._turbines = devices
+            self._turbines = DeviceList(devices)
 
         elif device_type == DeviceType.FluidPumpDevice:
-            self._pumps = devices
+            self._pumps = DeviceList(devices)
 
         elif device_type == DeviceType.FluidP2XDevice:
-            self._p2xs = devices
+            self._p2xs = DeviceList(devices)
 
         elif device_type == DeviceType.BranchDevice:
             for d in devices:
                 self.add_branch(d)  # each branch needs to be converted accordingly
 
         elif device_type == DeviceType.PMeasurementDevice:
-            self._pi_measurements = devices
+            self._pi_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.QMeasurementDevice:
-            self._qi_measurements = devices
+            self._qi_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.PgMeasurementDevice:
-            self._pg_measurements = devices
+            self._pg_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.QgMeasurementDevice:
-            self._qg_measurements = devices
+            self._qg_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.PfMeasurementDevice:
-            self._pf_measurements = devices
+            self._pf_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.PtMeasurementDevice:
-            self._pt_measurements = devices
+            self._pt_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.QfMeasurementDevice:
-            self._qf_measurements = devices
+            self._qf_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.QtMeasurementDevice:
-            self._qt_measurements = devices
+            self._qt_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.VmMeasurementDevice:
-            self._vm_measurements = devices
+            self._vm_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.VaMeasurementDevice:
-            self._va_measurements = devices
+            self._va_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.IfMeasurementDevice:
-            self._if_measurements = devices
+            self._if_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.ItMeasurementDevice:
-            self._it_measurements = devices
+            self._it_measurements = DeviceList(devices)
 
         elif device_type == DeviceType.ModellingAuthority:
-            self._modelling_authorities = devices
+            self._modelling_authorities = DeviceList(devices)
 
         elif device_type == DeviceType.FacilityDevice:
-            self._facilities = devices
+            self._facilities = DeviceList(devices)
 
         elif device_type == DeviceType.RmsModelTemplateDevice:
-            self._rms_models = devices
+            self._rms_models = DeviceList(devices)
 
         else:
             raise Exception('Element type not understood ' + str(device_type))
 
+        self.invalidate_index_registry()
+
     def add_element(self, obj: ALL_DEV_TYPES) -> None:
         """
         Add a device in its corresponding list
@@ -6169,6 +6334,8 @@ class Assets:
         else:
             raise Exception('Element type not understood ' + str(obj.device_type))
 
+        self.invalidate_index_registry()
+
     def delete_element(self, obj: ALL_DEV_TYPES) -> None:
         """
         Get set of elements and their parent nodes
@@ -6368,6 +6535,8 @@ class Assets:
         else:
             raise Exception('Element type not understood ' + str(obj.device_type))
 
+        self.invalidate_index_registry()
+
     def merge_object(self,
                      api_obj: ALL_DEV_TYPES,
                      all_elms_base_dict: Dict[str, ALL_DEV_TYPES],
@@ -6410,6 +6579,8 @@ class Assets:
             elif api_obj.action == ActionType.NoAction:
                 pass
 
+            self.invalidate_index_registry()
+
             return True
 
         else:
@@ -6523,6 +6694,8 @@ class Assets:
             for elm in elm_list:
                 self.get_elements_by_type(device_type=elm.device_type).clear()
 
+        self.invalidate_index_registry()
+
     def get_dictionary_of_lists(
             self,
             elm_type: DeviceType
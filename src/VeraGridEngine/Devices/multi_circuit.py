@@ -11,8 +11,7 @@ import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple, Union, Set, Callable, Sequence, Any, TYPE_CHECKING
 from uuid import getnode as get_mac, uuid4
-import networkx as nx
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from scipy.sparse import csc_matrix, lil_matrix, coo_matrix
 
 from VeraGridEngine.Devices.assets import Assets
@@ -23,8 +22,12 @@ import VeraGridEngine.Devices as dev
 from VeraGridEngine.Devices.types import ALL_DEV_TYPES, INJECTION_DEVICE_TYPES, FLUID_TYPES, AREA_TYPES
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.Topology.topology import find_different_states
+from VeraGridEngine.Utils.hashing import hash_arrays
 from VeraGridEngine.enumerations import DeviceType, ActionType, SubObjectType, DynamicVarType
 
+plt = lazy_import('matplotlib.pyplot')
+nx = lazy_import('networkx')
+
 
 if TYPE_CHECKING:
     from VeraGridEngine.Simulations.OPF.opf_ts_results import OptimalPowerFlowTimeSeriesResults
@@ -278,11 +281,10 @@ class MultiCircuit(Assets):
         Get branch active matrix
         :return: array with branch active status
         """
-        active = np.empty((self.get_time_number(),
-                           self.get_branch_number(add_hvdc=False, add_vsc=False, add_switch=True)), dtype=int)
-        for i, b in enumerate(self.get_branches(add_hvdc=False, add_vsc=False, add_switch=True)):
-            active[:, i] = b.active_prof.toarray()
-        return active
+        return self.get_profile_matrix_from_lists(
+            device_lists=self.get_branch_lists(add_hvdc=False, add_vsc=False, add_switch=True),
+            prop='active'
+        ).astype(int)
 
     def get_topologic_group_dict(self) -> Dict[int, List[int]]:
         """
@@ -295,6 +297,52 @@ class MultiCircuit(Assets):
 
         return find_different_states(states_array=self.get_branch_active_time_array())
 
+    def get_fingerprints_by_category(self,
+                                     t_from: Union[int, None] = None,
+                                     t_to: Union[int, None] = None,
+                                     include_profiles: bool = True) -> Dict[str, str]:
+        """
+        Content hash of each device category (see EditableDevice.get_fingerprint)
+        Only the devices that changed since the last call are hashed again
+        :param t_from: first time index of the profiles window (None for the beginning)
+        :param t_to: time index after the last of the profiles window (None for the end)
+        :param include_profiles: include the profiles in the hash?
+        :return: Dictionary with the device type name: hexadecimal digest
+        """
+        data = dict()
+        for key, tpe in self.device_type_name_dict.items():
+            data[tpe.value] = hash_arrays(*[elm.get_fingerprint(t_from=t_from,
+                                                                t_to=t_to,
+                                                                include_profiles=include_profiles)
+                                            for elm in self.get_elements_by_type(device_type=tpe)])
+        return data
+
+    def fingerprint(self,
+                    t_from: Union[int, None] = None,
+                    t_to: Union[int, None] = None,
+                    include_profiles: bool = True) -> str:
+        """
+        Stable content hash of the grid, to use as key of the caches that depend on the grid data.
+        The descriptive fields (name, idtag, comments, ...) are not part of the hash,
+        see FINGERPRINT_EXCLUDED_PROPERTIES.
+        :param t_from: first time index of the profiles window (None for the beginning)
+        :param t_to: time index after the last of the profiles window (None for the end)
+        :param include_profiles: include the time array and the profiles in the hash?
+        :return: hexadecimal digest
+        """
+        values = [self.Sbase, self.fBase]
+
+        if include_profiles and self.time_profile is not None:
+            values.append(self.time_profile.values[t_from:t_to].astype('datetime64[ns]').view(np.int64))
+
+        for key, fp in self.get_fingerprints_by_category(t_from=t_from,
+                                                         t_to=t_to,
+                                                         include_profiles=include_profiles).items():
+            values.append(key)
+            values.append(fp)
+
+        return hash_arrays(*values)
+
     def copy(self) -> "MultiCircuit":
         """
         Returns a deep (true) copy of this circuit.
@@ -1708,13 +1756,10 @@ class MultiCircuit(Assets):
         Get the complex bus power Injections
         :return: (ntime, nbr) [MVA]
         """
-        val = np.zeros((self.get_time_number(),
-                        self.get_branch_number(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch)))
-
-        for i, branch in enumerate(self.get_branches(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch)):
-            val[:, i] = branch.rate_prof.toarray()
-
-        return val
+        return self.get_profile_matrix_from_lists(
+            device_lists=self.get_branch_lists(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch),
+            prop='rate'
+        ).astype(float)
 
     def get_branch_rates(self, add_hvdc=False, add_vsc=False, add_switch=True) -> Vec:
         """
@@ -1733,13 +1778,10 @@ class MultiCircuit(Assets):
         Get the complex bus power Injections
         :return: (ntime, nbr) [MVA]
         """
-        val = np.zeros((self.get_time_number(),
-                        self.get_branch_number(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch)))
-
-        for i, branch in enumerate(self.get_branches(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch)):
-            val[:, i] = branch.rate_prof.toarray() * branch.contingency_factor_prof.toarray()
-
-        return val
+        device_lists = self.get_branch_lists(add_hvdc=add_hvdc, add_vsc=add_vsc, add_switch=add_switch)
+        rates = self.get_profile_matrix_from_lists(device_lists=device_lists, prop='rate')
+        factors = self.get_profile_matrix_from_lists(device_lists=device_lists, prop='contingency_factor')
+        return rates * factors
 
     def get_branch_contingency_rates(self, add_hvdc=False, add_vsc=False, add_switch=True) -> Vec:
         """
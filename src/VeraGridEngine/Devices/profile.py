@@ -3,7 +3,10 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.  
 # SPDX-License-Identifier: MPL-2.0
 
-from typing import Union, Dict, Tuple, List, Any
+from __future__ import annotations
+import os
+import tempfile
+from typing import Union, Dict, Tuple, List, Any, TYPE_CHECKING
 from collections import Counter
 import numpy as np
 import numba as nb
@@ -11,9 +14,13 @@ import numba as nb
 from VeraGridEngine.basic_structures import Numeric, NumericVec, IntVec
 from VeraGridEngine.enumerations import DeviceType
 from VeraGridEngine.Utils.Sparse.sparse_array import SparseArray, PROFILE_TYPES, check_type
+from VeraGridEngine.Utils.hashing import hash_arrays
 
+if TYPE_CHECKING:  # Only imports the below statements during type checking
+    from VeraGridEngine.Devices.profile_store import ProfileColumns
 
-@nb.njit()
+
+@nb.njit(cache=True)
 def compress_array_numba(arr, base):
     """
     Compress Array
@@ -81,6 +88,49 @@ def check_if_sparse(arr: Union[NumericVec], sparsity: float = 0.8) -> Tuple[bool
         return True, max_val
 
 
+# number of values copied at once between memory-mapped arrays, this bounds the RAM used by the copies
+MEMMAP_CHUNK_SIZE = 1 << 20
+
+
+def _get_memmap_filename(arr: Union[np.ndarray, None]) -> Union[str, None]:
+    """
+    Get the file of a memory-mapped array, or of the memory-mapped array it is a view of
+    :param arr: numpy array
+    :return: file path or None if the array is not memory-mapped
+    """
+    while arr is not None:
+        if isinstance(arr, np.memmap) and arr.filename is not None:
+            return arr.filename
+        arr = arr.base if isinstance(arr, np.ndarray) else None
+
+    return None
+
+
+def _create_memmap_next_to(filename: str, dtype: np.dtype, size: int) -> np.memmap:
+    """
+    Create a new memory-mapped .npy array in the folder of another memory-mapped file
+    :param filename: file path of the existing memory-mapped array
+    :param dtype: data type
+    :param size: number of values
+    :return: memory-mapped array (initialized to zeros)
+    """
+    fd, new_filename = tempfile.mkstemp(suffix='.npy', prefix='profile_', dir=os.path.dirname(filename))
+    os.close(fd)
+    return np.lib.format.open_memmap(new_filename, mode='w+', dtype=dtype, shape=(size,))
+
+
+def _copy_in_chunks(src: np.ndarray, dst: np.ndarray) -> None:
+    """
+    Copy an array into another of the same size by chunks,
+    so that copying between memory-mapped arrays does not load them into RAM at once
+    :param src: source array
+    :param dst: destination array
+    """
+    for a in range(0, len(src), MEMMAP_CHUNK_SIZE):
+        b = min(a + MEMMAP_CHUNK_SIZE, len(src))
+        dst[a:b] = src[a:b]
+
+
 class Profile:
     """
     Profile
@@ -93,6 +143,8 @@ class Profile:
         '_sparsity_threshold',
         '_dtype',
         '_initialized',
+        '_fingerprints',
+        '_columns',
     )
 
     def __init__(self,
@@ -121,6 +173,12 @@ class Profile:
 
         self._initialized: bool = False
 
+        # content hashes by time window, None when the profile changed (see get_fingerprint)
+        self._fingerprints: Union[Dict[Tuple[Union[int, None], Union[int, None]], str], None] = None
+
+        # columnar storage whose column is the dense array, if any (see profile_store.ProfileColumns)
+        self._columns: Union[ProfileColumns, None] = None
+
         if arr is not None:
             self.set(arr=arr)
 
@@ -129,9 +187,20 @@ class Profile:
         Clear the profile
         :return:
         """
+        self.leave_columns()
         self._sparse_array: Union[SparseArray, None] = None
         self._dense_array: Union[NumericVec, None] = None
         self._initialized: bool = False
+        self._fingerprints = None
+
+    def leave_columns(self) -> None:
+        """
+        Stop being a column of the columnar storage, this makes the storage outdated (see ProfileColumns.is_valid)
+        It is called before replacing the dense array, and when the profile object is replaced in its device
+        """
+        if self._columns is not None:
+            self._columns.invalidate()
+            self._columns = None
 
     def info(self):
         """
@@ -188,6 +257,7 @@ class Profile:
         """
         if self.sparse_array is not None:
             self.sparse_array.default_value = self.default_value
+        self._fingerprints = None
 
     @property
     def is_sparse(self) -> bool:
@@ -235,6 +305,7 @@ class Profile:
         :param default_value: default value
         :param map_data: map with the data
         """
+        self.leave_columns()
         self._is_sparse = True
 
         try:
@@ -250,6 +321,7 @@ class Profile:
         else:
             self._sparse_array.create_from_dict(default_value=default_value, size=size, map_data=map_data)
         self._initialized = True
+        self._fingerprints = None
 
     def create_dense(self, size: int, default_value: Numeric):
         """
@@ -257,10 +329,74 @@ class Profile:
         :param size: size
         :param default_value: default value
         """
+        self.leave_columns()
         self._is_sparse = False
         self._dense_array = np.full(size, default_value)
         self._sparse_array = None
         self._initialized = True
+        self._fingerprints = None
+
+    def set_dense_view(self, arr: NumericVec, columns: Union[ProfileColumns, None] = None) -> None:
+        """
+        Use an existing array as dense storage without copying nor analyzing it
+        This is used by the columnar profile store to make the profile a view of a matrix column
+        :param arr: array of the profile size
+        :param columns: columnar storage that owns arr, if any
+        """
+        self.leave_columns()
+        self._is_sparse = False
+        self._dense_array = arr
+        self._sparse_array = None
+        self._initialized = True
+        self._fingerprints = None
+        self._columns = columns
+
+    def get_values_dtype(self) -> np.dtype:
+        """
+        Get the numpy data type of the values (the one of toarray)
+        :return: numpy dtype
+        """
+        if self._is_sparse:
+            return np.asarray(self._sparse_array.default_value).dtype
+        elif self._dense_array is not None:
+            return self._dense_array.dtype
+        else:
+            return np.zeros(0).dtype
+
+    def write_values(self, arr: NumericVec) -> None:
+        """
+        Write the profile values into an existing array of the profile size,
+        the sparse profiles are written without creating a dense copy
+        :param arr: array (i.e. a memory-mapped array or a matrix column)
+        """
+        if self._is_sparse:
+            arr[:] = self._sparse_array.default_value
+            arr[self._sparse_array.get_indices()] = self._sparse_array.get_values()
+        else:
+            _copy_in_chunks(src=self._dense_array, dst=arr)
+
+    def set_memmap(self, filename: str) -> None:
+        """
+        Move the profile values to a memory-mapped file (.npy) and use it as dense storage
+        Only the pages of the time steps that are accessed are loaded into RAM.
+        The values are written directly into the file, without building a dense copy in RAM first
+        :param filename: file path
+        """
+        arr = np.lib.format.open_memmap(filename, mode='w+', dtype=self.get_values_dtype(), shape=(self.size(),))
+        self.write_values(arr)
+        arr.flush()
+        self.set_dense_view(arr)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        """
+        Is the dense storage a memory-mapped file (or a view of one)?
+        :return: bool
+        """
+        if self._is_sparse or self._dense_array is None:
+            return False
+
+        return _get_memmap_filename(self._dense_array) is not None
 
     @property
     def sparsity(self) -> float:
@@ -307,6 +443,8 @@ class Profile:
             if len(arr_mod) != self.size():
                 raise ValueError("The array must have the same size as the profile")
 
+        self.leave_columns()
+
         if len(arr_mod) > 0:
 
             # Count occurrences of each element in the array
@@ -348,6 +486,7 @@ class Profile:
             self._dense_array = arr_mod
 
         self._initialized = True
+        self._fingerprints = None
         return True
 
     def __eq__(self, other: "Profile") -> bool:
@@ -415,6 +554,8 @@ class Profile:
                 assert key < len(self._dense_array)
                 self._dense_array[key] = value
 
+            self._fingerprints = None
+
         else:
             raise TypeError("Key must be an integer")
 
@@ -447,16 +588,29 @@ class Profile:
     def resize(self, n: int):
         """
         Resize the profile
+        The memory-mapped profiles stay memory-mapped: the values are copied to a new file in the same folder
         :param n: new size
         """
+        self._fingerprints = None
         if isinstance(n, int):
             if self._initialized:
                 if self._is_sparse:
                     self._sparse_array.resize(n=n)
+                elif self.is_memory_mapped:
+                    # keep the values on disk: a new mapped file is created instead of loading them into RAM
+                    new_arr = _create_memmap_next_to(filename=_get_memmap_filename(self._dense_array),
+                                                     dtype=self._dense_array.dtype,
+                                                     size=n)
+                    m = min(n, len(self._dense_array))
+                    _copy_in_chunks(src=self._dense_array[:m], dst=new_arr[:m])
+                    new_arr.flush()
+                    self.leave_columns()
+                    self._dense_array = new_arr
                 else:
                     try:
                         self._dense_array.resize(n)
                     except ValueError:
+                        self.leave_columns()
                         new_arr = np.zeros(n, dtype=self._dense_array.dtype)
                         new_arr[:len(self._dense_array)] = self._dense_array
                         self._dense_array = new_arr  # this is to avoid ValueError when resizing a numpy array of Objects
@@ -469,11 +623,25 @@ class Profile:
     def resample(self, indices: IntVec):
         """
         Resample this profile in-place
+        The memory-mapped profiles stay memory-mapped: the values are copied to a new file in the same folder
         :param indices: new indices
         """
+        self._fingerprints = None
         if self._is_sparse:
             self._sparse_array.resample(indices=indices)
+        elif self.is_memory_mapped:
+            # keep the values on disk: a new mapped file is created instead of loading them into RAM
+            new_arr = _create_memmap_next_to(filename=_get_memmap_filename(self._dense_array),
+                                             dtype=self._dense_array.dtype,
+                                             size=len(indices))
+            for a in range(0, len(indices), MEMMAP_CHUNK_SIZE):
+                b = min(a + MEMMAP_CHUNK_SIZE, len(indices))
+                new_arr[a:b] = self._dense_array[indices[a:b]]
+            new_arr.flush()
+            self.leave_columns()
+            self._dense_array = new_arr
         else:
+            self.leave_columns()
             self._dense_array = self._dense_array[indices]
 
     def fill(self, value: Any):
@@ -483,23 +651,25 @@ class Profile:
         """
         check_type(dtype=self.dtype, value=value)
 
+        self.leave_columns()
         self.default_value = value
         self._is_sparse = True
         if self._sparse_array is None:
             self._sparse_array = SparseArray(data_type=self.dtype, default_value=value)
         self._sparse_array.fill(value)
         self._dense_array = None
+        self._fingerprints = None
 
     def scale(self, value: Union[float, int]):
         """
         Scale this profile with the same value
         :param value: any value
         """
+        self._fingerprints = None
         if self._is_sparse:
 
             # Scale the map
-            self._sparse_array._map = {key: val * value
-                                       for key, val in self._sparse_array.get_map().items()}
+            self._sparse_array.scale(value)
         else:
 
             # Scale the dense array
@@ -528,6 +698,28 @@ class Profile:
         else:
             return np.zeros(0)
 
+    def take(self, indices: IntVec) -> NumericVec:
+        """
+        Get the values at several positions in one go
+        :param indices: array of integer indices
+        :return: NumericVec of the size of indices
+        """
+        if self._is_sparse:
+            return self._sparse_array.take(indices)
+        else:
+            if self._dense_array is None:
+                return np.full(len(indices), self.default_value)
+            else:
+                return self._dense_array[indices]
+
+    def is_constant(self) -> bool:
+        """
+        Check if this profile is trivially constant (sparse without any stored value)
+        Note that a dense profile is never considered constant here, even if all its values are the same
+        :return: bool
+        """
+        return self._is_sparse and self._sparse_array is not None and self._sparse_array.nnz == 0
+
     def tolist(self) -> List[Union[int, float]]:
         """
         Get dense list representation
@@ -557,17 +749,41 @@ class Profile:
         :param data: array of data values
         """
         self._sparse_array.set_sparse_data_from_data(indptr=indptr, data=data)
+        self._fingerprints = None
 
     def fix_nan(self, default_value: float = 0.0):
         """
         Replace NaN values with default value in-place
         :param default_value: some value to replace the NaN with
         """
+        self._fingerprints = None
         if self.dtype == float:
             if not self._is_sparse:
                 if self._dense_array is not None:
                     np.nan_to_num(self._dense_array, nan=default_value)  # this is supposed to happen in-place
 
+    def get_fingerprint(self, t_from: Union[int, None] = None, t_to: Union[int, None] = None) -> str:
+        """
+        Content hash of the profile values, cached until the profile is modified through its methods.
+        Modifying the arrays returned by dense_array or toarray in-place is not tracked.
+        :param t_from: first time index of the window (None for the beginning)
+        :param t_to: time index after the last of the window (None for the end)
+        :return: hexadecimal digest
+        """
+        if self._fingerprints is None:
+            self._fingerprints = dict()
+
+        fp = self._fingerprints.get((t_from, t_to), None)
+
+        if fp is None:
+            if self._initialized:
+                fp = hash_arrays(str(self._dtype), self.toarray()[t_from:t_to])
+            else:
+                fp = hash_arrays(str(self._dtype), self.default_value)
+            self._fingerprints[(t_from, t_to)] = fp
+
+        return fp
+
     def copy(self):
         """
         Deep copy
@@ -587,4 +803,6 @@ class Profile:
         if self._dense_array is not None:
             new_prof._dense_array = self._dense_array.copy()
 
+        new_prof._initialized = self._initialized
+
         return new_prof
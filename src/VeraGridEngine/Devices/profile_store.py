@@ -0,0 +1,247 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import os
+from typing import List, Dict, Tuple, Union, TYPE_CHECKING
+import numpy as np
+
+from VeraGridEngine.basic_structures import NumericVec, DeviceList
+from VeraGridEngine.enumerations import DeviceType
+from VeraGridEngine.Devices.profile import Profile
+
+if TYPE_CHECKING:  # Only imports the below statements during type checking
+    from VeraGridEngine.Devices.types import ALL_DEV_TYPES
+
+# profile data types that can be stored in a numeric matrix
+COLUMNAR_PROFILE_TYPES = (bool, int, float)
+
+
+def _columns_copy() -> None:
+    """
+    Copies of a profile do not belong to the columnar storage (see ProfileColumns.__reduce__)
+    :return: None
+    """
+    return None
+
+
+class ProfileColumns:
+    """
+    (n_time, n_devices) matrix whose columns back the profiles of one property of a list of devices.
+    Each device profile holds a zero-copy view of its column, hence modifying the profile values
+    modifies the matrix and vice versa.
+    """
+
+    __slots__ = (
+        'profile_name',
+        'matrix',
+        'version',
+        '_source',
+        '_source_version',
+        '_devices',
+        '_views',
+    )
+
+    def __init__(self, devices: DeviceList, profile_name: str, dtype: type, nt: int,
+                 filename: Union[str, None] = None):
+        """
+        Constructor
+        :param devices: list of devices of the same type
+        :param profile_name: name of the profile attribute (i.e. P_prof)
+        :param dtype: profile data type
+        :param nt: number of time steps
+        :param filename: if provided, the matrix is memory-mapped to this .npy file
+        """
+        self.profile_name = profile_name
+
+        if filename is None:
+            # Fortran order, so that every column is contiguous in memory
+            self.matrix = np.empty((nt, len(devices)), dtype=dtype, order='F')
+        else:
+            # C order, so that a time window is a contiguous block of the file
+            # and only the pages of the simulated time steps are loaded into RAM
+            self.matrix = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=(nt, len(devices)))
+
+        # number of profiles that stopped being a column (see Profile.leave_columns)
+        self.version: int = 0
+
+        # list of devices and its version when the matrix was built,
+        # the list version changes when a device is added, removed or re-ordered
+        self._source: DeviceList = devices
+        self._source_version: int = devices.version
+
+        self._devices: List[ALL_DEV_TYPES] = list(devices)
+        self._views: List[NumericVec] = list()
+
+        for j, elm in enumerate(devices):
+            prof: Profile = getattr(elm, profile_name)
+            view = self.matrix[:, j]
+            prof.write_values(view)
+            prof.set_dense_view(view, columns=self)
+            self._views.append(view)
+
+        if isinstance(self.matrix, np.memmap):
+            self.matrix.flush()
+
+    def __reduce__(self):
+        """
+        The copies (copy, deepcopy, pickle) of the profiles do not take the columnar storage along
+        """
+        return _columns_copy, ()
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        """
+        Is the matrix a memory-mapped file?
+        :return: bool
+        """
+        return isinstance(self.matrix, np.memmap)
+
+    def invalidate(self) -> None:
+        """
+        A profile stopped being a column of the matrix
+        """
+        self.version += 1
+
+    def is_built_from(self, devices: List[ALL_DEV_TYPES]) -> bool:
+        """
+        Was the matrix built from this list of devices?
+        :param devices: list of devices
+        :return: bool
+        """
+        return devices is self._source
+
+    def is_valid(self, devices: List[ALL_DEV_TYPES]) -> bool:
+        """
+        Check that the matrix still represents the profiles of the given devices.
+        Adding, removing or re-ordering devices (see DeviceList.version), replacing a profile object,
+        or any profile operation that replaces the profile array (set, resize, resample, fill, ...)
+        detaches the column and invalidates the matrix.
+        This is a constant time check.
+        :param devices: list of devices
+        :return: bool
+        """
+        return devices is self._source and self._source.version == self._source_version and self.version == 0
+
+    def detach(self) -> None:
+        """
+        Give each profile its own copy of the values, so that the matrix can be released
+        Note that memory-mapped values are loaded into RAM
+        """
+        for elm, view in zip(self._devices, self._views):
+            prof: Profile = getattr(elm, self.profile_name)
+            if not prof.is_sparse and prof.dense_array is view:
+                prof.set_dense_view(view.copy())
+
+
+class ProfileStore:
+    """
+    Columnar profile storage: one matrix per device type and profile property
+    """
+
+    __slots__ = (
+        '_data',
+    )
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._data: Dict[Tuple[DeviceType, str], ProfileColumns] = dict()
+
+    def consolidate(self, devices: DeviceList, nt: int, min_dense_fraction: float = 0.5,
+                    folder: Union[str, None] = None) -> int:
+        """
+        Move the profiles of a list of devices into columnar matrices
+        Only the numeric properties where at least min_dense_fraction of the profiles are dense are moved,
+        because densifying mostly-sparse profiles would increase the memory usage instead of reducing it.
+        :param devices: list of devices of the same type, it must be the DeviceList of the grid,
+                        whose version tells when the matrices are outdated
+        :param nt: number of time steps
+        :param min_dense_fraction: minimum fraction of dense profiles to consolidate a property
+        :param folder: if provided, the matrices are memory-mapped to .npy files in this folder,
+                       the files are created with mode w+, so the folder must not be used by another store
+        :return: number of consolidated properties
+        """
+        if len(devices) == 0 or nt == 0 or not isinstance(devices, DeviceList):
+            # the lists built on demand (i.e. get_load_like_devices) cannot tell when they change
+            return 0
+
+        device_type = devices[0].device_type
+        n = 0
+        for prop, profile_name in devices[0].properties_with_profile.items():
+
+            prof0: Profile = getattr(devices[0], profile_name)
+            if prof0.dtype not in COLUMNAR_PROFILE_TYPES:
+                continue
+
+            n_dense = 0
+            for elm in devices:
+                prof: Profile = getattr(elm, profile_name)
+                if prof.size() != nt:
+                    # not all the profiles are initialized with the right size
+                    n_dense = -1
+                    break
+                if not prof.is_sparse:
+                    n_dense += 1
+
+            if n_dense >= 0 and n_dense >= min_dense_fraction * len(devices):
+                self.release(device_type=device_type, prop=prop)
+
+                if folder is None:
+                    filename = None
+                else:
+                    filename = os.path.join(folder, f"{device_type.name}_{prop}.npy")
+
+                self._data[(device_type, prop)] = ProfileColumns(devices=devices,
+                                                                 profile_name=profile_name,
+                                                                 dtype=prof0.dtype,
+                                                                 nt=nt,
+                                                                 filename=filename)
+                n += 1
+
+        return n
+
+    def get_matrix(self, devices: List[ALL_DEV_TYPES], prop: str) -> Union[np.ndarray, None]:
+        """
+        Get the matrix of profile values of a property
+        :param devices: list of devices of the same type
+        :param prop: property name (i.e. P)
+        :return: (n_time, n_devices) matrix view or None if it is not stored or is outdated
+        """
+        if len(devices) == 0:
+            return None
+
+        data = self._data.get((devices[0].device_type, prop), None)
+
+        if data is not None and data.is_built_from(devices):
+            if data.is_valid(devices):
+                return data.matrix
+            else:
+                # drop the outdated matrix, the profiles that were not replaced keep their values
+                self.release(device_type=devices[0].device_type, prop=prop)
+
+        return None
+
+    def release(self, device_type: DeviceType, prop: str) -> None:
+        """
+        Stop storing a property in columnar form
+        :param device_type: DeviceType
+        :param prop: property name
+        """
+        data = self._data.pop((device_type, prop), None)
+        if data is not None:
+            data.detach()
+
+    def clear(self) -> None:
+        """
+        Release all the matrices
+        """
+        for data in self._data.values():
+            data.detach()
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
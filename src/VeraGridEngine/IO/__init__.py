@@ -5,14 +5,21 @@
 
 from VeraGridEngine.IO.cim import *
 from VeraGridEngine.IO.veragrid import *
-from VeraGridEngine.IO.matpower import *
-from VeraGridEngine.IO.epc import *
-from VeraGridEngine.IO.dgs import *
-from VeraGridEngine.IO.others import *
-
-
-
-
-
-
-
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+# the parsers of the other formats are only imported when used (see lazy_attributes)
+IO_LAZY_ATTRIBUTES = {
+    **CIM_LAZY_ATTRIBUTES,
+    'parse_matpower_file': 'VeraGridEngine.IO.matpower.legacy.matpower_parser',
+    'get_matpower_case_data': 'VeraGridEngine.IO.matpower.legacy.matpower_parser',
+    'to_matpower': 'VeraGridEngine.IO.matpower.legacy.matpower_parser',
+    'PowerWorldParser': 'VeraGridEngine.IO.epc.epc_parser',
+    'dgs_to_circuit': 'VeraGridEngine.IO.dgs.dgs_parser',
+    'load_dpx': 'VeraGridEngine.IO.others.dpx_parser',
+    'load_iPA': 'VeraGridEngine.IO.others.ipa_parser',
+    'plx_to_veragrid': 'VeraGridEngine.IO.others.plx_parser',
+    'pypsa2veragrid': 'VeraGridEngine.IO.others.pypsa_parser',
+    'rte2veragrid': 'VeraGridEngine.IO.others.rte_parser',
+}
+
+__getattr__ = lazy_attributes(__name__, IO_LAZY_ATTRIBUTES)
@@ -4,3 +4,8 @@
 # SPDX-License-Identifier: MPL-2.0
 from VeraGridEngine.IO.cim.cgmes import *
 from VeraGridEngine.IO.cim.cim16 import *
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+CIM_LAZY_ATTRIBUTES = {**CGMES_LAZY_ATTRIBUTES, **CIM16_LAZY_ATTRIBUTES}
+
+__getattr__ = lazy_attributes(__name__, CIM_LAZY_ATTRIBUTES)
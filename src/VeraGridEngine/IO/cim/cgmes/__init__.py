@@ -1,8 +1,15 @@
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
-# file, You can obtain one at https://mozilla.org/MPL/2.0/.  
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 
-from VeraGridEngine.IO.cim.cgmes.cgmes_data_parser import CgmesDataParser
-from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit
 from VeraGridEngine.IO.cim.cgmes.cgmes_enums import CgmesProfileType
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+# the CGMES classes are only imported when used (see lazy_attributes)
+CGMES_LAZY_ATTRIBUTES = {
+    'CgmesDataParser': 'VeraGridEngine.IO.cim.cgmes.cgmes_data_parser',
+    'CgmesCircuit': 'VeraGridEngine.IO.cim.cgmes.cgmes_circuit',
+}
+
+__getattr__ = lazy_attributes(__name__, CGMES_LAZY_ATTRIBUTES)
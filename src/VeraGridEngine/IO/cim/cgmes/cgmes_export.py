@@ -5,9 +5,6 @@
 
 import zipfile
 from io import BytesIO
-from rdflib import OWL
-from rdflib.graph import Graph
-from rdflib.namespace import RDF, RDFS
 from typing import List
 
 import json
@@ -58,6 +55,11 @@ class CimExporter:
 
         current_directory = os.path.dirname(__file__)
 
+        # rdflib takes long to import, only do it when exporting
+        from rdflib import OWL
+        from rdflib.graph import Graph
+        from rdflib.namespace import RDF, RDFS
+
         rdf_serialization = Graph()
 
         if cgmes_circuit.cgmes_version == CGMESVersions.v2_4_15:
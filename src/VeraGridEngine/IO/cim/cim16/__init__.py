@@ -3,4 +3,12 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 
-from VeraGridEngine.IO.cim.cim16.cim_parser import CIMImport, CIMExport
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+# the CIM parser is only imported when used (see lazy_attributes)
+CIM16_LAZY_ATTRIBUTES = {
+    'CIMImport': 'VeraGridEngine.IO.cim.cim16.cim_parser',
+    'CIMExport': 'VeraGridEngine.IO.cim.cim16.cim_parser',
+}
+
+__getattr__ = lazy_attributes(__name__, CIM16_LAZY_ATTRIBUTES)
@@ -10,39 +10,16 @@ from collections.abc import Callable
 from datetime import datetime
 from typing import Union, List, Any, Dict, TYPE_CHECKING
 
-from VeraGridEngine.IO.cim.cgmes.cgmes_create_instances import create_cgmes_headers
-from VeraGridEngine.IO.cim.cgmes.veragrid_to_cgmes import veragrid_to_cgmes
-from VeraGridEngine.IO.cim.cgmes.cgmes_export import CimExporter
-from VeraGridEngine.IO.cim.cgmes.cgmes_data_parser import CgmesDataParser
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.data_logger import DataLogger
 from VeraGridEngine.IO.veragrid.json_parser import save_json_file_v3
 from VeraGridEngine.IO.veragrid.excel_interface import save_excel, load_from_xls, interpret_excel_v3, interprete_excel_v2
 from VeraGridEngine.IO.veragrid.pack_unpack import gather_model_as_data_frames, parse_veragrid_data, gather_model_as_jsons
-from VeraGridEngine.IO.matpower.legacy.matpower_parser import interpret_data_v1
-from VeraGridEngine.IO.matpower.matpower_circuit import MatpowerCircuit
-from VeraGridEngine.IO.matpower.matpower_to_veragrid import matpower_to_veragrid
-from VeraGridEngine.IO.dgs.dgs_parser import dgs_to_circuit
-from VeraGridEngine.IO.others.dpx_parser import load_dpx
-from VeraGridEngine.IO.others.ipa_parser import load_iPA
 from VeraGridEngine.IO.veragrid.json_parser import parse_json, parse_json_data_v2, parse_json_data_v3
-from VeraGridEngine.IO.raw.raw_parser_writer import read_raw, write_raw
-from VeraGridEngine.IO.raw.raw_to_veragrid import psse_to_veragrid
-from VeraGridEngine.IO.raw.veragrid_to_raw import veragrid_to_raw
-from VeraGridEngine.IO.epc.epc_parser import PowerWorldParser
-from VeraGridEngine.IO.cim.cim16.cim_parser import CIMImport, CIMExport
-from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit, is_valid_cgmes
-from VeraGridEngine.IO.cim.cgmes.cgmes_to_veragrid import cgmes_to_veragrid
 from VeraGridEngine.IO.veragrid.zip_interface import save_veragrid_data_to_zip, get_frames_from_zip
 from VeraGridEngine.IO.veragrid.sqlite_interface import save_data_frames_to_sqlite, open_data_frames_from_sqlite
 from VeraGridEngine.IO.veragrid.h5_interface import save_h5, open_h5
-from VeraGridEngine.IO.raw.rawx_parser_writer import parse_rawx, write_rawx
-from VeraGridEngine.IO.others.pypsa_parser import parse_pypsa_netcdf, parse_pypsa_hdf5
-from VeraGridEngine.IO.others.pandapower_parser import Panda2VeraGrid
 from VeraGridEngine.IO.cim.cgmes.cgmes_enums import CgmesProfileType
-from VeraGridEngine.IO.ucte.devices.ucte_circuit import UcteCircuit
-from VeraGridEngine.IO.ucte.ucte_to_veragrid import convert_ucte_to_veragrid
-from VeraGridEngine.IO.others.rte_parser import rte2veragrid
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Simulations.results_template import DriverToSave
@@ -52,6 +29,7 @@ from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_a
 
 if TYPE_CHECKING:
     from VeraGridEngine.Simulations.types import DRIVER_OBJECTS
+    from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit
 
 
 class FileSavingOptions:
@@ -226,6 +204,10 @@ class FileOpen:
                     looks_like_ucte = False
 
             if looks_like_cgmes:
+                from VeraGridEngine.IO.cim.cgmes.cgmes_data_parser import CgmesDataParser
+                from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit
+                from VeraGridEngine.IO.cim.cgmes.cgmes_to_veragrid import cgmes_to_veragrid
+
                 data_parser = CgmesDataParser(text_func=text_func, progress_func=progress_func,
                                               logger=self.cgmes_logger)
                 data_parser.load_files(files=self.file_name)
@@ -238,6 +220,8 @@ class FileOpen:
                                                  logger=self.cgmes_logger)
 
             elif looks_like_ucte:
+                from VeraGridEngine.IO.ucte.devices.ucte_circuit import UcteCircuit
+                from VeraGridEngine.IO.ucte.ucte_to_veragrid import convert_ucte_to_veragrid
 
                 ucte_grid = UcteCircuit()
                 ucte_grid.parse_file(files=self.file_name, logger=self.logger)
@@ -259,6 +243,7 @@ class FileOpen:
 
                     # Pass the table-like data dictionary to objects in this circuit
                     if 'version' not in data_dictionary:
+                        from VeraGridEngine.IO.matpower.legacy.matpower_parser import interpret_data_v1
                         interpret_data_v1(self.circuit, data_dictionary, self.logger)
 
                     elif data_dictionary['version'] == 2.0:
@@ -330,18 +315,22 @@ class FileOpen:
                         return None
 
                 elif file_extension.lower() == '.dgs':
+                    from VeraGridEngine.IO.dgs.dgs_parser import dgs_to_circuit
                     self.circuit = dgs_to_circuit(self.file_name)
 
                 elif file_extension.lower() == '.gch5':
                     self.circuit = open_h5(self.file_name, text_func=text_func, prog_func=progress_func)
 
                 elif file_extension.lower() == '.m':
+                    from VeraGridEngine.IO.matpower.matpower_circuit import MatpowerCircuit
+                    from VeraGridEngine.IO.matpower.matpower_to_veragrid import matpower_to_veragrid
                     # self.circuit, log = parse_matpower_file(self.file_name)
                     m_grid = MatpowerCircuit()
                     m_grid.read_file(file_name=self.file_name)
                     self.circuit = matpower_to_veragrid(m_grid, self.logger)
 
                 elif file_extension.lower() == '.dpx':
+                    from VeraGridEngine.IO.others.dpx_parser import load_dpx
                     self.circuit, log = load_dpx(self.file_name)
                     self.logger += log
 
@@ -353,6 +342,7 @@ class FileOpen:
 
                         if isinstance(data, dict):
                             if 'Red' in data.keys():
+                                from VeraGridEngine.IO.others.ipa_parser import load_iPA
                                 self.circuit = load_iPA(self.file_name)
                             elif sum([x in data.keys() for x in ['type', 'version']]) == 2:
                                 version = int(float(data['version']))
@@ -382,6 +372,8 @@ class FileOpen:
                         self.circuit = parse_json_data_v3(data, self.logger)
 
                 elif file_extension.lower() == '.raw':
+                    from VeraGridEngine.IO.raw.raw_parser_writer import read_raw
+                    from VeraGridEngine.IO.raw.raw_to_veragrid import psse_to_veragrid
                     pss_grid = read_raw(self.file_name,
                                         text_func=text_func,
                                         progress_func=progress_func,
@@ -393,6 +385,8 @@ class FileOpen:
                     )
 
                 elif file_extension.lower() == '.rawx':
+                    from VeraGridEngine.IO.raw.rawx_parser_writer import parse_rawx
+                    from VeraGridEngine.IO.raw.raw_to_veragrid import psse_to_veragrid
                     pss_grid = parse_rawx(self.file_name, logger=self.logger)
                     self.circuit = psse_to_veragrid(
                         psse_circuit=pss_grid,
@@ -401,11 +395,16 @@ class FileOpen:
                     )
 
                 elif file_extension.lower() == '.epc':
+                    from VeraGridEngine.IO.epc.epc_parser import PowerWorldParser
                     parser = PowerWorldParser(self.file_name)
                     self.circuit = parser.circuit
                     self.logger += parser.logger
 
                 elif file_extension.lower() in ['.xml', '.zip']:
+                    from VeraGridEngine.IO.cim.cgmes.cgmes_data_parser import CgmesDataParser
+                    from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit, is_valid_cgmes
+                    from VeraGridEngine.IO.cim.cgmes.cgmes_to_veragrid import cgmes_to_veragrid
+
                     data_parser = CgmesDataParser(
                         text_func=text_func,
                         progress_func=progress_func,
@@ -433,25 +432,32 @@ class FileOpen:
 
                     else:
                         # try RTE format
+                        from VeraGridEngine.IO.others.rte_parser import rte2veragrid
                         circuit, is_valid_rte = rte2veragrid(self.file_name, self.logger)
                         if is_valid_rte:
                             self.circuit = circuit
                         else:
                             # try CIM
+                            from VeraGridEngine.IO.cim.cim16.cim_parser import CIMImport
                             parser = CIMImport(text_func=text_func, progress_func=progress_func)
                             self.circuit = parser.load_cim_file(self.file_name)
                             self.logger += parser.logger
 
                 elif file_extension.lower() == '.hdf5':
+                    from VeraGridEngine.IO.others.pypsa_parser import parse_pypsa_hdf5
                     self.circuit = parse_pypsa_hdf5(self.file_name, self.logger)
 
                 elif file_extension.lower() == '.nc':
+                    from VeraGridEngine.IO.others.pypsa_parser import parse_pypsa_netcdf
                     self.circuit = parse_pypsa_netcdf(self.file_name, self.logger)
 
                 elif file_extension.lower() == '.p':
+                    from VeraGridEngine.IO.others.pandapower_parser import Panda2VeraGrid
                     self.circuit = Panda2VeraGrid(self.file_name, self.logger).get_multicircuit()
 
                 elif file_extension.lower() == '.uct' or file_extension.lower() == '.ucte':
+                    from VeraGridEngine.IO.ucte.devices.ucte_circuit import UcteCircuit
+                    from VeraGridEngine.IO.ucte.ucte_to_veragrid import convert_ucte_to_veragrid
                     ucte_grid = UcteCircuit()
                     ucte_grid.parse_file(files=[self.file_name], logger=self.logger)
                     self.circuit = convert_ucte_to_veragrid(ucte_grid=ucte_grid, logger=self.logger)
@@ -624,6 +630,7 @@ class FileSave:
         Save the circuit information in CIM format
         :return: logger with information
         """
+        from VeraGridEngine.IO.cim.cim16.cim_parser import CIMExport
 
         cim = CIMExport(self.circuit)
         cim.save(file_name=self.file_name)
@@ -635,6 +642,11 @@ class FileSave:
         Save the circuit information in CGMES format
         :return: logger with information
         """
+        from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit
+        from VeraGridEngine.IO.cim.cgmes.cgmes_data_parser import CgmesDataParser
+        from VeraGridEngine.IO.cim.cgmes.veragrid_to_cgmes import veragrid_to_cgmes
+        from VeraGridEngine.IO.cim.cgmes.cgmes_create_instances import create_cgmes_headers
+        from VeraGridEngine.IO.cim.cgmes.cgmes_export import CimExporter
         logger = Logger()
         if self.options.cgmes_boundary_set == "":
             logger.add_error(msg="Missing Boundary set path.")
@@ -707,6 +719,8 @@ class FileSave:
         Save the circuit information in json format
         :return:logger with information
         """
+        from VeraGridEngine.IO.raw.veragrid_to_raw import veragrid_to_raw
+        from VeraGridEngine.IO.raw.raw_parser_writer import write_raw
         logger = Logger()
         raw_circuit = veragrid_to_raw(self.circuit, logger=logger)
         logger += write_raw(self.file_name, raw_circuit, version=int(self.options.raw_version))
@@ -717,6 +731,8 @@ class FileSave:
         Save the circuit information in json format
         :return:logger with information
         """
+        from VeraGridEngine.IO.raw.veragrid_to_raw import veragrid_to_raw
+        from VeraGridEngine.IO.raw.rawx_parser_writer import write_rawx
         logger = Logger()
         raw_circuit = veragrid_to_raw(self.circuit, logger=logger)
         logger += write_rawx(self.file_name, raw_circuit)
@@ -7,7 +7,6 @@ import numpy as np
 from datetime import datetime
 from collections.abc import Mapping
 from typing import Dict
-import pyproj
 from VeraGridEngine.Devices.Injections.battery import Battery
 from VeraGridEngine.Devices.Injections.shunt import Shunt
 from VeraGridEngine.Devices.Aggregation.branch_group import BranchGroup
@@ -54,6 +53,8 @@ class PyPSAParser:
         # geo_crs: EPSG:4326  # general geographic projection, not used for metric measures. "EPSG:4326" is the standard used by OSM and google maps
         # distance_crs: EPSG:3857  # projection for distance measurements only. Possible recommended values are "EPSG:3857" (used by OSM and Google Maps)
         # area_crs: ESRI:54009  # projection for area measurements only. Possible recommended values are Global Mollweide "ESRI:54009"
+        import pyproj  # pyproj takes long to import, only do it when parsing
+
         self.to_latlon_converter = pyproj.Transformer.from_crs(self.srid, 4326, always_xy=False)
         self.to_xy_converter = pyproj.Transformer.from_crs(self.srid, 3857, always_xy=False)
 
@@ -15,12 +15,13 @@ from VeraGridEngine.IO.veragrid.pack_unpack import gather_model_as_jsons
 from VeraGridEngine.IO.file_system import get_create_veragrid_folder
 from VeraGridEngine.Simulations.driver_handler import create_driver
 from VeraGridEngine.Simulations.types import DRIVER_OBJECTS, RESULTS_OBJECTS
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 try:
-    import requests
+    requests = lazy_import('requests')
 
     REQUESTS_AVAILABLE = True
-except AttributeError as e:
+except (ModuleNotFoundError, AttributeError) as e:
     print(f"VeraGridEngine/IO/veragrid/remote.py: Error with requests -> {e}")
     REQUESTS_AVAILABLE = False
 
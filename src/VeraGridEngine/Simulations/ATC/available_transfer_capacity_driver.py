@@ -21,7 +21,7 @@ if TYPE_CHECKING:
     from VeraGridEngine.Simulations import ClusteringResults
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def get_proportional_deltas_sensed(P, idx, dP=1.0):
     """
 
@@ -64,7 +64,7 @@ def get_proportional_deltas_sensed(P, idx, dP=1.0):
     return deltaP
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def scale_proportional_sensed(P, idx1, idx2, dT=1.0):
     """
 
@@ -83,7 +83,7 @@ def scale_proportional_sensed(P, idx1, idx2, dT=1.0):
     return P + dP
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def compute_dP(P0: Vec,
                Pgen: Vec,
                P_installed: Vec,
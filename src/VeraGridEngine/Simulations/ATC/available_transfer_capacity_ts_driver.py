@@ -9,7 +9,7 @@ import numpy as np
 from typing import Union, List
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
-from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, compile_numerical_circuit_ts
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_options import LinearAnalysisOptions
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_ts_driver import LinearAnalysisTimeSeriesDriver
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis import LinearAnalysis
@@ -268,11 +268,17 @@ class AvailableTransferCapacityTimeSeriesDriver(TimeSeriesDriverTemplate):
         # declare the results
         self.results.clear()
 
+        # compile the time series once, then patch the circuit at every step
+        nc_ts = compile_numerical_circuit_ts(circuit=self.grid, time_indices=self.time_indices, logger=self.logger)
+
         for it, t in enumerate(self.time_indices):
 
             self.report_text('Available transfer capacity at ' + str(self.grid.time_profile[t]))
 
-            nc = compile_numerical_circuit_at(circuit=self.grid, t_idx=t)
+            if it == 0:
+                nc = nc_ts.get_at(t)
+            else:
+                nc_ts.update(nc=nc, t_idx=t)
 
             linear_analysis = LinearAnalysis(
                 nc=nc,
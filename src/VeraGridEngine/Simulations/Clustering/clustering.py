@@ -7,8 +7,6 @@ import os
 import numpy as np
 import time
 from typing import List, Tuple
-from sklearn.cluster import KMeans
-from sklearn.cluster import SpectralClustering
 from VeraGridEngine.basic_structures import IntVec, Vec, Mat
 
 
@@ -21,6 +19,8 @@ def kmeans_sampling(x_input: Mat, n_points: int = 10) -> Tuple[IntVec, Vec, IntV
              deviation of the closest representatives,
              array signifying to which cluster does each simulation belong
     """
+    from sklearn.cluster import KMeans  # sklearn takes long to import, only do it when clustering
+
     os.environ['OPENBLAS_NUM_THREADS'] = '12'
 
     # # declare the model
@@ -70,6 +70,7 @@ def kmeans_approximate_sampling(x_input: Mat, n_points: int = 10) -> Tuple[IntVe
     :param n_points: number of clusters
     :return: indices of the closest to the cluster centers, deviation of the closest representatives
     """
+    from sklearn.cluster import KMeans  # sklearn takes long to import, only do it when clustering
 
     # declare the model
     model = KMeans(n_clusters=n_points, random_state=0, n_init=10)
@@ -113,6 +114,7 @@ def spectral_approximate_sampling(x_input: Mat, n_points: int = 10) -> Tuple[Int
     :param n_points: number of clusters
     :return: indices of the closest to the cluster centers, deviation of the closest representatives
     """
+    from sklearn.cluster import SpectralClustering  # sklearn takes long to import, only do it when clustering
 
     # declare the model
     model = SpectralClustering(n_clusters=n_points)
@@ -8,7 +8,7 @@ import numpy as np
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
 from VeraGridEngine.Simulations.ContingencyAnalysis.contingency_analysis_results import ContingencyAnalysisResults
-from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc
+from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc, IslandPool
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions, SolverType
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis import LinearAnalysis, LinearMultiContingencies
 from VeraGridEngine.Simulations.ContingencyAnalysis.contingency_analysis_options import ContingencyAnalysisOptions
@@ -85,62 +85,64 @@ def nonlinear_contingency_analysis(grid: MultiCircuit,
 
     available_power = nc.generator_data.get_injections_per_bus().real
 
-    # for each contingency group
-    for ic, contingency_group in enumerate(linear_multiple_contingencies.contingency_groups_used):
-
-        # get the group's contingencies
-        contingencies = linear_multiple_contingencies.contingency_group_dict[contingency_group.idtag]
-
-        # set the status
-        nc.set_con_or_ra_status(contingencies)
-
-        # report progress
-        if t_idx is None and calling_class is not None:
-            calling_class.report_text(f'Contingency group: {contingency_group.name}')
-            calling_class.report_progress2(ic, len(linear_multiple_contingencies.contingency_groups_used) * 100)
-
-        # run
-        pf_res = multi_island_pf_nc(nc=nc,
-                                    options=pf_opts,
-                                    V_guess=pf_res_0.voltage,
-                                    logger=logger)
-
-        results.Sf[ic, :] = pf_res.Sf
-        results.Sbus[ic, :] = pf_res.Sbus
-        results.loading[ic, :] = pf_res.loading
-        results.voltage[ic, :] = pf_res.voltage
-        multi_contingency = linear_multiple_contingencies.multi_contingencies[ic] if options.use_srap else None
-
-        results.report.analyze(t=t_idx,
-                               t_prob=t_prob,
-                               mon_idx=mon_idx,
-                               nc=nc,
-                               base_flow=np.abs(pf_res_0.Sf),
-                               base_loading=np.abs(pf_res_0.loading),
-                               contingency_flows=np.abs(pf_res.Sf),
-                               contingency_loadings=np.abs(pf_res.loading),
-                               contingency_idx=ic,
-                               contingency_group=contingency_group,
-                               using_srap=options.use_srap,
-                               srap_ratings=nc.passive_branch_data.protection_rates,
-                               srap_max_power=options.srap_max_power,
-                               srap_deadband=options.srap_deadband,
-                               contingency_deadband=options.contingency_deadband,
-                               multi_contingency=multi_contingency,
-                               PTDF=PTDF,
-                               available_power=available_power,
-                               srap_used_power=results.srap_used_power,
-                               F=F,
-                               T=T,
-                               bus_area_indices=bus_area_indices,
-                               area_names=area_names,
-                               top_n=options.srap_top_n)
-
-        # set the status
-        nc.set_con_or_ra_status(contingencies, revert=True)
-
-        if calling_class is not None:
-            if calling_class.is_cancel():
-                return results
+    # the island workers (if any) are started once for all the contingencies
+    with IslandPool(options=pf_opts):
+        # for each contingency group
+        for ic, contingency_group in enumerate(linear_multiple_contingencies.contingency_groups_used):
+
+            # get the group's contingencies
+            contingencies = linear_multiple_contingencies.contingency_group_dict[contingency_group.idtag]
+
+            # set the status
+            nc.set_con_or_ra_status(contingencies)
+
+            # report progress
+            if t_idx is None and calling_class is not None:
+                calling_class.report_text(f'Contingency group: {contingency_group.name}')
+                calling_class.report_progress2(ic, len(linear_multiple_contingencies.contingency_groups_used) * 100)
+
+            # run
+            pf_res = multi_island_pf_nc(nc=nc,
+                                        options=pf_opts,
+                                        V_guess=pf_res_0.voltage,
+                                        logger=logger)
+
+            results.Sf[ic, :] = pf_res.Sf
+            results.Sbus[ic, :] = pf_res.Sbus
+            results.loading[ic, :] = pf_res.loading
+            results.voltage[ic, :] = pf_res.voltage
+            multi_contingency = linear_multiple_contingencies.multi_contingencies[ic] if options.use_srap else None
+
+            results.report.analyze(t=t_idx,
+                                   t_prob=t_prob,
+                                   mon_idx=mon_idx,
+                                   nc=nc,
+                                   base_flow=np.abs(pf_res_0.Sf),
+                                   base_loading=np.abs(pf_res_0.loading),
+                                   contingency_flows=np.abs(pf_res.Sf),
+                                   contingency_loadings=np.abs(pf_res.loading),
+                                   contingency_idx=ic,
+                                   contingency_group=contingency_group,
+                                   using_srap=options.use_srap,
+                                   srap_ratings=nc.passive_branch_data.protection_rates,
+                                   srap_max_power=options.srap_max_power,
+                                   srap_deadband=options.srap_deadband,
+                                   contingency_deadband=options.contingency_deadband,
+                                   multi_contingency=multi_contingency,
+                                   PTDF=PTDF,
+                                   available_power=available_power,
+                                   srap_used_power=results.srap_used_power,
+                                   F=F,
+                                   T=T,
+                                   bus_area_indices=bus_area_indices,
+                                   area_names=area_names,
+                                   top_n=options.srap_top_n)
+
+            # set the status
+            nc.set_con_or_ra_status(contingencies, revert=True)
+
+            if calling_class is not None:
+                if calling_class.is_cancel():
+                    return results
 
     return results
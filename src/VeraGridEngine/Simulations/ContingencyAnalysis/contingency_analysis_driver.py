@@ -8,7 +8,6 @@ from __future__ import annotations
 import numpy as np
 from typing import Union, List
 
-from VeraGridEngine.Compilers.circuit_to_gslv import gslv_contingencies
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.enumerations import EngineType, ContingencyMethod, SimulationTypes
 from VeraGridEngine.Simulations.ContingencyAnalysis.contingency_analysis_results import ContingencyAnalysisResults
@@ -22,10 +21,6 @@ from VeraGridEngine.Simulations.ContingencyAnalysis.Methods.linear_contingency_a
 from VeraGridEngine.Simulations.ContingencyAnalysis.Methods.helm_contingency_analysis import helm_contingency_analysis
 from VeraGridEngine.Simulations.ContingencyAnalysis.Methods.optimal_linear_contingency_analysis import \
     optimal_linear_contingency_analysis
-from VeraGridEngine.Compilers.circuit_to_bentayga import BENTAYGA_AVAILABLE
-from VeraGridEngine.Compilers.circuit_to_newton_pa import (NEWTON_PA_AVAILABLE, newton_pa_contingencies,
-                                                           translate_newton_pa_contingencies)
-from VeraGridEngine.Compilers.circuit_to_pgm import PGM_AVAILABLE
 
 
 class ContingencyAnalysisDriver(DriverTemplate):
@@ -96,17 +91,24 @@ class ContingencyAnalysisDriver(DriverTemplate):
         :param t_prob: probability of te time
         :return: ContingencyAnalysisResults
         """
-        if self.engine == EngineType.NewtonPA and not NEWTON_PA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Tried to use Newton, but failed back to VeraGrid')
-
-        if self.engine == EngineType.Bentayga and not BENTAYGA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Tried to use Bentayga, but failed back to VeraGrid')
-
-        if self.engine == EngineType.PGM and not PGM_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Tried to use PGM, but failed back to VeraGrid')
+        if self.engine == EngineType.NewtonPA:
+            # the third party engines are only imported when selected
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import NEWTON_PA_AVAILABLE
+            if not NEWTON_PA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Tried to use Newton, but failed back to VeraGrid')
+
+        if self.engine == EngineType.Bentayga:
+            from VeraGridEngine.Compilers.circuit_to_bentayga import BENTAYGA_AVAILABLE
+            if not BENTAYGA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Tried to use Bentayga, but failed back to VeraGrid')
+
+        if self.engine == EngineType.PGM:
+            from VeraGridEngine.Compilers.circuit_to_pgm import PGM_AVAILABLE
+            if not PGM_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Tried to use PGM, but failed back to VeraGrid')
 
         if self.engine == EngineType.VeraGrid:
 
@@ -155,6 +157,8 @@ class ContingencyAnalysisDriver(DriverTemplate):
                 raise Exception(f'Unknown contingency engine {self.options.contingency_method}')
 
         elif self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import (newton_pa_contingencies,
+                                                                       translate_newton_pa_contingencies)
 
             self.report_text("Running contingencies in newton...")
             con_res = newton_pa_contingencies(circuit=self.grid,
@@ -166,6 +170,7 @@ class ContingencyAnalysisDriver(DriverTemplate):
                                                              con_res=con_res)
 
         elif self.engine == EngineType.GSLV:
+            from VeraGridEngine.Compilers.circuit_to_gslv import gslv_contingencies
 
             self.report_text("Running contingencies in gslv...")
             con_res = gslv_contingencies(circuit=self.grid,
@@ -18,8 +18,6 @@ from VeraGridEngine.Simulations.ContingencyAnalysis.contingency_analysis_ts_resu
 from VeraGridEngine.enumerations import SimulationTypes
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
 from VeraGridEngine.Simulations.Clustering.clustering_results import ClusteringResults
-from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_contingencies, translate_contingency_report
-from VeraGridEngine.Compilers.circuit_to_gslv import (gslv_contingencies)
 from VeraGridEngine.Utils.NumericalMethods.weldorf_online_stddev import WeldorfOnlineStdDevMat
 
 
@@ -166,6 +164,7 @@ class ContingencyAnalysisTimeSeriesDriver(TimeSeriesDriverTemplate):
         Run with Newton Power Analytics
         :return:
         """
+        from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_contingencies, translate_contingency_report
         res = newton_pa_contingencies(circuit=self.grid,
                                       con_opt=self.options,
                                       time_series=True,
@@ -198,6 +197,7 @@ class ContingencyAnalysisTimeSeriesDriver(TimeSeriesDriverTemplate):
         Run with Newton Power Analytics
         :return:
         """
+        from VeraGridEngine.Compilers.circuit_to_gslv import gslv_contingencies
         res = gslv_contingencies(circuit=self.grid,
                                  con_opt=self.options,
                                  time_series=True,
@@ -2,6 +2,8 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.  
 # SPDX-License-Identifier: MPL-2.0
+import threading
+from typing import Tuple, Dict
 from numba import jit
 from numpy import float64, int32
 import numpy as np
@@ -11,9 +13,10 @@ from VeraGridEngine.Simulations.Derivatives.csc_derivatives import dSbus_dV_numb
 from VeraGridEngine.basic_structures import IntVec, CxVec
 from VeraGridEngine.Utils.NumericalMethods.common import make_lookup
 from VeraGridEngine.Utils.Sparse.csc2 import CSC
+from VeraGridEngine.Utils.hashing import hash_arrays
 
 
-@jit(nopython=True, cache=True)
+@jit(nopython=True, nogil=True, cache=True)
 def create_J_csr(nbus, dS_dVm_x, dS_dVa_x, Yp, Yj, pvpq, pq, Jx, Jj, Jp):  # pragma: no cover
     """
     Calculates Jacobian in CSR format.
@@ -165,7 +168,7 @@ def AC_jacobian_csr(Ybus: csr_matrix, V: CxVec, pvpq: IntVec, pq: IntVec) -> csc
     return csr_matrix((Jx, Jj, Jp), shape=(nj, nj)).tocsc()
 
 
-@jit(nopython=True)
+@jit(nopython=True, nogil=True, cache=True)
 def create_J_csc(nbus, Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec, pvpq, pq) -> CSC:
     """
     Calculates Jacobian in CSC format.
@@ -283,36 +286,28 @@ def AC_jacobian(Ybus: csc_matrix, V: CxVec, pvpq: IntVec, pq: IntVec) -> CSC:
     return J
 
 
-@jit(nopython=True)
-def create_J_vc_csc(nbus: int, Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec,
-                    idx_dtheta: IntVec, idx_dVm: IntVec, idx_dP: IntVec, idx_dQ: IntVec) -> CSC:
+@jit(nopython=True, nogil=True, cache=True)
+def create_J_vc_pattern(nbus: int, Yp: IntVec, Yi: IntVec,
+                        idx_dtheta: IntVec, idx_dVm: IntVec, idx_dP: IntVec, idx_dQ: IntVec) -> Tuple[CSC, IntVec]:
     """
-    Calculates Jacobian in CSC format.
+    Calculates the structure of the Jacobian computed by create_J_vc_csc.
+    The structure only depends on the structure of Ybus and on the indices, so it can be
+    computed once and then filled with fill_J_vc_data for every new voltage.
 
-    J has the shape
-
-              idx_dtheta      idx_dVm
-    idx_dP  | dP_dVa        | dP_dVm |
-    idx_dQ  | dQ_dVa        | dQ_dVm |
-
-    :param nbus:
-    :param Yx:
-    :param Yp:
-    :param Yi:
-    :param V:
+    :param nbus: number of buses
+    :param Yp: Ybus indptr
+    :param Yi: Ybus indices
     :param idx_dtheta: pv, pq, p, pqv
     :param idx_dVm: pq, p
     :param idx_dP: pv, pq, p, pqv
     :param idx_dQ: pq, pqv
-    :return: Jacobina matrix
+    :return: Jacobian with the structure set (the data is not initialized),
+             position in the Ybus data of the derivative that goes into every Jacobian entry
     """
-
-    # create Jacobian from fast calc of dS_dV
-    dS_dVm_x, dS_dVa_x = dSbus_dV_numba_sparse_csc(Yx, Yp, Yi, V, np.abs(V))
-
     nj = len(idx_dtheta) + len(idx_dVm)
-    nnz_estimate = 5 * len(dS_dVm_x)
+    nnz_estimate = 4 * len(Yi)
     J = CSC(nj, nj, nnz_estimate, False)
+    src = np.empty(nnz_estimate, dtype=np.int32)
 
     # Note: The row and column pointer of dVm and dVa are the same as the one from Ybus
     lookup_dP = make_lookup(nbus, idx_dP)
@@ -326,63 +321,287 @@ def create_J_vc_csc(nbus: int, Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec,
     p = 0
     J.indptr[p] = nnz
 
-    # J1 and J3 -----------------------------------------------------------------------------------------
-    for j in idx_dtheta:  # columns
+    # the columns of J1 and J3 are the idx_dtheta, the columns of J2 and J4 are the idx_dVm
+    for c in range(nj):
 
-        # J1
+        if c < n_no_slack:
+            j = idx_dtheta[c]
+        else:
+            j = idx_dVm[c - n_no_slack]
+
+        # J1 or J2
         for k in range(Yp[j], Yp[j + 1]):  # rows
             i = Yi[k]
             ii = lookup_dP[i]
 
             if idx_dtheta[ii] == i:
-                J.data[nnz] = dS_dVa_x[k].real
+                src[nnz] = k
                 J.indices[nnz] = ii
                 nnz += 1
 
-        # J3
+        # J3 or J4
         for k in range(Yp[j], Yp[j + 1]):  # rows
             i = Yi[k]
             ii = lookup_dQ[i]
 
             if idx_dQ[ii] == i:
-                J.data[nnz] = dS_dVa_x[k].imag
+                src[nnz] = k
                 J.indices[nnz] = ii + n_no_slack
                 nnz += 1
 
         p += 1
         J.indptr[p] = nnz
 
-    # J2 and J4 -----------------------------------------------------------------------------------------
-    for j in idx_dVm:  # columns
+    J.indptr[p] = nnz
+    J.resize(nnz)
+    return J, src[:nnz]
 
-        # J2
-        for k in range(Yp[j], Yp[j + 1]):
-            i = Yi[k]  # row at Y
-            ii = lookup_dP[i]
 
-            if idx_dtheta[ii] == i:
-                J.data[nnz] = dS_dVm_x[k].real
-                J.indices[nnz] = ii
+@jit(nopython=True, nogil=True, cache=True)
+def extend_J_vc_pattern(nbus: int, Yp: IntVec, Yi: IntVec, J0: CSC, src0: IntVec,
+                        idx_dtheta: IntVec, idx_dVm: IntVec, idx_dP: IntVec, idx_dQ: IntVec,
+                        n_dQ0: int) -> Tuple[CSC, IntVec]:
+    """
+    Extend a structure computed by create_J_vc_pattern with the buses appended to idx_dVm and idx_dQ
+    (i.e. the PV buses switched to PQ): the entries of J0 keep their positions in their columns,
+    the entries of the new rows are added at the end of every column and the new columns are added at the end.
+    This gives the same matrix as create_J_vc_pattern with the extended indices.
+
+    :param nbus: number of buses
+    :param Yp: Ybus indptr
+    :param Yi: Ybus indices
+    :param J0: structure of the first indices
+    :param src0: position in the Ybus data of the derivative that goes into every entry of J0
+    :param idx_dtheta: pv, pq, p, pqv (the same of J0)
+    :param idx_dVm: idx_dVm of J0 followed by the new buses
+    :param idx_dP: pv, pq, p, pqv (the same of J0)
+    :param idx_dQ: idx_dQ of J0 followed by the new buses
+    :param n_dQ0: length of the idx_dQ of J0
+    :return: Jacobian with the structure set (the data is not initialized),
+             position in the Ybus data of the derivative that goes into every Jacobian entry
+    """
+    nj = len(idx_dtheta) + len(idx_dVm)
+    nnz_estimate = J0.nnz + 3 * len(Yi)
+    J = CSC(nj, nj, nnz_estimate, False)
+    src = np.empty(nnz_estimate, dtype=np.int32)
+
+    lookup_dP = make_lookup(nbus, idx_dP)
+    lookup_dQ = make_lookup(nbus, idx_dQ)
+
+    n_no_slack = len(idx_dtheta)
+
+    nnz = 0
+    J.indptr[0] = nnz
+
+    for c in range(nj):
+
+        if c < n_no_slack:
+            j = idx_dtheta[c]
+        else:
+            j = idx_dVm[c - n_no_slack]
+
+        if c < J0.n_cols:
+            # copy the column of J0
+            for e in range(J0.indptr[c], J0.indptr[c + 1]):
+                src[nnz] = src0[e]
+                J.indices[nnz] = J0.indices[e]
                 nnz += 1
+        else:
+            # J1 or J2 of the new column
+            for k in range(Yp[j], Yp[j + 1]):  # rows
+                i = Yi[k]
+                ii = lookup_dP[i]
+
+                if idx_dtheta[ii] == i:
+                    src[nnz] = k
+                    J.indices[nnz] = ii
+                    nnz += 1
 
-        # J4
+        # J3 or J4 of the new rows (all the rows for a new column)
+        n_dQ_from = n_dQ0 if c < J0.n_cols else 0
         for k in range(Yp[j], Yp[j + 1]):  # rows
             i = Yi[k]
             ii = lookup_dQ[i]
 
-            if idx_dQ[ii] == i:
-                J.data[nnz] = dS_dVm_x[k].imag
+            if ii >= n_dQ_from and idx_dQ[ii] == i:
+                src[nnz] = k
                 J.indices[nnz] = ii + n_no_slack
                 nnz += 1
 
-        p += 1
-        J.indptr[p] = nnz
+        J.indptr[c + 1] = nnz
 
-    J.indptr[p] = nnz
     J.resize(nnz)
+    return J, src[:nnz]
+
+
+@jit(nopython=True, nogil=True, cache=True)
+def fill_J_vc_data(J: CSC, src: IntVec, n_no_slack: int, dS_dVm_x: CxVec, dS_dVa_x: CxVec) -> None:
+    """
+    Fill the data of a Jacobian structure computed with create_J_vc_pattern, in place
+    :param J: Jacobian structure
+    :param src: position in the Ybus data of the derivative that goes into every Jacobian entry
+    :param n_no_slack: length of idx_dtheta
+    :param dS_dVm_x: data of dS/dVm (same structure as Ybus)
+    :param dS_dVa_x: data of dS/dVa (same structure as Ybus)
+    """
+    for j in range(J.n_cols):
+        for e in range(J.indptr[j], J.indptr[j + 1]):
+
+            if j < n_no_slack:
+                val = dS_dVa_x[src[e]]
+            else:
+                val = dS_dVm_x[src[e]]
+
+            if J.indices[e] < n_no_slack:
+                J.data[e] = val.real  # dP
+            else:
+                J.data[e] = val.imag  # dQ
+
+
+def create_J_vc_csc(nbus: int, Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec,
+                    idx_dtheta: IntVec, idx_dVm: IntVec, idx_dP: IntVec, idx_dQ: IntVec) -> CSC:
+    """
+    Calculates Jacobian in CSC format.
+
+    J has the shape
+
+              idx_dtheta      idx_dVm
+    idx_dP  | dP_dVa        | dP_dVm |
+    idx_dQ  | dQ_dVa        | dQ_dVm |
+
+    :param nbus:
+    :param Yx:
+    :param Yp:
+    :param Yi:
+    :param V:
+    :param idx_dtheta: pv, pq, p, pqv
+    :param idx_dVm: pq, p
+    :param idx_dP: pv, pq, p, pqv
+    :param idx_dQ: pq, pqv
+    :return: Jacobina matrix
+    """
+
+    # create Jacobian from fast calc of dS_dV
+    dS_dVm_x, dS_dVa_x = dSbus_dV_numba_sparse_csc(Yx, Yp, Yi, V, np.abs(V))
+
+    J, src = create_J_vc_pattern(nbus, Yp, Yi, idx_dtheta, idx_dVm, idx_dP, idx_dQ)
+
+    fill_J_vc_data(J, src, len(idx_dtheta), dS_dVm_x, dS_dVa_x)
+
     return J
 
 
+# structures computed by create_J_vc_pattern, shared by all the JacobianVc (the oldest are discarded)
+_J_VC_PATTERNS: Dict[str, Tuple[CSC, IntVec]] = dict()
+_J_VC_PATTERNS_MAX = 32
+_J_VC_PATTERNS_LOCK = threading.Lock()  # the islands may be solved in concurrent threads
+
+
+class JacobianVc:
+    """
+    Jacobian of create_J_vc_csc that keeps its structure between calls
+
+    The structure is computed once per structure of Ybus and set of indices (that is, per
+    topology and control state) and shared between instances, so the time steps of the
+    same topology reuse it. Then only the data is filled for every new voltage: the same
+    CSC object is returned (and overwritten) on every call.
+    When some PV buses are switched to PQ, the current structure is extended with their
+    rows and columns (see extend_J_vc_pattern) instead of being computed again.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self.key: str = ""
+        self.J: CSC | None = None
+        self.src: IntVec | None = None
+
+        # arrays of the last call, to skip the hashing when they are the same objects
+        # (the structure and index arrays are replaced, never modified in place, when they change)
+        self.last_args: Tuple = tuple()
+
+    def get_extended_rows(self, prev_args: Tuple, args: Tuple) -> int | None:
+        """
+        Check if the new indices only append buses to the idx_dVm and idx_dQ of the current structure
+        (see PfBasicFormulation.switch_pv_to_pq), so that it can be extended with extend_J_vc_pattern
+        :param prev_args: (Yp, Yi, idx_dtheta, idx_dVm, idx_dP, idx_dQ) of the current structure
+        :param args: (Yp, Yi, idx_dtheta, idx_dVm, idx_dP, idx_dQ) of the new structure
+        :return: length of the idx_dQ of the current structure if it can be extended, None otherwise
+        """
+        if self.J is None or len(prev_args) != len(args):
+            return None
+
+        Yp0, Yi0, idx_dtheta0, idx_dVm0, idx_dP0, idx_dQ0 = prev_args
+        Yp, Yi, idx_dtheta, idx_dVm, idx_dP, idx_dQ = args
+
+        if not (np.array_equal(Yp0, Yp) and np.array_equal(Yi0, Yi)
+                and np.array_equal(idx_dtheta0, idx_dtheta) and np.array_equal(idx_dP0, idx_dP)):
+            return None
+
+        if (len(idx_dVm) - len(idx_dVm0) != len(idx_dQ) - len(idx_dQ0)
+                or len(idx_dVm) <= len(idx_dVm0)
+                or not np.array_equal(idx_dVm0, idx_dVm[:len(idx_dVm0)])
+                or not np.array_equal(idx_dQ0, idx_dQ[:len(idx_dQ0)])):
+            return None
+
+        return len(idx_dQ0)
+
+    def compute(self, Ybus: csc_matrix, V: CxVec,
+                idx_dtheta: IntVec, idx_dVm: IntVec, idx_dP: IntVec, idx_dQ: IntVec) -> CSC:
+        """
+        Compute the Jacobian
+        :param Ybus: Ybus matrix in CSC format
+        :param V: Voltages vector
+        :param idx_dtheta: pv, pq, p, pqv
+        :param idx_dVm: pq, p
+        :param idx_dP: pv, pq, p, pqv
+        :param idx_dQ: pq, pqv
+        :return: Jacobian Matrix in CSC format
+        """
+        args = (Ybus.indptr, Ybus.indices, idx_dtheta, idx_dVm, idx_dP, idx_dQ)
+        prev_args = self.last_args
+
+        if len(prev_args) == len(args) and all(a is b for a, b in zip(args, prev_args)):
+            key = self.key
+        else:
+            key = hash_arrays(Ybus.shape[0], *args)
+            self.last_args = args
+
+        if key != self.key:
+            pattern = _J_VC_PATTERNS.get(key, None)
+
+            if pattern is None:
+                n_dQ0 = self.get_extended_rows(prev_args, args)
+
+                if n_dQ0 is not None:
+                    # the previous structure bordered with the switched buses
+                    pattern = extend_J_vc_pattern(Ybus.shape[0], Ybus.indptr, Ybus.indices, self.J, self.src,
+                                                  idx_dtheta, idx_dVm, idx_dP, idx_dQ, n_dQ0)
+                else:
+                    pattern = create_J_vc_pattern(Ybus.shape[0], Ybus.indptr, Ybus.indices,
+                                                  idx_dtheta, idx_dVm, idx_dP, idx_dQ)
+
+                with _J_VC_PATTERNS_LOCK:
+                    if key not in _J_VC_PATTERNS and len(_J_VC_PATTERNS) >= _J_VC_PATTERNS_MAX:
+                        del _J_VC_PATTERNS[next(iter(_J_VC_PATTERNS))]
+
+                    _J_VC_PATTERNS[key] = pattern
+
+            J0, self.src = pattern
+
+            # share the structure, but not the data
+            self.J = CSC(J0.n_rows, J0.n_cols, J0.nnz, False).set(J0.indices, J0.indptr,
+                                                                  np.empty(J0.nnz, dtype=np.float64))
+            self.key = key
+
+        dS_dVm_x, dS_dVa_x = dSbus_dV_numba_sparse_csc(Ybus.data, Ybus.indptr, Ybus.indices, V, np.abs(V))
+
+        fill_J_vc_data(self.J, self.src, len(idx_dtheta), dS_dVm_x, dS_dVa_x)
+
+        return self.J
+
+
 def AC_jacobianVc(Ybus: csc_matrix, V: CxVec, idx_dtheta: IntVec, idx_dVm: IntVec, idx_dQ: IntVec) -> CSC:
     """
     Create the AC Jacobian function with no embedded controls
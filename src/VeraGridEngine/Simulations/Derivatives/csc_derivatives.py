@@ -14,7 +14,7 @@ from VeraGridEngine.Utils.Sparse.csc2 import CSC, CxCSC
 from VeraGridEngine.Utils.Sparse.csc_numba import ialloc
 
 
-@njit(cache=True)
+@njit(nogil=True, cache=True)
 def dSbus_dV_numba_sparse_csc(Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec, Vm: Vec) -> Tuple[CxVec, CxVec]:
     """
     Compute the power injection derivatives w.r.t the voltage module and angle
@@ -119,7 +119,7 @@ def dSbus_dV_csc(Ybus: csc_matrix, V: CxVec, Vm) -> Tuple[CxCSC, CxCSC]:
 # ----------------------------------------------------------------------------------------------------------------------
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def map_coordinates_numba(nrows, ncols, indptr, indices, F, T):
     """
 
@@ -145,7 +145,7 @@ def map_coordinates_numba(nrows, ncols, indptr, indices, F, T):
     return idx_f, idx_t
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSbr_dm_csc(nbus, u_cbr_m, F_cbr, T_cbr, yff_cbr, yft_cbr, ytf_cbr, ytt_cbr, V, tap, tap_modules) -> CxCSC:
     """
     Derivative of the controllable branch power flows (and hence bus balance) w.r.t. m
@@ -209,7 +209,7 @@ def dSbr_dm_csc(nbus, u_cbr_m, F_cbr, T_cbr, yff_cbr, yft_cbr, ytf_cbr, ytt_cbr,
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSbr_dtau_csc(nbus, u_cbr_tau, F_cbr, T_cbr, yff_cbr, yft_cbr, ytf_cbr, ytt_cbr, V, tap, tap_modules) -> CxCSC:
     """
     Derivative of the controllable branch power flows (and hence bus balance) w.r.t. tau
@@ -271,7 +271,7 @@ def dSbr_dtau_csc(nbus, u_cbr_tau, F_cbr, T_cbr, yff_cbr, yft_cbr, ytf_cbr, ytt_
 
 # ------------------------
 
-@njit()
+@njit(nogil=True, cache=True)
 def csc_add_wrapper(A: CxCSC, B: CxCSC, alpha: float = 1.0, beta: float = 1.0) -> CxCSC:
     """
     Wrapper for csc_add_ff
@@ -288,7 +288,7 @@ def csc_add_wrapper(A: CxCSC, B: CxCSC, alpha: float = 1.0, beta: float = 1.0) -
     return my_csc.set(Ci, Cp, Cx)
 
 
-@njit(cache=True)
+@njit(nogil=True, cache=True)
 def csc_add_ff_comp(Am, An, Aindptr, Aindices, Adata,
                     Bm, Bn, Bindptr, Bindices, Bdata, alpha, beta):
     """
@@ -327,7 +327,7 @@ def csc_add_ff_comp(Am, An, Aindptr, Aindices, Adata,
     return Cm, Cn, Cp, Ci, Cx  # success; free workspace, return C
 
 
-@njit(cache=True)
+@njit(nogil=True, cache=True)
 def csc_spalloc_f(m, n, nzmax):
     """
     Allocate a sparse matrix (triplet form or compressed-column form).
@@ -344,12 +344,12 @@ def csc_spalloc_f(m, n, nzmax):
     return m, n, Aindptr, Aindices, Adata, Anzmax
 
 
-@njit(cache=True)
+@njit(nogil=True, cache=True)
 def xalloc_comp(n):
     return np.zeros(n, dtype=np.complex128)
 
 
-@njit(cache=True)
+@njit(nogil=True, cache=True)
 def csc_scatter_f_comp(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
     """
     Scatters and sums a sparse vector A(:,j) into a dense vector, x = x + beta * A(:,j)
@@ -378,7 +378,7 @@ def csc_scatter_f_comp(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
     return nz
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dV_numba(Yf_nrows, Yf_ncols, Yf_indices, Yf_indptr, Yf_data, V, F, T) -> Tuple[CxCSC, CxCSC]:
     """
 
@@ -429,7 +429,7 @@ def dSf_dV_numba(Yf_nrows, Yf_ncols, Yf_indices, Yf_indptr, Yf_data, V, F, T) ->
     return dSf_dVm, dSf_dVa
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dV_numba(Yt_nrows, Yt_ncols, Yt_indices, Yt_indptr, Yt_data, V, F, T) -> Tuple[CxCSC, CxCSC]:
     """
 
@@ -524,7 +524,7 @@ def dSt_dV_csc(Yt, V, F, T) -> Tuple[CxCSC, CxCSC]:
     return dSt_dVm, dSt_dVa
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dVm_csc(nbus, br_indices, bus_indices, yff, yft, Vm, Va, F, T) -> CxCSC:
     """
     dSf_dVm[br_indices, bus_indices]
@@ -582,7 +582,7 @@ def dSf_dVm_csc(nbus, br_indices, bus_indices, yff, yft, Vm, Va, F, T) -> CxCSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dPfdp_dVm_csc(nbus, br_indices, bus_indices, yff, yft, kdp, V, F, T) -> CSC:
     """
     dSf_dVm[br_indices, bus_indices]
@@ -650,7 +650,7 @@ def dPfdp_dVm_csc(nbus, br_indices, bus_indices, yff, yft, kdp, V, F, T) -> CSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dVa_csc(nbus, br_indices, bus_indices, yft, V, F, T) -> CxCSC:
     """
 
@@ -710,7 +710,7 @@ def dSf_dVa_csc(nbus, br_indices, bus_indices, yft, V, F, T) -> CxCSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dVm_csc(nbus, br_indices, bus_indices, ytt, ytf, Vm, Va, F, T) -> CxCSC:
     """
 
@@ -768,7 +768,7 @@ def dSt_dVm_csc(nbus, br_indices, bus_indices, ytt, ytf, Vm, Va, F, T) -> CxCSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dVa_csc(nbus, br_indices, bus_indices, ytf, V, F, T) -> CxCSC:
     """
 
@@ -830,7 +830,7 @@ def dSt_dVa_csc(nbus, br_indices, bus_indices, ytf, V, F, T) -> CxCSC:
 # ----------------------------------------------------------------------------------------------------------------------
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def derivatives_tau_csc_numba(nbus, nbr, iPxsh,
                               F: IntVec, T: IntVec,
                               Ys: CxVec, kconv, tap, V) -> Tuple[CxCSC, CxCSC, CxCSC]:
@@ -912,7 +912,7 @@ def derivatives_tau_csc_numba(nbus, nbr, iPxsh,
 
 
 # original one
-@njit()
+@njit(nogil=True, cache=True)
 def dSbus_dtau_csc(nbus, bus_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxVec,
                    tap: CxVec, V: CxVec) -> CxCSC:
     """
@@ -970,7 +970,7 @@ def dSbus_dtau_csc(nbus, bus_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxV
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dtau_csc(nbr, sf_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxVec, tap: CxVec, V: CxVec) -> CxCSC:
     """
     This function computes the derivatives of Sbus, Sf and St w.r.t. the tap angle (tau)
@@ -1019,7 +1019,7 @@ def dSf_dtau_csc(nbr, sf_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxVec,
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dtau_csc(nbr, st_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxVec, tap: CxVec, V: CxVec) -> CxCSC:
     """
     This function computes the derivatives of Sbus, Sf and St w.r.t. the tap angle (tau)
@@ -1069,7 +1069,7 @@ def dSt_dtau_csc(nbr, st_indices, tau_indices, F: IntVec, T: IntVec, Ys: CxVec,
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def derivatives_ma_csc_numba(nbus, nbr, iXxma, F, T, Ys, kconv, tap, tap_module, Bc, Beq, V) -> Tuple[
     CxCSC, CxCSC, CxCSC]:
     """
@@ -1155,7 +1155,7 @@ def derivatives_ma_csc_numba(nbus, nbr, iXxma, F, T, Ys, kconv, tap, tap_module,
 
 
 # original one
-@njit()
+@njit(nogil=True, cache=True)
 def dSbus_dm_csc(nbus, bus_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec, Bc: Vec,
                  tap: CxVec, tap_module: Vec, V: CxVec) -> CxCSC:
     """
@@ -1214,7 +1214,7 @@ def dSbus_dm_csc(nbus, bus_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec,
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dm_csc(nbr, sf_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec, Bc: Vec,
                tap: CxVec, tap_module: Vec, V: CxVec) -> CxCSC:
     """
@@ -1269,7 +1269,7 @@ def dSf_dm_csc(nbr, sf_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec, Bc:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dm_csc(nbr, st_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec,
                tap: CxVec, tap_module: Vec, V: CxVec) -> CxCSC:
     """
@@ -1321,7 +1321,7 @@ def dSt_dm_csc(nbr, st_indices, m_indices, F: IntVec, T: IntVec, Ys: CxVec,
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def derivatives_Beq_csc_numba(nbus, nbr, iBeqx, F, V, tap_module, kconv):
     """
     Compute the derivatives of:
@@ -1383,7 +1383,7 @@ def derivatives_Beq_csc_numba(nbus, nbr, iBeqx, F, V, tap_module, kconv):
     return dSbus_dBeq, dSf_dBeq, dSt_dBeq
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSbus_dbeq_csc(nbus, bus_indices, beq_indices, F: IntVec, kconv: Vec, tap_module: Vec, V: CxVec) -> CxCSC:
     """
 
@@ -1436,7 +1436,7 @@ def dSbus_dbeq_csc(nbus, bus_indices, beq_indices, F: IntVec, kconv: Vec, tap_mo
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSf_dbeq_csc(nbr, sf_indices, beq_indices, F: IntVec, kconv: Vec, tap_module: Vec, V: CxVec) -> CxCSC:
     """
     This function computes the derivatives of Sbus, Sf and St w.r.t. the tap angle (tau)
@@ -1482,7 +1482,7 @@ def dSf_dbeq_csc(nbr, sf_indices, beq_indices, F: IntVec, kconv: Vec, tap_module
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dSt_dbeq_csc(sf_indices, beq_indices) -> CxCSC:
     """
     This function computes the derivatives of Sbus, Sf and St w.r.t. the tap angle (tau)
@@ -1504,7 +1504,7 @@ def dSt_dbeq_csc(sf_indices, beq_indices) -> CxCSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLossvsc_dVm_csc(nvsc, nbus, i_u_vm, alpha2, alpha3, Vm, Pt, Qt, T) -> CSC:
     """
         pq = Pt[ig_plossacdc] * Pt[ig_plossacdc] + Qt[ig_plossacdc] * Qt[ig_plossacdc]
@@ -1545,7 +1545,7 @@ def dLossvsc_dVm_csc(nvsc, nbus, i_u_vm, alpha2, alpha3, Vm, Pt, Qt, T) -> CSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLosshvdc_dVm_csc(nhvdc: int, nbus: int, i_u_vm: IntVec, Vm: Vec, Pf_hvdc: Vec,
                       hvdc_r: Vec, F_hvdc: IntVec):
     """
@@ -1581,7 +1581,7 @@ def dLosshvdc_dVm_csc(nhvdc: int, nbus: int, i_u_vm: IntVec, Vm: Vec, Pf_hvdc: V
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLosshvdc_dPfhvdc_csc(nhvdc, Vm, hvdc_r, F_hvdc):
     """
     dLosshvdc = rpu * Pf_hvdc / Vm[F_hvdc]**2 - Pf_hvdc - Pt_hvdc
@@ -1611,7 +1611,7 @@ def dLosshvdc_dPfhvdc_csc(nhvdc, Vm, hvdc_r, F_hvdc):
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLosshvdc_dPthvdc_csc(nhvdc):
     """
     dLosshvdc = rpu * Pf_hvdc / Vm[F_hvdc]**2 - Pf_hvdc - Pt_hvdc
@@ -1640,7 +1640,7 @@ def dLosshvdc_dPthvdc_csc(nhvdc):
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dInjhvdc_dPfhvdc_csc(nhvdc):
     """
     dInjhvdc = Pf_hvdc - Pset - droop(Va[f] - Va[t])
@@ -1669,7 +1669,7 @@ def dInjhvdc_dPfhvdc_csc(nhvdc):
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLossvsc_dPfvsc_csc(nvsc, u_vsc_pf) -> CSC:
     """
     Compute dLossvsc_dPfvsc in CSC format with column indices aligned to u_vsc_pf.
@@ -1703,7 +1703,7 @@ def dLossvsc_dPfvsc_csc(nvsc, u_vsc_pf) -> CSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLossvsc_dPtvsc_csc(nvsc, u_vsc_pt, alpha2, alpha3, Vm, Pt, Qt, T_vsc) -> CSC:
     """
     Compute the sparse matrix for the derivative of loss with respect to Pt in CSC format.
@@ -1748,7 +1748,7 @@ def dLossvsc_dPtvsc_csc(nvsc, u_vsc_pt, alpha2, alpha3, Vm, Pt, Qt, T_vsc) -> CS
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dLossvsc_dQtvsc_csc(nvsc, u_vsc_qt, alpha2, alpha3, Vm, Pt, Qt, T_vsc) -> CSC:
     """
     Compute the sparse matrix for the derivative of loss with respect to Qt in CSC format.
@@ -1792,7 +1792,7 @@ def dLossvsc_dQtvsc_csc(nvsc, u_vsc_qt, alpha2, alpha3, Vm, Pt, Qt, T_vsc) -> CS
 
     return mat
 
-@njit()
+@njit(nogil=True, cache=True)
 def dIvsc_dPfpvsc_csc(nvsc, u_vsc_pfp, Vm, Fdcn_vsc) -> CSC:
     """
     Compute dIvsc_dPfpvsc in CSC format.
@@ -1828,7 +1828,7 @@ def dIvsc_dPfpvsc_csc(nvsc, u_vsc_pfp, Vm, Fdcn_vsc) -> CSC:
 
     return mat
 
-@njit()
+@njit(nogil=True, cache=True)
 def dIvsc_dPfnvsc_csc(nvsc, u_vsc_pfn, Vm, Fdcp_vsc) -> CSC:
     """
     Compute dIvsc_dPfnvsc in CSC format.
@@ -1865,7 +1865,7 @@ def dIvsc_dPfnvsc_csc(nvsc, u_vsc_pfn, Vm, Fdcp_vsc) -> CSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dIvsc_dVm_csc(nvsc, nbus, i_u_vm, Pfp_vsc, Pfn_vsc, Fdcp_vsc, Fdcn_vsc) -> CSC:
     """
     Compute dIvsc_dVm in CSC format.
@@ -1913,7 +1913,7 @@ def dIvsc_dVm_csc(nvsc, nbus, i_u_vm, Pfp_vsc, Pfn_vsc, Fdcp_vsc, Fdcn_vsc) -> C
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dImaxvsc_dVm_csc(nbus, k_vsc_imax, i_u_vm, Pt_vsc, Qt_vsc, Vm, T_vsc) -> CSC:
     """
     Compute dImaxvsc_dVm in CSC format.
@@ -1955,7 +1955,7 @@ def dImaxvsc_dVm_csc(nbus, k_vsc_imax, i_u_vm, Pt_vsc, Qt_vsc, Vm, T_vsc) -> CSC
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dImaxvsc_dPQ_csc(nvsc, k_vsc_imax, u_vsc_pqt, PQt_vsc, Vm, T_vsc) -> CSC:
     """
     Compute dImaxvsc_dPQ in CSC format.
@@ -1996,7 +1996,7 @@ def dImaxvsc_dPQ_csc(nvsc, k_vsc_imax, u_vsc_pqt, PQt_vsc, Vm, T_vsc) -> CSC:
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dP_dPfvsc_csc(i_k_p, u_vsc_pf, F_vsc) -> CSC:
     """
     Compute dP_dPfvsc in CSC format.
@@ -2037,7 +2037,7 @@ def dP_dPfvsc_csc(i_k_p, u_vsc_pf, F_vsc) -> CSC:
     return mat.real
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dPQ_dPQft_csc(nbus: int, nvsc: int, i_k_pq: IntVec, u_dev_pq: IntVec, FT_dev: IntVec) -> CSC:
     """
     Calculate the derivatives of the power balance with respect to injections of branches
@@ -2077,7 +2077,7 @@ def dPQ_dPQft_csc(nbus: int, nvsc: int, i_k_pq: IntVec, u_dev_pq: IntVec, FT_dev
     return mat
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dInj_dVa_csc(nhvdc, i_u_va, hvdc_pset, hvdc_r, hvdc_droop, V, F_hvdc, T_hvdc) -> CSC:
     """
     Compute dInj_dVa in CSC format for HVDC systems.
@@ -2128,7 +2128,7 @@ def dInj_dVa_csc(nhvdc, i_u_va, hvdc_pset, hvdc_r, hvdc_droop, V, F_hvdc, T_hvdc
     return mat.real
 
 
-@njit()
+@njit(nogil=True, cache=True)
 def dInjhvdc_dVa_csc(nhvdc, nbus, i_u_va, hvdc_droop, F_hvdc, T_hvdc) -> CSC:
     """
     Compute dInjhvdc_dVa in CSC format for HVDC systems.
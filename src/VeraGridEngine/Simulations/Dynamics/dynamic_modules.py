@@ -10,7 +10,9 @@ from scipy.sparse.linalg import splu
 from scipy.sparse import csr_matrix as sparse
 from enum import Enum
 from warnings import warn
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
 
 
 class DiffEqSolver(Enum):
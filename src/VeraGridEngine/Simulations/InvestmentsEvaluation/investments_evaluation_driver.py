@@ -12,8 +12,6 @@ from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Utils.NumericalMethods.MVRSM_mo_pareto import MVRSM_mo_pareto
 from VeraGridEngine.Simulations.InvestmentsEvaluation.investments_evaluation_results import InvestmentsEvaluationResults
 from VeraGridEngine.Simulations.InvestmentsEvaluation.investments_evaluation_options import InvestmentsEvaluationOptions
-from VeraGridEngine.Simulations.InvestmentsEvaluation.Methods.NSGA_3 import NSGA_3
-from VeraGridEngine.Simulations.InvestmentsEvaluation.Methods.mixed_variable_NSGA_2 import NSGA_2
 from VeraGridEngine.Simulations.InvestmentsEvaluation.Methods.random_eval import random_trial
 from VeraGridEngine.Simulations.InvestmentsEvaluation.Problems.black_box_problem_template import BlackBoxProblemTemplate
 from VeraGridEngine.enumerations import InvestmentEvaluationMethod, SimulationTypes
@@ -211,6 +209,9 @@ class InvestmentsEvaluationDriver(DriverTemplate):
         # add baseline
         ret = self.objective_function(x=np.zeros(self.problem.n_vars(), dtype=int))
 
+        # pymoo takes long to import, only do it when optimizing
+        from VeraGridEngine.Simulations.InvestmentsEvaluation.Methods.NSGA_3 import NSGA_3
+
         # optimize
         X, obj_values = NSGA_3(
             obj_func=self.objective_function,
@@ -268,6 +269,7 @@ class InvestmentsEvaluationDriver(DriverTemplate):
         ret = self.objective_function(x=np.zeros(self.problem.n_vars(), dtype=int))
 
         # optimize
+        from VeraGridEngine.Simulations.InvestmentsEvaluation.Methods.mixed_variable_NSGA_2 import NSGA_2
         X, obj_values = NSGA_2(
             grid=self.grid,
             obj_func=self.objective_function,
@@ -4,8 +4,7 @@
 # SPDX-License-Identifier: MPL-2.0
 import textwrap
 import numpy as np
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 from VeraGridEngine.Simulations.results_template import ResultsTemplate
 from VeraGridEngine.Simulations.results_table import ResultsTable
@@ -13,6 +12,9 @@ from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, Mat
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 from VeraGridEngine.Utils.NumericalMethods.MVRSM_mo_pareto import non_dominated_sorting
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 
 class InvestmentsEvaluationResults(ResultsTemplate):
     tpe = 'Investments Evaluation Results'
@@ -22,14 +22,13 @@ from VeraGridEngine.Simulations.Derivatives.ac_jacobian import AC_jacobian
 from VeraGridEngine.Simulations.Derivatives.csc_derivatives import dSf_dV_csc
 from VeraGridEngine.Utils.Sparse.csc import dense_to_csc
 import VeraGridEngine.Utils.Sparse.csc2 as csc
-from VeraGridEngine.Utils.MIP.selected_interface import lpDot1D_changes
 from VeraGridEngine.enumerations import ContingencyOperationTypes
 
 if TYPE_CHECKING:
     from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def make_contingency_flows(base_flow: Vec,
                            lodf_factors: sp.csc_matrix,
                            ptdf_factors: sp.csc_matrix,
@@ -610,6 +609,9 @@ class LinearMultiContingency:
         :param vsc_flow: Base Vsc flows (n_vsc)
         :return: New flows (nbranch)
         """
+        # imported here, since the selected MIP interface imports the MIP solvers
+        from VeraGridEngine.Utils.MIP.selected_interface import lpDot1D_changes
+
         mask = np.zeros(len(base_flow), dtype=bool)
         flow = base_flow.copy()
         changed_idx = np.zeros(0, dtype=int)
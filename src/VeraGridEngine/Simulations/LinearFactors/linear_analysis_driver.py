@@ -7,14 +7,11 @@ from __future__ import annotations
 import numpy as np
 from typing import Union, TYPE_CHECKING
 
-from numba.cuda.cudadrv.nvvm import nvvm_result
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis import LinearAnalysis
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
-from VeraGridEngine.Compilers.circuit_to_bentayga import BENTAYGA_AVAILABLE, bentayga_linear_matrices
-from VeraGridEngine.Compilers.circuit_to_newton_pa import NEWTON_PA_AVAILABLE, newton_pa_linear_matrices
 from VeraGridEngine.enumerations import EngineType, SimulationTypes
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_results import LinearAnalysisResults
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_options import LinearAnalysisOptions
@@ -83,13 +80,18 @@ class LinearAnalysisDriver(DriverTemplate):
             return
 
         # Run Analysis
-        if self.engine == EngineType.Bentayga and not BENTAYGA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed, back to VeraGrid')
-
-        if self.engine == EngineType.NewtonPA and not NEWTON_PA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed, back to VeraGrid')
+        if self.engine == EngineType.Bentayga:
+            # the third party engines are only imported when selected
+            from VeraGridEngine.Compilers.circuit_to_bentayga import BENTAYGA_AVAILABLE
+            if not BENTAYGA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed, back to VeraGrid')
+
+        if self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import NEWTON_PA_AVAILABLE
+            if not NEWTON_PA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed, back to VeraGrid')
 
         if self.engine == EngineType.VeraGrid:
 
@@ -131,6 +133,7 @@ class LinearAnalysisDriver(DriverTemplate):
             self.results.loading = self.results.Sf / (nc.passive_branch_data.rates + 1e-20)
 
         elif self.engine == EngineType.Bentayga:
+            from VeraGridEngine.Compilers.circuit_to_bentayga import bentayga_linear_matrices
 
             lin_mat = bentayga_linear_matrices(circuit=self.grid, distributed_slack=self.options.distribute_slack)
             self.results.PTDF = lin_mat.PTDF
@@ -140,6 +143,7 @@ class LinearAnalysisDriver(DriverTemplate):
             self.results.Sbus = lin_mat.Pbus * self.grid.Sbase
 
         elif self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_linear_matrices
 
             lin_mat = newton_pa_linear_matrices(circuit=self.grid, distributed_slack=self.options.distribute_slack)
             self.results.PTDF = lin_mat.PTDF
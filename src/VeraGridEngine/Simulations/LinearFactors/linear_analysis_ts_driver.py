@@ -8,7 +8,7 @@ from typing import Dict, Union, TYPE_CHECKING
 from VeraGridEngine.basic_structures import IntVec
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis import LinearAnalysis
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_options import LinearAnalysisOptions
-from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_ts
 from VeraGridEngine.enumerations import SimulationTypes
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_ts_results import LinearAnalysisTimeSeriesResults
@@ -77,14 +77,21 @@ class LinearAnalysisTimeSeriesDriver(TimeSeriesDriverTemplate):
         # Compute different topologies to consider
         # tpg = self.get_topologic_groups()
 
+        # compile the time series once, then patch the circuit at every step
+        nc_ts = compile_numerical_circuit_ts(circuit=self.grid,
+                                             time_indices=self.time_indices,
+                                             opf_results=self.opf_time_series_results,
+                                             logger=self.logger)
+        nc: NumericalCircuit | None = None
+
         for it, t in enumerate(self.time_indices):
             self.report_text('Linear analysis at ' + str(self.grid.time_profile[t]))
             self.report_progress2(it, len(self.time_indices))
 
-            nc: NumericalCircuit = compile_numerical_circuit_at(circuit=self.grid,
-                                                                t_idx=t,
-                                                                opf_results=self.opf_time_series_results,
-                                                                logger=self.logger)
+            if nc is None:
+                nc = nc_ts.get_at(t)
+            else:
+                nc_ts.update(nc=nc, t_idx=t)
 
             driver_ = LinearAnalysis(
                 nc=nc,
@@ -5,8 +5,6 @@
 
 from typing import List
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
-from VeraGridEngine.Simulations.NTC.ntc_opf import run_linear_ntc_opf
-from VeraGridEngine.Simulations.NTC.ntc_opf_strict import run_linear_ntc_opf_strict
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
 from VeraGridEngine.Simulations.NTC.ntc_options import OptimalNetTransferCapacityOptions
 from VeraGridEngine.Simulations.NTC.ntc_results import OptimalNetTransferCapacityResults
@@ -46,6 +44,9 @@ class OptimalNetTransferCapacityDriver(DriverTemplate):
         Run a power flow for every circuit
         @return: OptimalPowerFlowResults object
         """
+        # the MIP interface is only imported when an optimization is run
+        from VeraGridEngine.Simulations.NTC.ntc_opf import run_linear_ntc_opf
+        from VeraGridEngine.Simulations.NTC.ntc_opf_strict import run_linear_ntc_opf_strict
 
         self.report_text('Compiling...')
 
@@ -4,11 +4,9 @@
 # SPDX-License-Identifier: MPL-2.0
 
 import numpy as np
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
-from VeraGridEngine.Simulations.NTC.ntc_opf import run_linear_ntc_opf, NtcVars
-from VeraGridEngine.Simulations.NTC.ntc_opf_strict import run_linear_ntc_opf_strict
 from VeraGridEngine.Simulations.NTC.ntc_driver import OptimalNetTransferCapacityOptions
 from VeraGridEngine.Simulations.NTC.ntc_ts_results import OptimalNetTransferCapacityTimeSeriesResults
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
@@ -16,6 +14,9 @@ from VeraGridEngine.Simulations.Clustering.clustering_results import ClusteringR
 from VeraGridEngine.basic_structures import Logger
 from VeraGridEngine.enumerations import SimulationTypes
 
+if TYPE_CHECKING:
+    from VeraGridEngine.Simulations.NTC.ntc_opf import NtcVars
+
 
 class OptimalNetTransferCapacityTimeSeriesDriver(TimeSeriesDriverTemplate):
     tpe = SimulationTypes.OptimalNetTransferCapacityTimeSeries_run
@@ -52,6 +53,8 @@ class OptimalNetTransferCapacityTimeSeriesDriver(TimeSeriesDriverTemplate):
         """
         Run thread
         """
+        from VeraGridEngine.Simulations.NTC.ntc_opf import run_linear_ntc_opf
+        from VeraGridEngine.Simulations.NTC.ntc_opf_strict import run_linear_ntc_opf_strict
 
         self.report_progress(0)
 
@@ -10,7 +10,6 @@ from typing import Union, List
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.enumerations import EngineType, SimulationTypes
 from VeraGridEngine.Simulations.OPF.opf_options import OptimalPowerFlowOptions
-from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
 from VeraGridEngine.Simulations.OPF.ac_opf_worker import run_nonlinear_opf
 from VeraGridEngine.Simulations.NodalCapacity.nodal_capacity_options import NodalCapacityOptions
 from VeraGridEngine.Simulations.NodalCapacity.nodal_capacity_ts_results import NodalCapacityTimeSeriesResults
@@ -129,6 +128,7 @@ class NodalCapacityTimeSeriesDriver(TimeSeriesDriverTemplate):
             self.report_text('Formulating problem...')
 
         # DC optimal power flow
+        from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
         opf_vars = run_linear_opf_ts(grid=self.grid,
                                      time_indices=self.time_indices,
                                      solver_type=self.opf_options.mip_solver,
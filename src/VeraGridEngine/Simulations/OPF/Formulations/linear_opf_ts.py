@@ -18,7 +18,7 @@ from VeraGridEngine.IO.file_system import opf_file_path
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Devices.Aggregation.inter_aggregation_info import InterAggregationInfo
 from VeraGridEngine.Devices.Aggregation.contingency_group import ContingencyGroup
-from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, compile_numerical_circuit_ts
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.DataStructures.generator_data import GeneratorData
 from VeraGridEngine.DataStructures.battery_data import BatteryData
@@ -1815,6 +1815,19 @@ def run_linear_opf_ts(grid: MultiCircuit,
         else:
             time_indices = [None]
 
+    if time_indices[0] is None:
+        nc_ts = None
+    else:
+        # compile once per structural state, the steps are copies of those with the time values written on top
+        nc_ts = compile_numerical_circuit_ts(
+            circuit=grid,
+            time_indices=np.array(time_indices, dtype=int),
+            bus_dict=bus_dict,
+            areas_dict=areas_dict,
+            fill_gep=generation_expansion_planning,
+            logger=logger
+        )
+
     active_nodal_capacity = True
     if capacity_nodes_idx is None:
         active_nodal_capacity = False
@@ -1870,17 +1883,19 @@ def run_linear_opf_ts(grid: MultiCircuit,
         # local_t_idx would go from 0..100
         # global_t_idx would go from 100..200
 
-        # compile the circuit at the master time index ------------------------------------------------------------
-        # note: There are very little chances of simplifying this step and experience shows
-        #       it is not worth the effort, so compile every time step
-        nc: NumericalCircuit = compile_numerical_circuit_at(
-            circuit=grid,
-            t_idx=global_t_idx,  # yes, this is not a bug
-            bus_dict=bus_dict,
-            areas_dict=areas_dict,
-            fill_gep=generation_expansion_planning,
-            logger=logger
-        )
+        # get the circuit at the master time index ----------------------------------------------------------------
+        # note: every step gets its own copy, because the formulations may keep references to the arrays
+        if nc_ts is None:
+            nc: NumericalCircuit = compile_numerical_circuit_at(
+                circuit=grid,
+                t_idx=global_t_idx,  # yes, this is not a bug
+                bus_dict=bus_dict,
+                areas_dict=areas_dict,
+                fill_gep=generation_expansion_planning,
+                logger=logger
+            )
+        else:
+            nc: NumericalCircuit = nc_ts.get_at(global_t_idx)
 
         indices = nc.get_simulation_indices()
 
@@ -3,7 +3,6 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.  
 # SPDX-License-Identifier: MPL-2.0
 
-from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
 from VeraGridEngine.Simulations.OPF.opf_results import OptimalPowerFlowResults
 from VeraGridEngine.Simulations.OPF.opf_options import OptimalPowerFlowOptions
 from VeraGridEngine.Simulations.OPF.opf_ts_results import OptimalPowerFlowTimeSeriesResults
@@ -11,3 +10,11 @@ from VeraGridEngine.Simulations.OPF.opf_ts_driver import OptimalPowerFlowTimeSer
 from VeraGridEngine.Simulations.OPF.opf_driver import OptimalPowerFlowDriver
 from VeraGridEngine.Simulations.OPF.simple_dispatch_ts import run_simple_dispatch, run_greedy_dispatch_ts
 from VeraGridEngine.Simulations.OPF.ac_opf_worker import run_nonlinear_opf, NonlinearOPFResults
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+# the linear formulation imports the MIP solvers, so it is only imported when used (see lazy_attributes)
+OPF_LAZY_ATTRIBUTES = {
+    'run_linear_opf_ts': 'VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts',
+}
+
+__getattr__ = lazy_attributes(__name__, OPF_LAZY_ATTRIBUTES)
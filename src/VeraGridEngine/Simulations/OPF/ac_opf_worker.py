@@ -7,6 +7,7 @@ from typing import Union, Tuple, Sequence
 from VeraGridEngine.Utils.NumericalMethods.ips import interior_point_solver
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
 from VeraGridEngine.Simulations.OPF.opf_options import OptimalPowerFlowOptions
@@ -43,6 +44,7 @@ def run_nonlinear_opf(grid: MultiCircuit,
                       optimize_nodal_capacity: bool = False,
                       nodal_capacity_sign: float = 1.0,
                       capacity_nodes_idx: Union[IntVec, None] = None,
+                      nc: Union[NumericalCircuit, None] = None,
                       logger: Logger = Logger()) -> NonlinearOPFResults:
     """
     Run optimal power flow for a MultiCircuit
@@ -53,12 +55,14 @@ def run_nonlinear_opf(grid: MultiCircuit,
     :param optimize_nodal_capacity:
     :param nodal_capacity_sign:
     :param capacity_nodes_idx:
+    :param nc: NumericalCircuit already compiled at t_idx (optional, i.e. from NumericalCircuitTs.get_at)
     :param logger: Logger object
     :return: NonlinearOPFResults
     """
 
     # compile the system
-    nc = compile_numerical_circuit_at(circuit=grid, t_idx=t_idx, logger=logger)
+    if nc is None:
+        nc = compile_numerical_circuit_at(circuit=grid, t_idx=t_idx, logger=logger)
 
     if opf_options.ips_init_with_pf and opf_options.acopf_S0 is not None and opf_options.acopf_v0 is not None:
         # pick the passed values
@@ -7,13 +7,11 @@ from typing import Union
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.enumerations import SolverType, EngineType, SimulationTypes
 from VeraGridEngine.Simulations.OPF.opf_options import OptimalPowerFlowOptions
-from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
 from VeraGridEngine.Simulations.OPF.opf_results import OptimalPowerFlowResults
 from VeraGridEngine.Simulations.OPF.ac_opf_worker import run_nonlinear_opf
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
 from VeraGridEngine.Simulations.OPF.simple_dispatch_ts import GreedyDispatchInputsSnapshot, greedy_dispatch2
-from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_linear_opf, newton_pa_nonlinear_opf
 
 
 class OptimalPowerFlowDriver(TimeSeriesDriverTemplate):
@@ -128,7 +126,8 @@ class OptimalPowerFlowDriver(TimeSeriesDriverTemplate):
                 self.report_progress(0.0)
                 self.report_text('Formulating problem...')
 
-            # DC optimal power flow
+            # DC optimal power flow (the MIP interface is only imported when used)
+            from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
             opf_vars = run_linear_opf_ts(grid=self.grid,
                                          time_indices=None,
                                          solver_type=self.options.mip_solver,
@@ -286,6 +285,7 @@ class OptimalPowerFlowDriver(TimeSeriesDriverTemplate):
             self.opf()
 
         elif self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_linear_opf, newton_pa_nonlinear_opf
 
             ti = self.time_indices if self.time_indices is not None else 0
             use_time_series = self.time_indices is not None
@@ -6,13 +6,15 @@
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.Simulations.results_table import ResultsTable
 from VeraGridEngine.Simulations.results_template import ResultsTemplate
 from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, CxVec
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 
 class OptimalPowerFlowResults(ResultsTemplate):
 
@@ -10,13 +10,12 @@ from typing import Union
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.enumerations import SolverType, TimeGrouping, EngineType, SimulationTypes
 from VeraGridEngine.Simulations.OPF.opf_options import OptimalPowerFlowOptions
-from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
 from VeraGridEngine.Simulations.OPF.simple_dispatch_ts import run_greedy_dispatch_ts
 from VeraGridEngine.Simulations.OPF.ac_opf_worker import run_nonlinear_opf
 from VeraGridEngine.Simulations.OPF.opf_ts_results import OptimalPowerFlowTimeSeriesResults
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
-from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_linear_opf, newton_pa_nonlinear_opf
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_ts
 from VeraGridEngine.Simulations.Clustering.clustering_results import ClusteringResults
 from VeraGridEngine.basic_structures import IntVec, Vec, get_time_groups
 
@@ -105,6 +104,7 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         if self.options.solver == SolverType.LINEAR_OPF:
 
             # DC optimal power flow
+            from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
             opf_vars = run_linear_opf_ts(grid=self.grid,
                                          time_indices=self.time_indices,
                                          solver_type=self.options.mip_solver,
@@ -180,6 +180,12 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         elif self.options.solver == SolverType.NONLINEAR_OPF:
 
             self.report_progress(0.0)
+
+            # compile once per structural state
+            nc_ts = compile_numerical_circuit_ts(circuit=self.grid,
+                                                 time_indices=self.time_indices,
+                                                 logger=self.logger)
+
             for it, t in enumerate(self.time_indices):
 
                 # report progress
@@ -191,6 +197,7 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
                     grid=self.grid,
                     opf_options=self.options,
                     t_idx=t,
+                    nc=nc_ts.get_at(t),
                     # for the first power flow, use the given strategy
                     # for the successive ones, use the previous solution
                     # Sbus_pf0=self.results.Sbus[it - 1, :] if it > 0 else None,
@@ -268,6 +275,7 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         """
         Run the OPF by groups
         """
+        from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
 
         self.report_progress(0.0)
         self.report_text('Making groups...')
@@ -376,6 +384,12 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
             elif self.options.solver == SolverType.NONLINEAR_OPF:
 
                 self.report_progress(0.0)
+
+                # compile once per structural state
+                nc_ts = compile_numerical_circuit_ts(circuit=self.grid,
+                                                     time_indices=time_indices,
+                                                     logger=self.logger)
+
                 for it, t in enumerate(time_indices):
                     # report progress
                     self.report_text('Nonlinear OPF at ' + str(self.grid.time_profile[t]) + '...')
@@ -385,6 +399,7 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
                         grid=self.grid,
                         opf_options=self.options,
                         t_idx=t,
+                        nc=nc_ts.get_at(t),
                         # for the first power flow, use the given strategy
                         # for the successive ones, use the previous solution
                         # Sbus_pf0=self.results.Sbus[it - 1, :] if it > 0 else None,
@@ -524,6 +539,7 @@ class OptimalPowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
                         self.opf_by_groups()
 
         elif self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_linear_opf, newton_pa_nonlinear_opf
 
             if self.time_indices is None:
                 ti = 0
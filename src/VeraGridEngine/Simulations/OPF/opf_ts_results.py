@@ -7,8 +7,7 @@ from __future__ import annotations
 from typing import Union, TYPE_CHECKING
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.Simulations.OPF.opf_results import OptimalPowerFlowResults
 from VeraGridEngine.Simulations.results_table import ResultsTable
 from VeraGridEngine.Simulations.results_template import ResultsTemplate
@@ -16,6 +15,9 @@ from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, CxMat, Mat, BoolVec
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 if TYPE_CHECKING:  # Only imports the below statements during type checking
     from VeraGridEngine.Simulations.Clustering.clustering_results import ClusteringResults
     from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
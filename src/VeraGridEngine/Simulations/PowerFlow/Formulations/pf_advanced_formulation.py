@@ -12,7 +12,7 @@ from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOpt
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 import VeraGridEngine.Simulations.Derivatives.csc_derivatives as deriv
 from VeraGridEngine.Topology.simulation_indices import compile_types
-from VeraGridEngine.Utils.Sparse.csc2 import CSC, CxCSC, sp_slice, csc_stack_2d_ff, scipy_to_mat
+from VeraGridEngine.Utils.Sparse.csc2 import CSC, CxCSC, sp_slice, csc_stack_2d_ff, csc_stack_2d_ff_fill, scipy_to_mat
 from VeraGridEngine.Utils.NumericalMethods.common import find_closest_number
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import (expand, compute_fx_error,
                                                                                     power_flow_post_process_nonlinear)
@@ -25,7 +25,7 @@ from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions impo
 from VeraGridEngine.basic_structures import Vec, IntVec, CxVec, Logger
 
 
-@njit()
+@njit(cache=True)
 def adv_jacobian(nbus: int,
                  nbr: int,
                  idx_dva: IntVec,
@@ -53,7 +53,8 @@ def adv_jacobian(nbus: int,
                  yff: CxVec,
                  yft: CxVec,
                  ytf: CxVec,
-                 ytt: CxVec) -> CSC:
+                 ytt: CxVec,
+                 J_prev: CSC) -> CSC:
     """
     Compute the advanced jacobian
     :param nbus:
@@ -84,6 +85,7 @@ def adv_jacobian(nbus: int,
     :param yft:
     :param ytf:
     :param ytt:
+    :param J_prev: Jacobian of the previous call, its data is overwritten if the structure did not change
     :return:
     """
     # bus-bus derivatives (always needed)
@@ -119,15 +121,19 @@ def adv_jacobian(nbus: int,
     dPt_dtau_ = deriv.dSt_dtau_csc(nbr, idx_dPt, idx_dtau, F, T, Ys, complex_tap, V).real
     dQt_dtau_ = deriv.dSt_dtau_csc(nbr, idx_dQt, idx_dtau, F, T, Ys, complex_tap, V).imag
 
+    mats = [dP_dVa__, dP_dVm__, dP_dm__, dP_dtau__,
+            dQ_dVa__, dQ_dVm__, dQ_dm__, dQ_dtau__,
+            dPf_dVa_, dPf_dVm_, dPf_dm_, dPf_dtau_,
+            dQf_dVa_, dQf_dVm_, dQf_dm_, dQf_dtau_,
+            dPt_dVa_, dPt_dVm_, dPt_dm_, dPt_dtau_,
+            dQt_dVa_, dQt_dVm_, dQt_dm_, dQt_dtau_]
+
+    # fill the previous Jacobian if the structure is the same
+    if csc_stack_2d_ff_fill(mats=mats, n_rows=6, n_cols=4, res=J_prev):
+        return J_prev
+
     # compose the Jacobian
-    J = csc_stack_2d_ff(mats=
-                        [dP_dVa__, dP_dVm__, dP_dm__, dP_dtau__,
-                         dQ_dVa__, dQ_dVm__, dQ_dm__, dQ_dtau__,
-                         dPf_dVa_, dPf_dVm_, dPf_dm_, dPf_dtau_,
-                         dQf_dVa_, dQf_dVm_, dQf_dm_, dQf_dtau_,
-                         dPt_dVa_, dPt_dVm_, dPt_dm_, dPt_dtau_,
-                         dQt_dVa_, dQt_dVm_, dQt_dm_, dQt_dtau_],
-                        n_rows=6, n_cols=4)
+    J = csc_stack_2d_ff(mats=mats, n_rows=6, n_cols=4)
 
     return J
 
@@ -232,6 +238,9 @@ class PfAdvancedFormulation(PfFormulationTemplate):
 
         self.Ys: CxVec = self.nc.passive_branch_data.get_series_admittance()
 
+        # Jacobian of the previous iteration, its data is refilled while the structure does not change
+        self._J: CSC = CSC(0, 0, 0, False)
+
         self.adm = compute_admittances(
             R=self.nc.passive_branch_data.R,
             X=self.nc.passive_branch_data.X,
@@ -270,6 +279,22 @@ class PfAdvancedFormulation(PfFormulationTemplate):
         self.idx_dP = self.idx_dVa
         self.idx_dQ = np.r_[self.pq, self.pqv]
 
+    def switch_pv_to_pq(self, pq: IntVec, pv: IntVec, switched: IntVec) -> None:
+        """
+        Update the bus types after some PV buses became PQ, without rebuilding the indices:
+        the angle indices do not change and the switched buses are appended to the module
+        and reactive power indices, so the new Jacobian is the previous one bordered with
+        the new rows and columns (see newton_raphson_fx)
+        :param pq: Array of PQ indices (including the switched buses)
+        :param pv: Array of PV indices (without the switched buses)
+        :param switched: Array of the buses switched from PV to PQ
+        """
+        self.pq = pq
+        self.pv = pv
+
+        self.idx_dVm = np.r_[self.idx_dVm, switched]
+        self.idx_dQ = np.r_[self.idx_dQ, switched]
+
     def analyze_branch_controls(self) -> List[int]:
         """
         Analyze the control branches and compute the indices
@@ -550,8 +575,8 @@ class PfAdvancedFormulation(PfFormulationTemplate):
                 if len(changed) > 0:
                     any_change = True
 
-                    # update the bus type lists
-                    self.update_bus_types(pq=pq, pv=pv, pqv=pqv, p=p)
+                    # update the bus type lists, appending the switched buses to the unknowns
+                    self.switch_pv_to_pq(pq=pq, pv=pv, switched=np.array(changed, dtype=int))
 
                     # the composition of x may have changed, so recompute
                     x = self.var2x()
@@ -794,7 +819,10 @@ class PfAdvancedFormulation(PfFormulationTemplate):
                              yff=self.adm.yff,
                              yft=self.adm.yft,
                              ytf=self.adm.ytf,
-                             ytt=self.adm.ytt)
+                             ytt=self.adm.ytt,
+                             J_prev=self._J)
+
+            self._J = J
 
             return J
 
@@ -8,7 +8,7 @@ from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.Topology.admittance_matrices import AdmittanceMatrices
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
-from VeraGridEngine.Simulations.Derivatives.ac_jacobian import create_J_vc_csc
+from VeraGridEngine.Simulations.Derivatives.ac_jacobian import JacobianVc
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import (compute_fx_error,
                                                                                     power_flow_post_process_nonlinear)
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.discrete_controls import (control_q_inside_method,
@@ -24,7 +24,7 @@ from VeraGridEngine.Utils.Sparse.csc2 import CSC
 class PfBasicFormulation(PfFormulationTemplate):
 
     def __init__(self, V0: CxVec, S0: CxVec, I0: CxVec, Y0: CxVec, Qmin: Vec, Qmax: Vec,
-                 nc: NumericalCircuit, options: PowerFlowOptions):
+                 nc: NumericalCircuit, options: PowerFlowOptions, branch_results: bool = True):
         """
 
         :param V0:
@@ -34,6 +34,7 @@ class PfBasicFormulation(PfFormulationTemplate):
         :param Qmin:
         :param Qmax:
         :param options:
+        :param branch_results: compute the branch results in get_solution (see power_flow_post_process_nonlinear)
         """
         PfFormulationTemplate.__init__(self, V0=V0, options=options)
 
@@ -48,6 +49,8 @@ class PfBasicFormulation(PfFormulationTemplate):
         self.Qmin = Qmin
         self.Qmax = Qmax
 
+        self.branch_results = branch_results
+
         self.vd, self.pq, self.pv, self.pqv, self.p, self.no_slack = compile_types(
             Pbus=S0.real,
             types=self.nc.bus_data.bus_types
@@ -58,6 +61,9 @@ class PfBasicFormulation(PfFormulationTemplate):
         self.idx_dP = self.idx_dVa
         self.idx_dQ = np.r_[self.pq, self.pqv]
 
+        # Jacobian structure, kept between iterations
+        self._jacobian = JacobianVc()
+
     def x2var(self, x: Vec):
         """
         Convert X to decision variables
@@ -99,6 +105,22 @@ class PfBasicFormulation(PfFormulationTemplate):
         self.idx_dP = self.idx_dVa
         self.idx_dQ = np.r_[self.pq, self.pqv]
 
+    def switch_pv_to_pq(self, pq: IntVec, pv: IntVec, switched: IntVec) -> None:
+        """
+        Update the bus types after some PV buses became PQ, without rebuilding the indices:
+        the angle indices do not change and the switched buses are appended to the module
+        and reactive power indices, so the new Jacobian is the previous one bordered with
+        the new rows and columns (see newton_raphson_fx)
+        :param pq: Array of PQ indices (including the switched buses)
+        :param pv: Array of PV indices (without the switched buses)
+        :param switched: Array of the buses switched from PV to PQ
+        """
+        self.pq = pq
+        self.pv = pv
+
+        self.idx_dVm = np.r_[self.idx_dVm, switched]
+        self.idx_dQ = np.r_[self.idx_dQ, switched]
+
     def size(self) -> int:
         """
         Size of the jacobian matrix
@@ -186,8 +208,8 @@ class PfBasicFormulation(PfFormulationTemplate):
                 if len(changed) > 0:
                     any_change = True
 
-                    # update the bus type lists
-                    self.update_bus_types(pq=pq, pv=pv, pqv=pqv, p=p)
+                    # update the bus type lists, appending the switched buses to the unknowns
+                    self.switch_pv_to_pq(pq=pq, pv=pv, switched=np.array(changed, dtype=int))
 
                     # the composition of x may have changed, so recompute
                     x = self.var2x()
@@ -234,15 +256,12 @@ class PfBasicFormulation(PfFormulationTemplate):
         if self.adm.Ybus.format != 'csc':
             self.adm.Ybus = self.adm.Ybus.tocsc()
 
-        nbus = self.adm.Ybus.shape[0]
-
         if self.options.verbose >= 2:
             print("Ybus:")
             print(self.adm.Ybus.toarray())
 
-        # Create J in CSC order
-        J = create_J_vc_csc(nbus, self.adm.Ybus.data, self.adm.Ybus.indptr, self.adm.Ybus.indices,
-                            self.V, self.idx_dVa, self.idx_dVm, self.idx_dP, self.idx_dQ)
+        # Fill J in CSC order (the structure is only computed when the topology or the indices change)
+        J = self._jacobian.compute(self.adm.Ybus, self.V, self.idx_dVa, self.idx_dVm, self.idx_dP, self.idx_dQ)
 
         return J
 
@@ -286,7 +305,8 @@ class PfBasicFormulation(PfFormulationTemplate):
             Yt=self.adm.Yt,
             Yshunt_bus=self.adm.Yshunt_bus,
             branch_rates=self.nc.passive_branch_data.rates,
-            Sbase=self.nc.Sbase
+            Sbase=self.nc.Sbase,
+            branch_results=self.branch_results
         )
 
         return NumericPowerFlowResults(V=self.V,
@@ -9,7 +9,7 @@ from scipy.sparse import lil_matrix, csc_matrix
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
-from VeraGridEngine.Simulations.Derivatives.ac_jacobian import create_J_vc_csc
+from VeraGridEngine.Simulations.Derivatives.ac_jacobian import JacobianVc
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import (
     compute_fx_error, power_flow_post_process_nonlinear_3ph
 )
@@ -639,6 +639,9 @@ class PfBasicFormulation3Ph(PfFormulationTemplate):
         self.idx_dP = self.idx_dVa
         self.idx_dQ = np.r_[self.pq, self.pqv]
 
+        # Jacobian structure, kept between iterations
+        self._jacobian = JacobianVc()
+
     def x2var(self, x: Vec):
         """
         Convert X to decision variables
@@ -924,11 +927,8 @@ class PfBasicFormulation3Ph(PfFormulationTemplate):
             return J
 
         else:
-            nbus = self.Ybus.shape[0]
-
-            # Create J in CSC order
-            J = create_J_vc_csc(nbus, self.Ybus.data, self.Ybus.indptr, self.Ybus.indices,
-                                self.V, self.idx_dVa, self.idx_dVm, self.idx_dP, self.idx_dQ)
+            # Fill J in CSC order (the structure is only computed when the topology or the indices change)
+            J = self._jacobian.compute(self.Ybus, self.V, self.idx_dVa, self.idx_dVm, self.idx_dP, self.idx_dQ)
 
         return J
 
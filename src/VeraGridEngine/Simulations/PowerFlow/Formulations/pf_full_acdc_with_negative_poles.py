@@ -25,7 +25,7 @@ from VeraGridEngine.enumerations import (TapPhaseControl, TapModuleControl, Hvdc
 from VeraGridEngine.basic_structures import Vec, IntVec, CxVec, Logger
 
 
-@njit()
+@njit(cache=True)
 def adv_jacobian(nbus: int,
                  nbr: int,
                  nvsc: int,
@@ -13,7 +13,8 @@ from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOpt
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 import VeraGridEngine.Simulations.Derivatives.csc_derivatives as deriv
 from VeraGridEngine.Utils.NumericalMethods.common import find_closest_number, make_complex
-from VeraGridEngine.Utils.Sparse.csc2 import (CSC, CxCSC, scipy_to_mat, sp_slice, csc_stack_2d_ff)
+from VeraGridEngine.Utils.Sparse.csc2 import (CSC, CxCSC, scipy_to_mat, sp_slice, csc_stack_2d_ff,
+                                              csc_stack_2d_ff_fill)
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.discrete_controls import (control_q_for_generalized_method,
                                                                                      compute_slack_distribution)
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import expand
@@ -25,7 +26,7 @@ from VeraGridEngine.enumerations import (TapPhaseControl, TapModuleControl, Hvdc
 from VeraGridEngine.basic_structures import Vec, IntVec, CxVec, Logger
 
 
-@njit()
+@njit(cache=True)
 def adv_jacobian(nbus: int,
                  nbr: int,
                  nvsc: int,
@@ -90,7 +91,9 @@ def adv_jacobian(nbus: int,
 
                  Yi: IntVec,
                  Yp: IntVec,
-                 Yx: CxVec) -> CSC:
+                 Yx: CxVec,
+
+                 J_prev: CSC) -> CSC:
     """
 
     :param nbus:
@@ -139,6 +142,7 @@ def adv_jacobian(nbus: int,
     :param Yi:
     :param Yp:
     :param Yx:
+    :param J_prev: Jacobian of the previous call, its data is overwritten if the structure did not change
     :return:
     """
 
@@ -270,8 +274,7 @@ def adv_jacobian(nbus: int,
     dQt_dm = deriv.dSt_dm_csc(nbr, k_cbr_qt, u_cbr_m, F, T, Ys, tap, tap_modules, V).imag
     dQt_dtau = deriv.dSt_dtau_csc(nbr, k_cbr_qt, u_cbr_tau, F, T, Ys, tap, V).imag
 
-    # compose the Jacobian
-    J = csc_stack_2d_ff(mats=[
+    mats = [
         dP_dVa, dP_dVm, dP_dPfvsc, dP_dPtvsc, dP_dQtvsc, dP_dPfhvdc, dP_dPthvdc, dP_dQfhvdc, dP_dQthvdc, dP_dm, dP_dtau,
 
         dQ_dVa, dQ_dVm, dQ_dPfvsc, dQ_dPtvsc, dQ_dQtvsc, dQ_dPfhvdc, dQ_dPthvdc, dQ_dQfhvdc, dQ_dQthvdc, dQ_dm, dQ_dtau,
@@ -296,8 +299,14 @@ def adv_jacobian(nbus: int,
 
         dQt_dVa, dQt_dVm, dQt_dPfvsc, dQt_dPtvsc, dQt_dQtvsc, dQt_dPfhvdc, dQt_dPthvdc, dQt_dQfhvdc,
         dQt_dQthvdc, dQt_dm, dQt_dtau
+    ]
+
+    # fill the previous Jacobian if the structure is the same
+    if csc_stack_2d_ff_fill(mats=mats, n_rows=9, n_cols=11, res=J_prev):
+        return J_prev
 
-    ], n_rows=9, n_cols=11)
+    # compose the Jacobian
+    J = csc_stack_2d_ff(mats=mats, n_rows=9, n_cols=11)
 
     return J
 
@@ -576,6 +585,9 @@ class PfGeneralizedFormulation(PfFormulationTemplate):
         self.Pt_vsc[self.k_vsc_pt] = self.vsc_pt_set / self.nc.Sbase
         self.Qt_vsc[self.k_vsc_qt] = self.vsc_qt_set / self.nc.Sbase
 
+        # Jacobian of the previous iteration, its data is refilled while the structure does not change
+        self._J: CSC = CSC(0, 0, 0, False)
+
         # Admittance ---------------------------------------------------------------------------------------------------
 
         # self.Ys: CxVec = self.nc.passive_branch_data.get_series_admittance()
@@ -1861,9 +1873,13 @@ class PfGeneralizedFormulation(PfFormulationTemplate):
 
                 Yi=self.adm.Ybus.indices,
                 Yp=self.adm.Ybus.indptr,
-                Yx=self.adm.Ybus.data
+                Yx=self.adm.Ybus.data,
+
+                J_prev=self._J
             )
 
+            self._J = J_sym
+
             return J_sym
 
     def get_x_names(self) -> List[str]:
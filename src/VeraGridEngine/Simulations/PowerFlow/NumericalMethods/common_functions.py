@@ -6,7 +6,7 @@
 import numba as nb
 import numpy as np
 from scipy.sparse import csc_matrix
-from VeraGridEngine.basic_structures import Vec, CxVec, IntVec, CscMat, CxMat
+from VeraGridEngine.basic_structures import Vec, CxVec, IntVec, CscMat, CxMat, Mat
 
 
 @nb.njit(cache=True, fastmath=True)
@@ -48,6 +48,29 @@ def compute_zip_power(S0: CxVec, I0: CxVec, Y0: CxVec, Vm: CxVec) -> CxVec:
     return S0 + np.conj(I0 + Y0 * Vm) * Vm
 
 
+@nb.njit(nogil=True, cache=True)
+def compute_power_csc(Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxVec) -> CxVec:
+    """
+    Compute the power from the CSC admittance matrix structure and the voltage
+    :param Yx: Admittance matrix data
+    :param Yp: Admittance matrix column pointers
+    :param Yi: Admittance matrix row indices
+    :param V: Voltage vector
+    :return: Calculated power injections
+    """
+    n = len(V)
+    Ibus = np.zeros(n, dtype=np.complex128)
+    for j in range(n):
+        vj = V[j]
+        for k in range(Yp[j], Yp[j + 1]):
+            Ibus[Yi[k]] += Yx[k] * vj
+
+    for i in range(n):
+        Ibus[i] = V[i] * np.conj(Ibus[i])
+
+    return Ibus
+
+
 def compute_power(Ybus: csc_matrix, V: CxVec) -> CxVec:
     """
     Compute the power from the admittance matrix and the voltage
@@ -55,7 +78,11 @@ def compute_power(Ybus: csc_matrix, V: CxVec) -> CxVec:
     :param V: Voltage vector
     :return: Calculated power injections
     """
-    return V * np.conj(Ybus @ V)
+    if isinstance(Ybus, csc_matrix) and Ybus.shape[1] == len(V):
+        return compute_power_csc(Ybus.data.astype(np.complex128, copy=False), Ybus.indptr, Ybus.indices,
+                                 np.asarray(V, dtype=np.complex128))
+    else:
+        return V * np.conj(Ybus @ V)
 
 
 def fortescue_012_to_abc(z0: complex, z1: complex, z2: complex) -> CxMat:
@@ -121,7 +148,7 @@ def compute_fx_error(fx: Vec) -> float:
     return np.linalg.norm(fx, np.inf)
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def get_Sf(k: IntVec, Vm: Vec, V: CxVec, yff: CxVec, yft: CxVec, F: IntVec, T: IntVec):
     """
 
@@ -139,7 +166,7 @@ def get_Sf(k: IntVec, Vm: Vec, V: CxVec, yff: CxVec, yft: CxVec, F: IntVec, T: I
     return np.power(Vm[f], 2.0) * np.conj(yff[k]) + V[f] * np.conj(V[t]) * np.conj(yft[k])
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def get_St(k: IntVec, Vm: Vec, V: CxVec, ytf: CxVec, ytt: CxVec, F: IntVec, T: IntVec):
     """
 
@@ -157,7 +184,7 @@ def get_St(k: IntVec, Vm: Vec, V: CxVec, ytf: CxVec, ytt: CxVec, F: IntVec, T: I
     return np.power(Vm[t], 2.0) * np.conj(ytt[k]) + V[t] * np.conj(V[f]) * np.conj(ytf[k])
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def get_If(k: IntVec, V: CxVec, yff: CxVec, yft: CxVec, F: IntVec, T: IntVec):
     """
 
@@ -174,7 +201,7 @@ def get_If(k: IntVec, V: CxVec, yff: CxVec, yft: CxVec, F: IntVec, T: IntVec):
     return np.conj(V[f]) * np.conj(yff[k]) + np.conj(V[t]) * np.conj(yft[k])
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def get_It(k: IntVec, V: CxVec, ytf: CxVec, ytt: CxVec, F: IntVec, T: IntVec):
     """
 
@@ -280,7 +307,8 @@ def power_flow_post_process_nonlinear(Sbus: CxVec, V: CxVec, F: IntVec, T: IntVe
                                       pv: IntVec, vd: IntVec,
                                       Ybus: CscMat, Yf: CscMat, Yt: CscMat, Yshunt_bus: CxVec,
                                       branch_rates: Vec,
-                                      Sbase: float):
+                                      Sbase: float,
+                                      branch_results: bool = True):
     """
 
     :param Sbus:
@@ -295,6 +323,9 @@ def power_flow_post_process_nonlinear(Sbus: CxVec, V: CxVec, F: IntVec, T: IntVe
     :param Yshunt_bus:
     :param branch_rates:
     :param Sbase:
+    :param branch_results: compute the branch results, if False they are returned as zeros
+                           (i.e. when they are computed later for many solutions at once,
+                           see power_flow_post_process_branches_batch)
     :return:
     """
 
@@ -310,6 +341,13 @@ def power_flow_post_process_nonlinear(Sbus: CxVec, V: CxVec, F: IntVec, T: IntVe
     Vm = np.abs(V)
     Sbus += Vm * Vm * np.conj(Yshunt_bus)
 
+    if not branch_results:
+        nbr = len(F)
+        return (np.zeros(nbr, dtype=complex), np.zeros(nbr, dtype=complex),
+                np.zeros(nbr, dtype=complex), np.zeros(nbr, dtype=complex),
+                np.zeros(nbr, dtype=complex), np.zeros(nbr, dtype=complex),
+                np.zeros(nbr, dtype=complex), Sbus)
+
     # Branches current, loading, etc
     Vf = V[F]
     Vt = V[T]
@@ -330,6 +368,43 @@ def power_flow_post_process_nonlinear(Sbus: CxVec, V: CxVec, F: IntVec, T: IntVe
     return Sf, St, If, It, Vbranch, loading, losses, Sbus
 
 
+def power_flow_post_process_branches_batch(V: CxMat, F: IntVec, T: IntVec,
+                                           Yf: CscMat, Yt: CscMat,
+                                           branch_rates: Mat,
+                                           Sbase: float):
+    """
+    Branch results of a number of voltage solutions that share the branch admittances.
+    This is the branch part of power_flow_post_process_nonlinear applied to every row of V,
+    computing the currents of all the rows with a single sparse-dense product.
+    :param V: voltages matrix (n_solutions, nbus)
+    :param F: from bus indices
+    :param T: to bus indices
+    :param Yf: from admittance matrix
+    :param Yt: to admittance matrix
+    :param branch_rates: branch rates matrix (n_solutions, nbr) in MVA
+    :param Sbase: base power in MVA
+    :return: Sf, St, If, It, Vbranch, loading, losses matrices (n_solutions, nbr)
+    """
+    # Branches current, loading, etc
+    Vf = V[:, F]
+    Vt = V[:, T]
+    If = (Yf @ V.T).T
+    It = (Yt @ V.T).T
+    Sf = Vf * np.conj(If) * Sbase
+    St = Vt * np.conj(It) * Sbase
+
+    # Branch losses in MVA
+    losses = Sf + St
+
+    # branch voltage increment
+    Vbranch = Vf - Vt
+
+    # Branch loading in p.u.
+    loading = Sf / (branch_rates + 1e-9)
+
+    return Sf, St, If, It, Vbranch, loading, losses
+
+
 def power_flow_post_process_linear(Sbus: CxVec, V: CxVec,
                                    active: IntVec, X: Vec, tap_module: Vec, tap_angle: Vec,
                                    F: IntVec, T: IntVec,
@@ -215,7 +215,7 @@ def control_q_inside_method(Scalc: CxVec, S0: CxVec,
     return changed, pv, pq, pqv, p
 
 
-@nb.njit()
+@nb.njit(cache=True)
 def control_q_for_generalized_method(Scalc: CxVec, S0: CxVec,
                                      pv: IntVec, i_u_vm: IntVec, i_k_q: IntVec,
                                      Qmin: Vec, Qmax: Vec):
@@ -3,6 +3,8 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 
+from __future__ import annotations
+
 import numpy as np
 from numpy.linalg import norm
 from scipy.sparse.linalg import splu
@@ -14,10 +16,73 @@ from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.discrete_controls imp
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import power_flow_post_process_nonlinear
 from VeraGridEngine.basic_structures import Vec, CxVec, CscMat, IntVec
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
+from VeraGridEngine.Topology.topology_cache import get_topology_cache, hash_arrays
 
 np.set_printoptions(linewidth=320)
 
 
+class FastDecoupledFactors:
+    """
+    LU factorizations of B' and B'' reduced to the buses of the fast decoupled iterations
+    They only depend on the impedances, the topology and the bus types, so they can be reused
+    by all the power flows that share those (i.e. the time steps of a time series)
+    """
+
+    def __init__(self, B1: CscMat, B2: CscMat, pv: IntVec, pq: IntVec, pqv: IntVec, p: IntVec):
+        """
+        Constructor
+        :param B1: B' matrix for the fast decoupled algorithm
+        :param B2: B'' matrix for the fast decoupled algorithm
+        :param pv: Array with the indices of the PV buses
+        :param pq: Array with the indices of the PQ buses
+        :param pqv: Array with the indices of the PQV buses
+        :param p: Array with the indices of the P buses
+        """
+        self.blck1_idx: IntVec = np.r_[pv, pq, p, pqv]
+        self.blck2_idx: IntVec = np.r_[pq, p]
+        self.blck3_idx: IntVec = np.r_[pq, pqv]
+
+        self.B1_factorization = splu(B1[np.ix_(self.blck1_idx, self.blck1_idx)]) if len(self.blck1_idx) else None
+        self.B2_factorization = splu(B2[np.ix_(self.blck3_idx, self.blck2_idx)]) if len(self.blck2_idx) else None
+
+
+def get_fast_decoupled_factors(nc: NumericalCircuit,
+                               B1: CscMat,
+                               B2: CscMat,
+                               pv: IntVec,
+                               pq: IntVec,
+                               pqv: IntVec,
+                               p: IntVec) -> FastDecoupledFactors:
+    """
+    Get the B' and B'' factorizations of a circuit from the topology cache, computing them if needed
+    The time series drivers install a cache for their run (see RunTopologyCache), so their steps
+    reuse the factorizations of the repeated topologies even if no global cache is set
+    :param nc: NumericalCircuit instance (it provides the topology signature)
+    :param B1: B' matrix of nc
+    :param B2: B'' matrix of nc
+    :param pv: Array with the indices of the PV buses
+    :param pq: Array with the indices of the PQ buses
+    :param pqv: Array with the indices of the PQV buses
+    :param p: Array with the indices of the P buses
+    :return: FastDecoupledFactors
+    """
+    cache = get_topology_cache()
+    if cache is not None:
+        key = hash_arrays(nc.get_fast_decoupled_key(), pv, pq, pqv, p)
+        factors = cache.get('fast_decoupled_factors', key)
+        if factors is not None:
+            return factors
+    else:
+        key = ""
+
+    factors = FastDecoupledFactors(B1=B1, B2=B2, pv=pv, pq=pq, pqv=pqv, p=p)
+
+    if cache is not None:
+        cache.set('fast_decoupled_factors', key, factors)
+
+    return factors
+
+
 def FDPF(nc: NumericalCircuit,
          Vbus: CxVec,
          S0: CxVec,
@@ -37,7 +102,9 @@ def FDPF(nc: NumericalCircuit,
          tol: float = 1e-9,
          max_it: float = 100,
          control_q: bool = False,
-         distribute_slack: bool = False) -> NumericPowerFlowResults:
+         distribute_slack: bool = False,
+         factors: FastDecoupledFactors | None = None,
+         branch_results: bool = True) -> NumericPowerFlowResults:
     """
     Fast decoupled power flow
     :param nc: NumericalCircuit instance
@@ -62,6 +129,9 @@ def FDPF(nc: NumericalCircuit,
     :param max_it: maximum number of iterations
     :param control_q: Control Q method
     :param distribute_slack: Distribute Slack method
+    :param factors: B' and B'' factorizations for the given bus types (see get_fast_decoupled_factors),
+                    if None they are computed here
+    :param branch_results: compute the branch results (see power_flow_post_process_nonlinear)
     :return: NumericPowerFlowResults instance
     """
 
@@ -77,14 +147,17 @@ def FDPF(nc: NumericalCircuit,
     pv = pv_.copy()
     pqv = pqv_.copy()
     p = p_.copy()
-    blck1_idx = np.r_[pv, pq, p, pqv]
-    blck2_idx = np.r_[pq, p]
-    blck3_idx = np.r_[pq, pqv]
-    n_block1 = len(blck1_idx)
 
     # Factorize B1 and B2
-    B1_factorization = splu(B1[np.ix_(blck1_idx, blck1_idx)])
-    B2_factorization = splu(B2[np.ix_(blck3_idx, blck2_idx)])
+    if factors is None:
+        factors = FastDecoupledFactors(B1=B1, B2=B2, pv=pv, pq=pq, pqv=pqv, p=p)
+
+    blck1_idx = factors.blck1_idx
+    blck2_idx = factors.blck2_idx
+    blck3_idx = factors.blck3_idx
+    B1_factorization = factors.B1_factorization
+    B2_factorization = factors.B2_factorization
+    n_block1 = len(blck1_idx)
 
     # evaluate initial mismatch
     Sbus = cf.compute_zip_power(S0, I0, Y0, Vm)  # compute the ZIP power injection
@@ -158,13 +231,12 @@ def FDPF(nc: NumericalCircuit,
 
                 if len(changed) > 0:
                     # adjust internal variables to the new pq|pv values
-                    blck1_idx = np.r_[pv, pq, p, pqv]
-                    blck2_idx = np.r_[pq, p]
-                    blck3_idx = np.r_[pq, pqv]
-
-                    # Factorize B1 and B2
-                    B1_factorization = splu(B1[np.ix_(blck1_idx, blck1_idx)])
-                    B2_factorization = splu(B2[np.ix_(blck3_idx, blck2_idx)])
+                    factors = FastDecoupledFactors(B1=B1, B2=B2, pv=pv, pq=pq, pqv=pqv, p=p)
+                    blck1_idx = factors.blck1_idx
+                    blck2_idx = factors.blck2_idx
+                    blck3_idx = factors.blck3_idx
+                    B1_factorization = factors.B1_factorization
+                    B2_factorization = factors.B2_factorization
 
             if distribute_slack and normQ < 1e-2:
                 ok, delta = compute_slack_distribution(Scalc=Scalc,
@@ -197,7 +269,8 @@ def FDPF(nc: NumericalCircuit,
         Yt=Yt,
         Yshunt_bus=Yshunt_bus,
         branch_rates=nc.passive_branch_data.rates,
-        Sbase=nc.Sbase)
+        Sbase=nc.Sbase,
+        branch_results=branch_results)
 
     return NumericPowerFlowResults(V=voltage,
                                    Scalc=Scalc * nc.Sbase,
@@ -20,7 +20,8 @@ def gausspf(nc: NumericalCircuit,
             S0: CxVec, I0: CxVec, Y0: CxVec, V0: CxVec,
             pv: IntVec, pq: IntVec, p: IntVec, pqv: IntVec, vd: IntVec,
             bus_installed_power: Vec, Qmin: Vec, Qmax: Vec, tol=1e-3, max_it=50,
-            control_q=False, distribute_slack=False, verbose=False, logger: Logger = None) -> NumericPowerFlowResults:
+            control_q=False, distribute_slack=False, verbose=False, logger: Logger = None,
+            branch_results: bool = True) -> NumericPowerFlowResults:
     """
     Gauss-Seidel Power flow
     :param nc: NumericalCircuit
@@ -46,6 +47,7 @@ def gausspf(nc: NumericalCircuit,
     :param distribute_slack: Distribute Slack?
     :param verbose: Verbose?
     :param logger: Logger to store the debug information
+    :param branch_results: compute the branch results (see power_flow_post_process_nonlinear)
     :return: NumericPowerFlowResults instance
     """
     start = time.time()
@@ -183,7 +185,8 @@ def gausspf(nc: NumericalCircuit,
         Yt=Yt,
         Yshunt_bus=Yshunt_bus,
         branch_rates=nc.passive_branch_data.rates,
-        Sbase=nc.Sbase)
+        Sbase=nc.Sbase,
+        branch_results=branch_results)
 
     return NumericPowerFlowResults(V=V,
                                    Scalc=Scalc * nc.Sbase,
@@ -691,7 +691,7 @@ def helm_josep(nc: NumericalCircuit,
                Yseries: CscMat, V0: CxVec, S0: CxVec, Ysh0: CxVec,
                pq: IntVec, pv: IntVec, vd: IntVec, no_slack: IntVec,
                tolerance: float = 1e-6, max_coefficients: int = 30, use_pade: bool = True,
-               verbose: int = 0, logger: Logger = None) -> NumericPowerFlowResults:
+               verbose: int = 0, logger: Logger = None, branch_results: bool = True) -> NumericPowerFlowResults:
     """
     Holomorphic Embedding LoadFlow Method as formulated by Josep Fanals Batllori in 2020
     :param nc: NumericalCircuit
@@ -711,6 +711,7 @@ def helm_josep(nc: NumericalCircuit,
     :param use_pade: Use the Padè approximation? otherwise, a simple summation is done
     :param verbose: print intermediate information
     :param logger: Logger object to store the debug info
+    :param branch_results: compute the branch results (see power_flow_post_process_nonlinear)
     :return: V, converged, norm_f, Scalc, iter_, elapsed
     """
 
@@ -793,7 +794,8 @@ def helm_josep(nc: NumericalCircuit,
         Yt=Yt,
         Yshunt_bus=Yshunt_bus,
         branch_rates=nc.passive_branch_data.rates,
-        Sbase=nc.Sbase
+        Sbase=nc.Sbase,
+        branch_results=branch_results
     )
 
     return NumericPowerFlowResults(
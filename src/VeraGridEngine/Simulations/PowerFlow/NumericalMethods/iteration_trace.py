@@ -0,0 +1,121 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import time
+from typing import List, Dict, Union, TYPE_CHECKING
+import pandas as pd
+
+if TYPE_CHECKING:  # Only imports the below statements during type checking
+    from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
+
+# phases of an iteration whose wall time is recorded (seconds)
+TRACE_PHASES = ('update', 'jacobian', 'factorization', 'solve', 'line_search', 'controls')
+
+# other values recorded per iteration
+TRACE_COUNTERS = ('error', 'nnz', 'fill_in', 'line_search_trials', 'linear_iterations', 'bordered')
+
+
+class IterationTrace:
+    """
+    Opt-in per-iteration instrumentation of the Newton-like power flow solvers
+
+    Every iteration records the wall time spent in each phase:
+        - update: evaluation of the residuals (problem.update without controls)
+        - jacobian: computation of the Jacobian
+        - factorization: factorization of the Jacobian (or of the system matrix)
+        - solve: solution of the linear system with the factorization
+        - line_search: trial points evaluated by the line search (problem.check_error)
+        - controls: problem.update with the controls (the control outer loop)
+    and the error, the number of non-zeros of the Jacobian, the fill-in of its factorization
+    (non-zeros of the factors minus the non-zeros of the Jacobian), the line search trials,
+    the iterations of the Krylov linear solver and the rows and columns that the controls
+    added to the factorization as a bordered system.
+
+    A disabled trace ignores all the calls, so the solvers can use it unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Constructor
+        :param enabled: record the values?
+        """
+        self.enabled = enabled
+
+        # one record per iteration (iteration 0 is the initial point)
+        self.records: List[Dict[str, Union[int, float]]] = list()
+
+    @staticmethod
+    def tic() -> float:
+        """
+        Get the current time, to be passed to add_time
+        :return: seconds
+        """
+        return time.perf_counter()
+
+    def start_iteration(self, iteration: int) -> None:
+        """
+        Start the record of an iteration
+        :param iteration: iteration number
+        """
+        if self.enabled:
+            record: Dict[str, Union[int, float]] = {'iteration': iteration}
+            for phase in TRACE_PHASES:
+                record[phase] = 0.0
+            for counter in TRACE_COUNTERS:
+                record[counter] = 0
+            self.records.append(record)
+
+    def add_time(self, phase: str, tic: float) -> None:
+        """
+        Add the time elapsed since tic to a phase of the current iteration
+        :param phase: one of TRACE_PHASES
+        :param tic: value of tic() at the beginning of the phase
+        """
+        if self.enabled and len(self.records):
+            self.records[-1][phase] += time.perf_counter() - tic
+
+    def add(self, name: str, value: Union[int, float]) -> None:
+        """
+        Add a value to a counter of the current iteration
+        :param name: one of TRACE_COUNTERS
+        :param value: value to add
+        """
+        if self.enabled and len(self.records):
+            self.records[-1][name] += value
+
+    def set(self, name: str, value: Union[int, float]) -> None:
+        """
+        Set a counter of the current iteration
+        :param name: one of TRACE_COUNTERS
+        :param value: value
+        """
+        if self.enabled and len(self.records):
+            self.records[-1][name] = value
+
+    def get_phase_totals(self) -> Dict[str, float]:
+        """
+        Get the total time spent in every phase
+        :return: dictionary phase: seconds
+        """
+        return {phase: sum(record[phase] for record in self.records) for phase in TRACE_PHASES}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Get the trace as a DataFrame with one row per iteration
+        :return: DataFrame
+        """
+        return pd.DataFrame(self.records, columns=['iteration'] + list(TRACE_PHASES) + list(TRACE_COUNTERS))
+
+
+def set_trace(solution: NumericPowerFlowResults, trace: IterationTrace) -> NumericPowerFlowResults:
+    """
+    Store the trace in a solution if it is enabled
+    :param solution: NumericPowerFlowResults
+    :param trace: IterationTrace
+    :return: the same solution
+    """
+    solution.trace = trace if trace.enabled else None
+    return solution
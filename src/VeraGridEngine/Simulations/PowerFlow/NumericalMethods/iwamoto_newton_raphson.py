@@ -7,7 +7,7 @@ import time
 import scipy
 import numpy as np
 from VeraGridEngine.Utils.NumericalMethods.sparse_solve import get_sparse_type, get_linear_solver
-from VeraGridEngine.Utils.Sparse.csc2 import spsolve_csc
+from VeraGridEngine.Utils.Sparse.csc2 import sparse_factorization
 from VeraGridEngine.Simulations.Derivatives.ac_jacobian import AC_jacobianVc, CSC
 import VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions as cf
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
@@ -63,7 +63,8 @@ def IwamotoNR(nc: NumericalCircuit,
               S0: CxVec, V0: CxVec, I0: CxVec, Y0: CxVec,
               pv_: IntVec, pq_: IntVec, pqv_: IntVec, p_: IntVec, vd_: IntVec,
               Qmin: Vec, Qmax: Vec, tol: float, max_it: int = 15,
-              control_q: bool = False, robust: bool = False, logger: Logger = None) -> NumericPowerFlowResults:
+              control_q: bool = False, robust: bool = False, logger: Logger = None,
+              branch_results: bool = True) -> NumericPowerFlowResults:
     """
     Solves the power flow using a full Newton's method with the Iwamoto optimal step factor.
     :param nc: NumericalCircuit instance
@@ -86,6 +87,7 @@ def IwamotoNR(nc: NumericalCircuit,
     :param control_q: Control reactive power?
     :param robust: use of the Iwamoto optimal step factor?.
     :param logger: Logger
+    :param branch_results: compute the branch results (see power_flow_post_process_nonlinear)
     :return: Voltage solution, converged?, error, calculated power Injections
     """
     start = time.time()
@@ -129,7 +131,7 @@ def IwamotoNR(nc: NumericalCircuit,
 
             # compute update step
             try:
-                dx, ok = spsolve_csc(J, f)
+                dx, ok = sparse_factorization.solve(J, f)
 
                 if not ok:
                     end = time.time()
@@ -271,7 +273,8 @@ def IwamotoNR(nc: NumericalCircuit,
         Yt=Yt,
         Yshunt_bus=Yshunt_bus,
         branch_rates=nc.passive_branch_data.rates,
-        Sbase=nc.Sbase)
+        Sbase=nc.Sbase,
+        branch_results=branch_results)
 
     return NumericPowerFlowResults(V=V,
                                    Scalc=Scalc * nc.Sbase,
@@ -2,23 +2,24 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.  
 # SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
 import time
 import numpy as np
 import scipy.sparse as sp
-from VeraGridEngine.Utils.NumericalMethods.sparse_solve import get_linear_solver
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.Formulations.pf_formulation_template import PfFormulationTemplate
-from VeraGridEngine.Utils.Sparse.csc2 import mat_to_scipy
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.iteration_trace import IterationTrace, set_trace
+from VeraGridEngine.Utils.Sparse.csc2 import mat_to_scipy, sparse_factorization
 from VeraGridEngine.basic_structures import Logger
 
-linear_solver = get_linear_solver()
-
 
 def levenberg_marquardt_fx(problem: PfFormulationTemplate,
                            tol: float = 1e-6,
                            max_iter: int = 10,
                            verbose: int = 0,
-                           logger: Logger = Logger()) -> NumericPowerFlowResults:
+                           logger: Logger = Logger(),
+              trace: IterationTrace | None = None) -> NumericPowerFlowResults:
     """
     Levenberg-Marquardt to solve:
 
@@ -33,22 +34,30 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
     :param max_iter: Maximum number of iterations
     :param verbose:  Display console information
     :param logger: Logger instance
+    :param trace: IterationTrace to record the time and the statistics of every iteration (None to skip)
     :return: ConvexMethodResult
     """
     start = time.time()
 
+    if trace is None:
+        trace = IterationTrace(enabled=False)
+
     # get the initial point
     x = problem.var2x()
 
     if len(x) == 0:
         # if the length of x is zero, means that there's nothing to solve
         # for instance there might be a single node that is a slack node
-        return problem.get_solution(elapsed=time.time() - start, iterations=0)
+        return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=0), trace)
 
     iter_ = 0
 
     # initialize the problem state
+    trace.start_iteration(iter_)
+    tic = trace.tic()
     error, converged, x, f = problem.update(x, update_controls=False)
+    trace.add_time('update', tic)
+    trace.set('error', error)
 
     # save the error evolution
     error_evolution = np.zeros(max_iter + 1)
@@ -58,23 +67,26 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
         print(f'It {iter_}, error {problem.error}, converged {problem.converged}, x {x}, dx not computed yet')
 
     if converged:
-        return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+        return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
     else:
 
         nu = 2.0
         obj_val_prev = 1e9  # very large number
 
+        tic = trace.tic()
         J = mat_to_scipy(problem.Jacobian())
+        trace.add_time('jacobian', tic)
+        trace.set('nnz', J.nnz)
 
         if J.shape[0] != J.shape[1]:
             logger.add_error("Jacobian not square, check the controls!", "Levenberg-Marquadt")
-            return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+            return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
         elif J.shape[0] != len(f):
             logger.add_error("Jacobian and residuals have different sizes!", "Levenberg-Marquadt",
                              value=len(f), expected_value=J.shape[0])
-            return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+            return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
         # system matrix
         # H1 = H^t
@@ -101,20 +113,26 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
 
             # update iteration counter
             iter_ += 1
+            trace.start_iteration(iter_)
 
             if verbose > 0:
                 print('-' * 200)
                 print(f'Iter: {iter_}')
                 print('-' * 200)
 
-            try:
+            # Solve the increment
+            tic = trace.tic()
+            factor = sparse_factorization.factor(sys_mat)
+            trace.add_time('factorization', tic)
 
-                # Solve the increment
-                dx = linear_solver(sys_mat, g)
-
-            except RuntimeError:
+            if factor is None:
                 logger.add_error(f"Levenberg-Marquardt's system matrix is singular @iter {iter_}:")
-                return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+                return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
+
+            trace.set('fill_in', factor.nnz - sys_mat.nnz)
+            tic = trace.tic()
+            dx = factor.solve(g)
+            trace.add_time('solve', tic)
 
             if verbose > 1:
                 print("H:\n", problem.get_jacobian_df(J))
@@ -132,7 +150,9 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
 
                 # update
                 update_controls = error < (tol * 100)
+                tic = trace.tic()
                 error, converged, x, f = problem.update(x - dx, update_controls=update_controls)
+                trace.add_time('controls' if update_controls else 'update', tic)
 
                 # record the previous objective function value
                 obj_val_prev = obj_val
@@ -141,16 +161,19 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
                 obj_val = 0.5 * f @ f
 
                 # update Jacobian and system matrix
+                tic = trace.tic()
                 J = mat_to_scipy(problem.Jacobian())
+                trace.add_time('jacobian', tic)
+                trace.set('nnz', J.nnz)
 
                 if J.shape[0] != J.shape[1]:
                     logger.add_error("Jacobian not square, check the controls!", "Levenberg-Marquadt")
-                    return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+                    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
                 elif J.shape[0] != len(f):
                     logger.add_error("Jacobian and residuals have different sizes!", "Levenberg-Marquadt",
                                      value=len(f), expected_value=J.shape[0])
-                    return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+                    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
                 # system matrix
                 # H1 = H^t
@@ -172,6 +195,7 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
 
             # save the error evolution
             error_evolution[iter_] = error
+            trace.set('error', error)
 
             if verbose > 0:
                 if verbose == 1:
@@ -179,5 +203,5 @@ def levenberg_marquardt_fx(problem: PfFormulationTemplate,
                 else:
                     print(f'error {error}, converged {converged}, x {x}, dx {dx}')
 
-    return problem.get_solution(elapsed=time.time() - start, iterations=iter_)
+    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iter_), trace)
 
@@ -6,6 +6,7 @@
 
 import time
 import warnings
+from typing import Tuple
 import scipy.sparse as sp
 import numpy as np
 
@@ -13,7 +14,8 @@ from VeraGridEngine.Utils.NumericalMethods.sparse_solve import get_sparse_type,
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 import VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions as cf
-from VeraGridEngine.basic_structures import CxVec, Vec, IntVec, CscMat
+from VeraGridEngine.Utils.Sparse.csc2 import sparse_factorization
+from VeraGridEngine.basic_structures import CxVec, Vec, IntVec, CscMat, Mat, CxMat
 from VeraGridEngine.enumerations import ConverterControlType
 
 linear_solver = get_linear_solver()
@@ -125,6 +127,64 @@ def linear_pf(nc: NumericalCircuit,
                                    elapsed=elapsed)
 
 
+def linear_pf_block(Ybus: sp.csc_matrix, Bpqpv: sp.csc_matrix, Bref: sp.csc_matrix, Bf: sp.csc_matrix, b: Vec,
+                    S0: CxMat, I0: CxMat, Y0: CxMat, V0: CxMat, tau: Mat,
+                    vd: IntVec, no_slack: IntVec, pq: IntVec) -> Tuple[CxMat, CxMat, Mat, Vec, bool]:
+    """
+    Solves the linear-DC power flow (as linear_pf) of a number of scenarios that share the susceptance matrix.
+    Bpqpv is factorized once and all the scenarios are solved as one multi-column right hand side,
+    and the branch flows of all the scenarios come out of one sparse-dense product.
+    :param Ybus: Normal circuit admittance matrix
+    :param Bpqpv: Susceptance matrix reduced
+    :param Bref: Susceptane matrix sliced for the slack node
+    :param Bf: Susceptance matrix of the Branches to nodes (used to include the phase shifters)
+    :param b: Array of branch susceptances (active / (X * tap_module))
+    :param S0: Complex power Injections matrix (scenarios, buses)
+    :param I0: Complex current Injections matrix (scenarios, buses)
+    :param Y0: Complex admittance Injections matrix (scenarios, buses)
+    :param V0: Complex seed voltage matrix (scenarios, buses), it contains the ref voltages
+    :param tau: Branch angles matrix (scenarios, branches)
+    :param vd: array of the indices of the slack nodes
+    :param no_slack: array of the indices of the non-slack nodes
+    :param pq: array of the indices of the pq nodes
+    :return: V (scenarios, buses), Scalc (scenarios, buses), Pf (scenarios, branches) in p.u.,
+             norm_f per scenario, ok (False if Bpqpv is singular)
+    """
+    Vm = np.abs(V0)
+    Va = np.angle(V0)
+    ok = True
+
+    if len(no_slack) > 0:
+        # compute the power injection
+        Sbus = cf.compute_zip_power(S0, I0, Y0, Vm)
+
+        # compose the reduced power injections (see linear_pf), one column per scenario
+        Pps = (Bf.T @ tau.T).T
+        Pinj = Sbus[:, no_slack].real - (Bref @ Va[:, vd].T).T * Vm[:, no_slack] + Pps[:, no_slack]
+
+        # update angles for non-reference buses
+        factor = sparse_factorization.factor(Bpqpv)
+        if factor is None:
+            Va[:, no_slack] = np.nan
+            ok = False
+        else:
+            Va[:, no_slack] = factor.solve(Pinj.T).T
+
+    # re assemble the voltage
+    V = Vm * np.exp(1j * Va)
+
+    # compute the calculated power injection and the error of the voltage solution
+    Scalc = V * np.conj((Ybus @ V.T).T)
+    dS = Scalc - S0
+    f = np.c_[dS[:, no_slack].real, dS[:, pq].imag]
+    norm_f = np.abs(f).max(axis=1) if f.shape[1] > 0 else np.zeros(f.shape[0])
+
+    # branch flows (see power_flow_post_process_linear)
+    Pf = (Bf @ np.angle(V).T).T - b * tau
+
+    return V, Scalc, Pf, norm_f, ok
+
+
 def acdc_lin_pf(nc: NumericalCircuit,
                 Bbus: sp.csc_matrix, Bf: sp.csc_matrix,
                 Gbus: sp.csc_matrix, Gf: sp.csc_matrix,
@@ -336,7 +396,8 @@ def acdc_lin_pf(nc: NumericalCircuit,
 
 def lacpf(nc: NumericalCircuit,
           Ybus: CscMat, Yf: CscMat, Yt: CscMat, Ys: CscMat, Yshunt_bus: CxVec,
-          S0: CxVec, V0: CxVec, pq: IntVec, pv: IntVec, vd: IntVec) -> NumericPowerFlowResults:
+          S0: CxVec, V0: CxVec, pq: IntVec, pv: IntVec, vd: IntVec,
+          branch_results: bool = True) -> NumericPowerFlowResults:
     """
     Linearized AC Load Flow
 
@@ -355,6 +416,7 @@ def lacpf(nc: NumericalCircuit,
     :param pq: list of indices of the pq nodes
     :param pv: list of indices of the pv nodes
     :param vd: Array with the indices of the slack buses
+    :param branch_results: compute the branch results (see power_flow_post_process_nonlinear)
     :return: NumericPowerFlowResults
     """
 
@@ -459,7 +521,8 @@ def lacpf(nc: NumericalCircuit,
         Yt=Yt,
         Yshunt_bus=Yshunt_bus,
         branch_rates=nc.passive_branch_data.rates,
-        Sbase=nc.Sbase
+        Sbase=nc.Sbase,
+        branch_results=branch_results
     )
 
     return NumericPowerFlowResults(V=V,
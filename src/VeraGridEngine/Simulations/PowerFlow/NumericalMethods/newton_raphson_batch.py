@@ -0,0 +1,228 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import time
+from typing import Tuple
+import numpy as np
+import numba as nb
+from scipy.sparse import csc_matrix
+from VeraGridEngine.Simulations.Derivatives.ac_jacobian import JacobianVc
+from VeraGridEngine.Simulations.Derivatives.csc_derivatives import dSbus_dV_numba_sparse_csc
+from VeraGridEngine.Utils.Sparse.csc2 import sparse_factorization
+from VeraGridEngine.basic_structures import Vec, Mat, CxVec, CxMat, IntVec, BoolVec, Logger
+
+
+@nb.njit(cache=True)
+def compute_power_batch(Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxMat) -> CxMat:
+    """
+    Compute the power injections of a number of voltage scenarios: S = V · conj(Ybus x V)
+    :param Yx: data of Ybus in CSC format
+    :param Yp: indptr of Ybus in CSC format
+    :param Yi: indices of Ybus in CSC format
+    :param V: voltages matrix (scenarios, buses)
+    :return: power injections matrix (scenarios, buses)
+    """
+    K, n = V.shape
+    S = np.empty((K, n), dtype=np.complex128)
+    I = np.empty(n, dtype=np.complex128)
+
+    for k in range(K):
+        I[:] = 0.0
+        for j in range(n):
+            for e in range(Yp[j], Yp[j + 1]):
+                I[Yi[e]] += Yx[e] * V[k, j]
+
+        for i in range(n):
+            S[k, i] = V[k, i] * np.conj(I[i])
+
+    return S
+
+
+@nb.njit(cache=True)
+def compute_jacobian_data_batch(Yx: CxVec, Yp: IntVec, Yi: IntVec, V: CxMat,
+                                J_indptr: IntVec, J_indices: IntVec, src: IntVec, n_no_slack: int) -> Mat:
+    """
+    Compute the data of the Jacobians of a number of voltage scenarios over the structure
+    computed by create_J_vc_pattern (see fill_J_vc_data)
+    :param Yx: data of Ybus in CSC format
+    :param Yp: indptr of Ybus in CSC format
+    :param Yi: indices of Ybus in CSC format
+    :param V: voltages matrix (scenarios, buses)
+    :param J_indptr: indptr of the Jacobian structure
+    :param J_indices: indices of the Jacobian structure
+    :param src: position in the Ybus data of the derivative that goes into every Jacobian entry
+    :param n_no_slack: length of idx_dtheta
+    :return: Jacobian data matrix (scenarios, nnz)
+    """
+    K = V.shape[0]
+    nnz = len(src)
+    Jx = np.empty((K, nnz))
+
+    for k in range(K):
+        Vk = V[k, :].copy()
+        dS_dVm_x, dS_dVa_x = dSbus_dV_numba_sparse_csc(Yx, Yp, Yi, Vk, np.abs(Vk))
+
+        for j in range(len(J_indptr) - 1):
+            for e in range(J_indptr[j], J_indptr[j + 1]):
+
+                if j < n_no_slack:
+                    val = dS_dVa_x[src[e]]
+                else:
+                    val = dS_dVm_x[src[e]]
+
+                if J_indices[e] < n_no_slack:
+                    Jx[k, e] = val.real  # dP
+                else:
+                    Jx[k, e] = val.imag  # dQ
+
+    return Jx
+
+
+def compute_fx_batch(Ybus: csc_matrix, V: CxMat, Vm: Mat, S0: CxMat, I0: CxVec, Y0: CxVec,
+                     idx_dP: IntVec, idx_dQ: IntVec) -> Tuple[Mat, Vec, CxMat]:
+    """
+    Compute the residuals of a number of scenarios
+    :param Ybus: Admittance matrix in CSC format
+    :param V: voltages matrix (scenarios, buses)
+    :param Vm: voltage modules matrix (scenarios, buses)
+    :param S0: specified power matrix (scenarios, buses)
+    :param I0: specified current vector
+    :param Y0: specified admittance vector
+    :param idx_dP: indices of the active power equations
+    :param idx_dQ: indices of the reactive power equations
+    :return: residuals (scenarios, equations), errors per scenario, calculated power (scenarios, buses)
+    """
+    Sbus = S0 + np.conj(I0 + Y0 * Vm) * Vm
+    Scalc = compute_power_batch(Ybus.data, Ybus.indptr, Ybus.indices, V)
+    dS = Scalc - Sbus
+    f = np.c_[dS[:, idx_dP].real, dS[:, idx_dQ].imag]
+    error = np.abs(f).max(axis=1) if f.shape[1] > 0 else np.zeros(f.shape[0])
+    return f, error, Scalc
+
+
+def newton_raphson_batch(Ybus: csc_matrix,
+                         S0: CxMat,
+                         V0: CxVec,
+                         I0: CxVec,
+                         Y0: CxVec,
+                         pv: IntVec,
+                         pq: IntVec,
+                         pqv: IntVec,
+                         p: IntVec,
+                         tol: float = 1e-6,
+                         max_iter: int = 10,
+                         trust: float = 1.0,
+                         logger: Logger = Logger()) -> Tuple[CxMat, CxMat, BoolVec, Vec, IntVec, float]:
+    """
+    Newton-Raphson with line search (as newton_raphson_fx with PfBasicFormulation)
+    advancing a number of injection scenarios of the same grid together.
+
+    All the scenarios share the Jacobian structure and the column ordering of its factorization,
+    the residuals and the Jacobian values are computed for all the scenarios at once, and
+    every scenario stops iterating when it converges. There are no controls: the scenarios
+    that need them (i.e. reactive power limits) must be solved again by the caller.
+
+    :param Ybus: Admittance matrix
+    :param S0: specified power matrix (scenarios, buses)
+    :param V0: initial voltage (the same for all the scenarios)
+    :param I0: specified current vector
+    :param Y0: specified admittance vector
+    :param pv: array of pv bus indices
+    :param pq: array of pq bus indices
+    :param pqv: array of pqv bus indices
+    :param p: array of p bus indices
+    :param tol: Error tolerance
+    :param max_iter: Maximum number of iterations
+    :param trust: trust amount in the derivative length correctness
+    :param logger: Logger instance
+    :return: V (scenarios, buses), Scalc (scenarios, buses), converged (scenarios),
+             error (scenarios), iterations (scenarios), elapsed seconds
+    """
+    start = time.time()
+
+    if Ybus.format != 'csc':
+        Ybus = Ybus.tocsc()
+
+    K = S0.shape[0]
+    idx_dVa = np.r_[pv, pq, pqv, p]
+    idx_dVm = np.r_[pq, p]
+    idx_dP = idx_dVa
+    idx_dQ = np.r_[pq, pqv]
+    a = len(idx_dVa)
+
+    Va = np.tile(np.angle(V0), (K, 1))
+    Vm = np.tile(np.abs(V0), (K, 1))
+    V = Vm * np.exp(1j * Va)
+    x = np.c_[Va[:, idx_dVa], Vm[:, idx_dVm]]
+
+    f, error, Scalc = compute_fx_batch(Ybus, V, Vm, S0, I0, Y0, idx_dP, idx_dQ)
+    converged = error < tol
+    iterations = np.zeros(K, dtype=int)
+
+    if x.shape[1] == 0:
+        return V, Scalc, converged, error, iterations, time.time() - start
+
+    # Jacobian structure, shared by all the scenarios
+    jac = JacobianVc()
+    J0 = jac.compute(Ybus, V0, idx_dVa, idx_dVm, idx_dP, idx_dQ)
+    J = csc_matrix((np.empty(J0.nnz), J0.indices, J0.indptr), shape=(J0.n_rows, J0.n_cols))
+
+    trust0 = trust if trust <= 1.0 else 1.0  # trust radius in NR should not be greater than 1
+    active = ~converged
+    iteration = 0
+
+    while active.any() and iteration < max_iter:
+
+        iteration += 1
+        act = np.where(active)[0]
+        iterations[act] = iteration
+
+        Jx = compute_jacobian_data_batch(Ybus.data, Ybus.indptr, Ybus.indices, V[act, :],
+                                         J0.indptr, J0.indices, jac.src, a)
+
+        # compute the update steps: J x Δx = Δg
+        dx = np.zeros((len(act), x.shape[1]))
+        for i, k in enumerate(act):
+            J.data[:] = Jx[i, :]
+            dx[i, :], ok = sparse_factorization.solve(J, -f[k, :])
+
+            if not ok:
+                logger.add_error(f"Newton-Raphson's Jacobian is singular @iter {iteration}:", value=int(k))
+                active[k] = False
+
+        # line search: reduce the step of the scenarios whose error increases
+        mu = np.full(len(act), trust0)
+        x_sol = x[act, :].copy()
+        pending = active[act].copy()
+        Va_t = Va[act, :]
+        Vm_t = Vm[act, :]
+        f_t = f[act, :]
+        error_t = error[act]
+        Scalc_t = Scalc[act, :]
+
+        while pending.any():
+            r = np.where(pending)[0]
+            x_sol[r, :] = x[act[r], :] + dx[r, :] * mu[r, np.newaxis]
+            Va_t[np.ix_(r, idx_dVa)] = x_sol[r, :a]
+            Vm_t[np.ix_(r, idx_dVm)] = x_sol[r, a:]
+            f_t[r, :], error_t[r], Scalc_t[r, :] = compute_fx_batch(Ybus, Vm_t[r, :] * np.exp(1j * Va_t[r, :]),
+                                                                    Vm_t[r, :], S0[act[r], :], I0, Y0,
+                                                                    idx_dP, idx_dQ)
+            mu[r] *= 0.25
+            pending[r] = (error_t[r] >= error[act[r]]) & (mu[r] > tol)
+
+        # update the scenarios that are still active
+        keep = active[act]
+        upd = act[keep]
+        x[upd, :] = x_sol[keep, :]
+        Va[upd, :] = Va_t[keep, :]
+        Vm[upd, :] = Vm_t[keep, :]
+        V[upd, :] = Vm[upd, :] * np.exp(1j * Va[upd, :])
+        f[upd, :] = f_t[keep, :]
+        error[upd] = error_t[keep]
+        Scalc[upd, :] = Scalc_t[keep, :]
+        converged[upd] = error[upd] < tol
+        active[upd] = ~converged[upd]
+
+    return V, Scalc, converged, error, iterations, time.time() - start
@@ -2,12 +2,91 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
 import time
+from typing import List, Tuple
 import numpy as np
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.Formulations.pf_formulation_template import PfFormulationTemplate
-from VeraGridEngine.Utils.Sparse.csc2 import CSC, spsolve_csc
-from VeraGridEngine.basic_structures import Logger
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.iteration_trace import IterationTrace
+from VeraGridEngine.Utils.Sparse.csc2 import (CSC, SparseFactorization, KrylovSolver, sparse_factorization,
+                                              get_bordered_factor)
+from VeraGridEngine.basic_structures import Logger, IntVec
+from VeraGridEngine.enumerations import JacobianReusePolicy
+
+
+def get_problem_structure(problem: PfFormulationTemplate) -> Tuple[List[str], List[str]]:
+    """
+    Get the names of the variables and the equations of a problem,
+    these change when the controls modify the structure of the Jacobian
+    :param problem: PfFormulationTemplate
+    :return: names of the variables, names of the equations
+    """
+    return problem.get_x_names(), problem.get_fx_names()
+
+
+def get_positions(names: List[str], new_names: List[str]) -> None | Tuple[IntVec, IntVec]:
+    """
+    Get the positions in a list of names of the names of another list
+    :param names: old names
+    :param new_names: new names
+    :return: positions of the old names in new_names, positions of the added names (None if any name is missing)
+    """
+    pos = {name: i for i, name in enumerate(new_names)}
+    old = np.array([pos.get(name, -1) for name in names], dtype=int)
+
+    if (old < 0).any():
+        return None
+
+    added = np.ones(len(new_names), dtype=bool)
+    added[old] = False
+    return old, np.where(added)[0]
+
+
+def get_structure_extension(structure: Tuple[List[str], List[str]],
+                            new_structure: Tuple[List[str], List[str]]) -> None | Tuple[IntVec, IntVec, IntVec, IntVec]:
+    """
+    Check if a problem structure only adds variables and equations to another (i.e. PV buses switched to PQ),
+    in that case the new Jacobian is the old one bordered by the new rows and columns
+    :param structure: old structure (see get_problem_structure)
+    :param new_structure: new structure
+    :return: None if the new structure does not extend the old one, otherwise the positions in the new Jacobian of:
+             the old rows, the old columns, the added rows and the added columns
+    """
+    cols = get_positions(structure[0], new_structure[0])
+    rows = get_positions(structure[1], new_structure[1])
+
+    if cols is None or rows is None:
+        return None
+
+    rows_a, rows_b = rows
+    cols_a, cols_b = cols
+
+    if len(cols_b) == 0 or len(rows_b) != len(cols_b):
+        return None
+
+    return rows_a, cols_a, rows_b, cols_b
+
+
+def get_nr_solution(problem: PfFormulationTemplate, start: float, iterations: int,
+                    n_factorizations: int, n_linear_iterations: int,
+                    trace: IterationTrace | None) -> NumericPowerFlowResults:
+    """
+    Get the solution of the problem with the Newton-Raphson statistics
+    :param problem: PfFormulationTemplate
+    :param start: start time
+    :param iterations: number of iterations
+    :param n_factorizations: number of Jacobian factorizations
+    :param n_linear_iterations: number of iterations of the Krylov linear solver
+    :param trace: IterationTrace (None if disabled)
+    :return: NumericPowerFlowResults
+    """
+    solution = problem.get_solution(elapsed=time.time() - start, iterations=iterations)
+    solution.n_factorizations = n_factorizations
+    solution.n_linear_iterations = n_linear_iterations
+    solution.trace = trace
+    return solution
 
 
 def newton_raphson_fx(problem: PfFormulationTemplate,
@@ -15,7 +94,13 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
                       max_iter: int = 10,
                       trust: float = 1.0,
                       verbose: int = 0,
-                      logger: Logger = Logger()) -> NumericPowerFlowResults:
+                      logger: Logger = Logger(),
+                      reuse_policy: JacobianReusePolicy = JacobianReusePolicy.Always,
+                      refresh_period: int = 3,
+                      refresh_ratio: float = 0.5,
+                      linear_solver: SparseFactorization | KrylovSolver = sparse_factorization,
+                      trace: IterationTrace | None = None,
+                      max_border: int = 64) -> NumericPowerFlowResults:
     """
     Newton-Raphson with Line search to solve:
 
@@ -23,16 +108,37 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
         s.t.
             g(x) = 0
 
+    With a reuse policy other than Always, this is a chord (dishonest) Newton-Raphson:
+    the Jacobian factorization is kept for several iterations, and it is refreshed when
+    the policy says so, when a step with the old factorization does not reduce the error,
+    or when the controls change the structure of the problem. If the controls only add
+    variables and equations (i.e. PV buses switched to PQ), the old factorization is extended
+    with the new rows and columns of the Jacobian (bordered system) instead of refreshing it.
+
+    With a KrylovSolver, the steps are solved with GMRES or BiCGSTAB preconditioned with an
+    incomplete LU that the solver keeps across iterations and calls.
+
     :param problem: PfFormulationTemplate
     :param tol: Error tolerance
     :param max_iter: Maximum number of iterations
     :param trust: trust amount in the derivative length correctness
     :param verbose:  Display console information
     :param logger: Logger instance
+    :param reuse_policy: When to refresh the Jacobian factorization
+    :param refresh_period: Iterations between refreshes with JacobianReusePolicy.EveryK
+    :param refresh_ratio: With JacobianReusePolicy.ReductionRatio, the factorization is refreshed
+                          when an iteration does not bring the error below this fraction of the previous one
+    :param linear_solver: sparse_factorization (direct) or a KrylovSolver (see get_krylov_solver)
+    :param trace: IterationTrace to record the time and the statistics of every iteration (None to skip)
+    :param max_border: Maximum number of rows and columns that can border the last factorization,
+                       when the controls add more, the factorization is refreshed
     :return: ConvexMethodResult
     """
     start = time.time()
 
+    if trace is not None and not trace.enabled:
+        trace = None  # the instrumentation is skipped altogether
+
     # get the initial point
     x = problem.var2x()
 
@@ -42,7 +148,14 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
         return problem.get_solution(elapsed=time.time() - start, iterations=0)
 
     # set the problem state
-    error, converged, _, f = problem.update(x, update_controls=False)
+    if trace is not None:
+        trace.start_iteration(0)
+        tic = trace.tic()
+        error, converged, _, f = problem.update(x, update_controls=False)
+        trace.add_time('update', tic)
+        trace.set('error', error)
+    else:
+        error, converged, _, f = problem.update(x, update_controls=False)
 
     iteration = 0
     error0 = error
@@ -52,6 +165,14 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
     # save the error evolution
     error_evolution[iteration] = problem.error
 
+    # Jacobian factorization state
+    factor = None
+    n_factorizations = 0
+    n_linear_iterations = 0
+    last_refresh = 0
+    border_size = 0
+    refresh = True
+
     if verbose > 0:
         print('-' * 200)
         print(f'Iter: {iteration}')
@@ -59,7 +180,7 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
         print("x:\n", problem.get_x_df(x))
 
     if problem.converged:
-        return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+        return get_nr_solution(problem, start, iteration, n_factorizations, n_linear_iterations, trace)
 
     else:
 
@@ -70,48 +191,132 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
 
             # update iteration counter
             iteration += 1
+            if trace is not None:
+                trace.start_iteration(iteration)
 
             if verbose > 0:
                 print('-' * 200)
                 print(f'Iter: {iteration}')
                 print('-' * 200)
 
-            J: CSC = problem.Jacobian()
+            if reuse_policy == JacobianReusePolicy.Always:
+                refresh = True
+            elif reuse_policy == JacobianReusePolicy.EveryK and iteration - last_refresh >= refresh_period:
+                refresh = True
+
+            if refresh:
+                if trace is not None:
+                    tic = trace.tic()
+                    J: CSC = problem.Jacobian()
+                    trace.add_time('jacobian', tic)
+                    trace.set('nnz', J.nnz)
+                else:
+                    J: CSC = problem.Jacobian()
 
-            if J.shape[0] != J.shape[1]:
-                logger.add_error("Jacobian not square, check the controls!", "Newton-Raphson",
-                                 value=J.shape[0], expected_value=J.shape[1])
-                return problem.get_solution(elapsed=time.time() - start, iterations=iteration, )
+                if J.shape[0] != J.shape[1]:
+                    logger.add_error("Jacobian not square, check the controls!", "Newton-Raphson",
+                                     value=J.shape[0], expected_value=J.shape[1])
+                    return get_nr_solution(problem, start, iteration, n_factorizations, n_linear_iterations, trace)
 
-            if J.shape[0] != len(f):
-                logger.add_error("Jacobian and residuals have different sizes!", "Newton-Raphson",
-                                 value=len(f), expected_value=J.shape[0])
-                return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+                if J.shape[0] != len(f):
+                    logger.add_error("Jacobian and residuals have different sizes!", "Newton-Raphson",
+                                     value=len(f), expected_value=J.shape[0])
+                    return get_nr_solution(problem, start, iteration, n_factorizations, n_linear_iterations, trace)
 
-            try:
+                # factorize J, the factors are reused by the next iterations if the policy allows it
+                if trace is not None:
+                    tic = trace.tic()
+                    factor = linear_solver.factor(J)
+                    trace.add_time('factorization', tic)
+                else:
+                    factor = linear_solver.factor(J)
+                n_factorizations += 1
+                last_refresh = iteration
+                border_size = 0
 
-                # compute update step: J x Δx = Δg
-                dx, ok = spsolve_csc(J, -f)
+                if factor is None:
+                    logger.add_error(f"Newton-Raphson's Jacobian is singular @iter {iteration}:")
+                    print("(newton_raphson_fx.py) Singular Jacobian")
+                    return get_nr_solution(problem, start, iteration, n_factorizations, n_linear_iterations, trace)
 
-            except RuntimeError:
-                logger.add_error(f"Newton-Raphson's Jacobian is singular @iter {iteration}:")
-                print("(newton_raphson_fx.py) Singular Jacobian")
-                return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+                if trace is not None:
+                    trace.set('fill_in', factor.nnz - J.nnz)
 
-            if not ok:
-                logger.add_error(f"Newton-Raphson's Jacobian is singular @iter {iteration}:")
-                print("(newton_raphson_fx.py) Singular Jacobian")
-                return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+            else:
+                J = None
+
+            # compute update step: J x Δx = Δg
+            if trace is not None:
+                tic = trace.tic()
+                dx = factor.solve(-f)
+                trace.add_time('solve', tic)
+                trace.set('linear_iterations', factor.last_iterations)
+            else:
+                dx = factor.solve(-f)
+            n_linear_iterations += factor.last_iterations
 
             # line search
             mu = trust0
             x_sol = x
+            tic = trace.tic() if trace is not None else 0.0
+            n_trials = 0
             while not converged and mu > tol and error >= error0:
                 error, x_sol = problem.check_error(x + dx * mu)
                 mu *= 0.25
+                n_trials += 1
+            if trace is not None:
+                trace.add_time('line_search', tic)
+                trace.add('line_search_trials', n_trials)
+
+            if not refresh and error >= error0:
+                # the old factorization did not provide a descent direction: refresh it and try again
+                error = error0
+                refresh = True
+                continue
 
             update_controls = error < (tol * 100)
-            error, converged, x, f = problem.update(x=x_sol, update_controls=update_controls)
+
+            # the controls may change the variables or the equations, invalidating the factorization
+            structure = get_problem_structure(problem) if (update_controls and
+                                                           reuse_policy != JacobianReusePolicy.Always) else None
+
+            if trace is not None:
+                tic = trace.tic()
+                error, converged, x, f = problem.update(x=x_sol, update_controls=update_controls)
+                trace.add_time('controls' if update_controls else 'update', tic)
+                trace.set('error', error)
+            else:
+                error, converged, x, f = problem.update(x=x_sol, update_controls=update_controls)
+
+            refresh = reuse_policy == JacobianReusePolicy.ReductionRatio and error > refresh_ratio * error0
+
+            if not refresh and structure is not None:
+                new_structure = get_problem_structure(problem)
+
+                if new_structure != structure:
+                    # border the factorization with the added variables and equations if possible
+                    refresh = True
+                    extension = get_structure_extension(structure, new_structure)
+
+                    if extension is not None and border_size + len(extension[3]) <= max_border:
+                        if trace is not None:
+                            tic = trace.tic()
+                            J = problem.Jacobian()
+                            trace.add_time('jacobian', tic)
+
+                            tic = trace.tic()
+                            bordered = get_bordered_factor(factor, J, *extension)
+                            trace.add_time('factorization', tic)
+                        else:
+                            J = problem.Jacobian()
+                            bordered = get_bordered_factor(factor, J, *extension)
+
+                        if bordered is not None:
+                            factor = bordered
+                            border_size += len(extension[3])
+                            refresh = False
+                            if trace is not None:
+                                trace.set('bordered', len(extension[3]))
 
             if verbose > 1:
                 print("x:\n", problem.get_x_df(x))
@@ -121,7 +326,8 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
             error_evolution[iteration] = error
 
             if verbose > 1:
-                print("J:\n", problem.get_jacobian_df(J))
+                if J is not None:
+                    print("J:\n", problem.get_jacobian_df(J))
                 print("f:\n", problem.get_f_df(f))
                 print("dx:\n", problem.get_x_df(dx))
                 print("x:\n", problem.get_x_df(x))
@@ -130,4 +336,4 @@ def newton_raphson_fx(problem: PfFormulationTemplate,
             elif verbose == 1:
                 print(f'It {iteration}, error {error}, converged {converged}')
 
-    return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+    return get_nr_solution(problem, start, iteration, n_factorizations, n_linear_iterations, trace)
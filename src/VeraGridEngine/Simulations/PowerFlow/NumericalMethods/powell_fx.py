@@ -2,18 +2,18 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
 import time
 from typing import Tuple
 import numpy as np
-from VeraGridEngine.Utils.NumericalMethods.sparse_solve import get_linear_solver
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.Formulations.pf_formulation_template import PfFormulationTemplate
-from VeraGridEngine.Utils.Sparse.csc2 import mat_to_scipy
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.iteration_trace import IterationTrace, set_trace
+from VeraGridEngine.Utils.Sparse.csc2 import mat_to_scipy, sparse_factorization
 from VeraGridEngine.basic_structures import Logger, Vec
 from VeraGridEngine.Utils.NumericalMethods.common import norm
 
-linear_solver = get_linear_solver()
-
 
 def compute_beta(a: Vec, b: Vec, delta: float):
     """
@@ -63,7 +63,8 @@ def powell_fx(problem: PfFormulationTemplate,
               max_iter: int = 10,
               trust: float = 1.0,
               verbose: int = 0,
-              logger: Logger = Logger()) -> NumericPowerFlowResults:
+              logger: Logger = Logger(),
+              trace: IterationTrace | None = None) -> NumericPowerFlowResults:
     """
     Powell's Dog leg algorithm to solve:
 
@@ -79,36 +80,47 @@ def powell_fx(problem: PfFormulationTemplate,
     :param trust: trust amount in the derivative length correctness
     :param verbose:  Display console information
     :param logger: Logger instance
+    :param trace: IterationTrace to record the time and the statistics of every iteration (None to skip)
     :return: ConvexMethodResult
     """
     start = time.time()
 
+    if trace is None:
+        trace = IterationTrace(enabled=False)
+
     # get the initial point
     x = problem.var2x()
 
     if len(x) == 0:
         # if the length of x is zero, means that there's nothing to solve
         # for instance there might be a single node that is a slack node
-        return problem.get_solution(elapsed=time.time() - start, iterations=0)
+        return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=0), trace)
 
     delta = trust
+    trace.start_iteration(0)
+    tic = trace.tic()
     f_error, converged, x, f = problem.update(x, update_controls=False)
+    trace.add_time('update', tic)
+    trace.set('error', f_error)
 
     if problem.converged:
-        return problem.get_solution(elapsed=time.time() - start, iterations=0)
+        return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=0), trace)
 
     else:
 
+        tic = trace.tic()
         J = mat_to_scipy(problem.Jacobian())
+        trace.add_time('jacobian', tic)
+        trace.set('nnz', J.nnz)
 
         if J.shape[0] != J.shape[1]:
             logger.add_error("Jacobian not square, check the controls!", "Powell")
-            return problem.get_solution(elapsed=time.time() - start, iterations=0)
+            return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=0), trace)
 
         if J.shape[0] != len(f):
             logger.add_error("Jacobian and residuals have different sizes!", "Powell",
                              value=len(f), expected_value=J.shape[0])
-            return problem.get_solution(elapsed=time.time() - start, iterations=0)
+            return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=0), trace)
 
         g = J.T @ f
 
@@ -125,6 +137,7 @@ def powell_fx(problem: PfFormulationTemplate,
 
             # update iteration counter
             iteration += 1
+            trace.start_iteration(iteration)
 
             # compute alpha (3.19)
             g_proy = J @ g
@@ -136,15 +149,19 @@ def powell_fx(problem: PfFormulationTemplate,
                 print(f'Iter: {iteration}')
                 print('-' * 200)
 
-            # compute update step
-            try:
+            # compute update step: J x Δx = Δg
+            tic = trace.tic()
+            factor = sparse_factorization.factor(J)
+            trace.add_time('factorization', tic)
 
-                # compute update step: J x Δx = Δg
-                hgn = linear_solver(J, -f)
-
-            except RuntimeError:
+            if factor is None:
                 logger.add_error(f"Powell's system matrix is singular @iter {iteration}:")
-                return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+                return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iteration), trace)
+
+            trace.set('fill_in', factor.nnz - J.nnz)
+            tic = trace.tic()
+            hgn = factor.solve(-f)
+            trace.add_time('solve', tic)
 
             # compute hdl (3.20)
             hdl, L0_Lhdl = compute_hdl(hgn=hgn, hsd=hsd, g=g, alpha=alpha, delta=delta, f_error=f_error)
@@ -156,21 +173,26 @@ def powell_fx(problem: PfFormulationTemplate,
 
             # tol2 = tol * (norm(x) + tol)
             update_controls = f_error < (tol * 100)
+            tic = trace.tic()
             f_error_new, converged, x, f = problem.update(x + hdl, update_controls=update_controls)
+            trace.add_time('controls' if update_controls else 'update', tic)
 
             rho = (f_error - f_error_new) / L0_Lhdl if L0_Lhdl > 0 else -1.0
 
             if rho > 0.0 or len(f) != J.shape[0]:
+                tic = trace.tic()
                 J = mat_to_scipy(problem.Jacobian())  # compute the Jacobian too
+                trace.add_time('jacobian', tic)
+                trace.set('nnz', J.nnz)
 
                 if J.shape[0] != J.shape[1]:
                     logger.add_error("Jacobian not square, check the controls!", "Powell")
-                    return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+                    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iteration), trace)
 
                 if J.shape[0] != len(f):
                     logger.add_error("Jacobian and residuals have different sizes!", "Powell",
                                      value=len(f), expected_value=J.shape[0])
-                    return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+                    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iteration), trace)
 
                 g = J.T @ f
                 f_error = f_error_new
@@ -186,6 +208,7 @@ def powell_fx(problem: PfFormulationTemplate,
 
             # save the error evolution
             error_evolution[iteration] = f_error
+            trace.set('error', f_error)
 
             if verbose > 0:
                 if verbose == 1:
@@ -193,4 +216,4 @@ def powell_fx(problem: PfFormulationTemplate,
                 else:
                     print(f'error {f_error}, converged {converged}, x {x}, dx {hdl}')
 
-    return problem.get_solution(elapsed=time.time() - start, iterations=iteration)
+    return set_trace(problem.get_solution(elapsed=time.time() - start, iterations=iteration), trace)
@@ -13,12 +13,6 @@ from VeraGridEngine.Simulations.PowerFlow.power_flow_results import PowerFlowRes
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results_3ph import PowerFlowResults3Ph
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
-from VeraGridEngine.Compilers.circuit_to_bentayga import (BENTAYGA_AVAILABLE, bentayga_pf,
-                                                          translate_bentayga_pf_results)
-from VeraGridEngine.Compilers.circuit_to_newton_pa import (NEWTON_PA_AVAILABLE, newton_pa_pf,
-                                                           translate_newton_pa_pf_results)
-from VeraGridEngine.Compilers.circuit_to_gslv import (GSLV_AVAILABLE, gslv_pf, translate_gslv_pf_results)
-from VeraGridEngine.Compilers.circuit_to_pgm import PGM_AVAILABLE, pgm_pf
 from VeraGridEngine.enumerations import EngineType, SimulationTypes
 
 if TYPE_CHECKING:  # Only imports the below statements during type checking
@@ -126,21 +120,30 @@ class PowerFlowDriver(DriverTemplate):
         Pack run_pf for the QThread
         """
         self.tic()
-        if self.engine == EngineType.GSLV and not GSLV_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed back to VeraGrid')
-
-        if self.engine == EngineType.NewtonPA and not NEWTON_PA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed back to VeraGrid')
-
-        if self.engine == EngineType.Bentayga and not BENTAYGA_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed back to VeraGrid')
-
-        if self.engine == EngineType.PGM and not PGM_AVAILABLE:
-            self.engine = EngineType.VeraGrid
-            self.logger.add_warning('Failed back to VeraGrid')
+        if self.engine == EngineType.GSLV:
+            # the third party engines are only imported when selected
+            from VeraGridEngine.Compilers.circuit_to_gslv import GSLV_AVAILABLE
+            if not GSLV_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed back to VeraGrid')
+
+        if self.engine == EngineType.NewtonPA:
+            from VeraGridEngine.Compilers.circuit_to_newton_pa import NEWTON_PA_AVAILABLE
+            if not NEWTON_PA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed back to VeraGrid')
+
+        if self.engine == EngineType.Bentayga:
+            from VeraGridEngine.Compilers.circuit_to_bentayga import BENTAYGA_AVAILABLE
+            if not BENTAYGA_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed back to VeraGrid')
+
+        if self.engine == EngineType.PGM:
+            from VeraGridEngine.Compilers.circuit_to_pgm import PGM_AVAILABLE
+            if not PGM_AVAILABLE:
+                self.engine = EngineType.VeraGrid
+                self.logger.add_warning('Failed back to VeraGrid')
 
         if self.engine == EngineType.VeraGrid:
 
@@ -170,6 +173,7 @@ class PowerFlowDriver(DriverTemplate):
                                                    logger=self.logger)
 
             else:
+                from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_pf, translate_newton_pa_pf_results
                 res = newton_pa_pf(circuit=self.grid, pf_opt=self.options, time_series=False)
 
                 self.results = PowerFlowResults(n=self.grid.get_bus_number(),
@@ -204,6 +208,7 @@ class PowerFlowDriver(DriverTemplate):
                                                    logger=self.logger)
 
             else:
+                from VeraGridEngine.Compilers.circuit_to_gslv import gslv_pf, translate_gslv_pf_results
 
                 res = gslv_pf(circuit=self.grid,
                               pf_opt=self.options,
@@ -225,6 +230,7 @@ class PowerFlowDriver(DriverTemplate):
                                                    logger=self.logger)
 
             else:
+                from VeraGridEngine.Compilers.circuit_to_bentayga import bentayga_pf, translate_bentayga_pf_results
 
                 res = bentayga_pf(self.grid, self.options, time_series=False)
 
@@ -260,6 +266,7 @@ class PowerFlowDriver(DriverTemplate):
                                                    logger=self.logger)
 
             else:
+                from VeraGridEngine.Compilers.circuit_to_pgm import pgm_pf
 
                 self.results = pgm_pf(self.grid, self.options, logger=self.logger)
                 self.results.area_names = [a.name for a in self.grid.areas]
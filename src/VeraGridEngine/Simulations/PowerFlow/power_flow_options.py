@@ -3,7 +3,8 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 
-from VeraGridEngine.enumerations import BranchImpedanceMode, SolverType
+from VeraGridEngine.enumerations import (BranchImpedanceMode, SolverType, JacobianReusePolicy, SparseSolver,
+                                         IslandSolvingMode)
 from VeraGridEngine.Simulations.options_template import OptionsTemplate
 
 
@@ -34,7 +35,21 @@ class PowerFlowOptions(OptionsTemplate):
                  use_stored_guess: bool = False,
                  initialize_angles: bool = False,
                  generate_report: bool = False,
-                 three_phase_unbalanced: bool = False):
+                 three_phase_unbalanced: bool = False,
+                 grouped_time_series: bool = False,
+                 n_workers: int = 1,
+                 jacobian_reuse_policy: JacobianReusePolicy = JacobianReusePolicy.Always,
+                 jacobian_refresh_period: int = 3,
+                 jacobian_refresh_ratio: float = 0.5,
+                 linear_solver: SparseSolver = SparseSolver.SuperLU,
+                 krylov_tolerance: float = 1e-8,
+                 krylov_max_iter: int = 200,
+                 ilu_drop_tol: float = 1e-4,
+                 ilu_fill_factor: float = 10.0,
+                 ilu_refresh_growth: float = 2.0,
+                 island_solving_mode: IslandSolvingMode = IslandSolvingMode.Serial,
+                 island_workers: int = 0,
+                 trace_iterations: bool = False):
         """
         Power flow options class
         :param solver_type: Solver type
@@ -53,6 +68,27 @@ class PowerFlowOptions(OptionsTemplate):
         :param use_stored_guess: Use the existing solution from the Bus class (Vm0, Va0)
         :param initialize_angles: Use a linear power flow to initialize the voltage guess
         :param generate_report: Generate the power flow report after the solution?
+        :param grouped_time_series: Run the time series grouped by topology, starting every step from the previous one
+        :param n_workers: Number of processes used to run the time series
+        :param jacobian_reuse_policy: When the Newton-Raphson refreshes the Jacobian factorization
+                                      (Always is the regular Newton-Raphson)
+        :param jacobian_refresh_period: Iterations between Jacobian refreshes with JacobianReusePolicy.EveryK
+        :param jacobian_refresh_ratio: With JacobianReusePolicy.ReductionRatio, the Jacobian is refreshed when an
+                                       iteration does not bring the error below this fraction of the previous one
+        :param linear_solver: Linear solver of the Newton-Raphson steps: SuperLU (direct) or
+                              GMRES / BiCGSTAB (Krylov with an incomplete LU preconditioner that is reused)
+        :param krylov_tolerance: Relative tolerance of the Krylov linear solver
+        :param krylov_max_iter: Maximum number of iterations of the Krylov linear solver
+                                (for GMRES, inner iterations including those of every restart cycle)
+        :param ilu_drop_tol: Drop tolerance of the incomplete LU preconditioner
+        :param ilu_fill_factor: Fill factor of the incomplete LU preconditioner
+        :param ilu_refresh_growth: The preconditioner is refreshed when the Krylov iterations grow
+                                   above this factor of the iterations after its last refresh
+        :param island_solving_mode: Solve the islands one after the other, or concurrently in a pool
+                                    of threads or processes
+        :param island_workers: Number of threads or processes used to solve the islands (0: number of CPUs)
+        :param trace_iterations: Record the time per phase and the statistics of every iteration of
+                                 the Newton-like solvers (see PowerFlowResults.get_trace_df)
         """
         OptionsTemplate.__init__(self, name='PowerFlowOptions')
 
@@ -100,6 +136,34 @@ class PowerFlowOptions(OptionsTemplate):
 
         self.three_phase_unbalanced = three_phase_unbalanced
 
+        self.grouped_time_series = grouped_time_series
+
+        self.n_workers = n_workers
+
+        self.jacobian_reuse_policy = jacobian_reuse_policy
+
+        self.jacobian_refresh_period = jacobian_refresh_period
+
+        self.jacobian_refresh_ratio = jacobian_refresh_ratio
+
+        self.linear_solver = linear_solver
+
+        self.krylov_tolerance = krylov_tolerance
+
+        self.krylov_max_iter = krylov_max_iter
+
+        self.ilu_drop_tol = ilu_drop_tol
+
+        self.ilu_fill_factor = ilu_fill_factor
+
+        self.ilu_refresh_growth = ilu_refresh_growth
+
+        self.island_solving_mode = island_solving_mode
+
+        self.island_workers = island_workers
+
+        self.trace_iterations = trace_iterations
+
         self.register(key="solver_type", tpe=SolverType)
         self.register(key="retry_with_other_methods", tpe=bool)
         self.register(key="tolerance", tpe=float)
@@ -121,4 +185,18 @@ class PowerFlowOptions(OptionsTemplate):
         self.register(key="use_stored_guess", tpe=bool)
         self.register(key="initialize_angles", tpe=bool)
         self.register(key="generate_report", tpe=bool)
-        self.register(key="three_phase_unbalanced", tpe=bool)
\ No newline at end of file
+        self.register(key="three_phase_unbalanced", tpe=bool)
+        self.register(key="grouped_time_series", tpe=bool)
+        self.register(key="n_workers", tpe=int)
+        self.register(key="jacobian_reuse_policy", tpe=JacobianReusePolicy)
+        self.register(key="jacobian_refresh_period", tpe=int)
+        self.register(key="jacobian_refresh_ratio", tpe=float)
+        self.register(key="linear_solver", tpe=SparseSolver)
+        self.register(key="krylov_tolerance", tpe=float)
+        self.register(key="krylov_max_iter", tpe=int)
+        self.register(key="ilu_drop_tol", tpe=float)
+        self.register(key="ilu_fill_factor", tpe=float)
+        self.register(key="ilu_refresh_growth", tpe=float)
+        self.register(key="island_solving_mode", tpe=IslandSolvingMode)
+        self.register(key="island_workers", tpe=int)
+        self.register(key="trace_iterations", tpe=bool)
\ No newline at end of file
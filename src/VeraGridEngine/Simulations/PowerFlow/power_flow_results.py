@@ -5,9 +5,8 @@
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
-from typing import List, Tuple
+from VeraGridEngine.Utils.lazy_import import lazy_import
+from typing import List, Tuple, Dict
 
 from VeraGridEngine.Simulations.results_table import ResultsTable
 from VeraGridEngine.Simulations.results_template import ResultsTemplate
@@ -15,6 +14,9 @@ from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, CxVec, ConvergenceReport, Logger
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 
 class NumericPowerFlowResults:
     """
@@ -107,6 +109,15 @@ class NumericPowerFlowResults:
         self.elapsed = elapsed
         self.method = None
 
+        # number of Jacobian factorizations (Newton-Raphson methods)
+        self.n_factorizations = 0
+
+        # number of iterations of the Krylov linear solver (Newton-Raphson methods)
+        self.n_linear_iterations = 0
+
+        # per-iteration trace (IterationTrace), if requested
+        self.trace = None
+
 
 class PowerFlowResults(ResultsTemplate):
 
@@ -358,6 +369,55 @@ class PowerFlowResults(ResultsTemplate):
             val = max(val, conv.iterations())
         return val
 
+    @property
+    def factorizations(self) -> int:
+        """
+        Total number of Jacobian factorizations
+        :return: int
+        """
+        return sum(conv.factorizations() for conv in self.convergence_reports)
+
+    @property
+    def linear_iterations(self) -> int:
+        """
+        Total number of iterations of the Krylov linear solver
+        :return: int
+        """
+        return sum(conv.linear_iterations() for conv in self.convergence_reports)
+
+    def get_trace_df(self) -> pd.DataFrame:
+        """
+        Get the per-iteration traces of all the islands and methods
+        (recorded with PowerFlowOptions.trace_iterations)
+        :return: DataFrame with the island index, the method and the IterationTrace columns
+        """
+        frames = list()
+        for island_idx, report in enumerate(self.convergence_reports):
+            for method, trace in zip(report.methods_, report.traces_):
+                if trace is not None:
+                    df = trace.to_dataframe()
+                    df.insert(0, 'Method', str(method))
+                    df.insert(0, 'Island', island_idx)
+                    frames.append(df)
+
+        if len(frames):
+            return pd.concat(frames, ignore_index=True)
+        else:
+            return pd.DataFrame()
+
+    def get_trace_phase_totals(self) -> Dict[str, float]:
+        """
+        Get the total time spent in every phase of the traced iterations
+        :return: dictionary phase: seconds
+        """
+        totals = dict()
+        for report in self.convergence_reports:
+            for trace in report.traces_:
+                if trace is not None:
+                    for phase, val in trace.get_phase_totals().items():
+                        totals[phase] = totals.get(phase, 0.0) + val
+        return totals
+
     def apply_from_island(self,
                           results: NumericPowerFlowResults,
                           b_idx: np.ndarray,
@@ -467,7 +527,9 @@ class PowerFlowResults(ResultsTemplate):
                 'Converged?': report.converged_,
                 'Error': report.error_,
                 'Elapsed (s)': report.elapsed_,
-                'Iterations': report.iterations_}
+                'Iterations': report.iterations_,
+                'Factorizations': report.factorizations_,
+                'Linear iterations': report.linear_iterations_}
 
         df = pd.DataFrame(data)
 
@@ -5,8 +5,7 @@
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from typing import List, Tuple
 
 from VeraGridEngine.Simulations.results_table import ResultsTable
@@ -15,6 +14,9 @@ from VeraGridEngine.Simulations.PowerFlow.power_flow_results import NumericPower
 from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, CxVec, ConvergenceReport, Logger
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 
 def get_3p_indices(length_3p: int) -> Tuple[IntVec, IntVec, IntVec]:
     """
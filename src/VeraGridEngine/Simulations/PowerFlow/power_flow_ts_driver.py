@@ -4,19 +4,476 @@
 # SPDX-License-Identifier: MPL-2.0
 
 import numpy as np
-from typing import Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+from typing import Union, Generator, Tuple, Dict, Any
 from VeraGridEngine.Simulations.PowerFlow.power_flow_ts_results import PowerFlowTimeSeriesResults
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
+from VeraGridEngine.Simulations.PowerFlow.power_flow_results import PowerFlowResults
 from VeraGridEngine.Simulations.driver_template import TimeSeriesDriverTemplate
 from VeraGridEngine.Simulations.Clustering.clustering_results import ClusteringResults
 import VeraGridEngine.Simulations.PowerFlow.power_flow_worker as pf_worker
-from VeraGridEngine.Compilers.circuit_to_bentayga import bentayga_pf
-from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_pf
-from VeraGridEngine.Compilers.circuit_to_pgm import pgm_pf
-from VeraGridEngine.Compilers.circuit_to_gslv import gslv_pf
-from VeraGridEngine.basic_structures import IntVec
-from VeraGridEngine.enumerations import EngineType, SimulationTypes
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.linearized_power_flow import linear_pf_block
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import power_flow_post_process_branches_batch
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_ts
+from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
+from VeraGridEngine.DataStructures.numerical_circuit_ts import NumericalCircuitTs, copy_numerical_circuit
+from VeraGridEngine.Topology.simulation_indices import compile_types
+from VeraGridEngine.Topology.topology_cache import RunTopologyCache, TopologyCache, set_topology_cache, get_topology_cache
+from VeraGridEngine.Utils.shared_arrays import SharedArrays, SharedArraysSpecs, attach_shared_arrays
+from VeraGridEngine.basic_structures import IntVec, CxVec, Logger
+from VeraGridEngine.enumerations import EngineType, SimulationTypes, SolverType
+
+
+def get_warm_start_voltage(nc: NumericalCircuit, V_prev: Union[CxVec, None]) -> Union[CxVec, None]:
+    """
+    Get the initial voltage of a time step from the solution of the previous one
+    The buses with a fixed voltage module keep the set point of the circuit, and the slack buses keep their angle too
+    :param nc: NumericalCircuit of the time step
+    :param V_prev: voltage solution of the previous time step (None for a cold start)
+    :return: voltage guess, None for a cold start
+    """
+    if V_prev is None:
+        return None
+
+    V0 = nc.bus_data.Vbus
+    indices = nc.get_simulation_indices()
+    fixed_vm = np.r_[indices.pv, indices.pqv]
+
+    V = V_prev.copy()
+    V[fixed_vm] = np.abs(V0[fixed_vm]) * np.exp(1j * np.angle(V_prev[fixed_vm]))
+    V[indices.vd] = V0[indices.vd]
+
+    # the buses that were not solved (i.e. islands without slack) start from the circuit guess
+    V = np.where(V == 0.0, V0, V)
+
+    return V
+
+
+def iterate_time_series_pf(nc_ts: NumericalCircuitTs,
+                           options: PowerFlowOptions,
+                           positions: IntVec,
+                           logger: Logger,
+                           bulk_branches: bool = False) -> Generator[Tuple[int, PowerFlowResults], None, None]:
+    """
+    Run the power flow of a number of time positions of a compiled time series
+    If options.grouped_time_series is set, the positions are run grouped by structural state over a single
+    circuit patched in-place, and every step starts from the voltage of the previous converged step of its group.
+    The admittances, islands and factorizations are built once per topology when a topology cache is installed,
+    the driver installs one for the run (see RunTopologyCache).
+    :param nc_ts: NumericalCircuitTs
+    :param options: PowerFlowOptions
+    :param positions: time positions to run (in nc_ts.time_indices)
+    :param logger: Logger
+    :param bulk_branches: skip the branch results of the structural states that can compute them
+                          later with post_process_time_series_pf (see branch_results_in_bulk)
+    :return: generator of (time position, PowerFlowResults)
+    """
+    if not options.grouped_time_series:
+        for it in positions:
+            pf_res = pf_worker.multi_island_pf_nc(nc=nc_ts.get_at(nc_ts.time_indices[it]),
+                                                  options=options,
+                                                  logger=logger)
+            yield it, pf_res
+
+    else:
+        # group the positions by structural state, keeping their order within the group
+        order = np.argsort(nc_ts.state_of_t[positions], kind='stable')
+
+        nc: Union[NumericalCircuit, None] = None
+        state_prev = -1
+        V_prev: Union[CxVec, None] = None
+        branch_results = True
+
+        for it in positions[order]:
+            t = nc_ts.time_indices[it]
+            state = nc_ts.state_of_t[it]
+
+            if state != state_prev:
+                nc = nc_ts.get_at(t)
+                state_prev = state
+                V_prev = None
+                branch_results = not (bulk_branches and branch_results_in_bulk(options=options,
+                                                                                nc=nc_ts.templates[state]))
+            else:
+                nc_ts.update(nc=nc, t_idx=t)
+
+            pf_res = pf_worker.multi_island_pf_nc(nc=nc,
+                                                  options=options,
+                                                  logger=logger,
+                                                  V_guess=get_warm_start_voltage(nc=nc, V_prev=V_prev),
+                                                  branch_results=branch_results)
+
+            V_prev = pf_res.voltage if pf_res.converged else None
+
+            yield it, pf_res
+
+
+def store_time_series_pf(data: Union[PowerFlowTimeSeriesResults, SimpleNamespace],
+                         it: int,
+                         pf_res: PowerFlowResults,
+                         branches: bool = True) -> None:
+    """
+    Store the power flow results of a time step
+    :param data: PowerFlowTimeSeriesResults or namespace holding its arrays (see PF_TS_SHARED_ARRAYS)
+    :param it: time position
+    :param pf_res: PowerFlowResults of the time step
+    :param branches: store the branch results too (False if they are computed by post_process_time_series_pf)
+    """
+    data.voltage[it, :] = pf_res.voltage
+    data.S[it, :] = pf_res.Sbus
+    if branches:
+        data.Sf[it, :] = pf_res.Sf
+        data.St[it, :] = pf_res.St
+        data.If[it, :] = pf_res.If
+        data.It[it, :] = pf_res.It
+        data.Vbranch[it, :] = pf_res.Vbranch
+        data.loading[it, :] = pf_res.loading
+        data.losses[it, :] = pf_res.losses
+    data.hvdc_losses[it, :] = pf_res.losses_hvdc
+    data.hvdc_Pf[it, :] = pf_res.Pf_hvdc
+    data.hvdc_Pt[it, :] = pf_res.Pt_hvdc
+    data.hvdc_loading[it, :] = pf_res.loading_hvdc
+    data.error_values[it] = pf_res.error
+    data.converged_values[it] = pf_res.converged
+
+
+# arrays of PowerFlowTimeSeriesResults written by store_time_series_pf
+PF_TS_SHARED_ARRAYS = ['voltage', 'S', 'Sf', 'St', 'If', 'It', 'Vbranch', 'loading', 'losses',
+                       'hvdc_losses', 'hvdc_Pf', 'hvdc_Pt', 'hvdc_loading',
+                       'error_values', 'converged_values']
+
+
+def branch_results_in_bulk(options: PowerFlowOptions, nc: NumericalCircuit) -> bool:
+    """
+    Check if the branch results of the time steps of a structural state are computed
+    by post_process_time_series_pf instead of by the power flow of every step.
+    This needs the grouped time series, branch admittances that only depend on the
+    time series values (no branch controls) and the non-linear branch flows
+    :param options: PowerFlowOptions
+    :param nc: NumericalCircuit template of the structural state
+    :return: bool
+    """
+    return (options.grouped_time_series
+            and options.solver_type != SolverType.Linear
+            and not nc.active_branch_data.any_pf_control
+            and not nc.topology_performed)
+
+
+def post_process_time_series_pf(nc_ts: NumericalCircuitTs,
+                                positions: IntVec,
+                                data: Union[PowerFlowTimeSeriesResults, SimpleNamespace]) -> None:
+    """
+    Compute the branch results (Sf, St, If, It, Vbranch, loading and losses) of a number of
+    time positions from their stored voltages.
+    The positions are grouped by structural state and by tap modules, so that every group
+    shares Yf and Yt, and the results of all the steps of a group are computed at once
+    from the (steps, nbus) voltage matrix (see power_flow_post_process_branches_batch)
+    :param nc_ts: NumericalCircuitTs
+    :param positions: time positions (in nc_ts.time_indices), their voltages must be stored in data
+    :param data: PowerFlowTimeSeriesResults or namespace holding its arrays (see PF_TS_SHARED_ARRAYS)
+    """
+    # group the positions by structural state
+    positions = positions[np.argsort(nc_ts.state_of_t[positions], kind='stable')]
+    states = nc_ts.state_of_t[positions]
+    group_starts = np.r_[0, np.where(np.diff(states) != 0)[0] + 1]
+
+    for group in np.split(positions, group_starts[1:]):
+
+        tap_module = nc_ts.get_values('active_branch_data', 'tap_module', group)
+        rates = nc_ts.get_values('passive_branch_data', 'rates', group)
+
+        # group the steps that share the admittances
+        sub_groups: Dict[bytes, list] = dict()
+        for k in range(len(group)):
+            sub_groups.setdefault(tap_module[k, :].tobytes(), list()).append(k)
+
+        nc = copy_numerical_circuit(nc_ts.templates[nc_ts.state_of_t[group[0]]])
+
+        # the inactive branches are left at zero, as they are not part of any island
+        br_idx = np.where(nc.passive_branch_data.active)[0]
+
+        for ks in sub_groups.values():
+            ks = np.array(ks)
+            its = group[ks]
+
+            nc.active_branch_data.tap_module = tap_module[ks[0], :]
+            adm = nc.get_admittance_matrices()
+
+            Sf, St, If, It, Vbranch, loading, losses = power_flow_post_process_branches_batch(
+                V=data.voltage[its, :],
+                F=nc.passive_branch_data.F[br_idx],
+                T=nc.passive_branch_data.T[br_idx],
+                Yf=adm.Yf[br_idx, :],
+                Yt=adm.Yt[br_idx, :],
+                branch_rates=rates[np.ix_(ks, br_idx)],
+                Sbase=nc.Sbase
+            )
+
+            data.Sf[np.ix_(its, br_idx)] = Sf
+            data.St[np.ix_(its, br_idx)] = St
+            data.If[np.ix_(its, br_idx)] = If
+            data.It[np.ix_(its, br_idx)] = It
+            data.Vbranch[np.ix_(its, br_idx)] = Vbranch
+            data.loading[np.ix_(its, br_idx)] = loading
+            data.losses[np.ix_(its, br_idx)] = losses
+
+
+def solve_time_series_pf(nc_ts: NumericalCircuitTs,
+                         options: PowerFlowOptions,
+                         positions: IntVec,
+                         data: Union[PowerFlowTimeSeriesResults, SimpleNamespace],
+                         logger: Logger) -> Generator[int, None, None]:
+    """
+    Run the power flow of a number of time positions of a compiled time series (see iterate_time_series_pf),
+    storing the results as store_time_series_pf does.
+    With the grouped time series, the power flow of the steps skips the branch results when possible,
+    and those of every structural state are computed with post_process_time_series_pf once all its steps
+    are solved (see branch_results_in_bulk)
+    :param nc_ts: NumericalCircuitTs
+    :param options: PowerFlowOptions
+    :param positions: time positions to run (in nc_ts.time_indices)
+    :param data: PowerFlowTimeSeriesResults or namespace holding its arrays (see PF_TS_SHARED_ARRAYS)
+    :param logger: Logger
+    :return: generator of the time positions stored
+    """
+    state_prev = -1
+    bulk = False
+    group = list()
+
+    for it, pf_res in iterate_time_series_pf(nc_ts=nc_ts, options=options, positions=positions, logger=logger,
+                                             bulk_branches=True):
+
+        state = nc_ts.state_of_t[it]
+        if state != state_prev:
+            if bulk and len(group):
+                post_process_time_series_pf(nc_ts=nc_ts, positions=np.array(group), data=data)
+            bulk = branch_results_in_bulk(options=options, nc=nc_ts.templates[state])
+            state_prev = state
+            group = list()
+
+        store_time_series_pf(data=data, it=it, pf_res=pf_res, branches=not bulk)
+        group.append(it)
+
+        yield it
+
+    if bulk and len(group):
+        post_process_time_series_pf(nc_ts=nc_ts, positions=np.array(group), data=data)
+
+
+def use_block_linear_pf(options: PowerFlowOptions) -> bool:
+    """
+    Check if the time series power flow can be solved with solve_time_series_linear_pf
+    This needs the grouped time series, since the steps are solved grouped by structural state
+    :param options: PowerFlowOptions
+    :return: bool
+    """
+    return (options.grouped_time_series
+            and options.solver_type == SolverType.Linear
+            and not options.distributed_slack)
+
+
+def solve_time_series_linear_pf(nc_ts: NumericalCircuitTs,
+                                options: PowerFlowOptions,
+                                positions: IntVec,
+                                data: Union[PowerFlowTimeSeriesResults, SimpleNamespace],
+                                logger: Logger,
+                                block_size: int = 1000) -> Generator[IntVec, None, None]:
+    """
+    Run the linear (DC) power flow of a number of time positions of a compiled time series,
+    storing the results as store_time_series_pf does.
+    The positions are grouped by structural state and split in blocks of up to block_size steps.
+    For every island of a block, the reduced susceptance matrix is factorized once per distinct
+    set of tap modules and slack buses, and all the time steps that share it are solved as one
+    multi-column right hand side (see linear_pf_block).
+    The states with branch controls or with a topology reduction are run step by step with multi_island_pf_nc.
+    :param nc_ts: NumericalCircuitTs
+    :param options: PowerFlowOptions (see use_block_linear_pf)
+    :param positions: time positions to run (in nc_ts.time_indices)
+    :param data: PowerFlowTimeSeriesResults or namespace holding its arrays (see PF_TS_SHARED_ARRAYS)
+    :param logger: Logger
+    :param block_size: maximum number of time steps solved together
+    :return: generator of the time positions stored after every block
+    """
+    # group the positions by structural state, keeping their order within the group
+    positions = positions[np.argsort(nc_ts.state_of_t[positions], kind='stable')]
+    states = nc_ts.state_of_t[positions]
+    group_starts = np.r_[0, np.where(np.diff(states) != 0)[0] + 1]
+
+    nc: Union[NumericalCircuit, None] = None
+
+    for group in np.split(positions, group_starts[1:]):
+        for block in np.array_split(group, int(np.ceil(len(group) / block_size))):
+
+            nt = len(block)
+            if nc is None:
+                nc = nc_ts.get_at(nc_ts.time_indices[block[0]])
+
+            template = nc_ts.templates[nc_ts.state_of_t[block[0]]]
+
+            if template.active_branch_data.any_pf_control or template.topology_performed:
+                # the controls cannot be linearized, and the reduced buses must be propagated: run step by step
+                for it in block:
+                    nc_ts.update(nc=nc, t_idx=nc_ts.time_indices[it])
+                    pf_res = pf_worker.multi_island_pf_nc(nc=nc, options=options, logger=logger)
+                    store_time_series_pf(data=data, it=it, pf_res=pf_res)
+                yield block
+                continue
+
+            # gather the time varying inputs of the block
+            Sbus = np.empty((nt, nc.nbus), dtype=complex)
+            I0 = np.empty((nt, nc.nbus), dtype=complex)
+            Y0 = np.empty((nt, nc.nbus), dtype=complex)
+            V0 = np.empty((nt, nc.nbus), dtype=complex)
+            Shvdc = np.empty((nt, nc.nbus))
+            tap_module = np.empty((nt, nc.nbr))
+            tap_angle = np.empty((nt, nc.nbr))
+            rates = np.empty((nt, nc.nbr))
+
+            for k, it in enumerate(block):
+                nc_ts.update(nc=nc, t_idx=nc_ts.time_indices[it])
+                Sbus[k, :] = nc.get_power_injections_pu()
+                I0[k, :] = nc.get_current_injections_pu()
+                Y0[k, :] = nc.get_admittance_injections_pu()
+                V0[k, :] = nc.bus_data.Vbus
+                tap_module[k, :] = nc.active_branch_data.tap_module
+                tap_angle[k, :] = nc.active_branch_data.tap_angle
+                rates[k, :] = nc.passive_branch_data.rates
+
+                # HVDC injections and results (see __multi_island_pf_nc_limited_support)
+                Shvdc[k, :], Losses_hvdc, Pf_hvdc, Pt_hvdc, loading_hvdc, n_free = nc.hvdc_data.get_power(
+                    Sbase=nc.Sbase,
+                    theta=np.zeros(nc.nbus),
+                )
+                data.hvdc_Pf[it, :] = - Pf_hvdc * nc.Sbase
+                data.hvdc_Pt[it, :] = - Pt_hvdc * nc.Sbase
+                data.hvdc_loading[it, :] = loading_hvdc
+                data.hvdc_losses[it, :] = Losses_hvdc * nc.Sbase
+
+            error = np.zeros(nt)
+            converged = np.ones(nt, dtype=bool)
+
+            # the HVDC lines are modelled as injections, so they do not link the islands
+            # (as in the step by step power flow without branch controls)
+            islands = nc.split_into_islands(ignore_single_node_islands=options.ignore_single_node_islands,
+                                            consider_hvdc_as_island_links=False,
+                                            logger=logger)
+
+            for i, island in enumerate(islands):
+                b_idx = island.bus_data.original_idx
+                br_idx = island.passive_branch_data.original_idx
+                bus_types = island.bus_data.bus_types.copy()
+
+                # group the steps that share the susceptance matrix and the slack buses
+                sub_groups: Dict[Tuple[bytes, bytes], list] = dict()
+                for k in range(nt):
+                    vd = compile_types(Pbus=Sbus[k, b_idx].real, types=bus_types.copy())[0]
+                    key = (tap_module[k, br_idx].tobytes(), vd.tobytes())
+                    sub_groups.setdefault(key, list()).append(k)
+
+                for ks in sub_groups.values():
+                    ks = np.array(ks)
+                    k0 = ks[0]
+
+                    island.active_branch_data.tap_module = tap_module[k0, br_idx]
+                    indices = island.get_simulation_indices(Sbus=Sbus[k0, b_idx], bus_types=bus_types.copy())
+
+                    if len(indices.vd) == 0:
+                        logger.add_info('No slack nodes in the island', str(i))
+                        continue
+
+                    adm = island.get_admittance_matrices()
+                    lin_adm = island.get_linear_admittance_matrices(indices=indices)
+
+                    V, Scalc, Pf, norm_f, ok = linear_pf_block(
+                        Ybus=adm.Ybus,
+                        Bpqpv=lin_adm.get_Bred(pqpv=indices.no_slack),
+                        Bref=lin_adm.get_Bslack(pqpv=indices.no_slack, vd=indices.vd),
+                        Bf=lin_adm.Bf,
+                        b=island.passive_branch_data.active.astype(float) / (
+                                island.passive_branch_data.X * island.active_branch_data.tap_module),
+                        S0=Sbus[np.ix_(ks, b_idx)] + Shvdc[np.ix_(ks, b_idx)],
+                        I0=I0[np.ix_(ks, b_idx)],
+                        Y0=Y0[np.ix_(ks, b_idx)],
+                        V0=V0[np.ix_(ks, b_idx)],
+                        tau=tap_angle[np.ix_(ks, br_idx)],
+                        vd=indices.vd,
+                        no_slack=indices.no_slack,
+                        pq=indices.pq
+                    )
+
+                    if not ok:
+                        logger.add_error('Singular susceptance matrix in the linear power flow', str(i))
+
+                    # branch results (see power_flow_post_process_linear)
+                    its = block[ks]
+                    Sf = Pf * nc.Sbase
+                    Vf = V[:, island.passive_branch_data.F]
+                    Vt = V[:, island.passive_branch_data.T]
+                    If = Pf / (Vf + 1e-20)
+                    data.voltage[np.ix_(its, b_idx)] = V
+                    data.S[np.ix_(its, b_idx)] = Scalc * nc.Sbase
+                    data.Sf[np.ix_(its, br_idx)] = Sf
+                    data.St[np.ix_(its, br_idx)] = -Sf
+                    data.If[np.ix_(its, br_idx)] = If
+                    data.It[np.ix_(its, br_idx)] = -If
+                    data.Vbranch[np.ix_(its, br_idx)] = Vf - Vt
+                    data.loading[np.ix_(its, br_idx)] = Sf / (rates[np.ix_(ks, br_idx)] + 1e-9)
+                    error[ks] = np.maximum(error[ks], norm_f)
+                    converged[ks] &= ok
+
+            data.error_values[block] = error
+            data.converged_values[block] = converged
+
+            yield block
+
+
+# state of the time series power flow worker processes (see _init_pf_ts_worker)
+_WORKER_STATE: Dict[str, Any] = dict()
+
+
+def _init_pf_ts_worker(nc_ts: NumericalCircuitTs, options: PowerFlowOptions, specs: SharedArraysSpecs) -> None:
+    """
+    Initialize a worker process: the compiled time series is received once per worker
+    The worker gets its own topology cache, that lives as long as the worker (the run)
+    :param nc_ts: NumericalCircuitTs
+    :param options: PowerFlowOptions
+    :param specs: specification of the shared results arrays
+    """
+    if get_topology_cache() is None:
+        set_topology_cache(TopologyCache())
+
+    arrays, blocks = attach_shared_arrays(specs)
+    _WORKER_STATE['nc_ts'] = nc_ts
+    _WORKER_STATE['options'] = options
+    _WORKER_STATE['arrays'] = arrays
+    _WORKER_STATE['blocks'] = blocks
+
+
+def _run_pf_ts_chunk(positions: IntVec) -> Logger:
+    """
+    Run a chunk of time positions in a worker process, writing the results into the shared arrays
+    :param positions: time positions
+    :return: Logger of the chunk
+    """
+    logger = Logger()
+    if use_block_linear_pf(_WORKER_STATE['options']):
+        for _ in solve_time_series_linear_pf(nc_ts=_WORKER_STATE['nc_ts'],
+                                             options=_WORKER_STATE['options'],
+                                             positions=positions,
+                                             data=_WORKER_STATE['arrays'],
+                                             logger=logger):
+            pass
+    else:
+        for _ in solve_time_series_pf(nc_ts=_WORKER_STATE['nc_ts'],
+                                      options=_WORKER_STATE['options'],
+                                      positions=positions,
+                                      data=_WORKER_STATE['arrays'],
+                                      logger=logger):
+            pass
+
+    return logger
 
 
 class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
@@ -64,13 +521,12 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
             clustering_results=None
         )
 
-    def run_single_thread(self, time_indices) -> PowerFlowTimeSeriesResults:
+    def _get_empty_results(self, time_indices: IntVec) -> PowerFlowTimeSeriesResults:
         """
-        Run single thread time series
+        Initialize the results of the time indices to simulate
         :param time_indices: array of time indices to consider
-        :return: TimeSeriesResults instance
+        :return: PowerFlowTimeSeriesResults instance
         """
-
         n = self.grid.get_bus_number()
         # m = self.grid.get_branch_number(add_hvdc=False, add_vsc=False, add_switch=True)
         m = self.grid.get_branch_number(add_vsc=False,
@@ -78,56 +534,125 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
                                         add_switch=True)
 
         # initialize the grid time series results we will append the island results with another function
-        time_series_results = PowerFlowTimeSeriesResults(n=n,
-                                                         m=m,
-                                                         n_hvdc=self.grid.get_hvdc_number(),
-                                                         bus_names=self.grid.get_bus_names(),
-                                                         branch_names=self.grid.get_branch_names(add_vsc=False,
-                                                                                                 add_hvdc=False,
-                                                                                                 add_switch=True),
-                                                         hvdc_names=self.grid.get_hvdc_names(),
-                                                         bus_types=np.zeros(n),
-                                                         time_array=self.grid.time_profile[time_indices],
-                                                         clustering_results=self.clustering_results)
-
-        # compile dictionaries once for speed
-        bus_dict = {bus: i for i, bus in enumerate(self.grid.buses)}
-        areas_dict = {elm: i for i, elm in enumerate(self.grid.areas)}
-        self.report_progress(0.0)
-        for it, t in enumerate(time_indices):
-
-            self.report_text('Time series at ' + str(self.grid.time_profile[t]) + '...')
-            self.report_progress2(it, len(time_indices))
-
-            # run power flow
-            pf_res = pf_worker.multi_island_pf(multi_circuit=self.grid,
-                                               t=t,
-                                               options=self.options,
-                                               opf_results=self.opf_time_series_results,
-                                               bus_dict=bus_dict,
-                                               areas_dict=areas_dict)
-
-            # gather results
-            time_series_results.voltage[it, :] = pf_res.voltage
-            time_series_results.S[it, :] = pf_res.Sbus
-            time_series_results.Sf[it, :] = pf_res.Sf
-            time_series_results.St[it, :] = pf_res.St
-            time_series_results.Vbranch[it, :] = pf_res.Vbranch
-            time_series_results.loading[it, :] = pf_res.loading
-            time_series_results.losses[it, :] = pf_res.losses
-            time_series_results.hvdc_losses[it, :] = pf_res.losses_hvdc
-            time_series_results.hvdc_Pf[it, :] = pf_res.Pf_hvdc
-            time_series_results.hvdc_Pt[it, :] = pf_res.Pt_hvdc
-            time_series_results.hvdc_loading[it, :] = pf_res.loading_hvdc
-            time_series_results.error_values[it] = pf_res.error
-            time_series_results.converged_values[it] = pf_res.converged
-
-            if self.__cancel__:
+        return PowerFlowTimeSeriesResults(n=n,
+                                          m=m,
+                                          n_hvdc=self.grid.get_hvdc_number(),
+                                          bus_names=self.grid.get_bus_names(),
+                                          branch_names=self.grid.get_branch_names(add_vsc=False,
+                                                                                  add_hvdc=False,
+                                                                                  add_switch=True),
+                                          hvdc_names=self.grid.get_hvdc_names(),
+                                          bus_types=np.zeros(n),
+                                          time_array=self.grid.time_profile[time_indices],
+                                          clustering_results=self.clustering_results)
+
+    def _compile(self, time_indices: IntVec) -> NumericalCircuitTs:
+        """
+        Compile the whole horizon once for speed
+        :param time_indices: array of time indices to consider
+        :return: NumericalCircuitTs
+        """
+        self.report_text('Compiling the time series...')
+        return compile_numerical_circuit_ts(
+            circuit=self.grid,
+            time_indices=time_indices,
+            apply_temperature=self.options.apply_temperature_correction,
+            branch_tolerance_mode=self.options.branch_impedance_tolerance_mode,
+            opf_results=self.opf_time_series_results,
+            use_stored_guess=self.options.use_stored_guess,
+            control_taps_modules=self.options.control_taps_modules,
+            control_taps_phase=self.options.control_taps_phase,
+            control_remote_voltage=self.options.control_remote_voltage,
+            logger=self.logger
+        )
+
+    def run_single_thread(self, time_indices) -> PowerFlowTimeSeriesResults:
+        """
+        Run single thread time series
+        :param time_indices: array of time indices to consider
+        :return: TimeSeriesResults instance
+        """
+        time_series_results = self._get_empty_results(time_indices=time_indices)
+
+        nc_ts = self._compile(time_indices=time_indices)
+
+        # the island workers (if any) are started once for all the time steps,
+        # and the admittances, islands and factorizations are cached for the repeated topologies of the run
+        with pf_worker.IslandPool(options=self.options), RunTopologyCache():
+            self.report_progress(0.0)
+            if use_block_linear_pf(self.options):
+                self.report_text('Running the linear time series...')
+                n_done = 0
+                for block in solve_time_series_linear_pf(nc_ts=nc_ts,
+                                                         options=self.options,
+                                                         positions=np.arange(len(time_indices)),
+                                                         data=time_series_results,
+                                                         logger=self.logger):
+                    n_done += len(block)
+                    self.report_progress2(n_done, len(time_indices))
+
+                    if self.__cancel__:
+                        return time_series_results
+
                 return time_series_results
 
+            for k, it in enumerate(solve_time_series_pf(nc_ts=nc_ts,
+                                                        options=self.options,
+                                                        positions=np.arange(len(time_indices)),
+                                                        data=time_series_results,
+                                                        logger=self.logger)):
+
+                self.report_text('Time series at ' + str(self.grid.time_profile[time_indices[it]]) + '...')
+                self.report_progress2(k, len(time_indices))
+
+                if self.__cancel__:
+                    return time_series_results
+
+            return time_series_results
+
+    def run_multi_process(self, time_indices) -> PowerFlowTimeSeriesResults:
+        """
+        Run the time series in a pool of options.n_workers processes
+        The time positions are split in contiguous chunks, and the workers write
+        their results directly into shared memory. Every chunk is run as in
+        run_single_thread, so for a given number of workers the results are deterministic.
+        :param time_indices: array of time indices to consider
+        :return: TimeSeriesResults instance
+        """
+        time_series_results = self._get_empty_results(time_indices=time_indices)
+
+        nc_ts = self._compile(time_indices=time_indices)
+
+        chunks = self.get_time_chunks(n_chunks=self.options.n_workers, nt=len(time_indices))
+
+        shared = SharedArrays({name: getattr(time_series_results, name) for name in PF_TS_SHARED_ARRAYS})
+
+        try:
+            self.report_text(f'Running the time series in {len(chunks)} processes...')
+            self.report_progress(0.0)
+            with ProcessPoolExecutor(max_workers=len(chunks),
+                                     initializer=_init_pf_ts_worker,
+                                     initargs=(nc_ts, self.options, shared.get_specs())) as executor:
+
+                futures = [executor.submit(_run_pf_ts_chunk, chunk) for chunk in chunks]
+
+                for k, future in enumerate(as_completed(futures)):
+                    self.logger += future.result()
+                    self.report_progress2(k + 1, len(chunks))
+
+                    if self.__cancel__:
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        break
+
+            shared.copy_to(time_series_results)
+
+        finally:
+            shared.release()
+
         return time_series_results
 
     def run_bentayga(self):
+        from VeraGridEngine.Compilers.circuit_to_bentayga import bentayga_pf
 
         res = bentayga_pf(self.grid, self.options, time_series=True)
 
@@ -161,6 +686,7 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         :param time_indices: array of time indices
         :return:
         """
+        from VeraGridEngine.Compilers.circuit_to_newton_pa import newton_pa_pf
         res = newton_pa_pf(circuit=self.grid,
                            pf_opt=self.options,
                            time_series=True,
@@ -206,6 +732,7 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         :param time_indices: array of time indices
         :return:
         """
+        from VeraGridEngine.Compilers.circuit_to_gslv import gslv_pf
         res = gslv_pf(circuit=self.grid,
                       pf_opt=self.options,
                       time_series=True,
@@ -276,7 +803,10 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
         self.tic()
 
         if self.engine == EngineType.VeraGrid:
-            self.results = self.run_single_thread(time_indices=self.time_indices)
+            if self.options.n_workers > 1 and len(self.time_indices) > 1:
+                self.results = self.run_multi_process(time_indices=self.time_indices)
+            else:
+                self.results = self.run_single_thread(time_indices=self.time_indices)
 
         elif self.engine == EngineType.Bentayga:
             self.report_text('Running Bentayga... ')
@@ -292,6 +822,7 @@ class PowerFlowTimeSeriesDriver(TimeSeriesDriverTemplate):
 
         elif self.engine == EngineType.PGM:
             self.report_text('Running Power Grid Model... ')
+            from VeraGridEngine.Compilers.circuit_to_pgm import pgm_pf
             self.results = pgm_pf(self.grid, self.options, logger=self.logger, time_series=True)
             self.results.area_names = [a.name for a in self.grid.areas]
 
@@ -3,11 +3,13 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 from __future__ import annotations
+import os
 import numpy as np
-from typing import Union, Dict, Tuple, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Union, Dict, Tuple, List, Any, Callable, TYPE_CHECKING
 
 import VeraGridEngine.Simulations.PowerFlow as pflw
-from VeraGridEngine.enumerations import SolverType
+from VeraGridEngine.enumerations import SolverType, SparseSolver, IslandSolvingMode
 from VeraGridEngine.basic_structures import Logger, ConvergenceReport
 from VeraGridEngine.Simulations.PowerFlow.power_flow_results import PowerFlowResults
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
@@ -16,7 +18,13 @@ from VeraGridEngine.Simulations.PowerFlow.Formulations.pf_basic_formulation impo
 from VeraGridEngine.Simulations.PowerFlow.Formulations.pf_generalized_formulation import PfGeneralizedFormulation
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.newton_raphson_fx import newton_raphson_fx
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.powell_fx import powell_fx
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.iteration_trace import IterationTrace
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.levenberg_marquadt_fx import levenberg_marquardt_fx
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.newton_raphson_batch import newton_raphson_batch
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.fast_decoupled import get_fast_decoupled_factors
+from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.common_functions import power_flow_post_process_nonlinear
+from VeraGridEngine.Utils.Sparse.csc2 import SparseFactorization, KrylovSolver, sparse_factorization, get_krylov_solver
+from VeraGridEngine.Topology.simulation_indices import compile_types
 from VeraGridEngine.Topology.simulation_indices import SimulationIndices
 from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
@@ -24,12 +32,38 @@ from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_a
 from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.discrete_controls import compute_slack_distribution
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.Devices.Aggregation.area import Area
-from VeraGridEngine.basic_structures import CxVec, Vec
+from VeraGridEngine.basic_structures import CxVec, Vec, CxMat
 
 if TYPE_CHECKING:  # Only imports the below statements during type checking
     from VeraGridEngine.Compilers.circuit_to_data import VALID_OPF_RESULTS
 
 
+def get_nr_linear_solver(options: PowerFlowOptions) -> SparseFactorization | KrylovSolver:
+    """
+    Get the linear solver of the Newton-Raphson steps
+    :param options: PowerFlowOptions
+    :return: sparse_factorization (direct) or the shared KrylovSolver of the options
+    """
+    if options.linear_solver in (SparseSolver.GMRES, SparseSolver.BiCGSTAB):
+        return get_krylov_solver(method=options.linear_solver,
+                                 tol=options.krylov_tolerance,
+                                 max_iter=options.krylov_max_iter,
+                                 drop_tol=options.ilu_drop_tol,
+                                 fill_factor=options.ilu_fill_factor,
+                                 refresh_growth=options.ilu_refresh_growth)
+    else:
+        return sparse_factorization
+
+
+def get_iteration_trace(options: PowerFlowOptions) -> IterationTrace | None:
+    """
+    Get a new iteration trace for a solver run if the options request it
+    :param options: PowerFlowOptions
+    :return: IterationTrace or None
+    """
+    return IterationTrace() if options.trace_iterations else None
+
+
 def __split_reactive_power_into_devices(nc: NumericalCircuit, Qbus: Vec, results: PowerFlowResults) -> None:
     """
     This function splits the reactive power of the power flow solution (nbus) into reactive power per device that
@@ -187,7 +221,8 @@ def __solve_island_complete_support(nc: NumericalCircuit,
                                                   tol=options.tolerance,
                                                   max_iter=options.max_iter,
                                                   verbose=options.verbose,
-                                                  logger=logger)
+                                                  logger=logger,
+                                                  trace=get_iteration_trace(options))
 
             elif solver_type == SolverType.NR:
 
@@ -206,7 +241,12 @@ def __solve_island_complete_support(nc: NumericalCircuit,
                                              max_iter=options.max_iter,
                                              trust=options.trust_radius,
                                              verbose=options.verbose,
-                                             logger=logger)
+                                             logger=logger,
+                                             reuse_policy=options.jacobian_reuse_policy,
+                                             refresh_period=options.jacobian_refresh_period,
+                                             refresh_ratio=options.jacobian_refresh_ratio,
+                                             linear_solver=get_nr_linear_solver(options),
+                                             trace=get_iteration_trace(options))
 
             elif solver_type == SolverType.PowellDogLeg:
 
@@ -225,7 +265,8 @@ def __solve_island_complete_support(nc: NumericalCircuit,
                                      max_iter=options.max_iter,
                                      trust=options.trust_radius,
                                      verbose=options.verbose,
-                                     logger=logger)
+                                     logger=logger,
+                                     trace=get_iteration_trace(options))
 
             elif solver_type == SolverType.Linear:
 
@@ -262,7 +303,10 @@ def __solve_island_complete_support(nc: NumericalCircuit,
                            converged=solution.converged,
                            error=solution.norm_f,
                            elapsed=solution.elapsed,
-                           iterations=solution.iterations)
+                           iterations=solution.iterations,
+                           factorizations=solution.n_factorizations,
+                           linear_iterations=solution.n_linear_iterations,
+                           trace=solution.trace)
 
                 if solution.method in [SolverType.Linear, SolverType.LACPF]:
                     # if the method is linear, we do not check the solution quality
@@ -306,6 +350,7 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                    V0: CxVec,
                                    S_base: CxVec,
                                    Shvdc: Vec,
+                                   branch_results: bool = True,
                                    logger=Logger()) -> Tuple[NumericPowerFlowResults, ConvergenceReport]:
     """
     Run a power flow simulation using the selected method (no outer loop controls).
@@ -317,6 +362,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
     :param V0: Array of initial voltages
     :param S_base: Array of power Injections
     :param Shvdc: Array of power injections due t the HVDC lines (only used in some algorithms)
+    :param branch_results: compute the branch results, if False they are left at zero
+                           (see power_flow_post_process_nonlinear)
     :param logger: Logger
     :return: NumericPowerFlowResults 
     """
@@ -435,7 +482,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                            max_coefficients=options.max_iter,
                                            use_pade=False,
                                            verbose=options.verbose,
-                                           logger=logger)
+                                           logger=logger,
+                                           branch_results=branch_results)
 
                 if options.distributed_slack:
                     ok, delta = compute_slack_distribution(Scalc=solution.Scalc,
@@ -459,7 +507,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                                    max_coefficients=options.max_iter,
                                                    use_pade=False,
                                                    verbose=options.verbose,
-                                                   logger=logger)
+                                                   logger=logger,
+                                                   branch_results=branch_results)
 
             # type DC
             elif solver_type == SolverType.Linear:
@@ -516,7 +565,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                       V0=V0,
                                       pq=indices.pq,
                                       pv=indices.pv,
-                                      vd=indices.vd)
+                                      vd=indices.vd,
+                                      branch_results=branch_results)
                 if options.distributed_slack:
                     ok, delta = compute_slack_distribution(Scalc=solution.Scalc,
                                                            vd=indices.vd,
@@ -532,7 +582,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                               V0=V0,
                                               pq=indices.pq,
                                               pv=indices.pv,
-                                              vd=indices.vd)
+                                              vd=indices.vd,
+                                              branch_results=branch_results)
 
             # Gauss-Seidel
             elif solver_type == SolverType.GAUSS:
@@ -558,7 +609,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                         control_q=options.control_Q,
                                         distribute_slack=options.distributed_slack,
                                         verbose=options.verbose,
-                                        logger=logger)
+                                        logger=logger,
+                                        branch_results=branch_results)
 
             # Levenberg-Marquardt
             elif solver_type == SolverType.LM:
@@ -569,13 +621,15 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                              Qmin=Qmin,
                                              Qmax=Qmax,
                                              nc=island,
-                                             options=options)
+                                             options=options,
+                                             branch_results=branch_results)
 
                 solution = levenberg_marquardt_fx(problem=problem,
                                                   tol=options.tolerance,
                                                   max_iter=options.max_iter,
                                                   verbose=options.verbose,
-                                                  logger=logger)
+                                                  logger=logger,
+                                                  trace=get_iteration_trace(options))
 
             # Fast decoupled
             elif solver_type == SolverType.FASTDECOUPLED:
@@ -603,7 +657,15 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                      tol=options.tolerance,
                                      max_it=options.max_iter,
                                      control_q=options.control_Q,
-                                     distribute_slack=options.distributed_slack)
+                                     distribute_slack=options.distributed_slack,
+                                     factors=get_fast_decoupled_factors(nc=island,
+                                                                        B1=fd_adm.B1,
+                                                                        B2=fd_adm.B2,
+                                                                        pv=indices.pv,
+                                                                        pq=indices.pq,
+                                                                        pqv=indices.pqv,
+                                                                        p=indices.p),
+                                     branch_results=branch_results)
 
             # Newton-Raphson (full, but non-generalized)
             elif solver_type == SolverType.NR:
@@ -614,14 +676,20 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                              Qmin=Qmin,
                                              Qmax=Qmax,
                                              nc=island,
-                                             options=options)
+                                             options=options,
+                                             branch_results=branch_results)
 
                 solution = newton_raphson_fx(problem=problem,
                                              tol=options.tolerance,
                                              max_iter=options.max_iter,
                                              trust=options.trust_radius,
                                              verbose=options.verbose,
-                                             logger=logger)
+                                             logger=logger,
+                                             reuse_policy=options.jacobian_reuse_policy,
+                                             refresh_period=options.jacobian_refresh_period,
+                                             refresh_ratio=options.jacobian_refresh_ratio,
+                                             linear_solver=get_nr_linear_solver(options),
+                                             trace=get_iteration_trace(options))
 
             # Powell's Dog Leg (full)
             elif solver_type == SolverType.PowellDogLeg:
@@ -632,14 +700,16 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                              Qmin=Qmin,
                                              Qmax=Qmax,
                                              nc=island,
-                                             options=options)
+                                             options=options,
+                                             branch_results=branch_results)
 
                 solution = powell_fx(problem=problem,
                                      tol=options.tolerance,
                                      max_iter=options.max_iter,
                                      trust=options.trust_radius,
                                      verbose=options.verbose,
-                                     logger=logger)
+                                     logger=logger,
+                                     trace=get_iteration_trace(options))
 
             # Newton-Raphson-Iwamoto
             elif solver_type == SolverType.IWAMOTO:
@@ -663,7 +733,8 @@ def __solve_island_limited_support(island: NumericalCircuit,
                                           max_it=options.max_iter,
                                           control_q=options.control_Q,
                                           robust=True,
-                                          logger=logger)
+                                          logger=logger,
+                                          branch_results=branch_results)
 
             else:
                 # for any other method, raise exception
@@ -678,7 +749,10 @@ def __solve_island_limited_support(island: NumericalCircuit,
                            converged=solution.converged,
                            error=solution.norm_f,
                            elapsed=solution.elapsed,
-                           iterations=solution.iterations)
+                           iterations=solution.iterations,
+                           factorizations=solution.n_factorizations,
+                           linear_iterations=solution.n_linear_iterations,
+                           trace=solution.trace)
 
                 if solution.method in [SolverType.Linear, SolverType.LACPF]:
                     # if the method is linear, we do not check the solution quality
@@ -716,6 +790,148 @@ def __solve_island_limited_support(island: NumericalCircuit,
         return final_solution, report
 
 
+class IslandPool:
+    """
+    Pool of threads or processes shared by all the island power flows of a simulation run
+    (see __solve_islands), so that the workers are started once per run instead of once per power flow.
+    It is used as a context manager around the run:
+
+        with IslandPool(options):
+            for t in ...:
+                multi_island_pf_nc(...)
+    """
+
+    def __init__(self, options: PowerFlowOptions, n_tasks: int = 0):
+        """
+        Constructor
+        :param options: PowerFlowOptions (island_solving_mode and island_workers)
+        :param n_tasks: number of islands to solve, to start no more workers than those (0: unknown)
+        """
+        self.mode = options.island_solving_mode
+        self.n_workers = options.island_workers if options.island_workers > 0 else os.cpu_count()
+        if n_tasks > 0:
+            self.n_workers = max(1, min(self.n_workers, n_tasks))
+        self.executor: Union[ThreadPoolExecutor, ProcessPoolExecutor, None] = None
+
+        # the pool belongs to the process that created it (the forked processes inherit this object)
+        self.pid = os.getpid()
+
+        self._previous: Union[IslandPool, None] = None
+
+    def __enter__(self) -> "IslandPool":
+        global _ISLAND_POOL
+
+        if self.mode == IslandSolvingMode.Processes:
+            self.executor = ProcessPoolExecutor(max_workers=self.n_workers)
+        elif self.mode == IslandSolvingMode.Threads:
+            self.executor = ThreadPoolExecutor(max_workers=self.n_workers)
+
+        self._previous = _ISLAND_POOL
+        _ISLAND_POOL = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        global _ISLAND_POOL
+
+        _ISLAND_POOL = self._previous
+        self._previous = None
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def get_executor(self, options: PowerFlowOptions) -> Union[ThreadPoolExecutor, ProcessPoolExecutor, None]:
+        """
+        Get the executor of this pool if it can run the islands of some options
+        :param options: PowerFlowOptions
+        :return: executor, None if the options ask for another mode or the pool belongs to another process
+        """
+        if self.mode == options.island_solving_mode and self.pid == os.getpid():
+            return self.executor
+        else:
+            return None
+
+
+# pool of the simulation run in progress (see IslandPool)
+_ISLAND_POOL: Union[IslandPool, None] = None
+
+
+def __solve_island_task(solve_function: Callable[..., Tuple[NumericPowerFlowResults, ConvergenceReport]],
+                        kwargs: Dict[str, Any]) -> Tuple[NumericPowerFlowResults, ConvergenceReport, Logger]:
+    """
+    Solve an island in a worker thread or process, with its own logger
+    :param solve_function: __solve_island_complete_support or __solve_island_limited_support
+    :param kwargs: arguments of solve_function, except the logger
+    :return: solution, convergence report, logger
+    """
+    logger = Logger()
+    solution, report = solve_function(logger=logger, **kwargs)
+    return solution, report, logger
+
+
+def __run_island_tasks(executor: Union[ThreadPoolExecutor, ProcessPoolExecutor],
+                       solve_function: Callable[..., Tuple[NumericPowerFlowResults, ConvergenceReport]],
+                       tasks: List[Dict[str, Any]],
+                       logger: Logger) -> List[Tuple[NumericPowerFlowResults, ConvergenceReport]]:
+    """
+    Solve a number of islands in a pool
+    :param executor: thread or process pool
+    :param solve_function: __solve_island_complete_support or __solve_island_limited_support
+    :param tasks: arguments of solve_function for every island, except the logger
+    :param logger: Logger
+    :return: list of (solution, convergence report) per task
+    """
+    solutions = list()
+    futures = [executor.submit(__solve_island_task, solve_function, kwargs) for kwargs in tasks]
+
+    for future in futures:
+        solution, report, island_logger = future.result()
+        logger += island_logger
+        solutions.append((solution, report))
+
+    return solutions
+
+
+def __solve_islands(solve_function: Callable[..., Tuple[NumericPowerFlowResults, ConvergenceReport]],
+                    tasks: List[Dict[str, Any]],
+                    options: PowerFlowOptions,
+                    logger: Logger) -> List[Tuple[NumericPowerFlowResults, ConvergenceReport]]:
+    """
+    Solve a number of islands as set in options.island_solving_mode
+
+    With the thread pool, the islands share the memory and the caches, and run concurrently
+    while the numerical kernels release the GIL (the numba Jacobian, power and csc kernels are
+    compiled with nogil=True, and the sparse factorizations run in compiled code).
+    With the process pool, the islands are materialized and sent to the worker processes.
+    Either way, the solutions are returned (and the logs merged) in the order of the tasks,
+    so the results do not depend on the mode.
+    Inside an IslandPool, its workers are reused, otherwise a pool is created for this call.
+
+    :param solve_function: __solve_island_complete_support or __solve_island_limited_support
+    :param tasks: arguments of solve_function for every island, except the logger
+    :param options: PowerFlowOptions
+    :param logger: Logger
+    :return: list of (solution, convergence report) per task
+    """
+    if options.island_solving_mode == IslandSolvingMode.Serial or len(tasks) < 2:
+        return [solve_function(logger=logger, **kwargs) for kwargs in tasks]
+
+    if options.island_solving_mode == IslandSolvingMode.Processes:
+        for kwargs in tasks:
+            for value in kwargs.values():
+                if isinstance(value, NumericalCircuit):
+                    value.materialize()
+
+    executor = _ISLAND_POOL.get_executor(options) if _ISLAND_POOL is not None else None
+
+    if executor is not None:
+        return __run_island_tasks(executor=executor, solve_function=solve_function, tasks=tasks, logger=logger)
+
+    with IslandPool(options=options, n_tasks=len(tasks)) as pool:
+        return __run_island_tasks(executor=pool.executor, solve_function=solve_function, tasks=tasks,
+                                  logger=logger)
+
+
 def __multi_island_pf_nc_complete_support(nc: NumericalCircuit,
                                           options: PowerFlowOptions,
                                           logger: Logger | None = None,
@@ -765,36 +981,43 @@ def __multi_island_pf_nc_complete_support(nc: NumericalCircuit,
                                     consider_hvdc_as_island_links=True,
                                     logger=logger)
 
+    solved_islands = list()
+    tasks = list()
     for i, island in enumerate(islands):
 
         indices = island.get_simulation_indices()
         Sbus_base = island.get_power_injections_pu()
 
         if len(indices.vd) > 0:
-
-            # call the numerical methods
-            solution, report = __solve_island_complete_support(
+            solved_islands.append(island)
+            tasks.append(dict(
                 nc=island,
                 indices=indices,
                 options=options,
                 V0=island.bus_data.Vbus if V_guess is None else V_guess[island.bus_data.original_idx],
                 S0=Sbus_base if Sbus_input is None else Sbus_input[island.bus_data.original_idx],
-                logger=logger
-            )
-
-            # merge the results from this island
-            results.apply_from_island(
-                results=solution,
-                b_idx=island.bus_data.original_idx,
-                br_idx=island.passive_branch_data.original_idx,
-                hvdc_idx=island.hvdc_data.original_idx,
-                vsc_idx=island.vsc_data.original_idx
-            )
-            results.convergence_reports.append(report)
+            ))
 
         else:
             logger.add_info('No slack nodes in the island', str(i))
 
+    # call the numerical methods
+    for island, (solution, report) in zip(solved_islands, __solve_islands(
+            solve_function=__solve_island_complete_support,
+            tasks=tasks,
+            options=options,
+            logger=logger
+    )):
+        # merge the results from this island
+        results.apply_from_island(
+            results=solution,
+            b_idx=island.bus_data.original_idx,
+            br_idx=island.passive_branch_data.original_idx,
+            hvdc_idx=island.hvdc_data.original_idx,
+            vsc_idx=island.vsc_data.original_idx
+        )
+        results.convergence_reports.append(report)
+
     return results
 
 
@@ -802,7 +1025,8 @@ def __multi_island_pf_nc_limited_support(nc: NumericalCircuit,
                                          options: PowerFlowOptions,
                                          logger: Logger | None = None,
                                          V_guess: Union[CxVec, None] = None,
-                                         Sbus_input: Union[CxVec, None] = None) -> PowerFlowResults:
+                                         Sbus_input: Union[CxVec, None] = None,
+                                         branch_results: bool = True) -> PowerFlowResults:
     """
     Multiple islands power flow (this is the most generic power flow function)
 
@@ -818,6 +1042,7 @@ def __multi_island_pf_nc_limited_support(nc: NumericalCircuit,
     :param logger: logger
     :param V_guess: voltage guess
     :param Sbus_input: Use this power injections if provided
+    :param branch_results: compute the branch results, if False they are left at zero
     :return: PowerFlowResults instance
     """
     if logger is None:
@@ -854,37 +1079,45 @@ def __multi_island_pf_nc_limited_support(nc: NumericalCircuit,
                                     consider_hvdc_as_island_links=False,
                                     logger=logger)
 
+    solved_islands = list()
+    tasks = list()
     for i, island in enumerate(islands):
 
         Sbus_base = island.get_power_injections_pu()
         indices = island.get_simulation_indices(Sbus=Sbus_base)
 
         if len(indices.vd) > 0:
-
-            # call the numerical methods
-            solution, report = __solve_island_limited_support(
+            solved_islands.append(island)
+            tasks.append(dict(
                 island=island,
                 indices=indices,
                 options=options,
                 V0=island.bus_data.Vbus if V_guess is None else V_guess[island.bus_data.original_idx],
                 S_base=Sbus_base if Sbus_input is None else Sbus_input[island.bus_data.original_idx],
                 Shvdc=Shvdc[island.bus_data.original_idx],
-                logger=logger
-            )
-
-            # merge the results from this island
-            results.apply_from_island(
-                results=solution,
-                b_idx=island.bus_data.original_idx,
-                br_idx=island.passive_branch_data.original_idx,
-                hvdc_idx=island.hvdc_data.original_idx,
-                vsc_idx=island.vsc_data.original_idx
-            )
-            results.convergence_reports.append(report)
+                branch_results=branch_results,
+            ))
 
         else:
             logger.add_info('No slack nodes in the island', str(i))
 
+    # call the numerical methods
+    for island, (solution, report) in zip(solved_islands, __solve_islands(
+            solve_function=__solve_island_limited_support,
+            tasks=tasks,
+            options=options,
+            logger=logger
+    )):
+        # merge the results from this island
+        results.apply_from_island(
+            results=solution,
+            b_idx=island.bus_data.original_idx,
+            br_idx=island.passive_branch_data.original_idx,
+            hvdc_idx=island.hvdc_data.original_idx,
+            vsc_idx=island.vsc_data.original_idx
+        )
+        results.convergence_reports.append(report)
+
     # Compile HVDC results (available for the complete grid since HVDC line as
     # formulated are split objects
     # Pt is the "generation" at the sending point
@@ -900,7 +1133,8 @@ def multi_island_pf_nc(nc: NumericalCircuit,
                        options: PowerFlowOptions,
                        logger: Logger | None = None,
                        V_guess: Union[CxVec, None] = None,
-                       Sbus_input: Union[CxVec, None] = None) -> PowerFlowResults:
+                       Sbus_input: Union[CxVec, None] = None,
+                       branch_results: bool = True) -> PowerFlowResults:
     """
     Multiple islands power flow (this is the most generic power flow function)
     :param nc: SnapshotData instance
@@ -908,6 +1142,9 @@ def multi_island_pf_nc(nc: NumericalCircuit,
     :param logger: logger
     :param V_guess: voltage guess
     :param Sbus_input: Use this power injections if provided (in p.u.)
+    :param branch_results: compute the branch results, if False only the voltages and the bus powers are computed
+                           and the branch results are left at zero (i.e. when they are computed later for many
+                           solutions at once). The circuits with branch controls always compute them.
     :return: PowerFlowResults instance
     """
     if logger is None:
@@ -963,6 +1200,7 @@ def multi_island_pf_nc(nc: NumericalCircuit,
             logger=logger,
             V_guess=V_guess,
             Sbus_input=Sbus_input,
+            branch_results=branch_results,
         )
 
         # expand voltages if there was a bus topology reduction
@@ -975,6 +1213,214 @@ def multi_island_pf_nc(nc: NumericalCircuit,
         return results
 
 
+def __solve_island_batch(island: NumericalCircuit,
+                         options: PowerFlowOptions,
+                         S0: CxMat,
+                         logger: Logger) -> List[Union[NumericPowerFlowResults, None]]:
+    """
+    Solve a number of injection scenarios of an island with the batched Newton-Raphson
+    :param island: NumericalCircuit of the island
+    :param options: PowerFlowOptions
+    :param S0: power injections matrix (scenarios, island buses) in p.u. (HVDC injections included)
+    :param logger: Logger
+    :return: list of solutions per scenario, None for the scenarios that must be solved one by one
+             (not converged, or reactive power limits violated with control_Q)
+    """
+    adm = island.get_admittance_matrices()
+    Qmax, Qmin = island.get_reactive_power_limits()
+
+    # same bus types as PfBasicFormulation
+    vd, pq, pv, pqv, p, no_slack = compile_types(Pbus=S0[0, :].real, types=island.bus_data.bus_types)
+
+    V, Scalc, converged, error, iterations, elapsed = newton_raphson_batch(
+        Ybus=adm.Ybus,
+        S0=S0,
+        V0=island.bus_data.Vbus,
+        I0=island.get_current_injections_pu(),
+        Y0=island.get_admittance_injections_pu(),
+        pv=pv,
+        pq=pq,
+        pqv=pqv,
+        p=p,
+        tol=options.tolerance,
+        max_iter=options.max_iter,
+        trust=options.trust_radius,
+        logger=logger
+    )
+
+    if options.control_Q and (len(pv) + len(p)) > 0:
+        pv_p = np.r_[pv, p]
+        Q = Scalc[:, pv_p].imag
+        q_violated = ((Q > Qmax[pv_p]) | (Q < Qmin[pv_p])).any(axis=1)
+    else:
+        q_violated = np.zeros(S0.shape[0], dtype=bool)
+
+    solutions = list()
+    for k in range(S0.shape[0]):
+
+        if converged[k] and not q_violated[k]:
+            Sf, St, If, It, Vbranch, loading, losses, Sbus = power_flow_post_process_nonlinear(
+                Sbus=Scalc[k, :],
+                V=V[k, :],
+                F=island.passive_branch_data.F,
+                T=island.passive_branch_data.T,
+                pv=pv,
+                vd=vd,
+                Ybus=adm.Ybus,
+                Yf=adm.Yf,
+                Yt=adm.Yt,
+                Yshunt_bus=adm.Yshunt_bus,
+                branch_rates=island.passive_branch_data.rates,
+                Sbase=island.Sbase
+            )
+
+            solution = NumericPowerFlowResults(V=V[k, :],
+                                               Scalc=Sbus * island.Sbase,
+                                               m=island.active_branch_data.tap_module,
+                                               tau=island.active_branch_data.tap_angle,
+                                               Sf=Sf,
+                                               St=St,
+                                               If=If,
+                                               It=It,
+                                               loading=loading,
+                                               losses=losses,
+                                               Pf_vsc=np.zeros(island.nvsc, dtype=float),
+                                               St_vsc=np.zeros(island.nvsc, dtype=complex),
+                                               If_vsc=np.zeros(island.nvsc, dtype=float),
+                                               It_vsc=np.zeros(island.nvsc, dtype=complex),
+                                               losses_vsc=np.zeros(island.nvsc, dtype=float),
+                                               loading_vsc=np.zeros(island.nvsc, dtype=float),
+                                               Sf_hvdc=np.zeros(island.nhvdc, dtype=complex),
+                                               St_hvdc=np.zeros(island.nhvdc, dtype=complex),
+                                               losses_hvdc=np.zeros(island.nhvdc, dtype=complex),
+                                               loading_hvdc=np.zeros(island.nhvdc, dtype=complex),
+                                               norm_f=error[k],
+                                               converged=True,
+                                               iterations=iterations[k],
+                                               elapsed=elapsed / S0.shape[0])  # share of the batch time
+            solution.method = SolverType.NR
+            solutions.append(solution)
+        else:
+            solutions.append(None)
+
+    return solutions
+
+
+def multi_island_pf_nc_batch(nc: NumericalCircuit,
+                             options: PowerFlowOptions,
+                             Sbus_input: CxMat,
+                             logger: Logger | None = None) -> List[PowerFlowResults]:
+    """
+    Multiple islands power flow of a number of power injection scenarios over the same circuit.
+    This is the same as calling multi_island_pf_nc with every row of Sbus_input, but when the
+    options allow it (Newton-Raphson with no distributed slack, no branch controls) the scenarios of every
+    island are solved together with newton_raphson_batch, and only the scenarios that do not converge
+    or that violate the reactive power limits are solved one by one.
+    :param nc: NumericalCircuit instance
+    :param options: PowerFlowOptions instance
+    :param Sbus_input: power injections matrix (scenarios, buses) in p.u.
+    :param logger: logger
+    :return: list of PowerFlowResults, one per scenario
+    """
+    if logger is None:
+        logger = Logger()
+
+    if (options.solver_type != SolverType.NR or options.distributed_slack or options.initialize_angles
+            or nc.active_branch_data.any_pf_control):
+        return [multi_island_pf_nc(nc=nc, options=options, logger=logger, Sbus_input=Sbus_input[k, :])
+                for k in range(Sbus_input.shape[0])]
+
+    n_scenarios = Sbus_input.shape[0]
+    results_list = [PowerFlowResults(n=nc.nbus,
+                                     m=nc.nbr,
+                                     n_hvdc=nc.nhvdc,
+                                     n_vsc=nc.nvsc,
+                                     n_gen=nc.ngen,
+                                     n_batt=nc.nbatt,
+                                     n_sh=nc.nshunt,
+                                     bus_names=nc.bus_data.names,
+                                     branch_names=nc.passive_branch_data.names,
+                                     hvdc_names=nc.hvdc_data.names,
+                                     vsc_names=nc.vsc_data.names,
+                                     gen_names=nc.generator_data.names,
+                                     batt_names=nc.battery_data.names,
+                                     sh_names=nc.shunt_data.names,
+                                     bus_types=nc.bus_data.bus_types)
+                    for _ in range(n_scenarios)]
+
+    # compose the HVDC power Injections (see __multi_island_pf_nc_limited_support)
+    Shvdc, Losses_hvdc, Pf_hvdc, Pt_hvdc, loading_hvdc, n_free = nc.hvdc_data.get_power(
+        Sbase=nc.Sbase,
+        theta=np.zeros(nc.nbus),
+    )
+
+    # compute islands
+    islands = nc.split_into_islands(ignore_single_node_islands=options.ignore_single_node_islands,
+                                    consider_hvdc_as_island_links=False,
+                                    logger=logger)
+
+    for i, island in enumerate(islands):
+
+        Sbus_base = island.get_power_injections_pu()
+        indices = island.get_simulation_indices(Sbus=Sbus_base)
+        b_idx = island.bus_data.original_idx
+
+        if len(indices.vd) > 0:
+
+            solutions = __solve_island_batch(island=island,
+                                             options=options,
+                                             S0=Sbus_input[:, b_idx] + Shvdc[b_idx],
+                                             logger=logger)
+
+            for k, solution in enumerate(solutions):
+
+                if solution is None:
+                    solution, report = __solve_island_limited_support(
+                        island=island,
+                        indices=indices,
+                        options=options,
+                        V0=island.bus_data.Vbus,
+                        S_base=Sbus_input[k, b_idx],
+                        Shvdc=Shvdc[b_idx],
+                        logger=logger
+                    )
+                else:
+                    report = ConvergenceReport()
+                    report.add(method=SolverType.NR,
+                               converged=solution.converged,
+                               error=solution.norm_f,
+                               elapsed=solution.elapsed,
+                               iterations=solution.iterations)
+
+                # merge the results from this island
+                results_list[k].apply_from_island(
+                    results=solution,
+                    b_idx=b_idx,
+                    br_idx=island.passive_branch_data.original_idx,
+                    hvdc_idx=island.hvdc_data.original_idx,
+                    vsc_idx=island.vsc_data.original_idx
+                )
+                results_list[k].convergence_reports.append(report)
+
+        else:
+            logger.add_info('No slack nodes in the island', str(i))
+
+    for results in results_list:
+        results.Pf_hvdc = - Pf_hvdc * nc.Sbase  # we change the sign to keep the sign convention with AC lines
+        results.Pt_hvdc = - Pt_hvdc * nc.Sbase  # we change the sign to keep the sign convention with AC lines
+        results.loading_hvdc = loading_hvdc
+        results.losses_hvdc = Losses_hvdc * nc.Sbase
+
+        # expand voltages if there was a bus topology reduction
+        if nc.topology_performed:
+            results.voltage = nc.propagate_bus_result(results.voltage)
+
+        # do the reactive power partition and store the values
+        __split_reactive_power_into_devices(nc=nc, Qbus=results.Sbus.imag, results=results)
+
+    return results_list
+
+
 def multi_island_pf(multi_circuit: MultiCircuit,
                     options: PowerFlowOptions,
                     opf_results: VALID_OPF_RESULTS | None = None,
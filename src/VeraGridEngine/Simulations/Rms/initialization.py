@@ -6,7 +6,6 @@ from typing import Tuple, Any, Sequence, Callable, Dict
 import math
 import numba as nb
 import numpy as np
-from scipy.optimize import newton_krylov
 from VeraGridEngine.Utils.Symbolic import BlockSolver
 from VeraGridEngine.Utils.Symbolic.symbolic import _emit, _emit_one
 from VeraGridEngine.Utils.Symbolic.block import Block, Expr
@@ -5,8 +5,7 @@
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import matplotlib.colors as plt_colors
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from typing import List, Tuple
 
 from VeraGridEngine.Simulations.results_table import ResultsTable
@@ -15,6 +14,9 @@ from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 from VeraGridEngine.basic_structures import IntVec, Vec, StrVec, CxVec, ConvergenceReport, Logger
 from VeraGridEngine.enumerations import StudyResultsType, ResultTypes, DeviceType
 
+plt = lazy_import('matplotlib.pyplot')
+plt_colors = lazy_import('matplotlib.colors')
+
 
 class NumericPowerFlowResults:
     """
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: MPL-2.0
 import numpy as np
 import numba as nb
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from typing import Union
 
 from VeraGridEngine.basic_structures import Logger
@@ -18,6 +18,8 @@ from VeraGridEngine.Simulations.PowerFlow.NumericalMethods.helm_power_flow impor
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
 from VeraGridEngine.basic_structures import Vec
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class SigmaAnalysisResults:  # TODO: inherit from ResultsTemplate
     """
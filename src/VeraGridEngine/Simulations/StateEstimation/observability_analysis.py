@@ -2,8 +2,7 @@ from datetime import time
 from typing import List
 
 import numpy as np
-import networkx as nx
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from numpy.linalg import matrix_rank, inv
 from scipy.sparse import csc_matrix, diags
 from scipy.sparse.linalg import splu
@@ -17,6 +16,9 @@ from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing as mp
 
+plt = lazy_import('matplotlib.pyplot')
+nx = lazy_import('networkx')
+
 
 def check_for_observability_and_return_unobservable_buses(nc: NumericalCircuit,
                                                           Ybus: CscMat,
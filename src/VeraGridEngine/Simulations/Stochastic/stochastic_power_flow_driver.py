@@ -12,7 +12,7 @@ from VeraGridEngine.Simulations.Stochastic.stochastic_power_flow_results import
 from VeraGridEngine.Simulations.Stochastic.stochastic_power_flow_input import StochasticPowerFlowInput
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, BranchImpedanceMode
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
-from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import PowerFlowOptions, multi_island_pf_nc
+from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import PowerFlowOptions, multi_island_pf_nc_batch
 from VeraGridEngine.enumerations import SimulationTypes
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
 
@@ -145,39 +145,45 @@ class StochasticPowerFlowDriver(DriverTemplate):
         # get the power injections in p.u.
         S_combinations = monte_carlo_input.get(self.max_sampling_points, use_latin_hypercube=use_lhs) / self.grid.Sbase
 
-        # run the time series
-        for i in range(self.max_sampling_points):
-
-            # Run the set monte carlo point at 't'
-            res = multi_island_pf_nc(nc=nc,
-                                     options=self.options,
-                                     Sbus_input=S_combinations[i, :])
-
-            # Gather the results
-            mc_results.S_points[i, :] = S_combinations[i, :]
-            mc_results.V_points[i, :] = res.voltage
-            mc_results.Sbr_points[i, :] = res.Sf
-            mc_results.loading_points[i, :] = res.loading
-            mc_results.losses_points[i, :] = res.losses
-
-            # determine when to stop
-            if i > 1:
-                v_sum += mc_results.get_voltage_sum()
-                v_avg = v_sum / i
-                v_variance = np.abs((np.power(mc_results.V_points - v_avg, 2.0) / (i - 1)).min())
-
-                # progress
-                variance_sum += v_variance
-                err = variance_sum / i
-                if err == 0:
-                    err = 1e-200  # to avoid division by zeros
-                mc_results.error_series.append(err)
-
-                # emmit the progress signal
-                std_dev_progress = 100 * self.mc_tol / err
-                if std_dev_progress > 100:
-                    std_dev_progress = 100
-                self.report_progress(max((std_dev_progress, i / self.max_sampling_points * 100)))
+        # run the sampling points in batches that are solved together
+        for batch in np.array_split(np.arange(self.max_sampling_points),
+                                    max(1, int(np.ceil(self.max_sampling_points / max(1, self.batch_size))))):
+
+            res_batch = multi_island_pf_nc_batch(nc=nc,
+                                                 options=self.options,
+                                                 Sbus_input=S_combinations[batch, :],
+                                                 logger=self.logger)
+
+            for i, res in zip(batch, res_batch):
+
+                # Gather the results
+                mc_results.S_points[i, :] = S_combinations[i, :]
+                mc_results.V_points[i, :] = res.voltage
+                mc_results.Sbr_points[i, :] = res.Sf
+                mc_results.loading_points[i, :] = res.loading
+                mc_results.losses_points[i, :] = res.losses
+
+                # determine when to stop
+                if i > 1:
+                    v_sum += mc_results.get_voltage_sum()
+                    v_avg = v_sum / i
+                    v_variance = np.abs((np.power(mc_results.V_points - v_avg, 2.0) / (i - 1)).min())
+
+                    # progress
+                    variance_sum += v_variance
+                    err = variance_sum / i
+                    if err == 0:
+                        err = 1e-200  # to avoid division by zeros
+                    mc_results.error_series.append(err)
+
+                    # emmit the progress signal
+                    std_dev_progress = 100 * self.mc_tol / err
+                    if std_dev_progress > 100:
+                        std_dev_progress = 100
+                    self.report_progress(max((std_dev_progress, i / self.max_sampling_points * 100)))
+
+                if self.__cancel__:
+                    break
 
             if self.__cancel__:
                 break
@@ -5,7 +5,6 @@
 
 
 import numpy as np
-from sklearn.neighbors import KNeighborsRegressor
 from VeraGridEngine.Simulations.Stochastic.latin_hypercube_sampling import lhs
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.basic_structures import CDF, CxVec, CxMat
@@ -34,6 +33,7 @@ class StochasticPowerFlowInput:
         self.Scdf_fixed = [CDF(Sprof_fixed[:, i]) for i in range(self.n)]
 
         # build the relationship of the dispatchable devices to the fixed ones for later
+        from sklearn.neighbors import KNeighborsRegressor  # sklearn takes long to import, only do it here
         self.regression_model = KNeighborsRegressor(n_neighbors=4)
         self.regression_model.fit(Sprof_fixed.real, Sprof_dispatcheable.real)
 
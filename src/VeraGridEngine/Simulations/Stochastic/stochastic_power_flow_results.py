@@ -3,7 +3,6 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 from VeraGridEngine.basic_structures import CDF
 from VeraGridEngine.Simulations.results_table import ResultsTable
 from VeraGridEngine.Simulations.results_template import ResultsTemplate
@@ -204,6 +203,8 @@ class StochasticPowerFlowResults(ResultsTemplate):
         # algorithm : {‘auto’, ‘ball_tree’, ‘kd_tree’, ‘brute’},
         # model = KNeighborsRegressor(n_neighbors=4, algorithm='brute', leaf_size=16)
 
+        from sklearn.ensemble import RandomForestRegressor  # sklearn takes long to import, only do it here
+
         model = RandomForestRegressor(10)
 
         model.fit(x_train, y_train)
@@ -3,14 +3,14 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 import numpy as np
-import networkx as nx
-from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import Normalizer
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Simulations.LinearFactors.linear_analysis_driver import LinearAnalysisResults
 from VeraGridEngine.enumerations import SimulationTypes
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
+from VeraGridEngine.Utils.lazy_import import lazy_import
+
+nx = lazy_import('networkx')
 
 
 class NodeGroupsDriver(DriverTemplate):
@@ -75,6 +75,10 @@ class NodeGroupsDriver(DriverTemplate):
         Run the monte carlo simulation
         @return:
         """
+        # sklearn takes long to import, only do it when running
+        from sklearn.cluster import DBSCAN
+        from sklearn.preprocessing import Normalizer
+
         self.tic()
         self.report_progress(0.0)
 
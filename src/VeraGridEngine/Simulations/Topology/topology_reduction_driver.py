@@ -3,7 +3,6 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 import pandas as pd
-import networkx as nx
 from scipy.sparse import lil_matrix, csc_matrix
 
 from typing import List
@@ -13,11 +12,14 @@ from VeraGridEngine.Devices.Branches.branch import BranchType
 from VeraGridEngine.Devices.Substation.bus import Bus
 from VeraGridEngine.enumerations import SimulationTypes
 from VeraGridEngine.Simulations.driver_template import DriverTemplate
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 pd.set_option('display.max_rows', 500)
 pd.set_option('display.max_columns', 500)
 pd.set_option('display.width', 1000)
 
+nx = lazy_import('networkx')
+
 
 def get_branches_of_bus(B, j):
     """
@@ -25,4 +25,9 @@ from VeraGridEngine.Simulations.Reliability import *
 from VeraGridEngine.Simulations.AI import *
 from VeraGridEngine.Simulations.Rms import *
 from VeraGridEngine.Simulations.results_template import DriverToSave, ResultsTemplate
+from VeraGridEngine.Utils.lazy_import import lazy_attributes
+
+SIMULATIONS_LAZY_ATTRIBUTES = {**OPF_LAZY_ATTRIBUTES}
+
+__getattr__ = lazy_attributes(__name__, SIMULATIONS_LAZY_ATTRIBUTES)
 
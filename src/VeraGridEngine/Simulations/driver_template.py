@@ -180,6 +180,9 @@ class TimeSeriesDriverTemplate(DriverTemplate):
 
         self.clustering_results: Union[ClusteringResults, None] = clustering_results
 
+        # index of the branch states along time_indices (computed on demand)
+        self._topology_index: Union[tp.TopologyIndex, None] = None
+
         if clustering_results:
             self.using_clusters = True
             self.time_indices: IntVec = clustering_results.time_indices
@@ -213,6 +216,19 @@ class TimeSeriesDriverTemplate(DriverTemplate):
         else:
             return [self.grid.time_profile[i].strftime('%d-%m-%Y %H:%M') for i in self.time_indices]
 
+    def get_topology_index(self) -> tp.TopologyIndex:
+        """
+        Get the index of the branch states along the time indices of this driver
+        It is computed once and reused afterwards
+        :return: TopologyIndex, where the time positions refer to self.time_indices
+        """
+        if self._topology_index is None:
+            self._topology_index = tp.compute_topology_index(
+                states_array=self.grid.get_branch_active_time_array()[self.time_indices]
+            )
+
+        return self._topology_index
+
     def get_topologic_groups(self) -> Dict[int, List[int]]:
         """
         Get numerical circuit time groups
@@ -222,9 +238,18 @@ class TimeSeriesDriverTemplate(DriverTemplate):
                  and that [5, 6, 7, 8] are represented by the topology of 5
         """
 
-        return tp.find_different_states(
-            states_array=self.grid.get_branch_active_time_array()[self.time_indices]
-        )
+        return self.get_topology_index().to_dict()
+
+    @staticmethod
+    def get_time_chunks(n_chunks: int, nt: int) -> List[IntVec]:
+        """
+        Split the time positions in contiguous chunks of similar size (i.e. to run them in parallel)
+        The chunks only depend on the arguments, so that the parallel runs are deterministic
+        :param n_chunks: number of chunks
+        :param nt: number of time positions
+        :return: list of arrays of time positions, without empty chunks
+        """
+        return [chunk for chunk in np.array_split(np.arange(nt), max(1, n_chunks)) if len(chunk) > 0]
 
     def get_fuel_emissions_energy_calculations(self, gen_p: Mat, gen_cost: Mat):
         """
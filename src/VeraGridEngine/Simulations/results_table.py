@@ -6,11 +6,13 @@
 from typing import Union, List
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.enumerations import ResultTypes, DeviceType
 from VeraGridEngine.basic_structures import StrVec, Mat, Vec
 from VeraGridEngine.Devices.types import ALL_DEV_TYPES
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 class ResultsTable:
     """
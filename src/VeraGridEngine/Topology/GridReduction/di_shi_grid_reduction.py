@@ -9,16 +9,18 @@ from typing import Tuple, Sequence, TYPE_CHECKING
 from scipy.sparse.linalg import factorized, spsolve
 from scipy.sparse import csc_matrix, bmat
 
-import networkx as nx
 import VeraGridEngine.Devices as dev
 from VeraGridEngine.basic_structures import IntVec, CxVec, Logger
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.Utils.lazy_import import lazy_import
 
 if TYPE_CHECKING:
     from VeraGridEngine.Devices.multi_circuit import MultiCircuit
     from VeraGridEngine.Simulations.PowerFlow.power_flow_results import PowerFlowResults
     from VeraGridEngine.DataStructures.numerical_circuit import NumericalCircuit
 
+nx = lazy_import('networkx')
+
 
 def ward_reduction_non_linear(nc: NumericalCircuit, e_buses, b_buses, i_buses, voltage: CxVec, Sbus: CxVec):
     """
@@ -15,13 +15,15 @@ from typing import Iterable, List, Dict, Tuple, Optional, Sequence
 import numpy as np
 import scipy.sparse as sp
 import scipy.sparse.linalg as spla
-import networkx as nx
 
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
 from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
 from VeraGridEngine.enumerations import SolverType
+from VeraGridEngine.Utils.lazy_import import lazy_import
+
+nx = lazy_import('networkx')
 
 
 # -----------------------------
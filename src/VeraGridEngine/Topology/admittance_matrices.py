@@ -889,6 +889,12 @@ class FastDecoupledAdmittanceMatrices:
         self.B1 = B1
         self.B2 = B2
 
+    def copy(self) -> "FastDecoupledAdmittanceMatrices":
+        """
+        Get a deep copy
+        """
+        return FastDecoupledAdmittanceMatrices(B1=self.B1.copy(), B2=self.B2.copy())
+
 
 def compute_fast_decoupled_admittances(X: Vec,
                                        B: Vec,
@@ -941,6 +947,15 @@ class LinearAdmittanceMatrices:
         self.Gbus = Gbus
         self.Gf = Gf
 
+    def copy(self) -> "LinearAdmittanceMatrices":
+        """
+        Get a deep copy
+        """
+        return LinearAdmittanceMatrices(Bbus=self.Bbus.copy(),
+                                        Bf=self.Bf.copy(),
+                                        Gbus=self.Gbus.copy(),
+                                        Gf=self.Gf.copy())
+
     def get_Bred(self, pqpv: IntVec) -> sp.csc_matrix:
         """
         Get Bred or Bpqpv for the PTDF and DC power flow
@@ -496,50 +496,101 @@ def get_adjacency_matrix(C_branch_bus_f: csc_matrix, C_branch_bus_t: csc_matrix,
     return C_bus_bus
 
 
-def find_different_states(states_array: IntMat, force_all=False) -> Dict[int, List[int]]:
+class TopologyIndex:
     """
-    Find the different branch states in time that may lead to different islands
-    :param states_array: bool array indicating the different grid states (time, device)
+    Index of the different states (i.e. branch active states) along the time
+    """
+
+    def __init__(self, state_of_t: IntVec, representative: IntVec):
+        """
+        Constructor
+        :param state_of_t: state id of every time position
+        :param representative: first time position of every state (the one that represents it)
+        """
+        self.state_of_t: IntVec = state_of_t
+        self.representative: IntVec = representative
+        self.counts: IntVec = np.bincount(state_of_t, minlength=len(representative))
+
+    @property
+    def n_states(self) -> int:
+        """
+        Number of different states
+        :return: int
+        """
+        return len(self.representative)
+
+    @property
+    def nt(self) -> int:
+        """
+        Number of time positions
+        :return: int
+        """
+        return len(self.state_of_t)
+
+    def get_positions(self, state: int) -> IntVec:
+        """
+        Get the time positions of a state
+        :param state: state id
+        :return: sorted time positions
+        """
+        return np.where(self.state_of_t == state)[0]
+
+    def to_dict(self) -> Dict[int, List[int]]:
+        """
+        Get the representation used by find_different_states
+        :return: Dictionary with the time: [array of times] represented by the index, for instance
+                 {0: [0, 1, 2, 3, 4], 5: [5, 6, 7, 8]}
+        """
+        order = np.argsort(self.state_of_t, kind='stable')
+        groups = np.split(order, np.cumsum(self.counts)[:-1])
+        return {int(self.representative[s]): groups[s].tolist() for s in range(self.n_states)}
+
+
+def compute_topology_index(states_array: IntMat, force_all=False) -> TopologyIndex:
+    """
+    Find the different states in time (i.e. branch active states that may lead to different islands)
+    Every time row is hashed through its bytes, so this is O(n_time x n_device)
+    :param states_array: array indicating the different grid states (time, device)
     :param force_all: Skip analysis and every time step is a state
-    :return: Dictionary with the time: [array of times] represented by the index, for instance
-             {0: [0, 1, 2, 3, 4], 5: [5, 6, 7, 8]}
-             This means that [0, 1, 2, 3, 4] are represented by the topology of 0
-             and that [5, 6, 7, 8] are represented by the topology of 5
+    :return: TopologyIndex, where the states are numbered in order of appearance
     """
     n_time = states_array.shape[0]
 
-    if force_all:
-        return {i: [i] for i in range(n_time)}  # force all states
-
-    else:
+    if force_all or n_time == 0:
+        return TopologyIndex(state_of_t=np.arange(n_time, dtype=int),
+                             representative=np.arange(n_time, dtype=int))
 
-        # initialize
-        states = dict()  # type: Dict[int, List[int]]
-        k = 1
-        for t in range(n_time):
+    arr = np.ascontiguousarray(states_array)
+    state_of_t = np.empty(n_time, dtype=int)
+    representative = list()
+    seen: Dict[bytes, int] = dict()
 
-            # search this state in the already existing states
-            keys = list(states.keys())
-            nn = len(keys)
-            found = False
-            i = 0
-            while i < nn and not found:
-                t2 = keys[i]
+    for t in range(n_time):
+        key = arr[t, :].tobytes()
+        state = seen.get(key, None)
 
-                # compare state at t2 with the state at t
-                if np.array_equal(states_array[t, :], states_array[t2, :]):
-                    states[t2].append(t)  # add the state to the existing list of the key
-                    found = True
+        if state is None:
+            # new state found
+            state = len(representative)
+            seen[key] = state
+            representative.append(t)
 
-                i += 1
+        state_of_t[t] = state
 
-            if not found:
-                # new state found (append itself)
-                states[t] = [t]
+    return TopologyIndex(state_of_t=state_of_t, representative=np.array(representative, dtype=int))
 
-            k += 1
 
-        return states
+def find_different_states(states_array: IntMat, force_all=False) -> Dict[int, List[int]]:
+    """
+    Find the different branch states in time that may lead to different islands
+    :param states_array: bool array indicating the different grid states (time, device)
+    :param force_all: Skip analysis and every time step is a state
+    :return: Dictionary with the time: [array of times] represented by the index, for instance
+             {0: [0, 1, 2, 3, 4], 5: [5, 6, 7, 8]}
+             This means that [0, 1, 2, 3, 4] are represented by the topology of 0
+             and that [5, 6, 7, 8] are represented by the topology of 5
+    """
+    return compute_topology_index(states_array=states_array, force_all=force_all).to_dict()
 
 
 def get_csr_bus_indices(C: csr_matrix) -> IntVec:
@@ -0,0 +1,207 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple, Union
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import SuperLU
+
+from VeraGridEngine.Utils.hashing import hash_arrays
+
+
+def get_nbytes(value: Any) -> int:
+    """
+    Estimate the memory used by a cached value
+    :param value: numpy array, sparse matrix, LU factorization, list, tuple, dict or object holding those
+    :return: number of bytes
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+
+    elif sp.issparse(value):
+        if hasattr(value, 'indptr'):
+            return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        else:
+            return value.data.nbytes + value.row.nbytes + value.col.nbytes
+
+    elif isinstance(value, SuperLU):
+        # L and U values and indices, plus the permutations
+        return value.nnz * 12 + value.perm_c.nbytes + value.perm_r.nbytes
+
+    elif isinstance(value, (list, tuple)):
+        return sum(get_nbytes(val) for val in value)
+
+    elif isinstance(value, dict):
+        return sum(get_nbytes(val) for val in value.values())
+
+    elif hasattr(value, '__dict__'):
+        return sum(get_nbytes(val) for val in vars(value).values())
+
+    else:
+        return 0
+
+
+class TopologyCache:
+    """
+    LRU cache of the structures that only depend on the grid topology and impedances
+    (island decompositions, admittance matrices, ...)
+
+    The entries are stored by kind (i.e. "islands", "Ybus") and by a hash of the arrays
+    that define them (see hash_arrays), so repeated topologies cost one lookup.
+    When the memory budget is exceeded, the least recently used entries are removed.
+    """
+
+    def __init__(self, max_memory_mb: float = 512.0):
+        """
+        Constructor
+        :param max_memory_mb: memory budget in MB
+        """
+        self.max_memory_mb: float = max_memory_mb
+
+        self._data: OrderedDict[Tuple[str, str], Tuple[Any, int]] = OrderedDict()
+
+        self._memory: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # guards the entries, since the islands may be solved in concurrent threads
+        self._lock = threading.Lock()
+
+    @property
+    def memory_mb(self) -> float:
+        """
+        Memory used by the cached entries in MB
+        :return: float
+        """
+        return self._memory / 1048576.0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, item: Tuple[str, str]) -> bool:
+        return item in self._data
+
+    def get(self, kind: str, key: str) -> Union[Any, None]:
+        """
+        Get a cached entry
+        :param kind: kind of entry (i.e. "Ybus")
+        :param key: hash of the arrays that define the entry
+        :return: cached value or None if not found
+        """
+        with self._lock:
+            entry = self._data.get((kind, key), None)
+
+            if entry is None:
+                self.misses += 1
+                return None
+            else:
+                self.hits += 1
+                self._data.move_to_end((kind, key))
+                return entry[0]
+
+    def set(self, kind: str, key: str, value: Any) -> None:
+        """
+        Store an entry, removing the least recently used ones if the memory budget is exceeded
+        :param kind: kind of entry (i.e. "Ybus")
+        :param key: hash of the arrays that define the entry
+        :param value: value to store (it must not be modified afterwards)
+        """
+        nbytes = get_nbytes(value)
+        max_bytes = self.max_memory_mb * 1048576.0
+
+        if nbytes > max_bytes:
+            # this would flush the whole cache for nothing
+            return
+
+        with self._lock:
+            old = self._data.pop((kind, key), None)
+            if old is not None:
+                self._memory -= old[1]
+
+            self._data[(kind, key)] = (value, nbytes)
+            self._memory += nbytes
+
+            while self._memory > max_bytes:
+                _, (_, nb_) = self._data.popitem(last=False)
+                self._memory -= nb_
+
+    def clear(self) -> None:
+        """
+        Remove all the entries
+        """
+        with self._lock:
+            self._data.clear()
+            self._memory = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# cache shared by all the simulations of this process
+# it is disabled by default, use set_topology_cache(TopologyCache(max_memory_mb=...)) to enable it
+_TOPOLOGY_CACHE: Union[TopologyCache, None] = None
+
+
+def get_topology_cache() -> Union[TopologyCache, None]:
+    """
+    Get the topology cache shared by the simulations
+    :return: TopologyCache or None if caching is disabled
+    """
+    return _TOPOLOGY_CACHE
+
+
+def set_topology_cache(cache: Union[TopologyCache, None]) -> None:
+    """
+    Set the topology cache shared by the simulations
+    The cache is disabled by default, since its memory is held for the life of the process
+    :param cache: TopologyCache or None to disable caching
+    """
+    global _TOPOLOGY_CACHE
+    _TOPOLOGY_CACHE = cache
+
+
+class RunTopologyCache:
+    """
+    Topology cache of a simulation run (i.e. a time series), so that the structures shared by its
+    power flows are built once per topology, without holding the memory once the run is over.
+    It is used as a context manager around the run:
+
+        with RunTopologyCache():
+            for t in ...:
+                multi_island_pf_nc(...)
+
+    If a cache is already installed (see set_topology_cache), that one is used and kept.
+    """
+
+    def __init__(self, max_memory_mb: float = 512.0):
+        """
+        Constructor
+        :param max_memory_mb: memory budget of the cache in MB
+        """
+        self.max_memory_mb = max_memory_mb
+        self.cache: Union[TopologyCache, None] = None
+        self._previous: Union[TopologyCache, None] = None
+
+    def __enter__(self) -> TopologyCache:
+        self._previous = get_topology_cache()
+
+        if self._previous is None:
+            self.cache = TopologyCache(max_memory_mb=self.max_memory_mb)
+            set_topology_cache(self.cache)
+        else:
+            self.cache = self._previous
+
+        return self.cache
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # restore the previous state, unless someone else installed another cache meanwhile
+        if get_topology_cache() is self.cache:
+            set_topology_cache(self._previous)
+
+        self.cache = None
+        self._previous = None
@@ -25,10 +25,12 @@ import random
 import numpy as np
 from typing import List, Tuple
 from scipy.linalg.blas import dger
-from scipy.optimize import minimize
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.Utils.NumericalMethods.non_dominated_sorting import non_dominated_sorting, dominates
 from VeraGridEngine.basic_structures import Vec, Mat
 
+optimize = lazy_import('scipy.optimize')
+
 
 def relu(x):
     """
@@ -318,9 +320,9 @@ class SurrogateModel:
         if scalarization_type == 0:
             # with linear scalarization
             # print('Using linear scalarization')
-            res = minimize(self.g_scalarize, x0, args=(scalarization_weights,), method='L-BFGS-B', bounds=self.bounds,
-                           jac=self.g_scalarize_jac,
-                           options={'maxiter': 20, 'maxfun': 20})
+            res = optimize.minimize(self.g_scalarize, x0, args=(scalarization_weights,), method='L-BFGS-B', bounds=self.bounds,
+                                    jac=self.g_scalarize_jac,
+                                    options={'maxiter': 20, 'maxfun': 20})
             return res.x
         elif scalarization_type == 1:
             # with max scalarization
@@ -328,27 +330,27 @@ class SurrogateModel:
             # Golovin, Daniel and Qiuyi Zhang. “Random Hypervolume Scalarizations for
             # Provable Multi-Objective Black Box Optimization.” ArXiv abs/2006.04655 (2020): n. pag.
             # print('Using max scalarization')
-            res = minimize(self.g_scalarize_max, x0, args=(scalarization_weights,), method='L-BFGS-B',
-                           bounds=self.bounds,
-                           jac=self.g_scalarize_max_jac,
-                           options={'maxiter': 20, 'maxfun': 20})
+            res = optimize.minimize(self.g_scalarize_max, x0, args=(scalarization_weights,), method='L-BFGS-B',
+                                    bounds=self.bounds,
+                                    jac=self.g_scalarize_max_jac,
+                                    options={'maxiter': 20, 'maxfun': 20})
             return res.x
         elif scalarization_type == 0.5:
             # with mix scalarization
             r = random.random()
             if r > 0.5:
                 # print('Using mixed scalarization (now max)')
-                res = minimize(self.g_scalarize_max, x0, args=(scalarization_weights,), method='L-BFGS-B',
-                               bounds=self.bounds,
-                               jac=self.g_scalarize_max_jac,
-                               options={'maxiter': 20, 'maxfun': 20})
+                res = optimize.minimize(self.g_scalarize_max, x0, args=(scalarization_weights,), method='L-BFGS-B',
+                                        bounds=self.bounds,
+                                        jac=self.g_scalarize_max_jac,
+                                        options={'maxiter': 20, 'maxfun': 20})
                 return res.x
             elif r <= 0.5:
                 # print('Using mixed scalarization (now linear)')
-                res = minimize(self.g_scalarize, x0, args=(scalarization_weights,), method='L-BFGS-B',
-                               bounds=self.bounds,
-                               jac=self.g_scalarize_jac,
-                               options={'maxiter': 20, 'maxfun': 20})
+                res = optimize.minimize(self.g_scalarize, x0, args=(scalarization_weights,), method='L-BFGS-B',
+                                        bounds=self.bounds,
+                                        jac=self.g_scalarize_jac,
+                                        options={'maxiter': 20, 'maxfun': 20})
                 return res.x
             else:
                 raise Exception('Warning: wrong random number generated')
@@ -358,10 +360,10 @@ class SurrogateModel:
             # Multiobjective Optimization Problems'')
             # Warning: type 2 Augmented Tchebycheff is untested!!!
             # print('Using augmented Tchebycheff scalarization')
-            res = minimize(self.augmented_Tchebycheff, x0, args=(scalarization_weights,), method='L-BFGS-B',
-                           bounds=self.bounds,
-                           jac=self.augmented_Tchebycheff_jac,
-                           options={'maxiter': 20, 'maxfun': 20})
+            res = optimize.minimize(self.augmented_Tchebycheff, x0, args=(scalarization_weights,), method='L-BFGS-B',
+                                    bounds=self.bounds,
+                                    jac=self.augmented_Tchebycheff_jac,
+                                    options={'maxiter': 20, 'maxfun': 20})
             return res.x
         else:
             raise Exception('Warning: wrong scalarization chosen.')
@@ -25,9 +25,11 @@ import random
 import numpy as np
 from typing import List, Tuple
 from scipy.linalg.blas import dger
-from scipy.optimize import minimize
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.basic_structures import Vec, Mat, IntVec
 
+optimize = lazy_import('scipy.optimize')
+
 
 def relu(x):
     """
@@ -250,8 +252,8 @@ class SurrogateModel:
         Find a minimum of the surrogate model approximately.
         :param x0: the initial guess.
         """
-        res = minimize(self.g, x0, method='L-BFGS-B', bounds=self.bounds, jac=self.g_jac,
-                       options={'maxiter': 20, 'maxfun': 20})
+        res = optimize.minimize(self.g, x0, method='L-BFGS-B', bounds=self.bounds, jac=self.g_jac,
+                                options={'maxiter': 20, 'maxfun': 20})
         return res.x
 
 
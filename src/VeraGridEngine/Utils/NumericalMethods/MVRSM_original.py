@@ -26,11 +26,13 @@ import time
 import numpy as np
 from typing import List, Tuple
 
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from scipy.linalg.blas import dger
-from scipy.optimize import minimize
 from VeraGridEngine.basic_structures import Vec, Mat, IntVec
 
+plt = lazy_import('matplotlib.pyplot')
+optimize = lazy_import('scipy.optimize')
+
 
 def relu(x):
     """
@@ -253,8 +255,8 @@ class SurrogateModel:
         Find a minimum of the surrogate model approximately.
         :param x0: the initial guess.
         """
-        res = minimize(self.g, x0, method='L-BFGS-B', bounds=self.bounds, jac=self.g_jac,
-                       options={'maxiter': 20, 'maxfun': 20})
+        res = optimize.minimize(self.g, x0, method='L-BFGS-B', bounds=self.bounds, jac=self.g_jac,
+                                options={'maxiter': 20, 'maxfun': 20})
         return res.x
 
 
@@ -6,9 +6,11 @@ from dataclasses import dataclass
 from typing import Callable, Tuple
 import numpy as np
 import numba as nb
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.basic_structures import Vec, CscMat, IntVec, CxVec
 
+plt = lazy_import('matplotlib.pyplot')
+
 
 def check_function_and_args(func: Callable, args: Tuple, n_used_for_solver: int) -> bool:
     """
@@ -10,12 +10,14 @@ import pandas as pd
 from scipy.sparse import csc_matrix as csc
 from scipy import sparse
 import timeit
-from matplotlib import pyplot as plt
+from VeraGridEngine.Utils.lazy_import import lazy_import
 from VeraGridEngine.basic_structures import Vec, CxVec
 from VeraGridEngine.Utils.Sparse.csc import pack_3_by_4, diags
 from VeraGridEngine.Utils.NumericalMethods.sparse_solve import get_linear_solver
 from VeraGridEngine.enumerations import SparseSolver
 
+plt = lazy_import('matplotlib.pyplot')
+
 linear_solver = get_linear_solver(SparseSolver.Pardiso)
 
 
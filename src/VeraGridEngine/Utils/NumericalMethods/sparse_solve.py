@@ -28,11 +28,12 @@ except ImportError:
 
 
 try:
-    from scipy.sparse.linalg import spsolve as scipy_spsolve, splu, spilu, gmres, spsolve_triangular
+    from scipy.sparse.linalg import spsolve as scipy_spsolve, splu, spilu, gmres, bicgstab, spsolve_triangular
     available_sparse_solvers.append(SparseSolver.UMFPACK)  # default linsolve solver
     available_sparse_solvers.append(SparseSolver.ILU)
     available_sparse_solvers.append(SparseSolver.SuperLU)
     available_sparse_solvers.append(SparseSolver.GMRES)
+    available_sparse_solvers.append(SparseSolver.BiCGSTAB)
     available_sparse_solvers.append(SparseSolver.UMFPACKTriangular)
 except ImportError:
     pass
@@ -65,7 +66,7 @@ def get_sparse_type(solver_type: SparseSolver = preferred_type):
     :param solver_type:
     :return: sparse matrix type
     """
-    if solver_type in [SparseSolver.Pardiso, SparseSolver.GMRES]:
+    if solver_type in [SparseSolver.Pardiso, SparseSolver.GMRES, SparseSolver.BiCGSTAB]:
         return csr_matrix
 
     elif solver_type in [SparseSolver.KLU, SparseSolver.SuperLU, SparseSolver.ILU, SparseSolver.UMFPACK]:
@@ -120,6 +121,18 @@ def gmres_linsolve(A: csc_matrix, b: Union[Vec, Mat]) -> Union[Vec, Mat]:
     return x
 
 
+def bicgstab_linsolve(A: csc_matrix, b: Union[Vec, Mat]) -> Union[Vec, Mat]:
+    """
+    BiCGSTAB wrapper function for linear system solve A x = b
+    (see KrylovSolver in csc2 for the preconditioned version used by the Newton-Raphson)
+    :param A: System matrix
+    :param b: right hand side
+    :return: solution
+    """
+    x, info = bicgstab(A, b)
+    return x
+
+
 def get_linear_solver(solver_type: SparseSolver = preferred_type) -> Callable[[csc_matrix, Union[Vec, Mat]], Union[Vec, Mat]]:
     """
     Privide the chosen linear solver_type function pointer to
@@ -150,6 +163,9 @@ def get_linear_solver(solver_type: SparseSolver = preferred_type) -> Callable[[c
         elif solver_type == SparseSolver.GMRES:
             return gmres_linsolve
 
+        elif solver_type == SparseSolver.BiCGSTAB:
+            return bicgstab_linsolve
+
         else:
             raise Exception('Unrecognized LU solver')
 
@@ -6,17 +6,46 @@ from __future__ import annotations
 
 import warnings
 import math
-from typing import List
+import inspect
+import threading
+from typing import List, Dict, Tuple, Union
 import numba as nb
 from numba import types
-from numba.experimental import jitclass
+from numba.core.extending import overload, overload_method, overload_attribute
+from numba.experimental import structref
 import numpy as np
 from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import spilu, gmres, bicgstab, LinearOperator
 from scipy.sparse.linalg._dsolve._superlu import gstrf, SuperLU
-from VeraGridEngine.basic_structures import IntVec, IntMat, Vec, CxVec
+from VeraGridEngine.basic_structures import IntVec, IntMat, Vec, CxVec, Mat, CxMat
+from VeraGridEngine.enumerations import SparseSolver
+from VeraGridEngine.Utils.hashing import hash_arrays
 
+# the relative tolerance of the scipy Krylov solvers is called rtol since scipy 1.12 (tol before)
+KRYLOV_TOL_KEYWORD = 'rtol' if 'rtol' in inspect.signature(gmres).parameters else 'tol'
 
-@jitclass([
+
+@structref.register
+class CSCType(types.StructRef):
+    """
+    numba type of the real CSC matrices
+    """
+
+    def preprocess_fields(self, fields):
+        return tuple((name, types.unliteral(typ)) for name, typ in fields)
+
+
+@structref.register
+class CxCSCType(types.StructRef):
+    """
+    numba type of the complex CSC matrices
+    """
+
+    def preprocess_fields(self, fields):
+        return tuple((name, types.unliteral(typ)) for name, typ in fields)
+
+
+csc_type = CSCType([
     ('n_rows', nb.int32),
     ('n_cols', nb.int32),
     ('nnz', nb.int32),
@@ -25,621 +54,1514 @@ from VeraGridEngine.basic_structures import IntVec, IntMat, Vec, CxVec
     ('indptr', nb.int32[:],),
     ('format', types.unicode_type)
 ])
-class CSC:
+
+cx_csc_type = CxCSCType([
+    ('n_rows', nb.int32),
+    ('n_cols', nb.int32),
+    ('nnz', nb.int32),
+    ('data', nb.complex128[:]),
+    ('indices', nb.int32[:]),
+    ('indptr', nb.int32[:],),
+    ('format', types.unicode_type)
+])
+
+
+class _CSCProxy(structref.StructRefProxy):
     """
-    numba CSC matrix struct
+    Python side of the numba CSC matrix structs: the attributes are read and written through jitted accessors
     """
 
-    def __init__(self, n_rows: int, n_cols: int, nnz: int, force_zeros: bool):
-        """
-        Constructor
-        :param n_rows:
-        :param n_cols:
-        :param nnz:
-        :param force_zeros:
-        """
-        self.format = "csc"
-        self.n_rows = n_rows  # n rows
-        self.n_cols = n_cols  # n cols
-        self.nnz = nnz
+    @property
+    def n_rows(self) -> int:
+        return csc_get_n_rows(self)
 
-        if force_zeros:
-            self.data = np.zeros(nnz, dtype=np.float64)
-            self.indices = np.zeros(nnz, dtype=np.int32)
-            self.indptr = np.zeros(n_cols + 1, dtype=np.int32)
-        else:
-            self.data = np.empty(nnz, dtype=np.float64)
-            self.indices = np.empty(nnz, dtype=np.int32)
-            self.indptr = np.empty(n_cols + 1, dtype=np.int32)
+    @n_rows.setter
+    def n_rows(self, value: int):
+        csc_set_n_rows(self, value)
+
+    @property
+    def n_cols(self) -> int:
+        return csc_get_n_cols(self)
+
+    @n_cols.setter
+    def n_cols(self, value: int):
+        csc_set_n_cols(self, value)
+
+    @property
+    def nnz(self) -> int:
+        return csc_get_nnz(self)
+
+    @nnz.setter
+    def nnz(self, value: int):
+        csc_set_nnz(self, value)
+
+    @property
+    def data(self) -> Vec | CxVec:
+        return csc_get_data(self)
+
+    @data.setter
+    def data(self, value: Vec | CxVec):
+        csc_set_data(self, value)
+
+    @property
+    def indices(self) -> IntVec:
+        return csc_get_indices(self)
+
+    @indices.setter
+    def indices(self, value: IntVec):
+        csc_set_indices(self, value)
+
+    @property
+    def indptr(self) -> IntVec:
+        return csc_get_indptr(self)
+
+    @indptr.setter
+    def indptr(self, value: IntVec):
+        csc_set_indptr(self, value)
+
+    @property
+    def format(self) -> str:
+        return csc_get_format(self)
 
-        self.indptr[0] = 0  # always
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Shape for scipy compatibility
+        :return: n_rows, n_cols
+        """
+        return csc_get_shape(self)
 
-    def set(self, indices: IntVec, indptr: IntVec, data: Vec) -> "CSC":
+    def set(self, indices: IntVec, indptr: IntVec, data: Vec | CxVec):
         """
         Set the internal arrays
         :param indices:
         :param indptr:
         :param data:
-        :return:
+        :return: self
         """
-        self.indices = indices
-        self.indptr = indptr
-        self.data = data
-        self.nnz = len(self.data)
-        self.indptr[0] = 0  # always
-        return self
+        return csc_set(self, indices, indptr, data)
 
     def fill_from_coo(self, Ti: IntVec, Tj: IntVec, Tx: CxVec, nnz: int):
         """
         C = compressed-column form of a triplet matrix T.
-        The columns of T are not sorted, and duplicate entries may be present in T.
-
         :param Ti: array of row indices (could be longer than nnz)
         :param Tj: array of column indices (could be longer than nnz)
         :param Tx: array of data (could be longer than nnz)
         :param nnz: number of non-zeros
         """
-        self.nnz = nnz
-        self.data = np.empty(self.nnz, dtype=np.float64)
-        self.indices = np.empty(self.nnz, dtype=np.int32)
-        self.indptr = np.empty(self.n_cols + 1, dtype=np.int32)
-        self.indptr[0] = 0  # always
+        csc_fill_from_coo(self, Ti, Tj, Tx, nnz)
+
+    def resize(self, nnz: int):
+        """
+        Resize this matrix
+        :param nnz: number of non-zeros
+        """
+        csc_resize(self, nnz)
+
+    def todense(self) -> Mat | CxMat:
+        """
+        Get dense array representation
+        :return:
+        """
+        return csc_todense(self)
+
+    def toarray(self) -> Mat | CxMat:
+        """
+        Get dense array representation
+        :return:
+        """
+        return csc_todense(self)
+
+    def copy(self):
+        """
+        Create a copy of this matrix
+        :return:
+        """
+        return csc_copy(self)
+
+    def __reduce__(self):
+        # rebuild from the arrays, so that the matrices can be sent to other processes
+        return _csc_from_arrays, (type(self), self.n_rows, self.n_cols, self.indices, self.indptr, self.data)
+
+
+class CSC(_CSCProxy):
+    """
+    numba CSC matrix struct
+
+    This is a numba StructRef (and not a jitclass) because the jitted functions that use
+    jitclasses cannot be cached to disk, and they would be compiled again by every process
+    """
+
+    def __new__(cls, n_rows: int, n_cols: int, nnz: int, force_zeros: bool):
+        """
+        Constructor
+        :param n_rows:
+        :param n_cols:
+        :param nnz:
+        :param force_zeros:
+        """
+        return csc_new(n_rows, n_cols, nnz, force_zeros)
+
+    def dot(self, x: Vec) -> Vec:
+        """
+        Mat-vector multiplication
+        :param x: vector
+        :return:
+        """
+        return csc_matvec_ff(self, x)
+
+    def get_diag_max(self) -> float:
+        """
+        Get the maximum value of the diagonal
+        :return: value
+        """
+        return csc_get_diag_max(self)
+
+    def add_val_to_diagonal(self, val: float) -> CSC:
+        """
+        Add value to the diagonal
+        :param val: some value
+        :return: copy with modified diagonal
+        """
+        return csc_add_val_to_diagonal(self, val)
+
+    def mul(self, B: CSC) -> CSC:
+        """
+        @ operator
+        :param B: CSC matrix
+        :return: CSC matrix
+        """
+        return csc_multiply_ff(self, B)
+
+    def sum(self, B: CSC) -> CSC:
+        """
+        + operator
+        :param B: CSC matrix
+        :return: CSC matrix
+        """
+        return csc_sum(self, B)
+
+    def add_scalar(self, val: float) -> CSC:
+        return csc_add_scalar(self, val)
+
+    def prod_scalar(self, val: float) -> CSC:
+        return csc_prod_scalar(self, val)
+
+
+class CxCSC(_CSCProxy):
+    """
+    numba complex CSC matrix struct (a StructRef, see CSC)
+    """
+
+    def __new__(cls, n_rows: int, n_cols: int, nnz: int, force_zeros: bool):
+        """
+        Constructor
+        :param n_rows:
+        :param n_cols:
+        :param nnz:
+        :param force_zeros:
+        """
+        return cx_csc_new(n_rows, n_cols, nnz, force_zeros)
+
+    def dot(self, x: CxVec) -> CxVec:
+        """
+        Mat-vector multiplication
+        :param x: vector
+        :return:
+        """
+        return csc_matvec_cx(self, x)
+
+    @property
+    def real(self) -> CSC:
+        """
+        Get the real representation of this matrix
+        :return: CSC
+        """
+        return cx_csc_real(self)
+
+    @property
+    def imag(self) -> CSC:
+        """
+        Get the imaginary representation of this matrix
+        :return: CSC
+        """
+        return cx_csc_imag(self)
+
+    def __matmul__(self, B: CSC | np.ndarray) -> CxCSC | np.ndarray:
+        """
+        @ operator
+        :param B: CSC matrix or ndarray
+        :return: CxCSC matrix or ndarray
+        """
+        return cx_csc_matmul(self, B)
+
+    def __add__(self, B: CxCSC | float) -> CxCSC:
+        """
+        + operator
+        :param B: CxCSC matrix or float
+        :return: CxCSC matrix
+        """
+        return cx_csc_add(self, B)
+
+    def csc_matrix_matrix_addition(self, b: CxCSC) -> CxCSC:
+        return cx_csc_matrix_matrix_addition(self, b)
+
+
+structref.define_boxing(CSCType, CSC)
+structref.define_boxing(CxCSCType, CxCSC)
+
+
+def _csc_from_arrays(cls, n_rows: int, n_cols: int, indices: IntVec, indptr: IntVec, data: Vec | CxVec):
+    """
+    Unpickle a CSC or a CxCSC matrix
+    :param cls: CSC or CxCSC
+    :param n_rows:
+    :param n_cols:
+    :param indices:
+    :param indptr:
+    :param data:
+    :return: CSC or CxCSC
+    """
+    return cls(n_rows, n_cols, len(data), False).set(indices, indptr, data)
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_new(n_rows: int, n_cols: int, nnz: int, force_zeros: bool) -> CSC:
+    """
+    Create a CSC matrix (the numba side of CSC(n_rows, n_cols, nnz, force_zeros))
+    :param n_rows:
+    :param n_cols:
+    :param nnz:
+    :param force_zeros:
+    :return: CSC
+    """
+    self = structref.new(csc_type)
+    self.format = "csc"
+    self.n_rows = n_rows  # n rows
+    self.n_cols = n_cols  # n cols
+    self.nnz = nnz
+
+    if force_zeros:
+        self.data = np.zeros(nnz, dtype=np.float64)
+        self.indices = np.zeros(nnz, dtype=np.int32)
+        self.indptr = np.zeros(n_cols + 1, dtype=np.int32)
+    else:
+        self.data = np.empty(nnz, dtype=np.float64)
+        self.indices = np.empty(nnz, dtype=np.int32)
+        self.indptr = np.empty(n_cols + 1, dtype=np.int32)
+
+    self.indptr[0] = 0  # always
+    return self
+
+
+@nb.njit(nogil=True, cache=True)
+def cx_csc_new(n_rows: int, n_cols: int, nnz: int, force_zeros: bool) -> CxCSC:
+    """
+    Create a CxCSC matrix (the numba side of CxCSC(n_rows, n_cols, nnz, force_zeros))
+    :param n_rows:
+    :param n_cols:
+    :param nnz:
+    :param force_zeros:
+    :return: CxCSC
+    """
+    self = structref.new(cx_csc_type)
+    self.format = "csc"
+    self.n_rows = n_rows  # n rows
+    self.n_cols = n_cols  # n cols
+    self.nnz = nnz
+
+    if force_zeros:
+        self.data = np.zeros(nnz, dtype=np.complex128)
+        self.indices = np.zeros(nnz, dtype=np.int32)
+        self.indptr = np.zeros(n_cols + 1, dtype=np.int32)
+    else:
+        self.data = np.empty(nnz, dtype=np.complex128)
+        self.indices = np.empty(nnz, dtype=np.int32)
+        self.indptr = np.empty(n_cols + 1, dtype=np.int32)
+
+    self.indptr[0] = 0  # always
+    return self
+
+
+@overload(CSC)
+def _csc_constructor(n_rows, n_cols, nnz, force_zeros):
+    def impl(n_rows, n_cols, nnz, force_zeros):
+        return csc_new(n_rows, n_cols, nnz, force_zeros)
+
+    return impl
+
+
+@overload(CxCSC)
+def _cx_csc_constructor(n_rows, n_cols, nnz, force_zeros):
+    def impl(n_rows, n_cols, nnz, force_zeros):
+        return cx_csc_new(n_rows, n_cols, nnz, force_zeros)
+
+    return impl
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_n_rows(A):
+    return A.n_rows
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_n_rows(A, value):
+    A.n_rows = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_n_cols(A):
+    return A.n_cols
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_n_cols(A, value):
+    A.n_cols = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_nnz(A):
+    return A.nnz
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_nnz(A, value):
+    A.nnz = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_data(A):
+    return A.data
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_data(A, value):
+    A.data = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_indices(A):
+    return A.indices
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_indices(A, value):
+    A.indices = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_indptr(A):
+    return A.indptr
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set_indptr(A, value):
+    A.indptr = value
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_format(A):
+    return A.format
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_shape(A):
+    return A.n_rows, A.n_cols
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_set(A, indices: IntVec, indptr: IntVec, data: Vec | CxVec):
+    """
+    Set the internal arrays of a CSC or CxCSC matrix
+    :param A: CSC or CxCSC
+    :param indices:
+    :param indptr:
+    :param data:
+    :return: A
+    """
+    A.indices = indices
+    A.indptr = indptr
+    A.data = data
+    A.nnz = len(A.data)
+    A.indptr[0] = 0  # always
+    return A
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_fill_from_coo(A, Ti: IntVec, Tj: IntVec, Tx: CxVec, nnz: int) -> None:
+    """
+    C = compressed-column form of a triplet matrix T.
+    The columns of T are not sorted, and duplicate entries may be present in T.
+
+    :param A: CSC or CxCSC to fill
+    :param Ti: array of row indices (could be longer than nnz)
+    :param Tj: array of column indices (could be longer than nnz)
+    :param Tx: array of data (could be longer than nnz)
+    :param nnz: number of non-zeros
+    """
+    A.nnz = nnz
+    A.data = np.empty(A.nnz, dtype=A.data.dtype)
+    A.indices = np.empty(A.nnz, dtype=np.int32)
+    A.indptr = np.empty(A.n_cols + 1, dtype=np.int32)
+    A.indptr[0] = 0  # always
+
+    w = np.zeros(A.n_cols, dtype=np.int32)  # get workspace
+
+    for k in range(A.nnz):
+        w[Tj[k]] += 1  # column counts
+
+    csc_cumsum_i(A.indptr, w, A.n_cols)  # column pointers
+
+    for k in range(A.nnz):
+        p = w[Tj[k]]
+        w[Tj[k]] += 1
+        A.indices[p] = Ti[k]  # A(i,j) is the pth entry in C
+        A.data[p] = Tx[k]
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_resize(A, nnz: int) -> None:
+    """
+    Resize a CSC or CxCSC matrix
+    :param A: CSC or CxCSC
+    :param nnz: number of non-zeros
+    """
+    A.nnz = nnz
+    A.data = A.data[:nnz]
+    A.indices = A.indices[:nnz]  # np.resize is not suported by numba
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_todense(A):
+    """
+    Get dense array representation of a CSC or CxCSC matrix
+    :param A: CSC or CxCSC
+    :return: dense matrix
+    """
+    val = np.zeros((A.n_rows, A.n_cols), dtype=A.data.dtype)
+
+    for j in range(A.n_cols):
+        for p in range(A.indptr[j], A.indptr[j + 1]):
+            val[A.indices[p], j] = A.data[p]
+    return val
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_copy(A):
+    """
+    Create a copy of a CSC or CxCSC matrix
+    :param A: CSC or CxCSC
+    :return: copy of the same type
+    """
+    return csc_set(csc_new_like(A, A.n_rows, A.n_cols, A.nnz), A.indices.copy(), A.indptr.copy(), A.data.copy())
+
+
+def csc_new_like(A, n_rows, n_cols, nnz):
+    """
+    Create a matrix of the same type as A (only callable from numba)
+    :param A: CSC or CxCSC
+    :param n_rows:
+    :param n_cols:
+    :param nnz: number of non-zeros
+    :return: CSC or CxCSC
+    """
+    raise NotImplementedError("csc_new_like is only available inside numba")
+
+
+@overload(csc_new_like)
+def _csc_new_like(A, n_rows, n_cols, nnz):
+    if isinstance(A, CxCSCType):
+        def impl(A, n_rows, n_cols, nnz):
+            return cx_csc_new(n_rows, n_cols, nnz, False)
+    else:
+        def impl(A, n_rows, n_cols, nnz):
+            return csc_new(n_rows, n_cols, nnz, False)
+    return impl
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_get_diag_max(A: CSC) -> float:
+    """
+    Get the maximum value of the diagonal
+    :param A: CSC
+    :return: value
+    """
+    val = -1e20
+    for j in range(A.n_cols):
+        for p in range(A.indptr[j], A.indptr[j + 1]):
+            if A.data[p] > val:
+                val = A.data[p]
+    return val
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_add_val_to_diagonal(A: CSC, val: float) -> CSC:
+    """
+    Add value to the diagonal
+    :param A: CSC
+    :param val: some value
+    :return: copy with modified diagonal
+    """
+    res = csc_copy(A)
+    for j in range(res.n_cols):
+        for p in range(res.indptr[j], res.indptr[j + 1]):
+            if res.indices[p] == j:
+                res.data[p] += val
+    return res
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_sum(A, B):
+    """
+    A + B for CSC or CxCSC matrices of the same type
+    :param A: CSC or CxCSC
+    :param B: CSC or CxCSC
+    :return: CSC or CxCSC
+    """
+    m = A.n_rows
+    n = B.n_cols
+
+    w = np.zeros(m, dtype=np.int32)
+
+    x = np.zeros(n, dtype=A.data.dtype)  # get workspace
+
+    C = csc_new_like(A, m, n, A.nnz + B.nnz)  # allocate result
+
+    nz = 0
+
+    for j in range(n):
+        C.indptr[j] = nz  # column j of C starts here
+
+        mark = j + 1
+
+        for p in range(A.indptr[j], A.indptr[j + 1]):
+            i = A.indices[p]  # A(i,j) is nonzero
+            if w[i] < mark:
+                w[i] = mark  # i is new entry in column j
+                C.indices[nz] = i  # add i to pattern of C(:,j)
+                nz = nz + 1
+                x[i] = A.data[p]  # x(i) = beta*A(i,j)
+            else:
+                x[i] += A.data[p]  # i exists in C(:,j) already
+
+        for p in range(B.indptr[j], B.indptr[j + 1]):
+            i = B.indices[p]  # A(i,j) is nonzero
+            if w[i] < mark:
+                w[i] = mark  # i is new entry in column j
+                C.indices[nz] = i  # add i to pattern of C(:,j)
+                nz = nz + 1
+                x[i] = B.data[p]  # x(i) = beta*A(i,j)
+            else:
+                x[i] += B.data[p]  # i exists in C(:,j) already
+
+        for p in range(C.indptr[j], nz):
+            C.data[p] = x[C.indices[p]]
+
+    C.indptr[n] = nz  # finalize the last column of C
+
+    return C
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_add_scalar(A, val):
+    """
+    Add a scalar to the non-zeros
+    :param A: CSC or CxCSC
+    :param val: value
+    :return: copy
+    """
+    res = csc_copy(A)
+    res.data += val
+    return res
+
+
+@nb.njit(nogil=True, cache=True)
+def csc_prod_scalar(A, val):
+    """
+    Multiply the non-zeros by a scalar
+    :param A: CSC or CxCSC
+    :param val: value
+    :return: copy
+    """
+    res = csc_copy(A)
+    res.data *= val
+    return res
+
+
+@nb.njit(nogil=True, cache=True)
+def cx_csc_real(A: CxCSC) -> CSC:
+    """
+    Get the real representation of a complex matrix
+    :param A: CxCSC
+    :return: CSC
+    """
+    res = csc_new(A.n_rows, A.n_cols, A.nnz, False)
+    res.indptr = A.indptr
+    res.indices = A.indices
+    res.data = A.data.real
+    return res
+
+
+@nb.njit(nogil=True, cache=True)
+def cx_csc_imag(A: CxCSC) -> CSC:
+    """
+    Get the imaginary representation of a complex matrix
+    :param A: CxCSC
+    :return: CSC
+    """
+    res = csc_new(A.n_rows, A.n_cols, A.nnz, False)
+    res.indptr = A.indptr
+    res.indices = A.indices
+    res.data = A.data.imag
+    return res
+
+
+def cx_csc_matmul(A: CxCSC, B: CSC | np.ndarray) -> CxCSC | np.ndarray:
+    """
+    A @ B
+    :param A: CxCSC
+    :param B: CSC or ndarray
+    :return: CxCSC or ndarray
+    """
+    if isinstance(B, CSC):
+        return csc_multiply_cx(A, B)
+    elif isinstance(B, np.ndarray):
+        return csc_matvec_cx(A, B)
+    else:
+        raise TypeError
+
+
+def cx_csc_add(A: CxCSC, B: CxCSC | float) -> CxCSC:
+    """
+    A + B
+    :param A: CxCSC
+    :param B: CxCSC or float
+    :return: CxCSC
+    """
+    if isinstance(B, CxCSC):
+        return csc_sum(A, B)
+    elif isinstance(B, float):
+        return csc_add_scalar(A, B)
+    else:
+        raise TypeError
+
+
+def cx_csc_matrix_matrix_addition(A: CxCSC, b: CxCSC) -> CxCSC:
+    """
+    A + b
+    :param A: CxCSC
+    :param b: CxCSC
+    :return: CxCSC
+    """
+    # Get the shape of the matrices
+    m, n1 = A.shape
+    n2, k = b.shape
+
+    # Initialize the arrays that define the result matrix
+    data = []
+    indices = []
+    indptr = [0]
+
+    # Loop over the columns of the matrices
+    for j in range(k):
+        # Initialize a dictionary to store the non-zero elements of the j-th column of the result matrix
+        col_dict = {}
+        # Loop over the non-zero elements of the j-th column of the first matrix
+        for ja in range(A.indptr[j], A.indptr[j + 1]):
+            col_dict[A.indices[ja]] = A.data[ja]
+        # Loop over the non-zero elements of the j-th column of the second matrix
+        for jb in range(b.indptr[j], b.indptr[j + 1]):
+            ib = b.indices[jb]
+            if ib in col_dict:
+                col_dict[ib] += b.data[jb]
+            else:
+                col_dict[ib] = b.data[jb]
+        # Add the non-zero elements of the j-th column of the result matrix to the data and indices arrays
+        for i, val in col_dict.items():
+            data.append(val)
+            indices.append(i)
+        # Add the index of the next column to the indptr array of the result matrix
+        indptr.append(len(data))
+
+    # Create the CSC matrix from the data, indices, and indptr arrays of the result matrix
+    my_mat = CxCSC(n_rows=m, n_cols=k, nnz=len(data), force_zeros=False)
+    my_mat.set(np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32),
+               np.array(data, dtype=np.complex128))
+
+    return my_mat
+
+
+@overload_method(CSCType, 'set')
+@overload_method(CxCSCType, 'set')
+def _csc_set_method(self, indices, indptr, data):
+    def impl(self, indices, indptr, data):
+        return csc_set(self, indices, indptr, data)
+
+    return impl
+
+
+@overload_method(CSCType, 'fill_from_coo')
+@overload_method(CxCSCType, 'fill_from_coo')
+def _csc_fill_from_coo_method(self, Ti, Tj, Tx, nnz):
+    def impl(self, Ti, Tj, Tx, nnz):
+        csc_fill_from_coo(self, Ti, Tj, Tx, nnz)
+
+    return impl
+
+
+@overload_method(CSCType, 'resize')
+@overload_method(CxCSCType, 'resize')
+def _csc_resize_method(self, nnz):
+    def impl(self, nnz):
+        csc_resize(self, nnz)
+
+    return impl
+
+
+@overload_method(CSCType, 'todense')
+@overload_method(CxCSCType, 'todense')
+@overload_method(CSCType, 'toarray')
+@overload_method(CxCSCType, 'toarray')
+def _csc_todense_method(self):
+    def impl(self):
+        return csc_todense(self)
+
+    return impl
+
+
+@overload_method(CSCType, 'copy')
+@overload_method(CxCSCType, 'copy')
+def _csc_copy_method(self):
+    def impl(self):
+        return csc_copy(self)
+
+    return impl
+
+
+@overload_attribute(CSCType, 'shape')
+@overload_attribute(CxCSCType, 'shape')
+def _csc_shape_attribute(self):
+    def impl(self):
+        return self.n_rows, self.n_cols
+
+    return impl
+
+
+@overload_method(CSCType, 'dot')
+def _csc_dot_method(self, x):
+    def impl(self, x):
+        return csc_matvec_ff(self, x)
+
+    return impl
+
+
+@overload_method(CxCSCType, 'dot')
+def _cx_csc_dot_method(self, x):
+    def impl(self, x):
+        return csc_matvec_cx(self, x)
+
+    return impl
+
+
+@overload_method(CSCType, 'get_diag_max')
+def _csc_get_diag_max_method(self):
+    def impl(self):
+        return csc_get_diag_max(self)
+
+    return impl
+
+
+@overload_method(CSCType, 'add_val_to_diagonal')
+def _csc_add_val_to_diagonal_method(self, val):
+    def impl(self, val):
+        return csc_add_val_to_diagonal(self, val)
+
+    return impl
+
+
+@overload_method(CSCType, 'mul')
+def _csc_mul_method(self, B):
+    def impl(self, B):
+        return csc_multiply_ff(self, B)
+
+    return impl
+
+
+@overload_method(CSCType, 'sum')
+def _csc_sum_method(self, B):
+    def impl(self, B):
+        return csc_sum(self, B)
+
+    return impl
+
+
+@overload_method(CSCType, 'add_scalar')
+def _csc_add_scalar_method(self, val):
+    def impl(self, val):
+        return csc_add_scalar(self, val)
+
+    return impl
+
+
+@overload_method(CSCType, 'prod_scalar')
+def _csc_prod_scalar_method(self, val):
+    def impl(self, val):
+        return csc_prod_scalar(self, val)
+
+    return impl
+
+
+@overload_attribute(CxCSCType, 'real')
+def _cx_csc_real_attribute(self):
+    def impl(self):
+        return cx_csc_real(self)
+
+    return impl
+
+
+@overload_attribute(CxCSCType, 'imag')
+def _cx_csc_imag_attribute(self):
+    def impl(self):
+        return cx_csc_imag(self)
+
+    return impl
+
+
+def mat_to_scipy(csc: CSC | CxCSC) -> csc_matrix:
+    """
+    CSC or CxCSC Matrix to Scipy
+    :param csc:
+    :return:
+    """
+    return csc_matrix((csc.data, csc.indices, csc.indptr), shape=(csc.n_rows, csc.n_cols))
+
+
+def scipy_to_mat(mat: csc_matrix) -> CSC:
+    """
+    Scipy CSC matrix to CSC marix
+    :param mat: Scipy CSC matrix
+    :return: CSC marix
+    """
+    if not mat.format == 'csc':
+        warnings.warn('scipy_to_cxmat: Converting matrix to CSC format...')
+        mat = mat.tocsc()
+
+    x = CSC(mat.shape[0], mat.shape[1], mat.nnz, False)
+    x.data[:] = mat.data.astype(np.float64)
+    x.indices[:] = mat.indices.astype(np.int32)
+    x.indptr[:] = mat.indptr.astype(np.int32)
+    return x
+
+
+def scipy_to_cxmat(mat: csc_matrix) -> CxCSC:
+    """
+    Scipy CSC matrix to CxCSC marix
+    :param mat: Scipy CSC matrix
+    :return: CxCSC marix
+    """
+    if not mat.format == 'csc':
+        warnings.warn('scipy_to_cxmat: Converting matrix to CSC format...')
+        mat = mat.tocsc()
+
+    x = CxCSC(mat.shape[0], mat.shape[1], mat.nnz, False)
+    x.data = mat.data.astype(np.complex128)
+    x.indices = mat.indices.astype(np.int32)
+    x.indptr = mat.indptr.astype(np.int32)
+    return x
+
+
+def spfactor(A: CSC) -> None | SuperLU:
+    """
+    Sparse factorization with SuperLU
+    :param A: CSC matrix
+    :return: SuperLU factorization object
+    """
+    permc_spec = None
+    diag_pivot_thresh = None
+    relax = None
+    panel_size = None
+    _options = dict(DiagPivotThresh=diag_pivot_thresh,
+                    ColPerm=permc_spec,
+                    PanelSize=panel_size,
+                    Relax=relax)
+
+    if _options["ColPerm"] == "NATURAL":
+        _options["SymmetricMode"] = True
+
+    try:
+        ret = gstrf(A.n_cols, A.nnz, A.data, A.indices, A.indptr,
+                    ilu=False, options=_options, csc_construct_func=None)
+        return ret
+    except RuntimeError:
+        return None
+
+
+def spsolve_csc(A: CSC, x: Vec) -> Vec:
+    """
+    Sparse solution
+    :param A: CSC matrix
+    :param x: vector
+    :return: solution
+    """
+    factor = spfactor(A)
+    if factor is None:
+        return np.full(len(x), np.nan), False
+    else:
+        return factor.solve(x), True
+
+
+class SparsePattern:
+    """
+    Column ordering of a sparsity pattern and the structure of the matrices once permuted
+    """
+    __slots__ = ('perm_c', 'indptr', 'indices', 'data_idx')
+
+    def __init__(self, A: CSC | csc_matrix, perm_c: IntVec):
+        """
+        Constructor
+        :param A: CSC matrix with the pattern
+        :param perm_c: column permutation computed by SuperLU for A
+        """
+        # column j of the permuted matrix is the column order[j] of A
+        order = np.argsort(perm_c)
+        counts = np.diff(A.indptr)[order]
 
-        w = np.zeros(self.n_cols, dtype=np.int32)  # get workspace
+        self.perm_c = perm_c.astype(np.int32)
+        self.indptr = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.indptr[1:])
 
-        for k in range(self.nnz):
-            w[Tj[k]] += 1  # column counts
+        # position in A.data of every entry of the permuted matrix
+        self.data_idx = np.repeat(A.indptr[order] - self.indptr[:-1], counts) + np.arange(self.indptr[-1])
+        self.indices = A.indices[self.data_idx].astype(np.int32)
+
+
+class SparseFactor:
+    """
+    LU factors of a matrix, solving the column permutation that was applied before the factorization
+    """
+    __slots__ = ('lu', 'perm_c')
 
-        csc_cumsum_i(self.indptr, w, self.n_cols)  # column pointers
+    # direct solution, there are no linear iterations (see KrylovFactor)
+    last_iterations = 0
 
-        for k in range(self.nnz):
-            p = w[Tj[k]]
-            w[Tj[k]] += 1
-            self.indices[p] = Ti[k]  # A(i,j) is the pth entry in C
-            # if Cx is not None:
-            self.data[p] = Tx[k]
+    def __init__(self, lu: SuperLU, perm_c: IntVec | None):
+        """
+        Constructor
+        :param lu: SuperLU factorization
+        :param perm_c: column permutation applied before the factorization, None if not permuted
+        """
+        self.lu = lu
+        self.perm_c = perm_c
 
     @property
-    def shape(self):
+    def shape(self) -> Tuple[int, int]:
         """
-        Shape for scipy compatibility
+        Shape of the factorized matrix
         :return: n_rows, n_cols
         """
-        return self.n_rows, self.n_cols
+        return self.lu.shape
 
-    def resize(self, nnz: np.int32):
+    @property
+    def nnz(self) -> int:
         """
-        Resize this matrix
-        :param nnz: number of non-zeros
+        Number of non-zeros of the L and U factors
+        :return: int
         """
-        self.nnz = nnz
-        self.data = self.data[:nnz]
-        self.indices = self.indices[:nnz]  # np.resize is not suported by numba
+        return self.lu.nnz
 
-    def todense(self):
+    def solve(self, b: Union[Vec, Mat]) -> Union[Vec, Mat]:
         """
-        Get dense array representation
-        :return:
+        Solve A x = b
+        :param b: right hand side vector or matrix
+        :return: solution
         """
-        val = np.zeros((self.n_rows, self.n_cols), dtype=np.float64)
+        y = self.lu.solve(b)
+        return y if self.perm_c is None else y[self.perm_c]
 
-        for j in range(self.n_cols):
-            for p in range(self.indptr[j], self.indptr[j + 1]):
-                val[self.indices[p], j] = self.data[p]
-        return val
 
-    def toarray(self):
-        """
-        Get dense array representation
-        :return:
-        """
-        return self.todense()
+class SparseFactorization:
+    """
+    Sparse LU factorization with SuperLU that reuses the column ordering per sparsity pattern
 
-    def copy(self):
-        """
-        Create a copy of this matrix
-        :return:
-        """
-        res = CSC(self.n_rows, self.n_cols, self.nnz, False)
-        res.data = self.data.copy()
-        res.indices = self.indices.copy()
-        res.indptr = self.indptr.copy()
-        return res
+    The column ordering (COLAMD) is computed the first time that a pattern is factorized,
+    then the matrices with the same pattern are permuted with a precomputed gather and
+    factorized numerically with the natural ordering. Since the pattern of the Jacobian
+    only depends on the topology (and the control modes), the ordering is reused across
+    the iterations and across the time steps of the same topology.
+    """
 
-    def dot(self, x: np.ndarray):
+    def __init__(self, max_patterns: int = 64):
         """
-        Mat-vector multiplication
-        :param x: vector
-        :return:
+        Constructor
+        :param max_patterns: maximum number of patterns to keep, the oldest are discarded
         """
-        return csc_matvec_ff(self, x)
-
-    # @property
-    # def T(self) -> "CSC":
-    #     """
-    #     Traspose
-    #     :return:
-    #     """
-    #     return sp_transpose(self)
+        self.max_patterns = max_patterns
+        self.patterns: Dict[str, SparsePattern] = dict()
 
-    def get_diag_max(self) -> float:
-        """
-        Get the maximum value of the diagonal
-        :return: value
-        """
-        val = -1e20
-        for j in range(self.n_cols):
-            for p in range(self.indptr[j], self.indptr[j + 1]):
-                if self.data[p] > val:
-                    val = self.data[p]
-        return val
+        # guards the patterns, since the islands may be solved in concurrent threads
+        self._lock = threading.Lock()
 
-    def add_val_to_diagonal(self, val: float) -> "CSC":
+    @staticmethod
+    def get_pattern_key(A: CSC | csc_matrix) -> str:
         """
-        Add value to the diagonal in-place
-        :param val: some value
-        :return: copy with modified diagonal
+        Get the key of the sparsity pattern of a matrix
+        :param A: CSC matrix
+        :return: key
         """
-        A = self.copy()
-        for j in range(A.n_cols):
-            for p in range(A.indptr[j], A.indptr[j + 1]):
-                if A.indices[p] == j:
-                    A.data[p] += val
-        return A
+        return hash_arrays(A.shape[0], A.shape[1], A.indptr, A.indices)
 
-    def mul(self, B: "CSC") -> "CSC":
+    def clear(self) -> None:
         """
-        @ operator
-        :param B: CSC matrix or ndarray
-        :return: CSC matrix or ndarray
+        Forget all the patterns
         """
-        return csc_multiply_ff(self, B)
+        with self._lock:
+            self.patterns.clear()
 
-    def sum(self, B: "CSC") -> "CSC" | np.ndarray:
+    def factor(self, A: CSC | csc_matrix) -> None | SparseFactor:
         """
-        @ operator
-        :param B: CSC matrix or ndarray
-        :return: CSC matrix or ndarray
+        LU factorization of a matrix, reusing the column ordering of its pattern if known
+        :param A: CSC matrix (or scipy csc_matrix)
+        :return: SparseFactor, None if the matrix is singular
         """
+        key = self.get_pattern_key(A)
+        pattern = self.patterns.get(key, None)
 
-        m = self.n_rows
-        n = B.n_cols
-
-        w = np.zeros(m, dtype=np.int32)
-
-        x = np.zeros(n, dtype=np.float64)  # get workspace
+        try:
+            if pattern is None:
+                lu = gstrf(A.shape[1], A.nnz, A.data,
+                           np.asarray(A.indices, dtype=np.int32), np.asarray(A.indptr, dtype=np.int32),
+                           ilu=False, options=dict(), csc_construct_func=None)
 
-        C = CSC(m, n, self.nnz + B.nnz, False)  # allocate result
+                pattern = SparsePattern(A=A, perm_c=lu.perm_c)
 
-        nz = 0
+                with self._lock:
+                    if key not in self.patterns and len(self.patterns) >= self.max_patterns:
+                        del self.patterns[next(iter(self.patterns))]
 
-        for j in range(n):
-            C.indptr[j] = nz  # column j of C starts here
+                    self.patterns[key] = pattern
 
-            # nz = csc_scatter_f(self.indptr, self.indices, self.data, j, 1.0, w, x, j + 1, C.indices, nz)  # alpha*A(:,j)
+                return SparseFactor(lu=lu, perm_c=None)
 
-            # nz = csc_scatter_f(B.indptr, B.indices, B.data, j, 1.0, w, x, j + 1, C.indices, nz)  # beta*B(:,j)
-
-            mark = j + 1
-
-            for p in range(self.indptr[j], self.indptr[j + 1]):
-                i = self.indices[p]  # A(i,j) is nonzero
-                if w[i] < mark:
-                    w[i] = mark  # i is new entry in column j
-                    C.indices[nz] = i  # add i to pattern of C(:,j)
-                    nz = nz + 1
-                    x[i] = self.data[p]  # x(i) = beta*A(i,j)
-                else:
-                    x[i] += self.data[p]  # i exists in C(:,j) already
-
-            for p in range(B.indptr[j], B.indptr[j + 1]):
-                i = B.indices[p]  # A(i,j) is nonzero
-                if w[i] < mark:
-                    w[i] = mark  # i is new entry in column j
-                    C.indices[nz] = i  # add i to pattern of C(:,j)
-                    nz = nz + 1
-                    x[i] = B.data[p]  # x(i) = beta*A(i,j)
-                else:
-                    x[i] += B.data[p]  # i exists in C(:,j) already
+            else:
+                lu = gstrf(A.shape[1], A.nnz, A.data[pattern.data_idx], pattern.indices, pattern.indptr,
+                           ilu=False, options=dict(ColPerm="NATURAL"), csc_construct_func=None)
 
-            for p in range(C.indptr[j], nz):
-                C.data[p] = x[C.indices[p]]
+                return SparseFactor(lu=lu, perm_c=pattern.perm_c)
 
-        C.indptr[n] = nz  # finalize the last column of C
+        except RuntimeError:
+            return None
 
-        return C
+    def solve(self, A: CSC | csc_matrix, b: Union[Vec, Mat]) -> Tuple[Union[Vec, Mat], bool]:
+        """
+        Sparse solution of A x = b
+        :param A: CSC matrix (or scipy csc_matrix)
+        :param b: right hand side
+        :return: solution, ok
+        """
+        factor = self.factor(A)
+        if factor is None:
+            return np.full(b.shape, np.nan), False
+        else:
+            return factor.solve(b), True
 
-    def add_scalar(self, val: float) -> "CSC":
-        res = self.copy()
-        res.data += val
-        return res
 
-    def prod_scalar(self, val: float) -> "CSC":
-        res = self.copy()
-        res.data *= val
-        return res
+# factorization shared by the Newton-like solvers, so that the orderings persist between calls
+sparse_factorization = SparseFactorization()
 
 
-@jitclass([
-    ('n_rows', nb.int32),
-    ('n_cols', nb.int32),
-    ('nnz', nb.int32),
-    ('data', nb.complex128[:]),
-    ('indices', nb.int32[:]),
-    ('indptr', nb.int32[:],),
-    ('format', types.unicode_type)
-])
-class CxCSC:
+class KrylovPreconditioner:
     """
-    numba CSC matrix struct
+    Incomplete LU preconditioner of a sparsity pattern
     """
+    __slots__ = ('ilu', 'operator', 'base_iterations')
 
-    def __init__(self, n_rows: int, n_cols: int, nnz: int, force_zeros: bool):
+    def __init__(self, ilu: SuperLU):
         """
         Constructor
-        :param n_rows:
-        :param n_cols:
-        :param nnz:
-        :param force_zeros:
+        :param ilu: incomplete LU factorization
         """
-        self.format = "csc"
-        self.n_rows = n_rows  # n rows
-        self.n_cols = n_cols  # n cols
-        self.nnz = nnz
+        self.ilu = ilu
+        self.operator = LinearOperator(ilu.shape, ilu.solve)
 
-        if force_zeros:
-            self.data = np.zeros(nnz, dtype=np.complex128)
-            self.indices = np.zeros(nnz, dtype=np.int32)
-            self.indptr = np.zeros(n_cols + 1, dtype=np.int32)
-        else:
-            self.data = np.empty(nnz, dtype=np.complex128)
-            self.indices = np.empty(nnz, dtype=np.int32)
-            self.indptr = np.empty(n_cols + 1, dtype=np.int32)
-
-        self.indptr[0] = 0  # always
+        # Krylov iterations of the first solution with this preconditioner (None until then)
+        self.base_iterations: int | None = None
 
-    def set(self, indices: IntVec, indptr: IntVec, data: CxVec) -> "CxCSC":
-        """
-        Set the internal arrays
-        :param indices:
-        :param indptr:
-        :param data:
-        :return:
-        """
-        self.indices = indices
-        self.indptr = indptr
-        self.data = data
-        self.nnz = len(self.data)
 
-        return self
+class KrylovFactor:
+    """
+    Matrix bound to the preconditioner of its pattern in a KrylovSolver, with the interface of SparseFactor
+    """
+    __slots__ = ('solver', 'A', 'key', 'last_iterations')
 
-    def fill_from_coo(self, Ti: IntVec, Tj: IntVec, Tx: CxVec, nnz: int):
+    def __init__(self, solver: KrylovSolver, A: csc_matrix, key: str):
         """
-        C = compressed-column form of a triplet matrix T.
-        The columns of T are not sorted, and duplicate entries may be present in T.
-
-        :param Ti: array of row indices (could be longer than nnz)
-        :param Tj: array of column indices (could be longer than nnz)
-        :param Tx: array of data (could be longer than nnz)
-        :param nnz: number of non-zeros
+        Constructor
+        :param solver: KrylovSolver
+        :param A: system matrix
+        :param key: key of the sparsity pattern of A
         """
-        self.nnz = nnz
-        self.data = np.empty(self.nnz, dtype=np.complex128)
-        self.indices = np.empty(self.nnz, dtype=np.int32)
-        self.indptr = np.empty(self.n_cols + 1, dtype=np.int32)
-        self.indptr[0] = 0  # always
-
-        w = np.zeros(self.n_cols, dtype=np.int32)  # get workspace
-
-        for k in range(self.nnz):
-            w[Tj[k]] += 1  # column counts
-
-        # csc_cumsum_i(p, c, n)
-        csc_cumsum_i(self.indptr, w, self.n_cols)  # column pointers
-        # nz = 0
-        # for i in range(self.n_cols):
-        #     self.indptr[i] = nz
-        #     nz += w[i]
-        #     w[i] = self.indptr[i]  # also copy p[0..n-1] back into c[0..n-1]
-        # self.indptr[self.n_cols] = nz
-
-        for k in range(self.nnz):
-            p = w[Tj[k]]
-            w[Tj[k]] += 1
-            self.indices[p] = Ti[k]  # A(i,j) is the pth entry in C
-            # if Cx is not None:
-            self.data[p] = Tx[k]
+        self.solver = solver
+        self.A = A
+        self.key = key
+
+        # Krylov iterations of the last solution
+        self.last_iterations = 0
 
     @property
-    def shape(self):
+    def shape(self) -> Tuple[int, int]:
         """
-        Shape for scipy compatibility
+        Shape of the matrix
         :return: n_rows, n_cols
         """
-        return self.n_rows, self.n_cols
+        return self.A.shape
 
     @property
-    def real(self) -> CSC:
+    def nnz(self) -> int:
         """
-        Get the real representation of this matrix
-        :return: CSC
+        Number of non-zeros of the incomplete L and U factors of the preconditioner in use
+        :return: int
         """
-        A = CSC(self.n_rows, self.n_cols, self.nnz, False)
-        A.indptr = self.indptr
-        A.indices = self.indices
-        A.data = self.data.real
-        return A
+        prec = self.solver.preconditioners.get(self.key, None)
+        return 0 if prec is None else prec.ilu.nnz
 
-    @property
-    def imag(self) -> CSC:
+    def solve(self, b: Union[Vec, Mat]) -> Union[Vec, Mat]:
         """
-        Get the imaginary representation of this matrix
-        :return: CSC
+        Solve A x = b
+        :param b: right hand side vector or matrix
+        :return: solution
         """
-        A = CSC(self.n_rows, self.n_cols, self.nnz, False)
-        A.indptr = self.indptr
-        A.indices = self.indices
-        A.data = self.data.imag
-        return A
+        if b.ndim == 1:
+            x, self.last_iterations = self.solver.solve_vector(self.A, self.key, b)
+            return x
+        else:
+            x = np.empty(b.shape)
+            self.last_iterations = 0
+            for j in range(b.shape[1]):
+                x[:, j], it = self.solver.solve_vector(self.A, self.key, b[:, j])
+                self.last_iterations += it
+            return x
 
-    def resize(self, nnz: nb.int32):
-        """
-        Resize this matrix
-        :param nnz: number of non-zeros
-        """
-        self.nnz = nnz
-        self.data = self.data[:nnz]
-        self.indices = self.indices[:nnz]  # np.resize is not suported by numba
 
-    def todense(self):
+class KrylovSolver:
+    """
+    Preconditioned Krylov (GMRES or BiCGSTAB) solution of A x = b, with the interface of SparseFactorization
+
+    The incomplete LU preconditioner is kept per sparsity pattern, so that it is reused across
+    the Newton-Raphson iterations and across the time steps of the same topology. It is computed
+    again with the current matrix when the Krylov method does not converge, or when it needs more
+    than refresh_growth times the iterations that it needed right after the last refresh.
+    If the Krylov method does not converge with a fresh preconditioner, the system is solved
+    with the direct sparse_factorization.
+    """
+
+    def __init__(self,
+                 method: SparseSolver = SparseSolver.GMRES,
+                 tol: float = 1e-8,
+                 max_iter: int = 200,
+                 drop_tol: float = 1e-4,
+                 fill_factor: float = 10.0,
+                 refresh_growth: float = 2.0,
+                 max_patterns: int = 64,
+                 restart: int = 20):
         """
-        Get dense array representation
-        :return:
+        Constructor
+        :param method: SparseSolver.GMRES or SparseSolver.BiCGSTAB
+        :param tol: relative tolerance of the Krylov method
+        :param max_iter: maximum number of Krylov iterations, for GMRES these are the inner iterations
+                         (the ones counted in the statistics), not the restart cycles
+        :param drop_tol: drop tolerance of the incomplete LU
+        :param fill_factor: fill factor of the incomplete LU
+        :param refresh_growth: the preconditioner is refreshed when the iterations grow above
+                               this factor of the iterations after its last refresh
+        :param max_patterns: maximum number of preconditioners to keep, the oldest are discarded
+        :param restart: number of GMRES iterations between restarts
         """
-        val = np.zeros((self.n_rows, self.n_cols), dtype=np.complex128)
-
-        for j in range(self.n_cols):
-            for p in range(self.indptr[j], self.indptr[j + 1]):
-                val[self.indices[p], j] = self.data[p]
-        return val
-
-    def toarray(self):
+        if method not in (SparseSolver.GMRES, SparseSolver.BiCGSTAB):
+            raise ValueError(f"{method} is not a Krylov method")
+
+        self.method = method
+        self.tol = tol
+        self.max_iter = max_iter
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+        self.refresh_growth = refresh_growth
+        self.max_patterns = max_patterns
+        self.restart = restart
+
+        self.preconditioners: Dict[str, KrylovPreconditioner] = dict()
+
+        # guards the preconditioners, since the islands may be solved in concurrent threads
+        self._lock = threading.Lock()
+
+        # statistics
+        self.n_solves = 0
+        self.n_iterations = 0
+        self.n_preconditioners = 0
+        self.n_fallbacks = 0
+
+    def clear(self) -> None:
         """
-        Get dense array representation
-        :return:
+        Forget all the preconditioners
         """
-        return self.todense()
+        with self._lock:
+            self.preconditioners.clear()
 
-    def copy(self):
+    def get_stats(self) -> Dict[str, int]:
         """
-        Create a copy of this matrix
-        :return:
+        Get the accumulated statistics
+        :return: dictionary of statistic name: value
         """
-        res = CSC(self.n_rows, self.n_cols, self.nnz, False)
-        res.data = self.data.copy()
-        res.indices = self.indices.copy()
-        res.indptr = self.indptr.copy()
-        return res
+        return {'solves': self.n_solves,
+                'iterations': self.n_iterations,
+                'preconditioners': self.n_preconditioners,
+                'fallbacks': self.n_fallbacks}
 
-    def dot(self, x: np.ndarray) -> np.ndarray:
+    def compute_preconditioner(self, A: csc_matrix, key: str) -> None | KrylovPreconditioner:
         """
-        Mat-vector multiplication
-        :param x: vector
-        :return:
+        Compute and store the incomplete LU preconditioner of a matrix
+        :param A: system matrix
+        :param key: key of the sparsity pattern of A
+        :return: KrylovPreconditioner, None if the incomplete factorization failed
         """
-        return csc_matvec_cx(self, x)
+        try:
+            prec = KrylovPreconditioner(ilu=spilu(A, drop_tol=self.drop_tol, fill_factor=self.fill_factor))
+        except RuntimeError:
+            return None
 
-    def __matmul__(self, B: "CxCSC" | np.ndarray) -> "CxCSC" | np.ndarray:
-        """
+        self.n_preconditioners += 1
 
-        :param B:
-        :return:
+        with self._lock:
+            if key not in self.preconditioners and len(self.preconditioners) >= self.max_patterns:
+                del self.preconditioners[next(iter(self.preconditioners))]
+
+            self.preconditioners[key] = prec
+        return prec
+
+    def krylov(self, A: csc_matrix, b: Vec, prec: KrylovPreconditioner) -> Tuple[Vec, int, bool]:
+        """
+        Run the Krylov method
+        :param A: system matrix
+        :param b: right hand side
+        :param prec: KrylovPreconditioner
+        :return: solution, number of iterations, converged?
         """
-        if isinstance(B, CSC):
-            return csc_multiply_cx(self, B)
-        elif isinstance(B, np.ndarray):
-            return csc_matvec_cx(self, B)
+        counter = [0]
+
+        def callback(_):
+            counter[0] += 1
+
+        if self.method == SparseSolver.GMRES:
+            # scipy's maxiter counts restart cycles, while max_iter and the callback count inner iterations,
+            # so the limit is converted to cycles (rounded up to a whole cycle)
+            restart = max(1, min(self.restart, self.max_iter))
+            x, info = gmres(A, b, M=prec.operator, atol=0.0, restart=restart,
+                            maxiter=max(1, math.ceil(self.max_iter / restart)),
+                            callback=callback, callback_type='pr_norm', **{KRYLOV_TOL_KEYWORD: self.tol})
         else:
-            raise TypeError
+            x, info = bicgstab(A, b, M=prec.operator, atol=0.0, maxiter=self.max_iter,
+                               callback=callback, **{KRYLOV_TOL_KEYWORD: self.tol})
 
-    def __add__(self, B: "CxCSC" | float) -> "CxCSC" | np.ndarray:
+        return x, counter[0], info == 0
+
+    def factor(self, A: CSC | csc_matrix) -> None | KrylovFactor:
         """
-        @ operator
-        :param B: CSC matrix or ndarray
-        :return: CSC matrix or ndarray
+        Prepare the solution of a matrix, computing the preconditioner of its pattern if unknown
+        :param A: CSC matrix (or scipy csc_matrix)
+        :return: KrylovFactor, None if the preconditioner could not be computed (i.e. singular matrix)
         """
-        if isinstance(B, CxCSC):
-
-            print(f"Adding CxCSC matrices: A.shape={self.shape}, B.shape={B.shape}")
-            print(f"CxCSC Matrix Data Types: A.data={self.data.dtype}, B.data={B.data.dtype}")
+        if not isinstance(A, csc_matrix):
+            # copy, since scipy may sort the indices in place and the structure of A can be shared
+            A = csc_matrix((A.data, A.indices, A.indptr), shape=A.shape, copy=True)
 
-            m = self.n_rows
-            n = B.n_cols
+        key = SparseFactorization.get_pattern_key(A)
 
-            w = np.zeros(m, dtype=np.int32)
+        if key not in self.preconditioners:
+            if self.compute_preconditioner(A, key) is None:
+                return None
 
-            x = np.zeros(n, dtype=np.complex128)  # get workspace
+        return KrylovFactor(solver=self, A=A, key=key)
 
-            C = CxCSC(m, n, self.nnz + B.nnz, False)  # allocate result
+    def solve_vector(self, A: csc_matrix, key: str, b: Vec) -> Tuple[Vec, int]:
+        """
+        Solve A x = b, refreshing the preconditioner if the Krylov iterations grow
+        :param A: system matrix
+        :param key: key of the sparsity pattern of A
+        :param b: right hand side vector
+        :return: solution, number of Krylov iterations
+        """
+        self.n_solves += 1
+        prec = self.preconditioners.get(key, None)
+        if prec is None:
+            prec = self.compute_preconditioner(A, key)
 
-            nz = 0
+        iterations = 0
+        ok = False
+        x = None
 
-            for j in range(n):
-                C.indptr[j] = nz  # column j of C starts here
+        if prec is not None:
+            calibrate = prec.base_iterations is None
+            x, iterations, ok = self.krylov(A, b, prec)
 
-                # nz = csc_scatter_f(self.indptr, self.indices, self.data, j, 1.0, w, x, j + 1, C.indices, nz)  # alpha*A(:,j)
+            if not ok and not calibrate:
+                # the preconditioner got stale: compute it with the current matrix and try again
+                prec = self.compute_preconditioner(A, key)
+                if prec is not None:
+                    x, it, ok = self.krylov(A, b, prec)
+                    prec.base_iterations = it
+                    iterations += it
 
-                # nz = csc_scatter_f(B.indptr, B.indices, B.data, j, 1.0, w, x, j + 1, C.indices, nz)  # beta*B(:,j)
+            elif calibrate:
+                prec.base_iterations = iterations
 
-                mark = j + 1
+            elif iterations > self.refresh_growth * max(prec.base_iterations, 1):
+                # the solution is fine, but the next ones are done with a fresh preconditioner
+                self.compute_preconditioner(A, key)
 
-                for p in range(self.indptr[j], self.indptr[j + 1]):
-                    i = self.indices[p]  # A(i,j) is nonzero
-                    if w[i] < mark:
-                        w[i] = mark  # i is new entry in column j
-                        C.indices[nz] = i  # add i to pattern of C(:,j)
-                        nz = nz + 1
-                        x[i] = self.data[p]  # x(i) = beta*A(i,j)
-                    else:
-                        x[i] += self.data[p]  # i exists in C(:,j) already
+        self.n_iterations += iterations
 
-                for p in range(B.indptr[j], B.indptr[j + 1]):
-                    i = B.indices[p]  # A(i,j) is nonzero
-                    if w[i] < mark:
-                        w[i] = mark  # i is new entry in column j
-                        C.indices[nz] = i  # add i to pattern of C(:,j)
-                        nz = nz + 1
-                        x[i] = B.data[p]  # x(i) = beta*A(i,j)
-                    else:
-                        x[i] += B.data[p]  # i exists in C(:,j) already
+        if not ok:
+            self.n_fallbacks += 1
+            x, _ = sparse_factorization.solve(A, b)
 
-                for p in range(C.indptr[j], nz):
-                    C.data[p] = x[C.indices[p]]
+        return x, iterations
 
-            C.indptr[n] = nz  # finalize the last column of C
 
-            return C
+# Krylov solvers shared by the Newton-like solvers, so that the preconditioners persist between calls
+krylov_solvers: Dict[Tuple, KrylovSolver] = dict()
+_krylov_solvers_lock = threading.Lock()
 
-        elif isinstance(B, float):
-            res = self.copy()
-            res.data += B
-            return res
-        else:
-            raise TypeError
 
-    def csc_matrix_matrix_addition(self, b: CxCSC) -> CxCSC:
-        # Get the shape of the matrices
-        m, n1 = self.shape
-        n2, k = b.shape
-
-        # Initialize the arrays that define the result matrix
-        data = []
-        indices = []
-        indptr = [0]
-
-        # Loop over the columns of the matrices
-        for j in range(k):
-            # Initialize a dictionary to store the non-zero elements of the j-th column of the result matrix
-            col_dict = {}
-            # Loop over the non-zero elements of the j-th column of the first matrix
-            for ja in range(self.indptr[j], self.indptr[j + 1]):
-                # Get the row index and value of the non-zero element
-                ia = self.indices[ja]
-                va = self.data[ja]
-                # Add the non-zero element to the dictionary
-                col_dict[ia] = va
-            # Loop over the non-zero elements of the j-th column of the second matrix
-            for jb in range(b.indptr[j], b.indptr[j + 1]):
-                # Get the row index and value of the non-zero element
-                ib = b.indices[jb]
-                vb = b.data[jb]
-                # Add the non-zero element to the dictionary
-                if ib in col_dict:
-                    col_dict[ib] += vb
-                else:
-                    col_dict[ib] = vb
-            # Add the non-zero elements of the j-th column of the result matrix to the data and indices arrays
-            for i, val in col_dict.items():
-                data.append(val)
-                indices.append(i)
-            # Add the index of the next column to the indptr array of the result matrix
-            indptr.append(len(data))
+def get_krylov_solver(method: SparseSolver = SparseSolver.GMRES,
+                      tol: float = 1e-8,
+                      max_iter: int = 200,
+                      drop_tol: float = 1e-4,
+                      fill_factor: float = 10.0,
+                      refresh_growth: float = 2.0) -> KrylovSolver:
+    """
+    Get the shared KrylovSolver of some settings
+    :param method: SparseSolver.GMRES or SparseSolver.BiCGSTAB
+    :param tol: relative tolerance of the Krylov method
+    :param max_iter: maximum number of Krylov iterations
+    :param drop_tol: drop tolerance of the incomplete LU
+    :param fill_factor: fill factor of the incomplete LU
+    :param refresh_growth: iterations growth factor that triggers the refresh of the preconditioner
+    :return: KrylovSolver
+    """
+    key = (method, tol, max_iter, drop_tol, fill_factor, refresh_growth)
+    with _krylov_solvers_lock:
+        solver = krylov_solvers.get(key, None)
+        if solver is None:
+            solver = KrylovSolver(method=method, tol=tol, max_iter=max_iter, drop_tol=drop_tol,
+                                  fill_factor=fill_factor, refresh_growth=refresh_growth)
+            krylov_solvers[key] = solver
+    return solver
 
-        # Create the CSC matrix from the data, indices, and indptr arrays of the result matrix
-        data = np.array(data, dtype=np.complex128)
-        indices = np.array(indices, dtype=np.int32)
-        indptr = np.array(indptr, dtype=np.int32)
 
-        my_mat = CxCSC(n_rows=m, n_cols=k, nnz=len(data), force_zeros=False)
-        my_mat.set(indices, indptr, data)
+class BorderedFactor:
+    """
+    Factorization of a matrix that extends an already factorized one with some rows and columns,
+    with the interface of SparseFactor. Permuting the rows and columns, the matrix is:
 
-        return my_mat
+        | A  B |
+        | C  D |
 
+    where A is the factorized matrix (the factors are reused as they are). Only the Schur
+    complement S = D - C A^-1 B (dense, of the size of the border) is factorized, then:
 
-def mat_to_scipy(csc: CSC | CxCSC) -> csc_matrix:
-    """
-    CSC or CxCSC Matrix to Scipy
-    :param csc:
-    :return:
+        y = A^-1 b_a
+        x_b = S^-1 (b_b - C y)
+        x_a = A^-1 (b_a - B x_b)
     """
-    return csc_matrix((csc.data, csc.indices, csc.indptr), shape=(csc.n_rows, csc.n_cols))
+    __slots__ = ('factor', 'n', 'rows_a', 'cols_a', 'rows_b', 'cols_b', 'B', 'C', 'S_inv', 'last_iterations')
 
+    def __init__(self, factor: SparseFactor | KrylovFactor | BorderedFactor, M: csc_matrix,
+                 rows_a: IntVec, cols_a: IntVec, rows_b: IntVec, cols_b: IntVec):
+        """
+        Constructor
+        :param factor: factorization of A (in the order of rows_a and cols_a)
+        :param M: extended matrix
+        :param rows_a: rows of M that correspond to the rows of A
+        :param cols_a: columns of M that correspond to the columns of A
+        :param rows_b: rows of M that border A
+        :param cols_b: columns of M that border A
+        """
+        self.factor = factor
+        self.n = M.shape[0]
+        self.rows_a = rows_a
+        self.cols_a = cols_a
+        self.rows_b = rows_b
+        self.cols_b = cols_b
+
+        M_a = M[rows_a, :]
+        M_b = M[rows_b, :]
+        self.B = M_a[:, cols_b].tocsc()
+        self.C = M_b[:, cols_a].tocsc()
+        D = M_b[:, cols_b].toarray()
+
+        # A^-1 B is only needed to compute the Schur complement, it is not kept (it is dense)
+        Z = factor.solve(self.B.toarray())
+        self.last_iterations = factor.last_iterations
+        self.S_inv = np.linalg.inv(D - self.C @ Z)
 
-def scipy_to_mat(mat: csc_matrix) -> CSC:
-    """
-    Scipy CSC matrix to CSC marix
-    :param mat: Scipy CSC matrix
-    :return: CSC marix
-    """
-    if not mat.format == 'csc':
-        warnings.warn('scipy_to_cxmat: Converting matrix to CSC format...')
-        mat = mat.tocsc()
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Shape of the extended matrix
+        :return: n_rows, n_cols
+        """
+        return self.n, self.n
 
-    x = CSC(mat.shape[0], mat.shape[1], mat.nnz, False)
-    x.data[:] = mat.data.astype(np.float64)
-    x.indices[:] = mat.indices.astype(np.int32)
-    x.indptr[:] = mat.indptr.astype(np.int32)
-    return x
+    @property
+    def nnz(self) -> int:
+        """
+        Number of non-zeros of the factors of A plus the dense inverse of the Schur complement
+        :return: int
+        """
+        return self.factor.nnz + self.S_inv.size
 
+    def solve(self, b: Union[Vec, Mat]) -> Union[Vec, Mat]:
+        """
+        Solve M x = b
+        :param b: right hand side vector or matrix
+        :return: solution
+        """
+        b_a = b[self.rows_a]
+        y = self.factor.solve(b_a)
+        iterations = self.factor.last_iterations
 
-def scipy_to_cxmat(mat: csc_matrix) -> CxCSC:
-    """
-    Scipy CSC matrix to CxCSC marix
-    :param mat: Scipy CSC matrix
-    :return: CxCSC marix
-    """
-    if not mat.format == 'csc':
-        warnings.warn('scipy_to_cxmat: Converting matrix to CSC format...')
-        mat = mat.tocsc()
+        x_b = self.S_inv @ (b[self.rows_b] - self.C @ y)
+        x_a = self.factor.solve(b_a - self.B @ x_b)
+        self.last_iterations = iterations + self.factor.last_iterations
 
-    x = CxCSC(mat.shape[0], mat.shape[1], mat.nnz, False)
-    x.data = mat.data.astype(np.complex128)
-    x.indices = mat.indices.astype(np.int32)
-    x.indptr = mat.indptr.astype(np.int32)
-    return x
+        x = np.empty(b.shape)
+        x[self.cols_a] = x_a
+        x[self.cols_b] = x_b
+        return x
 
 
-def spfactor(A: CSC) -> None | SuperLU:
+def get_bordered_factor(factor: SparseFactor | KrylovFactor | BorderedFactor, M: CSC | csc_matrix,
+                        rows_a: IntVec, cols_a: IntVec,
+                        rows_b: IntVec, cols_b: IntVec) -> None | BorderedFactor:
     """
-    Sparse factorization with SuperLU
-    :param A: CSC matrix
-    :return: SuperLU factorization object
+    Extend the factorization of a matrix A to a matrix M that borders it with some rows and columns,
+    without factorizing M (see BorderedFactor)
+    :param factor: factorization of A (in the order of rows_a and cols_a)
+    :param M: extended matrix (CSC or scipy csc_matrix)
+    :param rows_a: rows of M that correspond to the rows of A
+    :param cols_a: columns of M that correspond to the columns of A
+    :param rows_b: rows of M that border A
+    :param cols_b: columns of M that border A
+    :return: BorderedFactor, None if the Schur complement is singular
     """
-    permc_spec = None
-    diag_pivot_thresh = None
-    relax = None
-    panel_size = None
-    _options = dict(DiagPivotThresh=diag_pivot_thresh,
-                    ColPerm=permc_spec,
-                    PanelSize=panel_size,
-                    Relax=relax)
-
-    if _options["ColPerm"] == "NATURAL":
-        _options["SymmetricMode"] = True
+    M_sp = M if isinstance(M, csc_matrix) else mat_to_scipy(M)
 
     try:
-        ret = gstrf(A.n_cols, A.nnz, A.data, A.indices, A.indptr,
-                    ilu=False, options=_options, csc_construct_func=None)
-        return ret
-    except RuntimeError:
+        return BorderedFactor(factor=factor, M=M_sp, rows_a=rows_a, cols_a=cols_a, rows_b=rows_b, cols_b=cols_b)
+    except np.linalg.LinAlgError:
         return None
 
 
-def spsolve_csc(A: CSC, x: Vec) -> Vec:
-    """
-    Sparse solution
-    :param A: CSC matrix
-    :param x: vector
-    :return: solution
-    """
-    factor = spfactor(A)
-    if factor is None:
-        return np.full(len(x), np.nan), False
-    else:
-        return factor.solve(x), True
-
-
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def pack_4_by_4(A: CSC, B: CSC, C: CSC, D: CSC) -> CSC:
     """
     Stack 4 CSC matrices in a 2 by 2 structure
@@ -694,7 +1616,7 @@ def pack_4_by_4(A: CSC, B: CSC, C: CSC, D: CSC) -> CSC:
     return res
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def pack_3_by_4(A: CSC, B: CSC, C: CSC) -> CSC:
     """
     Stack 3 CSC matrices in a 2 by 2 structure
@@ -741,7 +1663,7 @@ def pack_3_by_4(A: CSC, B: CSC, C: CSC) -> CSC:
     return res
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_cumsum_i(p, c, n):
     """
     p [0..n] = cumulative sum of c [0..n-1], and then copy p [0..n-1] into c
@@ -763,7 +1685,7 @@ def csc_cumsum_i(p, c, n):
     return int(nz2)  # return sum (c [0..n-1])
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def sp_transpose(A: CSC) -> CSC:
     """
     Actual CSC transpose unlike scipy's
@@ -789,7 +1711,7 @@ def sp_transpose(A: CSC) -> CSC:
     return C
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def sp_slice_cols(A: CSC, cols: IntMat) -> CSC:
     """
     Slice columns
@@ -823,7 +1745,7 @@ def sp_slice_cols(A: CSC, cols: IntMat) -> CSC:
     return res
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def sp_slice_rows(mat: CSC, rows: np.ndarray) -> CSC:
     """
     Slice rows
@@ -836,7 +1758,7 @@ def sp_slice_rows(mat: CSC, rows: np.ndarray) -> CSC:
     return sp_transpose(A)
 
 
-@nb.njit()
+@nb.njit(nogil=True, cache=True)
 def sp_slice(A: CSC, rows: IntVec, cols: IntVec):
     """
     /*
@@ -887,7 +1809,7 @@ def sp_slice(A: CSC, rows: IntVec, cols: IntVec):
     return B
 
 
-@nb.njit()
+@nb.njit(nogil=True, cache=True)
 def csc_stack_2d_ff(mats: List[CSC], n_rows: int = 1, n_cols: int = 1) -> CSC:
     """
     Assemble matrix from a list of matrices representing a "super matrix"
@@ -954,7 +1876,88 @@ def csc_stack_2d_ff(mats: List[CSC], n_rows: int = 1, n_cols: int = 1) -> CSC:
     return res
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
+def csc_stack_2d_ff_fill(mats: List[CSC], n_rows: int, n_cols: int, res: CSC) -> bool:
+    """
+    Fill the data of a matrix assembled with csc_stack_2d_ff with the values of a new list of matrices, in place.
+    The new matrices must have the same structure as the ones used to assemble res; this is checked
+    before writing anything, so res is left untouched when the structure is different.
+
+    :param mats: list of CSC matrices arranged in row-major order (i.e. [mat11, mat12, mat13, mat21, mat22, mat23]
+    :param n_rows: number of rows of the mats structure
+    :param n_cols: number of cols of the mats structure
+    :param res: matrix assembled with csc_stack_2d_ff
+    :return: True if the structure matched and res was filled,
+             False if the structure is different (res must be assembled again with csc_stack_2d_ff)
+    """
+
+    # pass 1: check the dimensions
+    nnz = 0
+    nrows = 0
+    ncols = 0
+    for r in range(n_rows):
+        nrows += mats[r * n_cols].n_rows  # equivalent to mats[r, 0]
+        for c in range(n_cols):
+            nnz += mats[c + r * n_cols].nnz
+            if r == 0:
+                ncols += mats[c + r * n_cols].n_cols
+
+    if nrows != res.n_rows or ncols != res.n_cols or nnz != res.nnz:
+        return False
+
+    # pass 2: check the structure
+    cnt = 0
+    offset_col = 0
+    for c in range(n_cols):  # for each column of the array of matrices
+
+        # number of columns
+        n = mats[c].n_cols  # equivalent to mats[0, c]
+
+        for j in range(n):  # for every column of the column of matrices
+
+            offset_row = 0
+
+            for r in range(n_rows):  # for each row of the array of rows
+
+                # get the current sub-matrix
+                A: CSC = mats[r * n_cols + c]  # equivalent to mats[r, c]
+
+                if A.n_rows > 0 and A.nnz > 0:
+
+                    for k in range(A.indptr[j], A.indptr[j + 1]):  # for every entry in the column from A
+                        if res.indices[cnt] != A.indices[k] + offset_row:
+                            return False
+                        cnt += 1
+
+                offset_row += A.n_rows
+
+            if res.indptr[offset_col + j + 1] != cnt:
+                return False
+
+        offset_col += n
+
+    # pass 3: fill in the data
+    cnt = 0
+    for c in range(n_cols):  # for each column of the array of matrices
+
+        n = mats[c].n_cols  # equivalent to mats[0, c]
+
+        for j in range(n):  # for every column of the column of matrices
+
+            for r in range(n_rows):  # for each row of the array of rows
+
+                A: CSC = mats[r * n_cols + c]  # equivalent to mats[r, c]
+
+                if A.n_rows > 0 and A.nnz > 0:
+
+                    for k in range(A.indptr[j], A.indptr[j + 1]):  # for every entry in the column from A
+                        res.data[cnt] = A.data[k]
+                        cnt += 1
+
+    return True
+
+
+@nb.njit(nogil=True, cache=True)
 def diags(array: Vec) -> CSC:
     """
     Get diagonal sparse matrix from array
@@ -974,7 +1977,7 @@ def diags(array: Vec) -> CSC:
     return res
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def diagc(m: int, value: float = 1.0) -> CSC:
     """
     Get diagonal sparse matrix from value
@@ -994,7 +1997,7 @@ def diagc(m: int, value: float = 1.0) -> CSC:
     return res
 
 
-@nb.njit(cache=False)
+@nb.njit(nogil=True, cache=True)
 def extend(A: CSC, last_col: Vec, last_row: Vec, corner_val: float) -> CSC:
     """
     B = |   A       last_col |
@@ -1061,7 +2064,7 @@ def extend(A: CSC, last_col: Vec, last_row: Vec, corner_val: float) -> CSC:
     return B
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_multiply_ff(A: CSC, B: CSC) -> CSC:
     """
     Sparse matrix multiplication, C = A*B where A and B are CSC sparse matrices
@@ -1139,7 +2142,7 @@ def csc_multiply_ff(A: CSC, B: CSC) -> CSC:
     return C
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_multiply_ff2(Am, An, Ap, Ai, Ax,
                      Bm, Bn, Bp, Bi, Bx):
     """
@@ -1224,7 +2227,7 @@ def csc_multiply_ff2(Am, An, Ap, Ai, Ax,
     return Cm, Cn, Cp, Cinew, Cxnew, Cnzmax
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_multiply_cx(A: CxCSC, B: CSC) -> CxCSC:
     """
     Sparse matrix multiplication, C = A*B where A and B are CSC sparse matrices
@@ -1302,7 +2305,7 @@ def csc_multiply_cx(A: CxCSC, B: CSC) -> CxCSC:
     return C
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_matvec_ff(A: CSC, x: np.ndarray) -> np.ndarray:
     """
 
@@ -1330,7 +2333,7 @@ def csc_matvec_ff(A: CSC, x: np.ndarray) -> np.ndarray:
         raise Exception("Wrong number of dimensions")
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_matvec_cx(A: CxCSC, x: np.ndarray) -> np.ndarray:
     """
 
@@ -1359,7 +2362,7 @@ def csc_matvec_cx(A: CxCSC, x: np.ndarray) -> np.ndarray:
 
 
 # @nb.njit("i8(i4[:], i4[:], f8[:], i8, f8, i4[:], f8[:], i8, i4[:], i8)")
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_scatter_f(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
     """
     Scatters and sums a sparse vector A(:,j) into a dense vector, x = x + beta * A(:,j)
@@ -1388,7 +2391,7 @@ def csc_scatter_f(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
     return nz
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_scatter_cx(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
     """
     Scatters and sums a sparse vector A(:,j) into a dense vector, x = x + beta * A(:,j)
@@ -1416,7 +2419,7 @@ def csc_scatter_cx(Ap, Ai, Ax, j, beta, w, x, mark, Ci, nz):
             x[i] += beta * Ax[p]  # i exists in C(:,j) already
     return nz
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_spalloc_f(m, n, nzmax):
     """
     Allocate a sparse matrix (triplet form or compressed-column form).
@@ -1433,7 +2436,7 @@ def csc_spalloc_f(m, n, nzmax):
     return m, n, Aindptr, Aindices, Adata, Anzmax
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_spalloc_cx(m, n, nzmax):
     """
     Allocate a sparse matrix (triplet form or compressed-column form).
@@ -1449,7 +2452,7 @@ def csc_spalloc_cx(m, n, nzmax):
     Adata = np.zeros(Anzmax, dtype=np.complex128)
     return m, n, Aindptr, Aindices, Adata, Anzmax
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_add_ff(A: CSC, B: CSC, alpha = 1.0, beta = 1.0) -> CSC:
     """
     C = alpha*A + beta*B
@@ -1487,7 +2490,7 @@ def csc_add_ff(A: CSC, B: CSC, alpha = 1.0, beta = 1.0) -> CSC:
     return C  # success; free workspace, return C
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_add_ff2(Am, An, Aindptr, Aindices, Adata, Bn, Bindptr, Bindices, Bdata):
     """
     C = A + B
@@ -1523,7 +2526,7 @@ def csc_add_ff2(Am, An, Aindptr, Aindices, Adata, Bn, Bindptr, Bindices, Bdata):
     return Cm, Cn, Cp, Ci, Cx, nz  # success; free workspace, return C
 
 
-@nb.njit(cache=True)
+@nb.njit(nogil=True, cache=True)
 def csc_add_cx2(Am, An, Aindptr, Aindices, Adata, Bn, Bindptr, Bindices, Bdata):
     """
     C = A + B
@@ -3,7 +3,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 
-from typing import Dict, Any, Union
+from typing import Dict, Any, Union, Tuple, List
 import numpy as np
 from enum import Enum
 from VeraGridEngine.enumerations import DeviceType
@@ -39,16 +39,40 @@ def check_type(dtype: PROFILE_TYPES, value: Any) -> bool:
         raise Exception("Sparse array type value Not recognized")
 
 
+def get_numpy_type(dtype: PROFILE_TYPES) -> type:
+    """
+    Get the numpy type used to store the values of a declared profile type
+    :param dtype: declared type
+    :return: numpy type
+    """
+    if dtype == bool:
+        return np.bool_
+    elif dtype == int:
+        return np.int64
+    elif dtype == float:
+        return np.float64
+    else:
+        # enums, devices, arrays...
+        return object
+
+
 class SparseArray:
     """
     SparseArray
+    The values that differ from the default value are stored as two arrays:
+    the sorted positions (indices) and their values, similar to a CSR matrix row.
+    Both arrays are plain numpy arrays, so they can be passed to numba functions.
+    The scalar lookups (at) go through a {index: value} dictionary that is
+    built on the first lookup and dropped whenever the arrays change.
     """
 
     __slots__ = (
         '_dtype',
         '_default_value',
         '_size',
-        '_map',
+        '_indices',
+        '_values',
+        '_lookup',
     )
 
     def __init__(self, data_type: PROFILE_TYPES, default_value: Any, size: int = 0) -> None:
@@ -61,7 +85,9 @@ class SparseArray:
         self._dtype = data_type
         self._default_value: Any | None = self._dtype(default_value) if default_value is not None else None
         self._size: int = size
-        self._map: Dict[int, Any] = dict()
+        self._indices: IntVec = np.zeros(0, dtype=np.int64)
+        self._values: NumericVec = np.zeros(0, dtype=get_numpy_type(data_type))
+        self._lookup: Dict[int, Any] | None = None
 
     def copy(self) -> "SparseArray":
         """
@@ -69,7 +95,8 @@ class SparseArray:
         :return: A new SparseArray copy of this object
         """
         cpy = SparseArray(data_type=self._dtype, default_value=self._default_value, size=self._size)
-        cpy._map = self._map.copy()
+        cpy._indices = self._indices.copy()
+        cpy._values = self._values.copy()
         return cpy
 
     @property
@@ -109,6 +136,14 @@ class SparseArray:
         check_type(dtype=self.dtype, value=val2)
         self._default_value = val2
 
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored values (the ones different from the default value)
+        :return: int
+        """
+        return len(self._indices)
+
     def info(self):
         """
         Return dictionary with information about the profile object and its content
@@ -118,31 +153,114 @@ class SparseArray:
             "me": hex(id(self)),
             "default_value": self._default_value,
             "size": self._size,
-            "map": hex(id(self._map)),
+            "nnz": self.nnz,
         }
 
+    def get_indices(self) -> IntVec:
+        """
+        Get the sorted positions of the stored values
+        :return: IntVec
+        """
+        return self._indices
+
+    def get_values(self) -> NumericVec:
+        """
+        Get the stored values (aligned with get_indices)
+        :return: NumericVec
+        """
+        return self._values
+
     def get_map(self) -> Dict[int, Numeric]:
         """
-        Return the dictionary hosting the sparse data
+        Return the dictionary representation of the sparse data
+        Note: this is a copy, modifying it does not modify the array
         :return: Dict[int, Numeric]
         """
-        return self._map
+        return dict(zip(self._indices.tolist(), self._values.tolist()))
+
+    def _set_from_dict(self, data: Union[Dict[int, Numeric], None]) -> None:
+        """
+        Set the stored values from a dictionary
+        :param data: {index: value} dictionary
+        """
+        self._lookup = None
+        if data is None or len(data) == 0:
+            self._indices = np.zeros(0, dtype=np.int64)
+            self._values = np.zeros(0, dtype=get_numpy_type(self._dtype))
+        else:
+            keys = sorted(data.keys())
+            self._indices = np.array(keys, dtype=np.int64)
+            tpe = get_numpy_type(self._dtype)
+            if tpe == object:
+                self._values = np.empty(len(keys), dtype=object)
+                for i, key in enumerate(keys):
+                    self._values[i] = data[key]
+            else:
+                # let numpy find the type that holds all the values
+                self._values = np.array([data[key] for key in keys])
+
+    def _find(self, idx: int) -> Tuple[int, bool]:
+        """
+        Find the position of an index in the stored indices
+        :param idx: index
+        :return: insertion position, found?
+        """
+        pos = int(np.searchsorted(self._indices, idx))
+        return pos, pos < len(self._indices) and self._indices[pos] == idx
 
     def insert(self, i: int, x: Numeric):
         """
-        Insert an element in the data dictionary
+        Insert an element in the data
         :param i:
         :param x:
         :return:
         """
-        self._map[i] = x
+        if self._values.dtype == object:
+            tpe = object
+        else:
+            # promote the storage if needed (i.e. setting a float in an int array)
+            tpe = np.result_type(self._values, x)
+
+        if tpe != self._values.dtype:
+            # the stored values change type, the lookup values would be stale
+            self._lookup = None
+
+        pos, found = self._find(i)
+        if found:
+            if tpe != self._values.dtype:
+                self._values = self._values.astype(tpe)
+            self._values[pos] = x
+        else:
+            self._indices = np.insert(self._indices, pos, i)
+            # np.insert would try to unpack sequences when the values are objects
+            values = np.empty(len(self._values) + 1, dtype=tpe)
+            values[:pos] = self._values[:pos]
+            values[pos] = x
+            values[pos + 1:] = self._values[pos:]
+            self._values = values
+
+        if self._lookup is not None:
+            val = self._values[pos]
+            self._lookup[i] = val.item() if isinstance(val, np.generic) else val
+
+    def remove(self, i: int):
+        """
+        Remove an element from the data (it takes the default value)
+        :param i: index
+        """
+        pos, found = self._find(i)
+        if found:
+            self._indices = np.delete(self._indices, pos)
+            self._values = np.delete(self._values, pos)
+            if self._lookup is not None:
+                del self._lookup[i]
 
     def get_sparsity(self) -> float:
         """
         Get the sparsity of this profile
         :return: Sparsity metric
         """
-        return float(len(self._map)) / float(self._size)
+        return float(self.nnz) / float(self._size)
 
     def create(self, size: int, default_value: PROFILE_TYPES,
                data: Union[Dict[int, Numeric], None] = None) -> "SparseArray":
@@ -154,7 +272,7 @@ class SparseArray:
         """
         self.default_value = self._dtype(default_value) if default_value is not None else None
         self._size = size
-        self._map = data if data is not None else dict()
+        self._set_from_dict(data)
         return self
 
     def create_from_array(self, array: NumericVec,
@@ -166,11 +284,16 @@ class SparseArray:
         """
         self.default_value = self._dtype(default_value) if default_value is not None else None
         self._size = len(array)
-        self._map: Dict[int, Numeric] = dict()
 
-        for i, val in enumerate(array):
-            if val != default_value:
-                self._map[i] = val
+        array = np.asarray(array)
+        if array.dtype == object:
+            mask = np.array([val != default_value for val in array], dtype=bool)
+        else:
+            mask = array != default_value
+
+        self._indices = np.where(mask)[0].astype(np.int64)
+        self._values = array[mask]
+        self._lookup = None
 
         return self
 
@@ -185,7 +308,7 @@ class SparseArray:
         """
         self.default_value = self._dtype(default_value) if default_value is not None else None
         self._size = size
-        self._map = map_data
+        self._set_from_dict(map_data)
         return self
 
     def fill(self, value: Any):
@@ -194,7 +317,15 @@ class SparseArray:
         :param value: any value
         """
         self.default_value = self._dtype(value) if value is not None else None
-        self._map = dict()
+        self._set_from_dict(None)
+
+    def scale(self, value: Union[float, int]):
+        """
+        Scale the stored values in-place (the default value is not modified)
+        :param value: scaling factor
+        """
+        self._values = self._values * value
+        self._lookup = None
 
     def toarray(self) -> NumericVec:
         """
@@ -202,10 +333,7 @@ class SparseArray:
         :return: NumericVec
         """
         arr = np.full(self._size, self._default_value)
-
-        for key, val in self._map.items():
-            arr[key] = val
-
+        arr[self._indices] = self._values
         return arr
 
     def at(self, idx: int) -> Any:
@@ -214,17 +342,31 @@ class SparseArray:
         :param idx: index
         :return: Numeric value
         """
-        if len(self._map) == 0:
+        if len(self._indices) == 0:
             return self._default_value
 
-        else:
+        if self._lookup is None:
+            # tolist gives python scalars, like the values returned by the former dictionary
+            self._lookup = dict(zip(self._indices.tolist(), self._values.tolist()))
 
-            val = self._map.get(idx, None)
+        return self._lookup.get(idx, self._default_value)
 
-            if val is None:
-                return self._default_value
-            else:
-                return val
+    def take(self, indices: IntVec) -> NumericVec:
+        """
+        Get the values at several positions in one go (batched version of at)
+        :param indices: array of integer indices
+        :return: NumericVec of the size of indices
+        """
+        res = np.full(len(indices), self._default_value)
+
+        if len(self._indices):
+            indices = np.asarray(indices)
+            pos = np.searchsorted(self._indices, indices)
+            pos[pos == len(self._indices)] = 0
+            found = self._indices[pos] == indices
+            res[found] = self._values[pos[found]]
+
+        return res
 
     def __getitem__(self, key: int) -> Any:
         return self.at(idx=key)
@@ -236,7 +378,9 @@ class SparseArray:
             assert key < self._size
 
             if value != self._default_value:
-                self._map[key] = value
+                self.insert(key, value)
+            else:
+                self.remove(key)
 
         else:
             raise TypeError("Key must be an integer")
@@ -253,7 +397,10 @@ class SparseArray:
         if self._size != other._size:
             return False
 
-        if self._map != other._map:
+        if not np.array_equal(self._indices, other._indices):
+            return False
+
+        if self._values.tolist() != other._values.tolist():
             return False
 
         return True
@@ -270,12 +417,12 @@ class SparseArray:
         Clear the sparse array
         :return:
         """
-        self._map.clear()
+        self._set_from_dict(None)
         self._size = 0
 
     def set_data(self, d: Dict[int, Any]):
 
-        self._map = d
+        self._set_from_dict(d)
 
     def resize(self, n: int):
         """
@@ -285,13 +432,10 @@ class SparseArray:
                  reduced to its first n elements, removing those beyond (and destroying them)
         """
         if n < self._size:  # we need to delete the elements out of range
-
-            for key, val in self._map.items():
-
-                if key >= n:
-                    # delete elements whose index is now out of bounds from
-                    # the index -> value map.
-                    del self._map[key]
+            mask = self._indices < n
+            self._indices = self._indices[mask]
+            self._values = self._values[mask]
+            self._lookup = None
 
         self._size = n
 
@@ -307,7 +451,7 @@ class SparseArray:
                                 0  1  2  3  4  5  6  7  8
         original dense vector [0, 0, 2, 0, 7, 0, 0, 0, 3]
         
-        map: {{2: 2}, {4: 7}, {8: 3}}
+        indices: [2, 4, 8], values: [2, 7, 3]
         
         Now we resample with indices [2, 5, 8]
         
@@ -315,20 +459,16 @@ class SparseArray:
                                   new idx   0  1  2  -> indices' positions
         the supposedly modified vector is: [2, 0, 3]
         
-        the new map is: {{0: 2:}, {2: 3}}
+        the new data is: indices [0, 2], values [2, 3]
         """
-
-        new_map: Dict[int, Numeric] = dict()
-
-        for i, idx in enumerate(indices):
-
-            it = self._map.get(idx, None)
-
-            if it is not None:
-                # found, keep the value at the new index
-                new_map[i] = it
-
-        self._map = new_map
+        if len(self._indices):
+            indices = np.asarray(indices)
+            pos = np.searchsorted(self._indices, indices)
+            pos[pos == len(self._indices)] = 0
+            found = self._indices[pos] == indices
+            self._indices = np.where(found)[0].astype(np.int64)
+            self._values = self._values[pos[found]]
+            self._lookup = None
 
     def slice(self, indices: IntVec) -> "SparseArray":
         """
@@ -339,28 +479,50 @@ class SparseArray:
         cpy.resample(indices)
         return cpy
 
-    def get_sparse_representation(self):
+    def get_sparse_representation(self) -> Tuple[List[int], List[Any]]:
         """
         Get the sparse representation of the sparse data
-        :return:
+        :return: list of indices, list of values
         """
-        indptr = list()
-        data = list()
-        for i, x in self._map:
-            indptr.append(i)
-            data.append(x)
-
-        return indptr, data
+        return self._indices.tolist(), self._values.tolist()
 
     def set_sparse_data_from_data(self, indptr, data):
         """
-
-        :param indptr:
-        :param data:
-        :return:
-        """
-        for i, x in zip(indptr, data):
-            self._map[i] = x
+        Insert several elements in one go (bulk version of insert)
+        The existing values at the same positions are overwritten, and if a
+        position is repeated the last value is kept, like calling insert in a loop.
+        :param indptr: array of data indices
+        :param data: array of data values
+        """
+        indices = np.asarray(indptr, dtype=np.int64)
+        if len(indices) == 0:
+            return
+
+        if self._values.dtype == object:
+            values = np.empty(len(indices), dtype=object)
+            for k, x in enumerate(data):
+                values[k] = x
+            current = self._values
+        else:
+            values = np.asarray(data)
+            tpe = np.result_type(self._values, values)
+            values = values.astype(tpe)
+            current = self._values.astype(tpe)
+
+        # the new entries go after the existing ones, the stable sort keeps
+        # that order within each index, so the last entry of each run is the newest
+        all_indices = np.concatenate((self._indices, indices))
+        all_values = np.concatenate((current, values))
+        order = np.argsort(all_indices, kind='stable')
+        all_indices = all_indices[order]
+        all_values = all_values[order]
+
+        keep = np.ones(len(all_indices), dtype=bool)
+        keep[:-1] = all_indices[1:] != all_indices[:-1]
+
+        self._indices = all_indices[keep]
+        self._values = all_values[keep]
+        self._lookup = None
 
 
 class SparseObjectArray:
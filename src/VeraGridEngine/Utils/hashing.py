@@ -0,0 +1,29 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import hashlib
+from typing import Any
+import numpy as np
+
+
+def hash_arrays(*args: Any) -> str:
+    """
+    Compute a content hash of a number of arrays (and scalars)
+    The dtype and shape are part of the hash, so [1, 2] (int) and [1.0, 2.0] (float) are different
+    :param args: numpy arrays, scalars, strings or None
+    :return: hexadecimal digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            h.update(f"{arg.dtype.str}{arg.shape}".encode())
+            if arg.dtype == object:
+                h.update(repr(arg.tolist()).encode())
+            else:
+                h.update(np.ascontiguousarray(arg).view(np.uint8))
+        else:
+            h.update(f"<{arg!r}>".encode())
+
+    return h.hexdigest()
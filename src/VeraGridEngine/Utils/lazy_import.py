@@ -0,0 +1,102 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any, Dict, Callable, List, Tuple
+
+
+class LazyModule(ModuleType):
+    """
+    Module that is imported on the first access to one of its attributes
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        """
+        Import the module and take its attributes (only called for the missing attributes)
+        :param attr: attribute name
+        :return: attribute value
+        """
+        if attr.startswith('__'):
+            # do not import on the introspection made by copy, pickle, inspect, etc.
+            raise AttributeError(attr)
+
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Get a module that is only imported on the first access to one of its attributes.
+    This keeps the heavy third-party modules that few functions use (i.e. matplotlib.pyplot)
+    out of the import time of VeraGridEngine:
+
+        plt = lazy_import('matplotlib.pyplot')  # instead of from matplotlib import pyplot as plt
+
+    :param name: full name of the module
+    :return: the module if it was imported already, a LazyModule otherwise
+    """
+    module = sys.modules.get(name, None)
+    if module is not None:
+        return module
+
+    # check that the package exists (this does not import it)
+    package = name.split('.')[0]
+    if package not in sys.modules and importlib.util.find_spec(package) is None:
+        raise ModuleNotFoundError(f"No module named '{package}'", name=package)
+
+    return LazyModule(name)
+
+
+def lazy_attributes(module_name: str, attributes: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Get a module level __getattr__ (PEP 562) that imports some attributes on their first access.
+    This keeps the modules that few functions use (i.e. the CGMES parsers) out of the import time
+    of a package that exposes them:
+
+        __getattr__ = lazy_attributes(__name__, {'CgmesCircuit': 'VeraGridEngine.IO.cim.cgmes.cgmes_circuit'})
+
+    The lazy attributes are not exported by "from package import *", so the packages that re-export
+    them must chain their own lazy_attributes with the same dictionary (or declare them with lazy_exports).
+
+    :param module_name: full name of the module that gets the __getattr__ (__name__)
+    :param attributes: dictionary of attribute name: full name of the module that defines it
+    :return: __getattr__ function
+    """
+
+    def __getattr__(attr: str) -> Any:
+        source = attributes.get(attr, None)
+        if source is None:
+            raise AttributeError(f"module '{module_name}' has no attribute '{attr}'")
+
+        value = getattr(importlib.import_module(source), attr)
+        setattr(sys.modules[module_name], attr, value)  # the next accesses do not get here
+        return value
+
+    return __getattr__
+
+
+def lazy_exports(namespace: Dict[str, Any], attributes: Dict[str, str]) -> Tuple[List[str], Callable[[], List[str]]]:
+    """
+    Get the __all__ and __dir__ of a module that has lazy attributes, so that they are listed by dir()
+    and exported by "from module import *" (that resolves them through __getattr__, importing their modules).
+    A plain import of the module stays lazy:
+
+        __all__, __dir__ = lazy_exports(globals(), API_LAZY_ATTRIBUTES)  # at the end of the module
+
+    :param namespace: globals() of the module, once its public names are defined
+    :param attributes: dictionary of attribute name: full name of the module that defines it
+    :return: __all__ list, __dir__ function
+    """
+    names = sorted(set(name for name in namespace.keys() if not name.startswith('_')) | set(attributes.keys()))
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace.keys()) | set(attributes.keys()))
+
+    return names, __dir__
@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+# name of the memory block, shape and dtype of every array
+SharedArraysSpecs = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+
+class SharedArrays:
+    """
+    Arrays backed by multiprocessing.shared_memory blocks
+
+    The process that creates them passes get_specs() to the worker processes,
+    that write on the same memory through attach_shared_arrays.
+    The creator must call release() once the workers are done.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Constructor
+        :param arrays: dictionary of name: array to mirror (the initial values are copied)
+        """
+        self._blocks: List[shared_memory.SharedMemory] = list()
+
+        self.arrays: Dict[str, np.ndarray] = dict()
+
+        self._specs: SharedArraysSpecs = dict()
+
+        for name, arr in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            self._blocks.append(shm)
+
+            shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+            shared[...] = arr
+            self.arrays[name] = shared
+            self._specs[name] = (shm.name, arr.shape, arr.dtype.str)
+
+    def get_specs(self) -> SharedArraysSpecs:
+        """
+        Get the (picklable) description of the arrays used by attach_shared_arrays
+        :return: SharedArraysSpecs
+        """
+        return self._specs
+
+    def copy_to(self, obj: Any) -> None:
+        """
+        Copy the arrays into attributes of the same name of an object
+        :param obj: any object (i.e. the simulation results)
+        """
+        for name, arr in self.arrays.items():
+            setattr(obj, name, arr.copy())
+
+    def release(self) -> None:
+        """
+        Free the shared memory, the arrays cannot be used afterwards
+        """
+        self.arrays.clear()
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+
+def attach_shared_arrays(specs: SharedArraysSpecs) -> Tuple[SimpleNamespace, List[shared_memory.SharedMemory]]:
+    """
+    Attach to arrays created by SharedArrays in another process
+    :param specs: SharedArrays.get_specs()
+    :return: namespace with the arrays as attributes, memory blocks (keep them alive while the arrays are used)
+    """
+    blocks = list()
+    arrays = SimpleNamespace()
+
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        blocks.append(shm)
+        setattr(arrays, name, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+
+    return arrays, blocks
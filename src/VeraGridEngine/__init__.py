@@ -20,7 +20,14 @@ try:
                                                    get_certificate)
     from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, NumericalCircuit
 
-    from VeraGridEngine.api import *
+    import VeraGridEngine.api as api
+    from VeraGridEngine.Utils.lazy_import import lazy_attributes, lazy_exports
+
+    # "from VeraGridEngine.api import *" would import the lazy attributes too, so only the loaded ones are taken
+    globals().update({name: getattr(api, name) for name in api.__all__ if name not in api.API_LAZY_ATTRIBUTES})
+
+    __getattr__ = lazy_attributes(__name__, API_LAZY_ATTRIBUTES)
+    __all__, __dir__ = lazy_exports(globals(), API_LAZY_ATTRIBUTES)
 
     PROPERLY_LOADED_API = True
 except ModuleNotFoundError as e:
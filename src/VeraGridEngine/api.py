@@ -21,7 +21,15 @@ from VeraGridEngine.Compilers import *
 from VeraGridEngine.IO.file_handler import FileOpen, FileSave, FileSavingOptions
 from VeraGridEngine.IO.veragrid.remote import (gather_model_as_jsons_for_communication, RemoteInstruction,
                                                SimulationTypes, send_json_data, get_certificate_path, get_certificate)
-from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at, NumericalCircuit
+from VeraGridEngine.Compilers.circuit_to_data import (compile_numerical_circuit_at, compile_numerical_circuit_ts,
+                                                      NumericalCircuit, NumericalCircuitTs)
+from VeraGridEngine.warmup import warm_up
+from VeraGridEngine.Utils.lazy_import import lazy_attributes, lazy_exports
+
+# names of the IO and simulation modules that are only imported when used
+API_LAZY_ATTRIBUTES = {**SIMULATIONS_LAZY_ATTRIBUTES, **IO_LAZY_ATTRIBUTES}
+
+__getattr__ = lazy_attributes(__name__, API_LAZY_ATTRIBUTES)
 
 
 def open_file(filename: Union[str, List[str]]) -> MultiCircuit:
@@ -461,3 +469,7 @@ def clustering(circuit: MultiCircuit, n_points=100) -> ClusteringResults:
     drv = ClusteringDriver(grid=circuit, options=opts)
     drv.run()
     return drv.results
+
+
+# export the lazy attributes as well with "from VeraGridEngine.api import *"
+__all__, __dir__ = lazy_exports(globals(), API_LAZY_ATTRIBUTES)
@@ -635,8 +635,12 @@ class ConvergenceReport:
         self.error_ = list()
         self.elapsed_ = list()
         self.iterations_ = list()
+        self.factorizations_ = list()
+        self.linear_iterations_ = list()
+        self.traces_ = list()
 
-    def add(self, method, converged: bool, error: float, elapsed: float, iterations: int):
+    def add(self, method, converged: bool, error: float, elapsed: float, iterations: int, factorizations: int = 0,
+            linear_iterations: int = 0, trace: Any = None):
         """
 
         :param method:
@@ -644,6 +648,9 @@ class ConvergenceReport:
         :param error:
         :param elapsed:
         :param iterations:
+        :param factorizations: number of Jacobian factorizations
+        :param linear_iterations: number of iterations of the Krylov linear solver
+        :param trace: IterationTrace of the method (None if not recorded)
         :return:
         """
         self.methods_.append(method)
@@ -651,6 +658,9 @@ class ConvergenceReport:
         self.error_.append(error)
         self.elapsed_.append(elapsed)
         self.iterations_.append(iterations)
+        self.factorizations_.append(factorizations)
+        self.linear_iterations_.append(linear_iterations)
+        self.traces_.append(trace)
 
     def converged(self) -> bool:
         """
@@ -692,6 +702,26 @@ class ConvergenceReport:
         else:
             return 0.0
 
+    def factorizations(self) -> int:
+        """
+        Number of Jacobian factorizations of the last method
+        :return:
+        """
+        if len(self.factorizations_) > 0:
+            return self.factorizations_[-1]
+        else:
+            return 0
+
+    def linear_iterations(self) -> int:
+        """
+        Number of iterations of the Krylov linear solver of the last method
+        :return:
+        """
+        if len(self.linear_iterations_) > 0:
+            return self.linear_iterations_[-1]
+        else:
+            return 0
+
     def to_dataframe(self) -> pd.DataFrame:
         """
 
@@ -701,7 +731,9 @@ class ConvergenceReport:
                 'Converged?': self.converged_,
                 'Error': self.error_,
                 'Elapsed (s)': self.elapsed_,
-                'Iterations': self.iterations_}
+                'Iterations': self.iterations_,
+                'Factorizations': self.factorizations_,
+                'Linear iterations': self.linear_iterations_}
 
         return pd.DataFrame(data)
 
@@ -838,7 +870,128 @@ class CompressedJsonStruct:
         self.__data[i][j] = val
 
 
-class ListSet(list):
+class ReadOnlyDict(dict):
+    """
+    Dictionary that can be read but not modified, used to share cached dictionaries safely.
+    Use copy() to get a modifiable dictionary.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("This dictionary is read-only, copy it to modify it")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self) -> dict:
+        """
+        Get a modifiable copy
+        :return: dict
+        """
+        return dict(self)
+
+    def __reduce__(self):
+        # pickle and copy through the constructor, since __setitem__ is disabled
+        return ReadOnlyDict, (dict(self),)
+
+
+# counter of the modifications of all the DeviceList instances (see get_device_lists_version)
+_DEVICE_LISTS_VERSION: int = 0
+
+
+def get_device_lists_version() -> int:
+    """
+    Get the global counter of device list modifications, it changes every time a DeviceList is modified
+    :return: int
+    """
+    return _DEVICE_LISTS_VERSION
+
+
+class DeviceList(list):
+    """
+    List that counts its modifications, used to store the devices of a grid.
+    The caches built from the lists (i.e. the Assets index registry or the columnar profile store)
+    compare the version instead of checking every element.
+    """
+
+    def __init__(self, iterable=()):
+        """
+        Constructor
+        :param iterable: initial elements
+        """
+        super().__init__(iterable)
+        self.version: int = 0
+        self._modified()
+
+    def _modified(self) -> None:
+        """
+        Record a modification
+        """
+        global _DEVICE_LISTS_VERSION
+        _DEVICE_LISTS_VERSION += 1
+        self.version = _DEVICE_LISTS_VERSION
+
+    def append(self, value):
+        super().append(value)
+        self._modified()
+
+    def extend(self, iterable):
+        super().extend(iterable)
+        self._modified()
+
+    def insert(self, index, value):
+        super().insert(index, value)
+        self._modified()
+
+    def remove(self, value):
+        super().remove(value)
+        self._modified()
+
+    def pop(self, index=-1):
+        value = super().pop(index)
+        self._modified()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._modified()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._modified()
+
+    def reverse(self):
+        super().reverse()
+        self._modified()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._modified()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._modified()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._modified()
+        return result
+
+    def __reduce__(self):
+        # pickle and copy through the constructor
+        return self.__class__, (list(self),)
+
+
+class ListSet(DeviceList):
     """
     This is a class that behaves like a list except for the query "in" where it behaves like a set O(1)
     """
@@ -264,6 +264,68 @@ class SolverType(Enum):
             return s
 
 
+class JacobianReusePolicy(Enum):
+    """
+    When the Newton-Raphson methods refresh the Jacobian factorization
+    """
+    Always = 'Always'
+    EveryK = 'Every k iterations'
+    ReductionRatio = 'Error reduction ratio'
+
+    def __str__(self) -> str:
+        """
+
+        :return:
+        """
+        return str(self.value)
+
+    def __repr__(self):
+        return str(self)
+
+    @staticmethod
+    def argparse(s):
+        """
+
+        :param s:
+        :return:
+        """
+        try:
+            return JacobianReusePolicy[s]
+        except KeyError:
+            return s
+
+
+class IslandSolvingMode(Enum):
+    """
+    How the power flow solves the islands of a grid
+    """
+    Serial = 'Serial'
+    Threads = 'Thread pool'
+    Processes = 'Process pool'
+
+    def __str__(self) -> str:
+        """
+
+        :return:
+        """
+        return str(self.value)
+
+    def __repr__(self):
+        return str(self)
+
+    @staticmethod
+    def argparse(s):
+        """
+
+        :param s:
+        :return:
+        """
+        try:
+            return IslandSolvingMode[s]
+        except KeyError:
+            return s
+
+
 class SyncIssueType(Enum):
     """
     Sync issues enumeration
@@ -1445,6 +1507,7 @@ class SparseSolver(Enum):
     SuperLU = 'SuperLU'
     Pardiso = 'Pardiso'
     GMRES = 'GMRES'
+    BiCGSTAB = 'BiCGSTAB'
     UMFPACK = 'UmfPack'
     UMFPACKTriangular = 'UmfPackTriangular'
 
@@ -1462,7 +1525,7 @@ class SparseSolver(Enum):
         :return:
         """
         try:
-            return CGMESVersions[s]
+            return SparseSolver[s]
         except KeyError:
             return s
 
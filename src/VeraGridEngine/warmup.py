@@ -0,0 +1,113 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+"""
+Warm-up of the numba kernels of the engine
+
+The jitted functions are compiled on their first call, and saved to the numba cache
+(the __pycache__ folders, or NUMBA_CACHE_DIR if set), so that the next processes only load them.
+Running warm_up() once after installing (or updating) VeraGridEngine moves that compilation
+out of the first simulation:
+
+    python -m VeraGridEngine.warmup
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, Sequence
+from VeraGridEngine.Devices.multi_circuit import MultiCircuit
+from VeraGridEngine.Devices import Bus, Generator, Load, Line, Transformer2W
+from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
+from VeraGridEngine.Simulations.PowerFlow.power_flow_driver import PowerFlowDriver
+from VeraGridEngine.enumerations import SolverType, TapPhaseControl
+
+# power flow solvers compiled by warm_up
+WARM_UP_SOLVERS = (SolverType.NR,
+                   SolverType.IWAMOTO,
+                   SolverType.LM,
+                   SolverType.PowellDogLeg,
+                   SolverType.FASTDECOUPLED,
+                   SolverType.HELM,
+                   SolverType.GAUSS,
+                   SolverType.Linear,
+                   SolverType.LACPF)
+
+# solvers of the generalized formulation, used by the grids with controls
+GENERALIZED_SOLVERS = (SolverType.NR,
+                       SolverType.LM,
+                       SolverType.PowellDogLeg,
+                       SolverType.Linear)
+
+
+def get_warm_up_grid(controlled: bool = False) -> MultiCircuit:
+    """
+    Get the small grid used to compile the kernels
+    :param controlled: add a phase shifter that controls the power flow (this uses the generalized formulation)
+    :return: MultiCircuit
+    """
+    grid = MultiCircuit(name='warm-up')
+
+    bus1 = Bus('Bus 1', Vnom=20)
+    bus2 = Bus('Bus 2', Vnom=20)
+    bus3 = Bus('Bus 3', Vnom=20)
+    bus4 = Bus('Bus 4', Vnom=20)
+    for bus in (bus1, bus2, bus3, bus4):
+        grid.add_bus(bus)
+
+    grid.add_generator(bus1, Generator('Slack generator', vset=1.0))
+    grid.add_generator(bus2, Generator('Generator 2', P=20, vset=1.01))
+    grid.add_load(bus3, Load('Load 3', P=40, Q=20))
+    grid.add_load(bus4, Load('Load 4', P=25, Q=10))
+
+    grid.add_line(Line(bus1, bus2, name='Line 1-2', r=0.05, x=0.11, b=0.02))
+    grid.add_line(Line(bus1, bus3, name='Line 1-3', r=0.05, x=0.11, b=0.02))
+    grid.add_line(Line(bus2, bus3, name='Line 2-3', r=0.04, x=0.09, b=0.02))
+
+    grid.add_line(Line(bus3, bus4, name='Line 3-4', r=0.06, x=0.13, b=0.03))
+
+    if controlled:
+        grid.add_transformer2w(Transformer2W(bus2, bus4, name='Transformer 2-4', r=0.001, x=0.05,
+                                             tap_phase_control_mode=TapPhaseControl.Pf, Pset=10))
+
+    return grid
+
+
+def warm_up(solvers: Sequence[SolverType] = WARM_UP_SOLVERS, verbose: bool = False) -> Dict[str, float]:
+    """
+    Compile (or load from the numba cache) the kernels used by the power flow solvers,
+    running every solver on a small grid, and the solvers of the generalized formulation
+    on the same grid with a controlled transformer
+    :param solvers: solvers to warm up
+    :param verbose: print the time of every run
+    :return: dictionary "solver (grid)": seconds
+    """
+    times = dict()
+
+    for controlled in (False, True):
+
+        grid = get_warm_up_grid(controlled=controlled)
+
+        for solver_type in solvers:
+
+            if controlled and solver_type not in GENERALIZED_SOLVERS:
+                continue
+
+            tic = time.perf_counter()
+            driver = PowerFlowDriver(grid=grid,
+                                     options=PowerFlowOptions(solver_type=solver_type,
+                                                              retry_with_other_methods=False))
+            driver.run()
+            key = f"{solver_type.value} ({'controlled' if controlled else 'basic'})"
+            times[key] = time.perf_counter() - tic
+
+            if verbose:
+                print(f"{key}: {times[key]:.3f} s")
+
+    return times
+
+
+if __name__ == '__main__':
+    t0 = time.perf_counter()
+    warm_up(verbose=True)
+    print(f"Warm-up done in {time.perf_counter() - t0:.1f} s")
@@ -0,0 +1,80 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+import numpy as np
+import pytest
+
+import VeraGridEngine.Devices as dev
+from VeraGridEngine.IO.file_handler import FileOpen
+
+
+def test_index_registry_invalidation():
+    """
+    The cached device arrays and dictionaries must follow the changes of the grid
+    """
+    fname = os.path.join('data', 'grids', 'IEEE14 - multi-island hvdc.gridcal')
+    grid = FileOpen(fname).open()
+
+    def check():
+        branches = [elm for lst in grid.get_branch_lists(add_vsc=True, add_hvdc=True) for elm in lst]
+        assert grid.get_branches(add_vsc=True, add_hvdc=True, add_switch=False) == branches
+        assert np.array_equal(grid.get_branch_names(), np.array([elm.name for elm in branches]))
+        assert grid.get_branches_dict() == {elm.idtag: i for i, elm in enumerate(branches)}
+        assert grid.get_branches_index_dict() == {elm: i for i, elm in enumerate(branches)}
+        assert np.array_equal(grid.get_bus_names(), np.array([elm.name for elm in grid.buses]))
+        assert grid.get_bus_index_dict() == {elm: i for i, elm in enumerate(grid.buses)}
+
+    check()
+
+    # the device lists are copies, the index arrays and dictionaries are shared and read-only
+    grid.get_branches().clear()
+    assert grid.get_bus_index_dict() is grid.get_bus_index_dict()
+    assert grid.get_branch_names() is grid.get_branch_names()
+    with pytest.raises(TypeError):
+        grid.get_bus_index_dict().clear()
+    with pytest.raises(ValueError):
+        grid.get_bus_names()[0] = "x"
+    check()
+
+    # add / delete methods
+    b1 = grid.add_bus(dev.Bus(name="new bus 1"))
+    b2 = grid.add_bus(dev.Bus(name="new bus 2"))
+    line = grid.add_line(dev.Line(bus_from=b1, bus_to=b2, name="new line"))
+    check()
+
+    grid.delete_branch(line)
+    grid.delete_bus(b2)
+    check()
+
+    # direct modification of the lists
+    grid.lines.append(dev.Line(bus_from=b1, bus_to=grid.buses[0], name="appended line"))
+    check()
+
+    grid.lines.pop(0)
+    grid.lines.append(dev.Line(bus_from=b1, bus_to=grid.buses[1], name="appended line 2"))
+    check()
+
+    grid.lines = grid.lines[::-1]
+    check()
+
+    # renaming
+    grid.lines[0].name = "renamed line"
+    grid.buses[0].name = "renamed bus"
+    check()
+
+    # in place replacement keeping the length of the list
+    grid.lines[0] = dev.Line(bus_from=b1, bus_to=grid.buses[2], name="replaced line")
+    check()
+
+    # re-ordering
+    grid.buses.sort(key=lambda elm: elm.name)
+    check()
+
+    # the switches are included by default, like in get_branches and get_branch_number
+    assert len(grid.get_branch_idtags()) == len(grid.get_branches(add_vsc=True, add_hvdc=True))
+
+
+if __name__ == '__main__':
+    test_index_registry_invalidation()
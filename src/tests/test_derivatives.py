@@ -562,6 +562,57 @@ def test_jacobian():
     assert ok
 
 
+def test_jacobian_structure_reuse():
+    """
+    The Jacobian that keeps its structure must be the same as the one computed from scratch
+    """
+    fname = os.path.join("data", "grids", "RAW", "IEEE 14 bus.raw")
+    grid = gce.open_file(filename=fname)
+    nc = gce.compile_numerical_circuit_at(grid)
+
+    adm = nc.get_admittance_matrices()
+    idx = nc.get_simulation_indices()
+
+    idx_dtheta = np.r_[idx.pv, idx.pq, idx.pqv, idx.p]
+    idx_dVm = np.r_[idx.pq, idx.p]
+    idx_dQ = np.r_[idx.pq, idx.pqv]
+
+    jac = cscjac.JacobianVc()
+    V = nc.bus_data.Vbus.copy()
+
+    for it in range(3):
+        J1 = mdiff.Jacobian(adm.Ybus, V, idx_dtheta, idx_dQ, idx_dtheta, idx_dVm)
+        J2 = jac.compute(adm.Ybus, V, idx_dtheta, idx_dVm, idx_dtheta, idx_dQ)
+        assert np.allclose(J1.toarray(), J2.toarray())
+        V = V * polar_to_rect(np.ones(nc.nbus), np.full(nc.nbus, 0.01))
+        V[idx.pq] *= 0.99
+
+    # change of indices: pv buses become pq, one at a time, and are appended to the unknowns
+    # (see PfBasicFormulation.switch_pv_to_pq), the structure is extended keeping its entries
+    cscjac._J_VC_PATTERNS.clear()
+    for bus in idx.pv[:2]:
+        indptr0 = jac.J.indptr.copy()
+        src0 = jac.src.copy()
+
+        idx_dVm = np.r_[idx_dVm, bus]
+        idx_dQ = np.r_[idx_dQ, bus]
+        J1 = mdiff.Jacobian(adm.Ybus, V, idx_dtheta, idx_dQ, idx_dtheta, idx_dVm)
+        J2 = jac.compute(adm.Ybus, V, idx_dtheta, idx_dVm, idx_dtheta, idx_dQ)
+        assert np.allclose(J1.toarray(), J2.toarray())
+
+        for c in range(len(indptr0) - 1):
+            n = indptr0[c + 1] - indptr0[c]
+            assert np.array_equal(jac.src[J2.indptr[c]:J2.indptr[c] + n], src0[indptr0[c]:indptr0[c + 1]])
+
+    # any other change of indices computes the structure again
+    pq = np.r_[idx.pv[0], idx.pq]
+    idx_dVm = np.r_[pq, idx.p]
+    idx_dQ = np.r_[pq, idx.pqv]
+    J1 = mdiff.Jacobian(adm.Ybus, V, idx_dtheta, idx_dQ, idx_dtheta, idx_dVm)
+    J2 = jac.compute(adm.Ybus, V, idx_dtheta, idx_dVm, idx_dtheta, idx_dQ)
+    assert np.allclose(J1.toarray(), J2.toarray())
+
+
 if __name__ == '__main__':
     # test_branch_derivatives()
     test_tau_derivatives()
@@ -0,0 +1,71 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+
+from VeraGridEngine.IO.file_handler import FileOpen
+
+
+def test_fingerprint():
+    """
+    The fingerprint must be stable for the same data and change when the data changes
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    grid2 = FileOpen(fname).open()
+
+    # same data, same fingerprint
+    fp = grid.fingerprint()
+    assert fp == grid2.fingerprint()
+    assert grid.get_fingerprints_by_category() == grid2.get_fingerprints_by_category()
+    assert grid.fingerprint() == fp  # the cached values give the same result
+
+    # snapshot changes
+    assert not grid.lines[0].is_dirty()
+    grid.lines[0].R *= 2.0
+    assert grid.lines[0].is_dirty()
+    assert grid.fingerprint(include_profiles=False) != grid2.fingerprint(include_profiles=False)
+    changed = [key for key, val in grid.get_fingerprints_by_category().items()
+               if val != grid2.get_fingerprints_by_category()[key]]
+    assert changed == [grid.lines[0].device_type.value]
+
+    grid.lines[0].R /= 2.0
+    assert grid.fingerprint() == fp
+
+    # the descriptive fields are not part of the fingerprint
+    grid.lines[0].name = "renamed line"
+    grid.buses[0].name = "renamed bus"
+    grid.buses[0].comment = "some comment"
+    assert not grid.lines[0].is_dirty()
+    assert grid.fingerprint() == fp
+
+    # profile changes only affect the time windows that contain them
+    grid.loads[0].P_prof[3] = grid.loads[0].P_prof[3] + 1.0
+    assert grid.fingerprint() != fp
+    assert grid.fingerprint(t_from=0, t_to=3) == grid2.fingerprint(t_from=0, t_to=3)
+    assert grid.fingerprint(t_from=3, t_to=4) != grid2.fingerprint(t_from=3, t_to=4)
+    assert grid.fingerprint(include_profiles=False) == grid2.fingerprint(include_profiles=False)
+
+    # replacing a profile object goes through the profile setter, that marks the device as changed
+    fp = grid.fingerprint()
+    prof = grid.loads[1].P_prof.copy()
+    prof[0] = prof[0] + 1.0
+    grid.loads[1].P_prof = prof
+    assert grid.loads[1].is_dirty()
+    assert grid.fingerprint() != fp
+
+    # sub-objects are checked on every call
+    fname = os.path.join('data', 'grids', 'IEEE14 - multi-island hvdc.gridcal')
+    grid3 = FileOpen(fname).open()
+    fp = grid3.fingerprint()
+    tr = grid3.transformers2w[0]
+    tr.tap_changer.tap_position = tr.tap_changer.tap_position + 1
+    assert not tr.is_dirty()
+    assert grid3.fingerprint() != fp
+    tr.tap_changer.tap_position = tr.tap_changer.tap_position - 1
+    assert grid3.fingerprint() == fp
+
+
+if __name__ == '__main__':
+    test_fingerprint()
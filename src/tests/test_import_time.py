@@ -0,0 +1,125 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+import sys
+import json
+import subprocess
+
+import VeraGridEngine
+from VeraGridEngine.Utils.lazy_import import lazy_import
+from VeraGridEngine.IO.cim.cgmes.cgmes_circuit import CgmesCircuit
+from VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts import run_linear_opf_ts
+
+# modules that are only imported by the functions that use them
+DEFERRED_MODULES = ('matplotlib',
+                    'matplotlib.pyplot',
+                    'networkx',
+                    'sklearn',
+                    'rdflib',
+                    'pyproj',
+                    'pymoo',
+                    'requests',
+                    'scipy.optimize',
+                    'pulp',
+                    'VeraGridEngine.Utils.MIP.pulp_interface',
+                    'VeraGridEngine.Simulations.OPF.Formulations.linear_opf_ts',
+                    'VeraGridEngine.Simulations.NTC.ntc_opf',
+                    'VeraGridEngine.Compilers.circuit_to_bentayga',
+                    'VeraGridEngine.Compilers.circuit_to_newton_pa',
+                    'VeraGridEngine.Compilers.circuit_to_pgm',
+                    'VeraGridEngine.Compilers.circuit_to_gslv',
+                    'VeraGridEngine.IO.cim.cgmes.cgmes_circuit',
+                    'VeraGridEngine.IO.cim.cgmes.cgmes_data_parser',
+                    'VeraGridEngine.IO.cim.cim16.cim_parser',
+                    'VeraGridEngine.IO.raw',
+                    'VeraGridEngine.IO.ucte',
+                    'VeraGridEngine.IO.matpower',
+                    'VeraGridEngine.IO.others')
+
+# the only CIM modules imported with the API (the profile enumeration is used by the saving options)
+EAGER_CIM_MODULES = ('VeraGridEngine.IO.cim',
+                     'VeraGridEngine.IO.cim.cgmes',
+                     'VeraGridEngine.IO.cim.cgmes.cgmes_enums',
+                     'VeraGridEngine.IO.cim.cim16')
+
+IMPORT_SCRIPT = """
+import sys
+import time
+import json
+t0 = time.perf_counter()
+import VeraGridEngine.api
+t1 = time.perf_counter()
+print(json.dumps({'time': t1 - t0, 'modules': sorted(sys.modules.keys())}))
+"""
+
+
+def test_lazy_import():
+    """
+    Check that the lazy modules are imported on first use
+    """
+    mod = lazy_import('json')
+    assert mod is sys.modules['json']  # already imported: the module itself
+
+    mod = lazy_import('xml.dom.pulldom')
+    assert mod.START_ELEMENT == 'START_ELEMENT'
+    assert mod.parseString is sys.modules['xml.dom.pulldom'].parseString
+
+    try:
+        lazy_import('this_module_does_not_exist.at_all')
+        raise AssertionError('The missing modules must raise on lazy_import')
+    except ModuleNotFoundError:
+        pass
+
+
+def test_lazy_attributes():
+    """
+    Check that the lazy attributes are still reachable from the API
+    """
+    import VeraGridEngine.api as gce
+
+    assert gce.CgmesCircuit is CgmesCircuit
+    assert VeraGridEngine.CgmesCircuit is CgmesCircuit
+    assert gce.run_linear_opf_ts is run_linear_opf_ts
+    assert 'CgmesCircuit' in vars(gce)  # cached after the first access
+
+    # the star import exports the lazy attributes too
+    assert 'CgmesDataParser' in dir(gce)
+    namespace = dict()
+    exec('from VeraGridEngine.api import *', namespace)
+    for name in gce.API_LAZY_ATTRIBUTES.keys():
+        assert name in namespace, name
+    assert namespace['CgmesCircuit'] is CgmesCircuit
+    assert namespace['open_file'] is gce.open_file
+
+    try:
+        _ = gce.this_attribute_does_not_exist
+        raise AssertionError('The unknown attributes must raise AttributeError')
+    except AttributeError:
+        pass
+
+
+def test_import_time():
+    """
+    Importing the API must not import the heavy modules that only some functions use
+    """
+    src_path = os.path.dirname(os.path.dirname(os.path.abspath(VeraGridEngine.__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([src_path] + [p for p in [env.get('PYTHONPATH', '')] if p])
+
+    process = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], capture_output=True, text=True, env=env)
+    assert process.returncode == 0, process.stderr
+
+    stats = json.loads(process.stdout.strip().splitlines()[-1])
+    print(f"import VeraGridEngine.api: {stats['time']:.3f} s")
+
+    imported = [m for m in DEFERRED_MODULES if m in stats['modules']]
+    assert len(imported) == 0, imported
+
+    cim_modules = [m for m in stats['modules']
+                   if m.startswith('VeraGridEngine.IO.cim') and m not in EAGER_CIM_MODULES]
+    assert len(cim_modules) == 0, cim_modules
+
+    # generous bound, this was above 2 s with the eager imports
+    assert stats['time'] < 5.0
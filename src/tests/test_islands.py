@@ -7,12 +7,13 @@ import pandas as pd
 import numpy as np
 
 from VeraGridEngine.IO.file_handler import FileOpen
-from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import PowerFlowOptions
+from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import PowerFlowOptions, multi_island_pf_nc, IslandPool
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import SolverType
 from VeraGridEngine.Simulations.PowerFlow.power_flow_driver import PowerFlowDriver
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
 from VeraGridEngine.Topology.topology import find_islands
 from VeraGridEngine.api import FileOpen
+from VeraGridEngine.enumerations import IslandSolvingMode
 
 
 def test_ieee14_islands():
@@ -139,5 +140,108 @@ def test_islands():
             assert (computed_indices == expected_indices).all()
 
 
+def test_lazy_island_slices():
+    """
+    The island structures gather the arrays on first access, without modifying the parent structures
+    """
+    fname = os.path.join('data', 'grids', 'IEEE14 - multi-island hvdc.gridcal')
+    main_circuit = FileOpen(fname).open()
+    nc = compile_numerical_circuit_at(main_circuit, t_idx=None)
+
+    islands = nc.split_into_islands()
+    assert len(islands) == 2
+
+    for island in islands:
+        bus_idx = island.bus_data.original_idx
+        br_idx = island.passive_branch_data.original_idx
+
+        # nothing is gathered until accessed
+        assert island.passive_branch_data.is_lazy()
+        assert 'R' not in vars(island.passive_branch_data)
+        assert np.array_equal(island.passive_branch_data.R, nc.passive_branch_data.R[br_idx])
+        assert 'R' in vars(island.passive_branch_data)
+
+        assert np.array_equal(island.bus_data.Vbus, nc.bus_data.Vbus[bus_idx])
+        assert np.array_equal(island.passive_branch_data.Yff3,
+                              nc.passive_branch_data.Yff3[((br_idx * 3)[:, np.newaxis] + np.arange(3)).flatten()])
+
+        # the bus indices are re-mapped to the island
+        bus_map = np.full(nc.nbus, -1, dtype=int)
+        bus_map[bus_idx] = np.arange(len(bus_idx))
+        assert np.array_equal(island.passive_branch_data.F, bus_map[nc.passive_branch_data.F[br_idx]])
+        assert np.array_equal(island.load_data.bus_idx,
+                              bus_map[nc.load_data.bus_idx[island.load_data.original_idx]])
+
+        # writing on the island does not modify the parent
+        island.bus_data.Vbus[:] = 0.0
+        assert np.all(nc.bus_data.Vbus[bus_idx] != 0.0)
+
+        island.passive_branch_data.materialize()
+        assert not island.passive_branch_data.is_lazy()
+        assert np.array_equal(island.passive_branch_data.X, nc.passive_branch_data.X[br_idx])
+
+    # single island: every element is taken in order, the arrays are copies
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    nc = compile_numerical_circuit_at(FileOpen(fname).open(), t_idx=None)
+    islands = nc.split_into_islands()
+    assert len(islands) == 1
+    island = islands[0]
+    assert np.array_equal(island.passive_branch_data.R, nc.passive_branch_data.R)
+    assert island.passive_branch_data.R is not nc.passive_branch_data.R
+
+
+def test_parallel_island_solving():
+    """
+    Solving the islands in a pool of threads or processes gives the same results as solving them serially
+    """
+    for fname in [os.path.join('data', 'grids', '8_nodes_2_islands.gridcal'),
+                  os.path.join('data', 'grids', 'IEEE 39 (2 islands).gridcal')]:
+        nc = compile_numerical_circuit_at(FileOpen(fname).open(), t_idx=None)
+
+        results = dict()
+        for mode in IslandSolvingMode:
+            options = PowerFlowOptions(SolverType.NR,
+                                       retry_with_other_methods=False,
+                                       island_solving_mode=mode,
+                                       island_workers=2)
+            results[mode] = multi_island_pf_nc(nc=nc, options=options)
+
+        base = results[IslandSolvingMode.Serial]
+        assert base.converged
+        assert len(base.convergence_reports) > 1
+
+        for mode in [IslandSolvingMode.Threads, IslandSolvingMode.Processes]:
+            assert results[mode].converged == base.converged
+            assert len(results[mode].convergence_reports) == len(base.convergence_reports)
+            assert np.allclose(results[mode].voltage, base.voltage)
+            assert np.allclose(results[mode].Sf, base.Sf)
+            assert np.allclose(results[mode].loading, base.loading)
+
+
+def test_island_pool_reuse():
+    """
+    The power flows run inside an IslandPool reuse its workers, and give the same results
+    """
+    fname = os.path.join('data', 'grids', 'IEEE 39 (2 islands).gridcal')
+    nc = compile_numerical_circuit_at(FileOpen(fname).open(), t_idx=None)
+
+    base = multi_island_pf_nc(nc=nc, options=PowerFlowOptions(SolverType.NR, retry_with_other_methods=False))
+
+    for mode in [IslandSolvingMode.Threads, IslandSolvingMode.Processes]:
+        options = PowerFlowOptions(SolverType.NR,
+                                   retry_with_other_methods=False,
+                                   island_solving_mode=mode,
+                                   island_workers=2)
+
+        with IslandPool(options=options) as pool:
+            executor = pool.executor
+            for _ in range(3):
+                res = multi_island_pf_nc(nc=nc, options=options)
+                assert pool.executor is executor
+                assert np.allclose(res.voltage, base.voltage)
+
+        assert pool.executor is None
+
+
 if __name__ == '__main__':
     test_ieee14_islands()
@@ -7,6 +7,7 @@ import os
 import numpy as np
 
 from VeraGridEngine.api import *
+import VeraGridEngine.Simulations.PowerFlow.power_flow_worker as pf_worker
 
 
 def test_monte_carlo():
@@ -23,5 +24,31 @@ def test_monte_carlo():
     mc_sim.run()
 
 
+def test_batch_power_flow():
+    """
+    The batched power flow must give the same results as solving the scenarios one by one
+    """
+    for fname, control_q in [('IEEE39_1W.gridcal', False),
+                             ('case89pegase.m', True)]:
+        grid = FileOpen(os.path.join('data', 'grids', fname)).open()
+        nc = compile_numerical_circuit_at(grid)
+        options = PowerFlowOptions(SolverType.NR, control_q=control_q)
+
+        rng = np.random.default_rng(0)
+        S = nc.get_power_injections_pu()
+        S_scenarios = S[np.newaxis, :] * rng.uniform(0.95, 1.05, (20, nc.nbus))
+
+        results = pf_worker.multi_island_pf_nc_batch(nc=nc, options=options, Sbus_input=S_scenarios)
+
+        assert len(results) == S_scenarios.shape[0]
+        for k, res in enumerate(results):
+            res_k = pf_worker.multi_island_pf_nc(nc=nc, options=options, Sbus_input=S_scenarios[k, :])
+            assert res.converged == res_k.converged
+            assert np.allclose(res.voltage, res_k.voltage, atol=1e-8)
+            assert np.allclose(res.Sf, res_k.Sf, atol=1e-6)
+            assert np.allclose(res.gen_q, res_k.gen_q, atol=1e-6)
+
+
 if __name__ == '__main__':
     test_monte_carlo()
+    test_batch_power_flow()
@@ -0,0 +1,269 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+import numpy as np
+from VeraGridEngine.api import *
+import VeraGridEngine.Simulations.PowerFlow.power_flow_worker as pf_worker
+from VeraGridEngine.Simulations.OPF.ac_opf_worker import run_nonlinear_opf
+
+
+def compare_numerical_circuits(nc1: NumericalCircuit, nc2: NumericalCircuit) -> None:
+    """
+    Assert that all the numerical arrays of two circuits are equal
+    :param nc1: NumericalCircuit
+    :param nc2: NumericalCircuit
+    """
+    for struct_name in ['bus_data', 'passive_branch_data', 'active_branch_data', 'hvdc_data', 'vsc_data',
+                        'load_data', 'battery_data', 'generator_data', 'shunt_data']:
+        struct1 = getattr(nc1, struct_name)
+        struct2 = getattr(nc2, struct_name)
+        for key, val1 in vars(struct1).items():
+            if isinstance(val1, np.ndarray) and val1.dtype != object:
+                val2 = getattr(struct2, key)
+                assert np.allclose(val1, val2), f"{struct_name}.{key} differs at t={nc1.t_idx}"
+
+
+def test_compile_ts_equals_compile_at():
+    """
+    Check that the time-batched compilation gives the same circuits as the step by step compilation
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+
+    # add some structural changes
+    for t in range(10, 20):
+        grid.lines[3].active_prof[t] = False
+    for t in range(15, 30):
+        grid.generators[2].active_prof[t] = False
+    for t in range(40, 50):
+        grid.loads[5].active_prof[t] = False
+
+    time_indices = np.arange(60)
+    nc_ts = compile_numerical_circuit_ts(grid, time_indices=time_indices)
+
+    assert nc_ts.n_states == 5
+
+    for t in time_indices:
+        nc1 = nc_ts.get_at(t)
+        nc2 = compile_numerical_circuit_at(grid, t_idx=t)
+        compare_numerical_circuits(nc1, nc2)
+
+
+def test_numerical_circuit_ts_update():
+    """
+    Check that updating a circuit in-place gives the same circuit as compiling it
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(3, 6):
+        grid.lines[3].active_prof[t] = False
+
+    nc_ts = compile_numerical_circuit_ts(grid, time_indices=np.arange(10))
+    nc = nc_ts.get_at(0)
+    for t in range(1, 10):
+        nc_ts.update(nc=nc, t_idx=t)
+        compare_numerical_circuits(nc, compile_numerical_circuit_at(grid, t_idx=t))
+
+
+def test_nonlinear_opf_ts_circuits():
+    """
+    Check that the AC OPF on the circuits of the time-batched compilation
+    gives the same results as compiling every time step
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(2, 4):
+        grid.lines[3].active_prof[t] = False
+
+    opf_options = OptimalPowerFlowOptions(solver=SolverType.NONLINEAR_OPF, ips_tolerance=1e-8)
+    time_indices = np.arange(5)
+    nc_ts = compile_numerical_circuit_ts(grid, time_indices=time_indices)
+
+    for t in time_indices:
+        res1 = run_nonlinear_opf(grid=grid, opf_options=opf_options, t_idx=t, nc=nc_ts.get_at(t))
+        res2 = run_nonlinear_opf(grid=grid, opf_options=opf_options, t_idx=t)
+        assert np.allclose(res1.V, res2.V)
+        assert np.allclose(res1.Pg, res2.Pg)
+
+
+def test_power_flow_ts_equals_step_by_step():
+    """
+    Check that the time series power flow (that uses the time-batched compilation)
+    gives the same results as running the power flow step by step
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+
+    time_indices = np.arange(24)
+    options = PowerFlowOptions(solver_type=SolverType.NR, retry_with_other_methods=False)
+    driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+    driver.run()
+
+    for it, t in enumerate(time_indices):
+        res = pf_worker.multi_island_pf(multi_circuit=grid, options=options, t=t)
+        assert np.allclose(driver.results.voltage[it, :], res.voltage)
+        assert np.allclose(driver.results.Sf[it, :], res.Sf)
+
+
+def test_power_flow_ts_grouped():
+    """
+    Check that the time series power flow grouped by topology with warm starts
+    gives the same results as the step by step time series
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+    for t in range(8, 20):
+        grid.generators[2].active_prof[t] = False
+
+    time_indices = np.arange(24)
+    results = list()
+    for grouped in [False, True]:
+        options = PowerFlowOptions(solver_type=SolverType.NR, grouped_time_series=grouped)
+        driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+        driver.run()
+        results.append(driver.results)
+
+    assert results[1].converged_values.all()
+    assert np.allclose(results[0].voltage, results[1].voltage, atol=1e-8)
+    assert np.allclose(results[0].Sf, results[1].Sf, atol=1e-6)
+    assert np.allclose(results[0].losses, results[1].losses, atol=1e-6)
+
+
+def test_power_flow_ts_grouped_branch_results():
+    """
+    Check that the branch results computed for all the time steps at once from the voltages
+    match the ones of the step by step time series, with varying taps, rates and topology
+    """
+    fname = os.path.join('data', 'grids', 'IEEE 14 zip costs.gridcal')
+    grid = FileOpen(fname).open()
+    grid.create_profiles(steps=24, step_length=1, step_unit='h')
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+    for t in range(12, 18):
+        grid.transformers2w[0].tap_module_prof[t] = 1.02
+    for t in range(24):
+        grid.lines[0].rate_prof[t] = 100.0 + t
+
+    time_indices = np.arange(24)
+    results = list()
+    for grouped, n_workers in [(False, 1), (True, 1), (True, 2)]:
+        options = PowerFlowOptions(solver_type=SolverType.NR, grouped_time_series=grouped, n_workers=n_workers)
+        driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+        driver.run()
+        results.append(driver.results)
+
+    nc = compile_numerical_circuit_at(grid, t_idx=None)
+    F = nc.passive_branch_data.F
+    T = nc.passive_branch_data.T
+
+    for res in results[1:]:
+        assert res.converged_values.all()
+        assert np.allclose(results[0].voltage, res.voltage, atol=1e-8)
+        for name in ['Sf', 'St', 'losses']:
+            assert np.allclose(getattr(results[0], name), getattr(res, name), atol=1e-6), name
+        for name in ['If', 'It', 'loading']:
+            assert np.allclose(getattr(results[0], name), getattr(res, name), atol=1e-8), name
+
+        # the branch results of the inactive line are zero
+        Vbranch = res.voltage[:, F] - res.voltage[:, T]
+        Vbranch[5:10, 3] = 0.0
+        assert np.allclose(res.Vbranch, Vbranch)
+        assert np.allclose(res.Sf[5:10, 3], 0.0)
+
+
+def test_power_flow_without_branch_results():
+    """
+    Check that the power flow that skips the branch results gives the same voltages and powers
+    """
+    fname = os.path.join('data', 'grids', 'IEEE 14 zip costs.gridcal')
+    grid = FileOpen(fname).open()
+    nc = compile_numerical_circuit_at(grid, t_idx=None)
+
+    for solver_type in [SolverType.NR, SolverType.FASTDECOUPLED, SolverType.IWAMOTO, SolverType.LACPF]:
+        options = PowerFlowOptions(solver_type=solver_type, retry_with_other_methods=False)
+        res = pf_worker.multi_island_pf_nc(nc=nc, options=options)
+        res2 = pf_worker.multi_island_pf_nc(nc=nc, options=options, branch_results=False)
+
+        assert np.allclose(res.voltage, res2.voltage), solver_type
+        assert np.allclose(res.Sbus, res2.Sbus), solver_type
+        assert np.allclose(res2.Sf, 0.0), solver_type
+        assert not np.allclose(res.Sf, 0.0), solver_type
+
+
+def test_power_flow_ts_multi_process():
+    """
+    Check that the time series power flow run in a pool of processes gives
+    the same results as the single process run, and that it is deterministic
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+
+    time_indices = np.arange(24)
+    results = list()
+    for n_workers in [1, 2, 2]:
+        options = PowerFlowOptions(solver_type=SolverType.NR, n_workers=n_workers)
+        driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+        driver.run()
+        results.append(driver.results)
+
+    assert results[1].converged_values.all()
+    assert np.allclose(results[0].voltage, results[1].voltage, atol=1e-8)
+    assert np.allclose(results[0].Sf, results[1].Sf, atol=1e-6)
+    assert np.allclose(results[0].loading, results[1].loading, atol=1e-8)
+    assert np.array_equal(results[1].voltage, results[2].voltage)
+    assert np.array_equal(results[1].Sf, results[2].Sf)
+
+
+def test_power_flow_ts_linear_block():
+    """
+    Check that the linear time series power flow solved in blocks of time steps
+    gives the same results as running the linear power flow step by step
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+    for t in range(8, 20):
+        grid.generators[2].active_prof[t] = False
+
+    time_indices = np.arange(24)
+    options = PowerFlowOptions(solver_type=SolverType.Linear, grouped_time_series=True)
+    driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+    driver.run()
+
+    assert driver.results.converged_values.all()
+    assert np.abs(driver.results.If).max() > 0
+    for it, t in enumerate(time_indices):
+        res = pf_worker.multi_island_pf(multi_circuit=grid, options=options, t=t)
+        assert np.allclose(driver.results.voltage[it, :], res.voltage)
+        assert np.allclose(driver.results.Sf[it, :], res.Sf)
+        assert np.allclose(driver.results.S[it, :], res.Sbus)
+        assert np.allclose(driver.results.If[it, :], res.If)
+        assert np.allclose(driver.results.It[it, :], res.It)
+        assert np.allclose(driver.results.loading[it, :], res.loading)
+        assert np.isclose(driver.results.error_values[it], res.error)
+
+        # the step by step results do not keep Vbranch, so it is checked against the voltages
+        nc = compile_numerical_circuit_at(grid, t_idx=t)
+        active = nc.passive_branch_data.active.astype(bool)
+        Vbranch = res.voltage[nc.passive_branch_data.F] - res.voltage[nc.passive_branch_data.T]
+        assert np.allclose(driver.results.Vbranch[it, active], Vbranch[active])
+
+
+if __name__ == '__main__':
+    test_compile_ts_equals_compile_at()
+    test_numerical_circuit_ts_update()
+    test_nonlinear_opf_ts_circuits()
+    test_power_flow_ts_equals_step_by_step()
+    test_power_flow_ts_grouped()
+    test_power_flow_ts_grouped_branch_results()
+    test_power_flow_ts_multi_process()
+    test_power_flow_ts_linear_block()
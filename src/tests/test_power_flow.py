@@ -10,6 +10,7 @@ import numpy as np
 from VeraGridEngine.IO.file_handler import FileOpen
 from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import PowerFlowOptions, multi_island_pf_nc
 from VeraGridEngine.Simulations.PowerFlow.power_flow_options import SolverType
+from VeraGridEngine.enumerations import JacobianReusePolicy, SparseSolver
 from VeraGridEngine.Simulations.PowerFlow.power_flow_driver import PowerFlowDriver
 from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
 import VeraGridEngine.api as gce
@@ -628,6 +629,123 @@ def test_hvdc_all_methods() -> None:
         assert np.isclose(abs(res.voltage[1]), 1.02222, atol=1e-4)
 
 
+def test_jacobian_reuse_policies() -> None:
+    """
+    Check that the chord Newton-Raphson policies reach the same solution as the regular
+    Newton-Raphson with fewer Jacobian factorizations, with and without branch controls
+    """
+    SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+    for fname, control_taps_modules in [('IEEE39_1W.gridcal', False), ('5Bus_LTC_FACTS_Fig4.7.gridcal', True)]:
+        grid = gce.open_file(os.path.join(SCRIPT_DIR, 'data', 'grids', fname))
+
+        results = dict()
+        for policy in JacobianReusePolicy:
+            options = PowerFlowOptions(SolverType.NR,
+                                       control_q=False,
+                                       retry_with_other_methods=False,
+                                       control_taps_modules=control_taps_modules,
+                                       control_taps_phase=False,
+                                       control_remote_voltage=False,
+                                       max_iter=50,
+                                       tolerance=1e-8,
+                                       jacobian_reuse_policy=policy)
+            results[policy] = gce.power_flow(grid, options)
+            assert results[policy].converged
+
+        base = results[JacobianReusePolicy.Always]
+        assert base.factorizations == base.iterations
+
+        for policy in [JacobianReusePolicy.EveryK, JacobianReusePolicy.ReductionRatio]:
+            assert results[policy].factorizations < base.factorizations
+            assert np.allclose(results[policy].voltage, base.voltage, atol=1e-6)
+
+
+def test_jacobian_reuse_with_q_limits() -> None:
+    """
+    Check that when the reactive power limits switch PV buses to PQ, the chord Newton-Raphson
+    borders the factorization with the new rows and columns instead of refreshing it,
+    and reaches the same solution as the regular Newton-Raphson
+    """
+    grid = gce.open_file(os.path.join(SCRIPT_DIR, 'data', 'grids', 'IEEE118-gen120.gridcal'))
+
+    results = dict()
+    for policy in [JacobianReusePolicy.Always, JacobianReusePolicy.EveryK]:
+        options = PowerFlowOptions(SolverType.NR,
+                                   control_q=True,
+                                   retry_with_other_methods=False,
+                                   max_iter=50,
+                                   tolerance=1e-8,
+                                   jacobian_reuse_policy=policy,
+                                   trace_iterations=True)
+        results[policy] = gce.power_flow(grid, options)
+        assert results[policy].converged
+
+    base = results[JacobianReusePolicy.Always]
+    chord = results[JacobianReusePolicy.EveryK]
+    assert base.get_trace_df()['bordered'].sum() == 0
+    assert chord.get_trace_df()['bordered'].sum() > 0
+    assert chord.factorizations < base.factorizations
+    assert np.allclose(chord.voltage, base.voltage, atol=1e-6)
+
+
+def test_krylov_linear_solver() -> None:
+    """
+    Check that the Newton-Raphson with the preconditioned Krylov linear solvers
+    reaches the same solution as with the direct linear solver
+    """
+    grid = gce.open_file(os.path.join(SCRIPT_DIR, 'data', 'grids', 'IEEE39_1W.gridcal'))
+
+    results = dict()
+    for linear_solver in [SparseSolver.SuperLU, SparseSolver.GMRES, SparseSolver.BiCGSTAB]:
+        options = PowerFlowOptions(SolverType.NR,
+                                   retry_with_other_methods=False,
+                                   tolerance=1e-8,
+                                   linear_solver=linear_solver,
+                                   ilu_drop_tol=1e-3)
+        results[linear_solver] = gce.power_flow(grid, options)
+        assert results[linear_solver].converged
+
+    base = results[SparseSolver.SuperLU]
+    assert base.linear_iterations == 0
+
+    for linear_solver in [SparseSolver.GMRES, SparseSolver.BiCGSTAB]:
+        assert results[linear_solver].linear_iterations > 0
+        assert np.allclose(results[linear_solver].voltage, base.voltage, atol=1e-6)
+
+
+def test_iteration_trace() -> None:
+    """
+    Check that the Newton-like solvers record one trace row per iteration when requested
+    """
+    grid = gce.open_file(os.path.join(SCRIPT_DIR, 'data', 'grids', 'IEEE39_1W.gridcal'))
+
+    for solver_type in [SolverType.NR, SolverType.PowellDogLeg, SolverType.LM]:
+        options = PowerFlowOptions(solver_type,
+                                   retry_with_other_methods=False,
+                                   trace_iterations=True)
+        results = gce.power_flow(grid, options)
+        assert results.converged
+
+        df = results.get_trace_df()
+        assert len(df) == results.iterations + 1
+        assert np.allclose(df['iteration'].values, np.arange(len(df)))
+        assert df['nnz'].values[1:].min() > 0
+        assert df['fill_in'].values[1:].max() > 0
+        assert df['error'].values[-1] < options.tolerance
+
+        totals = results.get_trace_phase_totals()
+        assert totals['jacobian'] > 0
+        assert totals['factorization'] > 0
+
+        if solver_type == SolverType.NR:
+            assert df['line_search_trials'].values[1:].min() >= 1
+
+    # not requested: nothing is recorded
+    results = gce.power_flow(grid, PowerFlowOptions(SolverType.NR, retry_with_other_methods=False))
+    assert results.get_trace_df().empty
+
+
 # def test_reactive_power_splitting():
 #     options = PowerFlowOptions(SolverType.NR,
 #                                verbose=False,
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: MPL-2.0
 import math
 import os
+import tempfile
 import numpy as np
 import VeraGridEngine.api as gce
 from VeraGridEngine.Devices.profile import Profile, SparseArray, check_if_sparse
@@ -28,7 +29,7 @@ def test_sparse_array1():
     assert all_ok
 
     # x is fully dense, there should be internally the same as x
-    assert len(s._map) == n
+    assert len(s.get_map()) == n
 
 
 def test_sparse_array2():
@@ -52,7 +53,7 @@ def test_sparse_array2():
     assert all_ok
 
     # x is fully sparse, there are only 20 different values
-    assert len(s._map) == 20  # 30 - 10 -> 20
+    assert len(s.get_map()) == 20  # 30 - 10 -> 20
 
 
 def test_sparse_array3():
@@ -79,7 +80,7 @@ def test_sparse_array3():
     assert all_ok
 
     # x is fully sparse, the size should be 1
-    assert len(s._map) == 1  # only one value is different
+    assert len(s.get_map()) == 1  # only one value is different
 
 
 def test_sparse_array4():
@@ -112,7 +113,76 @@ def test_sparse_array4():
     assert all_ok
 
     # x is fully sparse
-    assert len(s._map) == len(x2[x2 != 0])  # should be 17
+    assert len(s.get_map()) == len(x2[x2 != 0])  # should be 17
+
+
+def test_sparse_array_vectorized():
+    """
+    Test the batched access, slicing and resizing of the sparse arrays against numpy
+    """
+    n = 200
+    x = np.zeros(n)
+    x[[3, 50, 51, 120, 199]] = [1.0, 2.0, -3.0, 4.5, 7.0]
+
+    s = SparseArray(data_type=float, default_value=0.0)
+    s.create_from_array(x, default_value=0.0)
+    assert s.nnz == 5
+    assert np.array_equal(s.get_indices(), [3, 50, 51, 120, 199])
+
+    indices = np.random.randint(low=0, high=n, size=500)
+    assert np.array_equal(s.take(indices), x[indices])
+    assert np.array_equal(s.toarray(), x)
+
+    indices = np.arange(0, n, 3)
+    assert np.array_equal(s.slice(indices).toarray(), x[indices])
+
+    # setting the default value removes the entry
+    s[50] = 0.0
+    x[50] = 0.0
+    s[10] = 8.0
+    x[10] = 8.0
+    assert s.nnz == 5
+    assert np.array_equal(s.toarray(), x)
+
+    s.resize(100)
+    assert np.array_equal(s.toarray(), x[:100])
+    assert s.nnz == 3
+
+
+def test_sparse_array_bulk_insert():
+    """
+    Test that the bulk insertion matches inserting one by one,
+    and that the scalar lookups follow the modifications
+    """
+    n = 1000
+    indices = np.random.randint(low=0, high=n, size=300)
+    values = np.random.rand(300)
+
+    s1 = SparseArray(data_type=float, default_value=0.0, size=n)
+    s1.insert(5, 2.0)
+    for i, x in zip(indices, values):
+        s1.insert(int(i), x)
+
+    s2 = SparseArray(data_type=float, default_value=0.0, size=n)
+    s2.insert(5, 2.0)
+    s2.set_sparse_data_from_data(indptr=indices, data=values)
+
+    assert s1 == s2
+    assert np.all(np.diff(s2.get_indices()) > 0)
+
+    # the lookups see the changes made after the first lookup
+    for i in range(n):
+        assert s1[i] == s2[i]
+
+    s2[7] = 3.0
+    s2.set_sparse_data_from_data(indptr=[8], data=[4.0])
+    s2.scale(2.0)
+    assert s2[7] == 6.0
+    assert s2[8] == 8.0
+
+    s2[7] = 0.0
+    assert s2[7] == 0.0
+    assert np.array_equal([s2[i] for i in range(n)], s2.toarray())
 
 
 def test_profile1():
@@ -142,7 +212,7 @@ def test_profile1():
     assert profile.is_sparse
 
     # x is fully sparse, there are only 20 different values
-    assert len(profile._sparse_array._map) == 20  # 30 - 10 -> 20
+    assert len(profile.sparse_array.get_map()) == 20  # 30 - 10 -> 20
 
 
 def test_profile2():
@@ -166,7 +236,7 @@ def test_profile2():
     assert all_ok
 
     # x is fully sparse, the size should be 1
-    assert len(profile._sparse_array._map) == 1  # only one value is different
+    assert len(profile.sparse_array.get_map()) == 1  # only one value is different
 
 
 def test_grid_profile_initialization():
@@ -194,3 +264,111 @@ def test_grid_profile_initialization():
                 logger.print()
 
             assert ok
+
+
+def test_columnar_profiles():
+    """
+    Check that the columnar profile storage is a zero-copy view of the device profiles
+    and that the bulk reads give the same values with and without it
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = gce.open_file(fname)
+
+    rates0 = grid.get_branch_rates_prof()
+    active0 = grid.get_branch_active_time_array()
+    load_p0 = np.array([elm.P_prof.toarray() for elm in grid.loads]).T
+
+    n = grid.consolidate_profiles(min_dense_fraction=0.0)
+    assert n > 0
+
+    assert np.allclose(rates0, grid.get_branch_rates_prof())
+    assert np.array_equal(active0, grid.get_branch_active_time_array())
+
+    # the profiles are views of the matrix columns
+    load_p = grid.get_profile_matrix(devices=grid.loads, prop='P')
+    assert np.allclose(load_p0, load_p)
+    grid.loads[0].P_prof[3] = 1234.0
+    assert load_p[3, 0] == 1234.0
+
+    # replacing a profile array detaches it, and the bulk read falls back to the profiles
+    grid.lines[0].rate_prof.set(np.full(grid.get_time_number(), 77.0))
+    assert np.allclose(grid.get_branch_rates_prof()[:, 0], 77.0)
+
+    # replacing a profile object detaches it too
+    load_p = grid.get_profile_matrix(devices=grid.loads, prop='P')
+    prof = grid.loads[1].P_prof.copy()
+    prof[0] = 4321.0
+    grid.loads[1].P_prof = prof
+    assert grid.get_profile_matrix(devices=grid.loads, prop='P')[0, 1] == 4321.0
+    assert load_p[0, 1] != 4321.0
+
+    # adding a device invalidates the matrix of its type
+    grid.add_load(bus=grid.buses[0], api_obj=gce.Load(P=10.0))
+    assert grid.get_profile_matrix(devices=grid.loads, prop='P').shape[1] == len(grid.loads)
+
+    # releasing the storage keeps the values
+    grid.release_profiles()
+    assert grid.loads[0].P_prof[3] == 1234.0
+
+
+def test_memory_mapped_profiles():
+    """
+    Check that memory-mapped profiles behave as the in-memory ones
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = gce.open_file(fname)
+    nt = grid.get_time_number()
+    time_indices = np.arange(24, 48)
+
+    nc_ts0 = gce.compile_numerical_circuit_ts(grid, time_indices=time_indices)
+    load_p0 = grid.loads[0].P_prof.toarray().copy()
+
+    with tempfile.TemporaryDirectory() as folder:
+        n = grid.consolidate_profiles(min_dense_fraction=0.0, folder=folder)
+        assert n > 0
+        assert grid.loads[0].P_prof.is_memory_mapped
+
+        # the compilation gives the same results
+        nc_ts = gce.compile_numerical_circuit_ts(grid, time_indices=time_indices)
+        for t in time_indices:
+            assert np.allclose(nc_ts0.get_at(t).load_data.S, nc_ts.get_at(t).load_data.S)
+
+        # item access and modification
+        prof = grid.loads[0].P_prof
+        assert prof[5] == load_p0[5]
+        prof[5] = 99.0
+        assert grid.get_profile_matrix(devices=grid.loads, prop='P')[5, 0] == 99.0
+
+        # resampling and resizing work on the mapped values and keep them mapped
+        prof.resample(np.arange(0, nt, 2))
+        assert np.allclose(prof.toarray(), load_p0[::2])
+        assert prof.is_memory_mapped
+        prof.resize(nt)
+        assert prof.size() == nt
+        assert np.allclose(prof.toarray()[:nt // 2], load_p0[::2])
+        assert prof.is_memory_mapped
+
+        # a second consolidation (or another grid) does not overwrite the mapped files
+        grid2 = gce.open_file(fname)
+        grid2.loads[0].P_prof[0] = -1.0
+        grid2.consolidate_profiles(min_dense_fraction=0.0, folder=folder)
+        assert grid.loads[1].P_prof[0] == grid2.loads[1].P_prof[0]
+        assert grid.loads[0].P_prof[0] != -1.0
+        grid2.release_profiles()
+
+        # sparse profiles are mapped without a dense copy
+        sparse_prof = Profile(default_value=1.0, data_type=float)
+        sparse_prof.create_sparse(size=nt, default_value=1.0, map_data={3: 5.0})
+        sparse_prof.set_memmap(os.path.join(folder, 'sparse.npy'))
+        assert sparse_prof.is_memory_mapped
+        assert sparse_prof[3] == 5.0 and sparse_prof[4] == 1.0
+
+        # a single profile can be mapped too
+        gen_prof = grid.generators[0].P_prof
+        gen_p0 = gen_prof.toarray().copy()
+        gen_prof.set_memmap(os.path.join(folder, 'gen0.npy'))
+        assert gen_prof.is_memory_mapped
+        assert np.allclose(gen_prof.toarray(), gen_p0)
+
+        grid.release_profiles()
+        grid.generators[0].P_prof.set(gen_p0)
@@ -6,11 +6,14 @@ from __future__ import annotations
 from time import time
 import numpy as np
 import numba as nb
-from scipy.sparse import csc_matrix, random, hstack, vstack
+from concurrent.futures import ThreadPoolExecutor
+from scipy.sparse import csc_matrix, random, hstack, vstack, diags
 from scipy.sparse import rand
 from scipy.sparse.linalg import spsolve as spsolve_scipy
 from VeraGridEngine.Utils.Sparse.csc2 import (sp_slice, sp_slice_rows, csc_stack_2d_ff, scipy_to_mat, spsolve_csc,
-                                              extend, CSC, csc_multiply_ff, csc_add_ff)
+                                              extend, CSC, csc_multiply_ff, csc_add_ff, SparseFactorization,
+                                              csc_stack_2d_ff_fill, KrylovSolver, get_bordered_factor)
+from VeraGridEngine.enumerations import SparseSolver
 
 
 def get_scipy_random_matrix(m: int | None = None, n: int | None = None) -> csc_matrix:
@@ -105,6 +108,40 @@ def test_stack_4():
     return True
 
 
+def test_stack_fill() -> None:
+    """
+    Test the in-place filling of a stacked matrix
+    """
+    mats = [scipy_to_mat(random(10, 5, density=0.3, format="csc", random_state=1)),
+            scipy_to_mat(random(10, 7, density=0.3, format="csc", random_state=2)),
+            scipy_to_mat(random(4, 5, density=0.3, format="csc", random_state=3)),
+            CSC(4, 7, 0, False)]
+    E1 = csc_stack_2d_ff(nb.typed.List(mats), 2, 2)
+
+    # same structure, new values
+    mats2 = [m.copy() for m in mats]
+    for m in mats2:
+        m.data[:] = np.random.rand(m.nnz)
+    E2 = csc_stack_2d_ff(nb.typed.List(mats2), 2, 2)
+
+    assert csc_stack_2d_ff_fill(nb.typed.List(mats2), 2, 2, E1)
+    assert np.allclose(E1.toarray(), E2.toarray())
+
+    # different structure
+    mats3 = [m.copy() for m in mats2]
+    mats3[3] = scipy_to_mat(random(4, 7, density=0.3, format="csc", random_state=4))
+    assert not csc_stack_2d_ff_fill(nb.typed.List(mats3), 2, 2, E1)
+    assert np.allclose(E1.toarray(), E2.toarray())
+
+    # same number of entries in different positions: the matrix is left untouched
+    mats4 = [m.copy() for m in mats2]
+    mats4[0] = scipy_to_mat(random(10, 5, density=0.3, format="csc", random_state=11))
+    assert mats4[0].nnz == mats2[0].nnz
+    assert not csc_stack_2d_ff_fill(nb.typed.List(mats4), 2, 2, E1)
+    assert np.allclose(E1.toarray(), E2.toarray())
+    assert not csc_stack_2d_ff_fill(nb.typed.List(mats2), 2, 2, CSC(0, 0, 0, False))
+
+
 def test_spsolve() -> None:
     """
     Test the CSC oriented spsolve_csc function
@@ -132,6 +169,154 @@ def test_spsolve() -> None:
             ok_a = False
 
 
+def test_sparse_factorization() -> None:
+    """
+    Test that the factorization that reuses the column ordering gives the same solutions
+    """
+    factorization = SparseFactorization()
+
+    for i in range(10):
+        m = np.random.randint(2, 500)
+        matrix = rand(m, m, density=0.05, format="csc", random_state=i) + diags(np.full(m, 10.0), format="csc")
+        matrix = matrix.tocsc()
+
+        for k in range(3):
+            # same pattern, different values
+            matrix.data = np.random.rand(matrix.nnz) + (matrix.data > 5.0) * 10.0
+            rhs = np.random.rand(m)
+            a = spsolve_scipy(matrix, rhs)
+
+            b, ok = factorization.solve(scipy_to_mat(matrix), rhs)
+            assert ok
+            assert np.allclose(a, b)
+
+            # the scipy matrices share the pattern
+            c, ok = factorization.solve(matrix, np.c_[rhs, 2 * rhs])
+            assert ok
+            assert np.allclose(a, c[:, 0])
+            assert np.allclose(2 * a, c[:, 1])
+
+        assert len(factorization.patterns) == i + 1
+
+    # singular matrix
+    matrix = csc_matrix(np.array([[1.0, 1.0], [1.0, 1.0]]))
+    _, ok = factorization.solve(matrix, np.ones(2))
+    assert not ok
+    x, ok = factorization.solve(matrix, np.ones(2))
+    assert not ok
+    assert np.isnan(x).all()
+
+
+def test_sparse_factorization_threads() -> None:
+    """
+    Test that the factorization can be shared by concurrent threads while its patterns are discarded
+    """
+    factorization = SparseFactorization(max_patterns=2)
+    matrices = list()
+    for i in range(8):
+        m = 50 + i
+        matrix = rand(m, m, density=0.05, format="csc", random_state=i) + diags(np.full(m, 10.0), format="csc")
+        matrices.append(matrix.tocsc())
+
+    def work(k: int) -> bool:
+        matrix = matrices[k % len(matrices)]
+        rhs = np.ones(matrix.shape[0])
+        x, ok = factorization.solve(matrix, rhs)
+        return ok and np.allclose(matrix @ x, rhs)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(work, range(400)))
+
+    assert len(factorization.patterns) <= 2
+
+
+def test_krylov_solver() -> None:
+    """
+    Test that the preconditioned Krylov solvers give the same solutions as the direct solver,
+    computing the preconditioner once per pattern while the values do not change much
+    """
+    for method in [SparseSolver.GMRES, SparseSolver.BiCGSTAB]:
+        solver = KrylovSolver(method=method, tol=1e-12)
+
+        m = 300
+        matrix = rand(m, m, density=0.02, format="csc", random_state=1) + diags(np.full(m, 10.0), format="csc")
+        matrix = matrix.tocsc()
+        data0 = matrix.data.copy()
+
+        for k in range(5):
+            # same pattern, slightly different values
+            matrix.data = data0 * (1.0 + 0.01 * k)
+            rhs = np.random.rand(m)
+            a = spsolve_scipy(matrix, rhs)
+
+            factor = solver.factor(scipy_to_mat(matrix))
+            b = factor.solve(rhs)
+            assert np.allclose(a, b)
+            assert factor.last_iterations > 0
+
+            c = factor.solve(np.c_[rhs, 2 * rhs])
+            assert np.allclose(a, c[:, 0])
+            assert np.allclose(2 * a, c[:, 1])
+
+        stats = solver.get_stats()
+        assert stats['solves'] == 15
+        assert stats['preconditioners'] == 1
+        assert stats['fallbacks'] == 0
+        assert len(solver.preconditioners) == 1
+
+    # the GMRES iteration limit counts the same inner iterations as the statistics
+    m = 300
+    matrix = rand(m, m, density=0.05, format="csc", random_state=2) + diags(np.full(m, 2.0), format="csc")
+    solver = KrylovSolver(method=SparseSolver.GMRES, tol=1e-14, max_iter=6, drop_tol=0.9, fill_factor=1.0,
+                          restart=3)
+    prec = solver.compute_preconditioner(matrix.tocsc(), key='test')
+    x, iterations, ok = solver.krylov(matrix.tocsc(), np.random.rand(m), prec)
+    assert not ok
+    assert iterations == 6
+
+
+def test_bordered_factor() -> None:
+    """
+    Test that extending a factorization with some rows and columns gives the solutions of the extended matrix
+    """
+    factorization = SparseFactorization()
+
+    for i in range(10):
+        m = np.random.randint(10, 300)
+        matrix = rand(m, m, density=0.05, format="csc", random_state=i) + diags(np.full(m, 10.0), format="csc")
+        matrix = matrix.tocsc()
+        rhs = np.random.rand(m)
+        a = spsolve_scipy(matrix, rhs)
+
+        # the border rows and columns are scattered in the matrix
+        k = np.random.randint(1, m // 4)
+        perm = np.random.permutation(m)
+        rows_a, rows_b = perm[k:], perm[:k]
+        cols_a, cols_b = perm[k:], perm[:k]
+
+        factor = factorization.factor(matrix[rows_a, :][:, cols_a].tocsc())
+        bordered = get_bordered_factor(factor, scipy_to_mat(matrix), rows_a, cols_a, rows_b, cols_b)
+        assert bordered.shape == (m, m)
+        assert np.allclose(a, bordered.solve(rhs))
+
+        c = bordered.solve(np.c_[rhs, 2 * rhs])
+        assert np.allclose(a, c[:, 0])
+        assert np.allclose(2 * a, c[:, 1])
+
+        # border a bordered factorization
+        k2 = np.random.randint(1, k + 1)
+        factor = factorization.factor(matrix[rows_a[k2:], :][:, cols_a[k2:]].tocsc())
+        inner = get_bordered_factor(factor, matrix[rows_a, :][:, cols_a].tocsc(),
+                                    np.arange(k2, m - k), np.arange(k2, m - k), np.arange(k2), np.arange(k2))
+        bordered = get_bordered_factor(inner, matrix, rows_a, cols_a, rows_b, cols_b)
+        assert np.allclose(a, bordered.solve(rhs))
+
+    # singular Schur complement
+    matrix = csc_matrix(np.array([[1.0, 1.0], [1.0, 1.0]]))
+    factor = factorization.factor(csc_matrix(np.array([[1.0]])))
+    assert get_bordered_factor(factor, matrix, np.array([0]), np.array([0]), np.array([1]), np.array([1])) is None
+
+
 def test_extend():
     """
     Test the extend function
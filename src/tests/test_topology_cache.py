@@ -0,0 +1,188 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+import numpy as np
+
+from VeraGridEngine.IO.file_handler import FileOpen
+from VeraGridEngine.Compilers.circuit_to_data import compile_numerical_circuit_at
+from VeraGridEngine.Simulations.PowerFlow.power_flow_options import PowerFlowOptions
+from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc
+from VeraGridEngine.Simulations.PowerFlow.power_flow_ts_driver import PowerFlowTimeSeriesDriver
+from VeraGridEngine.enumerations import SolverType
+from VeraGridEngine.Topology.topology_cache import (TopologyCache, RunTopologyCache, hash_arrays,
+                                                    get_topology_cache, set_topology_cache)
+
+
+def test_hash_arrays():
+    """
+    The hash must change with the values, the type and the shape of the arrays
+    """
+    a = np.array([1, 2, 3])
+    assert hash_arrays(a) == hash_arrays(a.copy())
+    assert hash_arrays(a) != hash_arrays(np.array([1, 2, 4]))
+    assert hash_arrays(a) != hash_arrays(a.astype(float))
+    assert hash_arrays(a, a) != hash_arrays(np.r_[a, a])
+    assert hash_arrays(a, True) != hash_arrays(a, False)
+
+
+def test_topology_cache_lru():
+    """
+    The least recently used entries are removed when the memory budget is exceeded
+    """
+    cache = TopologyCache(max_memory_mb=3 * 8e5 / 1048576.0)  # room for 3 arrays of 1e5 floats
+
+    for i in range(3):
+        cache.set('x', str(i), np.zeros(100000))
+
+    assert len(cache) == 3
+    assert cache.get('x', '0') is not None  # 0 is now the most recently used
+
+    cache.set('x', '3', np.zeros(100000))
+    assert len(cache) == 3
+    assert cache.get('x', '1') is None  # 1 was the least recently used
+    assert cache.get('x', '0') is not None
+    assert cache.memory_mb <= cache.max_memory_mb
+
+
+def test_topology_cache_power_flow():
+    """
+    The power flow results must be the same with and without the topology cache,
+    and repeated topologies must be served from the cache
+    """
+    fname = os.path.join('data', 'grids', 'IEEE14 - multi-island hvdc.gridcal')
+    grid = FileOpen(fname).open()
+    options = PowerFlowOptions()
+
+    previous_cache = get_topology_cache()
+    try:
+        set_topology_cache(None)
+        res_no_cache = multi_island_pf_nc(nc=compile_numerical_circuit_at(grid, t_idx=None), options=options)
+
+        cache = TopologyCache()
+        set_topology_cache(cache)
+        res1 = multi_island_pf_nc(nc=compile_numerical_circuit_at(grid, t_idx=None), options=options)
+        hits1 = cache.hits
+        res2 = multi_island_pf_nc(nc=compile_numerical_circuit_at(grid, t_idx=None), options=options)
+
+        assert cache.hits > hits1
+        assert np.allclose(res_no_cache.voltage, res1.voltage)
+        assert np.allclose(res_no_cache.voltage, res2.voltage)
+        assert np.allclose(res_no_cache.Sf, res2.Sf)
+
+    finally:
+        set_topology_cache(previous_cache)
+
+
+def test_topology_cache_returns_copies():
+    """
+    The cache is disabled by default, and when enabled the cached matrices
+    are handed out as copies, so that modifying them does not alter the cache
+    """
+    assert get_topology_cache() is None
+
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    nc = compile_numerical_circuit_at(grid, t_idx=None)
+
+    previous_cache = get_topology_cache()
+    try:
+        set_topology_cache(TopologyCache())
+        lin1 = nc.get_linear_admittance_matrices()
+        bbus = lin1.Bbus.toarray()
+        lin1.Bbus.data *= 2.0
+        lin2 = nc.get_linear_admittance_matrices()
+        assert np.allclose(lin2.Bbus.toarray(), bbus)
+
+        fd1 = nc.get_fast_decoupled_amittances()
+        b1 = fd1.B1.toarray()
+        fd1.B1.data *= 2.0
+        assert np.allclose(nc.get_fast_decoupled_amittances().B1.toarray(), b1)
+
+    finally:
+        set_topology_cache(previous_cache)
+
+
+def test_topology_cache_fast_decoupled():
+    """
+    The fast decoupled time series must reuse the B' and B'' factorizations
+    of the repeated topologies, giving the same results as without the cache
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+
+    options = PowerFlowOptions(solver_type=SolverType.FASTDECOUPLED,
+                               retry_with_other_methods=False,
+                               control_q=False)
+    time_indices = np.arange(24)
+
+    previous_cache = get_topology_cache()
+    try:
+        # step by step without any cache
+        set_topology_cache(None)
+        voltage = list()
+        for t in time_indices:
+            nc = compile_numerical_circuit_at(grid, t_idx=t)
+            voltage.append(multi_island_pf_nc(nc=nc, options=options).voltage)
+
+        # the driver reuses the factorizations through its run cache, looked at here with an outer scope
+        with RunTopologyCache() as cache:
+            driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+            driver.run()
+
+            n_factors = sum(1 for kind, key in cache._data.keys() if kind == 'fast_decoupled_factors')
+            assert n_factors == 2  # one per topology
+
+        assert driver.results.converged_values.all()
+        assert np.allclose(np.array(voltage), driver.results.voltage)
+
+    finally:
+        set_topology_cache(previous_cache)
+
+
+def test_run_topology_cache():
+    """
+    The time series driver installs a topology cache for the run and removes it afterwards,
+    so that the repeated topologies of the grouped time series reuse the admittances and islands
+    """
+    fname = os.path.join('data', 'grids', 'IEEE39_1W.gridcal')
+    grid = FileOpen(fname).open()
+    for t in range(5, 10):
+        grid.lines[3].active_prof[t] = False
+
+    options = PowerFlowOptions(solver_type=SolverType.NR, grouped_time_series=True)
+    time_indices = np.arange(24)
+
+    previous_cache = get_topology_cache()
+    try:
+        set_topology_cache(None)
+        driver = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+        driver.run()
+        assert get_topology_cache() is None
+
+        # the scope keeps an installed cache, here used to look at what the run stored
+        with RunTopologyCache() as cache:
+            assert get_topology_cache() is cache
+            driver2 = PowerFlowTimeSeriesDriver(grid=grid, options=options, time_indices=time_indices)
+            driver2.run()
+            assert get_topology_cache() is cache
+            assert cache.hits > cache.misses
+            assert ('islands' in {kind for kind, key in cache._data.keys()})
+
+        assert get_topology_cache() is None
+        assert np.allclose(driver.results.voltage, driver2.results.voltage)
+
+    finally:
+        set_topology_cache(previous_cache)
+
+
+if __name__ == '__main__':
+    test_hash_arrays()
+    test_topology_cache_lru()
+    test_topology_cache_power_flow()
+    test_topology_cache_returns_copies()
+    test_topology_cache_fast_decoupled()
+    test_run_topology_cache()
@@ -3,13 +3,15 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 # SPDX-License-Identifier: MPL-2.0
 import os
+import numpy as np
 
 from scipy.sparse import lil_matrix
 from VeraGridEngine.api import *
 import VeraGridEngine.Devices as dev
 from VeraGridEngine.Devices.multi_circuit import MultiCircuit
 from VeraGridEngine.api import power_flow
-from VeraGridEngine.Topology.topology import compute_connectivity_flexible
+from VeraGridEngine.Topology.topology import (compute_connectivity_flexible, find_different_states,
+                                              compute_topology_index)
 from VeraGridEngine.Simulations.PowerFlow.power_flow_worker import multi_island_pf_nc
 
 def test_topology_4_nodes_A():
@@ -1021,3 +1023,38 @@ def test_segmenting_by_hvdc():
     islands_1 = nc.split_into_islands(consider_hvdc_as_island_links=False)
 
     assert len(islands_1) == 2
+
+
+def test_find_different_states():
+    """
+    Check the hash based states search against the pairwise comparison
+    """
+
+    def find_different_states_tested(states_array):
+        states = dict()
+        for t in range(states_array.shape[0]):
+            found = False
+            for t2 in states.keys():
+                if np.array_equal(states_array[t, :], states_array[t2, :]):
+                    states[t2].append(t)
+                    found = True
+                    break
+            if not found:
+                states[t] = [t]
+        return states
+
+    np.random.seed(0)
+    patterns = np.random.rand(6, 40) > 0.2
+    states_array = patterns[np.random.randint(0, 6, size=200), :]
+
+    expected = find_different_states_tested(states_array)
+    computed = find_different_states(states_array)
+
+    assert computed == expected
+    assert list(computed.keys()) == list(expected.keys())
+
+    index = compute_topology_index(states_array)
+    assert index.n_states == len(expected)
+    for state, t0 in enumerate(index.representative):
+        assert index.get_positions(state).tolist() == expected[t0]
+        assert index.counts[state] == len(expected[t0])
@@ -0,0 +1,88 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+# SPDX-License-Identifier: MPL-2.0
+import os
+import sys
+import json
+import pickle
+import subprocess
+import numpy as np
+
+import VeraGridEngine
+from VeraGridEngine.warmup import warm_up, WARM_UP_SOLVERS, GENERALIZED_SOLVERS
+from VeraGridEngine.Utils.Sparse.csc2 import CSC, CxCSC, scipy_to_mat, mat_to_scipy
+from scipy.sparse import random as sparse_random
+
+# first power flow of a new process, reporting the numba compilations that it triggers
+COLD_START_SCRIPT = """
+import os
+import json
+from numba.core import event
+import VeraGridEngine.api as gce
+grid = gce.open_file(os.path.join('data', 'grids', 'IEEE39_1W.gridcal'))
+with event.install_recorder('numba:compile') as recorder:
+    results = gce.power_flow(grid, gce.PowerFlowOptions(retry_with_other_methods=False))
+compiled = sorted({str(e.data['dispatcher'].py_func.__qualname__) for _, e in recorder.buffer if e.is_start})
+print(json.dumps({'converged': bool(results.converged), 'compiled': compiled}))
+"""
+
+
+def test_csc_struct():
+    """
+    Check the CSC containers from python: attributes, methods and pickling
+    """
+    A = sparse_random(6, 6, density=0.4, format='csc', random_state=1)
+    A.setdiag(1.0)
+    A = A.tocsc()
+
+    B = scipy_to_mat(A)
+    assert isinstance(B, CSC)
+    assert B.shape == A.shape
+    assert B.nnz == A.nnz
+    assert np.allclose(B.todense(), A.toarray())
+    assert np.allclose(B.dot(np.ones(6)), A @ np.ones(6))
+    assert np.allclose(B.copy().add_val_to_diagonal(2.0).todense(), A.toarray() + 2.0 * np.eye(6))
+    assert np.allclose(B.sum(B).todense(), 2.0 * A.toarray())
+    assert np.allclose(B.mul(B).todense(), (A @ A).toarray())
+
+    B.data = B.data * 3.0
+    assert np.allclose(mat_to_scipy(B).toarray(), 3.0 * A.toarray())
+
+    C = pickle.loads(pickle.dumps(B))
+    assert isinstance(C, CSC)
+    assert np.allclose(C.todense(), B.todense())
+
+    Z = CxCSC(6, 6, A.nnz, False).set(A.indices.astype(np.int32), A.indptr.astype(np.int32),
+                                       (A.data * (1.0 + 2.0j)).astype(np.complex128))
+    assert np.allclose(Z.real.todense(), A.toarray())
+    assert np.allclose(Z.imag.todense(), 2.0 * A.toarray())
+    assert np.allclose((Z + Z).todense(), 2.0 * Z.todense())
+
+
+def test_warm_up():
+    """
+    Check that the warm-up runs all the solvers
+    """
+    times = warm_up()
+    assert len(times) == len(WARM_UP_SOLVERS) + len([s for s in WARM_UP_SOLVERS if s in GENERALIZED_SOLVERS])
+
+
+def test_cold_start_compilations():
+    """
+    Once warmed up, a new process must load the kernels from the numba cache
+    instead of compiling them, which took seconds with the former jitclass containers
+    """
+    warm_up()
+
+    src_path = os.path.dirname(os.path.dirname(os.path.abspath(VeraGridEngine.__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([src_path] + [p for p in [env.get('PYTHONPATH', '')] if p])
+
+    process = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], capture_output=True, text=True, env=env)
+    assert process.returncode == 0, process.stderr
+
+    stats = json.loads(process.stdout.strip().splitlines()[-1])
+
+    assert stats['converged']
+    assert len(stats['compiled']) == 0, stats['compiled']